@@ -0,0 +1,96 @@
+"""
+Builds data/timezones.npz, the timezone boundary dataset of services/timezone_index.py.
+
+Source: the timezone-boundary-builder polygons (OpenStreetMap data, ODbL) as
+shipped by the `timezonefinder` package. timezonefinder is only needed here,
+not at runtime - install it in a throwaway environment:
+
+    pip install --target /tmp/tzenv timezonefinder
+    PYTHONPATH=/tmp/tzenv python build_timezone_data.py [tolerance_deg]
+
+Rings are simplified (Douglas-Peucker, TOLERANCE degrees, ~1 km) and stored
+as int32 coordinates in 1e-4 degree units.
+"""
+import sys
+import numpy as np
+
+TOLERANCE = float(sys.argv[1]) if len(sys.argv) > 1 else 0.01
+SCALE = 10000  # coordinate units per degree
+OUT_PATH = "data/timezones.npz"
+
+
+def simplify(x, y, tolerance):
+    """Douglas-Peucker on a closed ring; returns the kept vertex indices (ring stays closed)."""
+    n = len(x)
+    if n <= 8:
+        return np.arange(n)
+    # Split the ring at the vertex farthest from the first one
+    far = int(np.argmax((x - x[0]) ** 2 + (y - y[0]) ** 2))
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, far, n - 1]] = True
+    stack = [(0, far), (far, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        dx, dy = x[b] - x[a], y[b] - y[a]
+        seg = dx * dx + dy * dy
+        px, py = x[a + 1:b] - x[a], y[a + 1:b] - y[a]
+        if seg == 0:
+            dist = np.hypot(px, py)
+        else:
+            dist = np.abs(px * dy - py * dx) / np.sqrt(seg)
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = a + 1 + i
+            keep[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+    return np.nonzero(keep)[0]
+
+
+def main():
+    from timezonefinder import TimezoneFinder
+    tf = TimezoneFinder()
+    names = sorted(tf.timezone_names)
+
+    poly_zone, poly_rings = [], []
+    ring_offsets, coords = [0], []
+    source_points = 0
+    for zone_id, name in enumerate(names):
+        for polygon in tf.get_geometry(tz_name=name, coords_as_pairs=False):
+            rings = 0
+            for ring_no, (xs, ys) in enumerate(polygon):
+                x, y = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+                source_points += len(x)
+                if x[0] != x[-1] or y[0] != y[-1]:
+                    x, y = np.append(x, x[0]), np.append(y, y[0])
+                idx = simplify(x, y, TOLERANCE)
+                if len(idx) < 4:
+                    if ring_no > 0:
+                        continue  # hole smaller than the tolerance
+                    idx = np.arange(len(x))  # keep small islands as they are
+                ring = np.round(np.column_stack([x[idx], y[idx]]) * SCALE).astype(np.int32)
+                coords.append(ring)
+                ring_offsets.append(ring_offsets[-1] + len(ring))
+                rings += 1
+            poly_zone.append(zone_id)
+            poly_rings.append(rings)
+
+    coords = np.concatenate(coords)
+    np.savez_compressed(
+        OUT_PATH,
+        zone_names=np.array(names),
+        poly_zone=np.array(poly_zone, dtype=np.int16),
+        poly_rings=np.array(poly_rings, dtype=np.int32),
+        ring_offsets=np.array(ring_offsets, dtype=np.int64),
+        coords=coords,
+        scale=np.array(SCALE),
+        tolerance=np.array(TOLERANCE),
+    )
+    print(f"{OUT_PATH}: {len(names)} zones, {len(poly_zone)} polygons, "
+          f"{len(coords)} of {source_points} vertices (tolerance {TOLERANCE} deg)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
+import os
 import json
 from services.kerykeion_engine import KerykeionService
 from services.numerology_service import get_numerology_data
 from services.astrology_aggregator import AstrologyAggregator
 
 class ReportGenerator:
+    # "bundle": one LLM request for all AI sections, each section's own generator only if
+    # it comes back missing/malformed. "separate": one LLM request per generator.
+    AI_MODE = os.getenv("REPORT_AI_MODE", "bundle")
+
     @staticmethod
     def generate_consolidated_report(name, year, month, day, hour, minute, city, lat, lng, timezone=None, context=None, lang="en", gender="male"):
-        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import ThreadPoolExecutor, Future
         from datetime import datetime
 
         print(f"Generating consolidated report for {name} ({lang}, {gender})...")
@@ -23,19 +28,26 @@ class ReportGenerator:
         if context is None: context = {}
         context['age'] = age
 
+        # Shared Skyfield pass for the Vedic report, Kundali SVGs and KP cusps
+        from services.vedic_astro_engine import VedicAstroEngine
+        chart_context = VedicAstroEngine.get_chart_context(year, month, day, hour, minute, lat, lng, timezone_str=timezone)
+        bundle_mode = ReportGenerator.AI_MODE == "bundle"
+
         with ThreadPoolExecutor() as executor:
             # Parallel Task 1: Vedic Analysis
             print(f"- Starting Vedic Analysis & Transits (Age: {age})...")
             vedic_future = executor.submit(
                 AstrologyAggregator.get_vedic_full_report,
-                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone, context=context
+                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone, context=context,
+                chart_context=chart_context, include_ai_summary=not bundle_mode
             )
             
             # Parallel Task 2: Numerology (Standard + Hilary Gerard + Loshu)
             print("- Starting Numerology Data Fetch (Parallel)...")
             numerology_future = executor.submit(
                 get_numerology_data,
-                name, year, month, day, context=context, lang=lang, gender=gender
+                name, year, month, day, context=context, lang=lang, gender=gender,
+                include_ai_insights=not bundle_mode
             )
             
             # Parallel Task 3: Astrocartography
@@ -43,7 +55,8 @@ class ReportGenerator:
             from services.astrocartography_engine import AstrocartographyEngine
             acg_future = executor.submit(
                 AstrocartographyEngine.calculate_power_zones,
-                name, year, month, day, hour, minute
+                name, year, month, day, hour, minute,
+                timezone_str=timezone, birth_lat=lat, birth_lng=lng
             )
 
             # Wait for base data to be ready
@@ -55,22 +68,73 @@ class ReportGenerator:
                 print(f"Warning: Astrocartography failed: {e}")
                 acg_locations = []
 
+        # Sun/Moon/Ascendant for the executive summary (the Western section itself stays disabled)
+        western_brief = None
+        if bundle_mode:
+            try:
+                western_brief = KerykeionService.calculate_chart(
+                    name, year, month, day, hour, minute, city, lat, lng, timezone_str=timezone,
+                    chart_context=chart_context
+                )
+            except Exception as e:
+                print(f"Western brief Error: {e}")
+
         # 2. Detailed AI Analyses (Parallelizing the dependent AI calls)
         print("- Starting AI Synthesis Layer (Parallel)...")
         with ThreadPoolExecutor() as executor:
-            from services.ai_service import generate_vedic_chart_analysis, generate_relationship_analysis
-            
+            from services.ai_service import (
+                generate_vedic_chart_analysis, generate_relationship_analysis,
+                generate_vedic_ai_summary, generate_report_bundle
+            )
+            from services.numerology_service import generate_ai_insights, attach_ai_insights
+
+            # Parallel Task for SVG and Analysis (Non-AI but separate)
+            svg_future = executor.submit(
+                AstrologyAggregator.get_kundali_svg,
+                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone,
+                chart_context=chart_context
+            )
+            navamsa_svg_future = executor.submit(
+                AstrologyAggregator.get_navamsa_svg,
+                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone,
+                chart_context=chart_context
+            )
+
+            # Bundle mode: every AI section from one prompt that carries the chart facts once
+            ai_sections = {}
+            if bundle_mode:
+                sections = ["vedic_summary", "personality", "relationship", "executive_summary", "numerology_insights"]
+                if age < 18:
+                    sections.remove("relationship")  # generate_relationship_analysis answers minors without AI
+                try:
+                    ai_sections = generate_report_bundle(
+                        name, vedic_full, numerology, loshu_data=numerology.get('loshu_grid'),
+                        western_data=western_brief, sections=sections, context=context, lang=lang,
+                        dob=f"{day}-{month}-{year}", place=city, age=age
+                    )
+                except Exception as e:
+                    print(f"Report Bundle AI Error: {e}")
+                print(f"- AI bundle returned {sum(v is not None for v in ai_sections.values())}/{len(sections)} sections")
+
+            def from_bundle(section, fn, *args, **kwargs):
+                """Bundled section if it came back valid, else that section's own generator."""
+                if ai_sections.get(section) is not None:
+                    done = Future()
+                    done.set_result(ai_sections[section])
+                    return done
+                return executor.submit(fn, *args, **kwargs)
+
             # Personality Analysis Future
-            personality_future = executor.submit(
-                generate_vedic_chart_analysis,
+            personality_future = from_bundle(
+                "personality", generate_vedic_chart_analysis,
                 name, vedic_full['planets'], vedic_full['panchang'], 
                 doshas=vedic_full.get('doshas', {}), lang=lang,
                 dob=f"{day}-{month}-{year}", place=city, age=age
             )
 
             # Relationship Analysis Future
-            relationship_future = executor.submit(
-                generate_relationship_analysis,
+            relationship_future = from_bundle(
+                "relationship", generate_relationship_analysis,
                 name, vedic_full['planets'], vedic_full['panchang'], lang=lang, age=age
             )
 
@@ -79,19 +143,24 @@ class ReportGenerator:
                 AstrologyAggregator.get_aggregated_best_prediction,
                 name, year, month, day, hour, minute, city, lat, lng, timezone,
                 vedic_data=vedic_full, numerology_data=numerology,
-                western_data=western_chart, context=context, lang=lang
+                western_data=western_brief, context=context, lang=lang,
+                executive_summary=ai_sections.get("executive_summary")
             )
 
-            # Parallel Task for SVG and Analysis (Non-AI but separate)
-            svg_future = executor.submit(
-                AstrologyAggregator.get_kundali_svg,
-                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone
-            )
-            navamsa_svg_future = executor.submit(
-                AstrologyAggregator.get_navamsa_svg,
-                name, year, month, day, hour, minute, lat, lng, lang=lang, timezone=timezone
-            )
-            
+            # Sections that get_vedic_full_report / get_numerology_data leave to the bundle
+            if bundle_mode:
+                vedic_summary_future = from_bundle(
+                    "vedic_summary", generate_vedic_ai_summary,
+                    name, vedic_full['planets'], vedic_full['panchang'], vedic_full['dasha'],
+                    lang=lang, context=context, doshas=vedic_full.get('doshas', {}), transits=vedic_full.get('transits')
+                )
+                numerology_ai_future = from_bundle(
+                    "numerology_insights", generate_ai_insights,
+                    name, f"{year}-{month:02d}-{day:02d}", numerology,
+                    loshu_data=numerology.get('loshu_grid'), vedic_data=vedic_full,
+                    western_data=western_brief, context=context, lang=lang
+                )
+
             # Collect Results
             try:
                 vedic_personality_analysis = personality_future.result()
@@ -123,6 +192,18 @@ class ReportGenerator:
                 print(f"Navamsa SVG Error: {e}")
                 navamsa_svg = None
 
+            if bundle_mode:
+                try:
+                    vedic_full['ai_summary'] = vedic_summary_future.result()
+                except Exception as e:
+                    print(f"AI Summary Error: {e}")
+                    vedic_full['ai_summary'] = None
+
+                try:
+                    attach_ai_insights(numerology, numerology_ai_future.result())
+                except Exception as e:
+                    print(f"Numerology AI Error: {e}")
+
         # Extract Loshu Grid to move it to Vedic Astrology
         loshu_data = numerology.pop('loshu_grid', None)
         transits = vedic_full.get('transits', []) # Already calculated in get_vedic_full_report
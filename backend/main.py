@@ -1,7 +1,9 @@
 from dotenv import load_dotenv
 load_dotenv()
 from fastapi import FastAPI, HTTPException, Request
+import json
 import time
+import threading
 
 # Force reload, Request
 from fastapi.exceptions import RequestValidationError
@@ -22,6 +24,7 @@ from services.migration_service import migrate_emails_to_lowercase
 from services.reset_password_migration import add_reset_columns
 from services.profile_schema_migration import add_profile_columns
 from database import engine, Base, AsyncSessionLocal
+from services.compute_dispatcher import ComputeDispatcher
 
 app = FastAPI()
 
@@ -60,6 +63,26 @@ async def startup():
     # Run Migration for Profile Columns
     await add_profile_columns(AsyncSessionLocal)
 
+    # Start compute processes now (DE421 preloaded) instead of on the first chart request
+    ComputeDispatcher.warm_up()
+
+    # Keep the shared "now" transit charts warm across bucket boundaries
+    from services.transit_cache import TransitCache
+    TransitCache.start_background_refresh()
+
+    # Sign-level daily horoscopes for all signs/languages, once per day
+    from services.horoscope_store import DailyHoroscopeStore
+    DailyHoroscopeStore.start_scheduler()
+
+    start_cache_stats_log()
+
+@app.on_event("shutdown")
+def shutdown():
+    log_cache_stats()
+    ComputeDispatcher.shutdown()
+    from services.llm_provider import LLMClient
+    LLMClient.shutdown()
+
 # Include Routers
 app.include_router(auth_router.router)
 app.include_router(profile_router.router)
@@ -82,6 +105,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 from fastapi.staticfiles import StaticFiles
@@ -116,12 +140,61 @@ class BirthDetails(BaseModel):
 def read_root():
     return {"message": "AstroPinch Backend is running"}
 
+# Cache statistics go to the log (internal data, not served over HTTP).
+# Every CACHE_STATS_LOG_SECONDS (0 turns it off) and at shutdown.
+CACHE_STATS_LOG_SECONDS = int(os.getenv("CACHE_STATS_LOG_SECONDS", "3600"))
+
+def cache_stats():
+    from services.chart_context import ChartContext
+    from services.transit_cache import TransitCache
+    from services.ai_cache import AIResponseCache
+    from services.chat_session import ChatSessionStore
+    from services.llm_provider import LLMClient
+    from services.horoscope_store import DailyHoroscopeStore
+    from services.chart_image_cache import ChartImageCache
+    from services.timezone_index import TimezoneIndex
+    from services.birth_instant import BirthInstant
+    return {
+        "charts": ChartContext.stats(),
+        "transits": TransitCache.stats(),
+        "ai": AIResponseCache.stats(),
+        "chat_sessions": ChatSessionStore.stats(),
+        "llm": LLMClient.stats(),
+        "horoscopes": DailyHoroscopeStore.stats(),
+        "chart_images": ChartImageCache.stats(),
+        "timezones": TimezoneIndex.stats(),
+        "birth_instants": BirthInstant.stats()
+    }
+
+def log_cache_stats():
+    try:
+        print(f"Cache stats: {json.dumps(cache_stats(), default=str)}")
+    except Exception as e:
+        print(f"Cache stats error: {e}")
+
+def start_cache_stats_log():
+    if CACHE_STATS_LOG_SECONDS <= 0:
+        return
+
+    def loop():
+        while True:
+            time.sleep(CACHE_STATS_LOG_SECONDS)
+            log_cache_stats()
+
+    threading.Thread(target=loop, name="cache-stats-log", daemon=True).start()
+
 @app.post("/api/chart")
 def get_chart(details: BirthDetails):
+    from services.vedic_astro_engine import VedicAstroEngine
+    # Cached natal pass - repeat views of the same profile skip Skyfield
+    chart_context = VedicAstroEngine.get_chart_context(
+        details.year, details.month, details.day, details.hour, details.minute,
+        details.lat, details.lng, timezone_str=details.timezone
+    )
     chart_data = KerykeionService.calculate_chart(
         details.name, details.year, details.month, details.day,
         details.hour, details.minute, details.city, details.lat, details.lng, details.timezone,
-        lang=details.lang
+        lang=details.lang, chart_context=chart_context
     )
     
     if not chart_data:
@@ -174,104 +247,68 @@ def get_chart_analysis(details: BirthDetails):
     )
     return analysis
 
+def _chart_image_response(request: Request, details, division, style):
+    """
+    PNG chart of the birth details, served from ChartImageCache. The ETag is the
+    placement fingerprint; a matching If-None-Match gets a 304 without rendering.
+    """
+    from services.vedic_astro_engine import VedicAstroEngine
+    from services.chart_image_cache import ChartImageCache
+    from services.chart_layout import CHART_PLACEMENTS
+    from fastapi import Response
+
+    # Get sidereal data
+    chart_data = VedicAstroEngine.calculate_sidereal_planets(
+        details.year, details.month, details.day,
+        details.hour, details.minute, details.lat, details.lng,
+        timezone_str=details.timezone
+    )
+    if division == "navamsa":
+        # Calculate divisional charts
+        chart_data = VedicAstroEngine.calculate_divisional_charts(chart_data)
+
+    placements = CHART_PLACEMENTS[(division, style)](chart_data)
+    fingerprint = ChartImageCache.fingerprint(style, placements)
+    etag = ChartImageCache.etag(fingerprint)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if ChartImageCache.not_modified(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    image = ChartImageCache.get_image(style, placements, fingerprint)
+    return JSONResponse({"image": image}, headers=headers)
+
 @app.post("/api/chart/lagna/north")
-def get_lagna_chart_north(details: BirthDetails):
+def get_lagna_chart_north(details: BirthDetails, request: Request):
     """Generate Lagna (D1) chart in North Indian style"""
     try:
-        from services.vedic_astro_engine import VedicAstroEngine
-        from services.chart_generator import ChartGenerator
-        import base64
-        
-        # Get sidereal data
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(
-            details.year, details.month, details.day,
-            details.hour, details.minute, details.lat, details.lng,
-            timezone_str=details.timezone
-        )
-        
-        # Generate chart
-        img_buffer = ChartGenerator.generate_lagna_chart_north_indian(sidereal_data)
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-        
-        return {"image": f"data:image/png;base64,{img_base64}"}
+        return _chart_image_response(request, details, "lagna", "north")
     except Exception as e:
         print(f"Lagna North Chart Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/chart/lagna/south")
-def get_lagna_chart_south(details: BirthDetails):
+def get_lagna_chart_south(details: BirthDetails, request: Request):
     """Generate Lagna (D1) chart in South Indian style"""
     try:
-        from services.vedic_astro_engine import VedicAstroEngine
-        from services.chart_generator import ChartGenerator
-        import base64
-        
-        # Get sidereal data
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(
-            details.year, details.month, details.day,
-            details.hour, details.minute, details.lat, details.lng,
-            timezone_str=details.timezone
-        )
-        
-        # Generate chart
-        img_buffer = ChartGenerator.generate_lagna_chart_south_indian(sidereal_data)
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-        
-        return {"image": f"data:image/png;base64,{img_base64}"}
+        return _chart_image_response(request, details, "lagna", "south")
     except Exception as e:
         print(f"Lagna South Chart Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/chart/navamsa/north")
-def get_navamsa_chart_north(details: BirthDetails):
+def get_navamsa_chart_north(details: BirthDetails, request: Request):
     """Generate Navamsa (D9) chart in North Indian style"""
     try:
-        from services.vedic_astro_engine import VedicAstroEngine
-        from services.chart_generator import ChartGenerator
-        import base64
-        
-        # Get sidereal data
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(
-            details.year, details.month, details.day,
-            details.hour, details.minute, details.lat, details.lng,
-            timezone_str=details.timezone
-        )
-        
-        # Calculate divisional charts
-        divisional_data = VedicAstroEngine.calculate_divisional_charts(sidereal_data)
-        
-        # Generate chart
-        img_buffer = ChartGenerator.generate_navamsa_chart_north_indian(divisional_data)
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-        
-        return {"image": f"data:image/png;base64,{img_base64}"}
+        return _chart_image_response(request, details, "navamsa", "north")
     except Exception as e:
         print(f"Navamsa North Chart Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/chart/navamsa/south")
-def get_navamsa_chart_south(details: BirthDetails):
+def get_navamsa_chart_south(details: BirthDetails, request: Request):
     """Generate Navamsa (D9) chart in South Indian style"""
     try:
-        from services.vedic_astro_engine import VedicAstroEngine
-        from services.chart_generator import ChartGenerator
-        import base64
-        
-        # Get sidereal data
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(
-            details.year, details.month, details.day,
-            details.hour, details.minute, details.lat, details.lng,
-            timezone_str=details.timezone
-        )
-        
-        # Calculate divisional charts
-        divisional_data = VedicAstroEngine.calculate_divisional_charts(sidereal_data)
-        
-        # Generate chart
-        img_buffer = ChartGenerator.generate_navamsa_chart_south_indian(divisional_data)
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-        
-        return {"image": f"data:image/png;base64,{img_base64}"}
+        return _chart_image_response(request, details, "navamsa", "south")
     except Exception as e:
         print(f"Navamsa South Chart Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -405,7 +442,8 @@ def get_pdf_report(details: BirthDetails):
         )
         
         # 2. Generate PDF
-        pdf_buffer = PDFReportService.generate_pdf_report(report_data, lang=details.lang)
+        pdf_timings = {}
+        pdf_buffer = PDFReportService.generate_pdf_report(report_data, lang=details.lang, timings=pdf_timings)
         
         # 3. Return Response
         from fastapi import Response
@@ -415,7 +453,13 @@ def get_pdf_report(details: BirthDetails):
         return Response(
             content=pdf_buffer.getvalue(), 
             media_type="application/pdf", 
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Server-Timing": ", ".join(
+                    f"pdf-{section};dur={pdf_timings[section] * 1000:.0f}"
+                    for section in ("story", "layout", "figure_wait", "total")
+                )
+            }
         )
         
     except Exception as e:
@@ -92,6 +92,20 @@ class Profile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     owner = relationship("User", back_populates="profiles")
+    chart_snapshot = relationship("ChartSnapshot", back_populates="profile", uselist=False, cascade="all, delete-orphan")
+
+class ChartSnapshot(Base):
+    __tablename__ = "chart_snapshots"
+
+    # Precomputed natal chart of a saved profile (see services/chart_snapshot.py)
+    id = Column(String, primary_key=True, default=generate_uuid)
+    profile_id = Column(ForeignKey("profiles.id", ondelete="CASCADE"), unique=True, index=True)
+    engine_version = Column(String)
+    birth_key = Column(String) # hash of the birth fields the chart was computed from
+    data = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    profile = relationship("Profile", back_populates="chart_snapshot")
 
 class UserSession(Base):
     __tablename__ = "sessions"
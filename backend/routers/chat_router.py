@@ -1,7 +1,15 @@
+import json
 from fastapi import APIRouter, HTTPException, Body
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
-from services.ai_service import generate_chat_response
+from services.ai_service import (
+    generate_chat_response, build_chat_messages, CHAT_OFFLINE_MESSAGE, CHAT_ERROR_MESSAGE
+)
+from services.chat_session import ChatSessionStore
+from services.compute_dispatcher import ComputeDispatcher
+from services.llm_provider import LLMClient, LLMError, estimate_tokens
 
 router = APIRouter(
     prefix="/api/chat",
@@ -15,13 +23,26 @@ class ChatRequest(BaseModel):
     history: list = [] # List of previous messages [{"role": "user", "content": "..."}]
     lang: str = "en"
 
+class ChatSessionRequest(BaseModel):
+    context: Dict[str, Any]
+    lang: str = "en"
+
+class ChatStreamRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None  # Only needed to start (or restart) a session
+    history: list = []
+    lang: str = "en"
+
 @router.post("/")
 async def chat_with_profile(request: ChatRequest):
     """
     Chat with the AI assistant about the user's astrological profile.
     """
     try:
-        response = generate_chat_response(
+        # Groq/Gemini HTTP call - keep it off the event loop
+        response = await ComputeDispatcher.run_io(
+            generate_chat_response,
             request.message,
             request.context,
             history=request.history,
@@ -31,3 +52,75 @@ async def chat_with_profile(request: ChatRequest):
     except Exception as e:
         print(f"Chat Endpoint Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to process chat request")
+
+
+@router.post("/session")
+async def start_chat_session(request: ChatSessionRequest):
+    """
+    Builds the profile preamble once and keeps it server-side. Later turns on
+    /api/chat/stream send the session id and the new message only.
+    """
+    session_id = ChatSessionStore.create(request.context, request.lang)
+    session = ChatSessionStore.get(session_id)
+    return {"session_id": session_id, "preamble_chars": len(session["preamble"]), "ttl_seconds": ChatSessionStore.TTL_SECONDS}
+
+
+def _sse(data, event=None):
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def stream_chat(request: ChatStreamRequest):
+    """
+    Server-Sent Events answer: a `session` event with the session id, then one
+    `data: {"token": ...}` per chunk as the model produces it, then a `done`
+    event with the full answer and the prompt size. Unknown session ids need the
+    context again (404). Older turns are summarized after the response is sent.
+    """
+    session = ChatSessionStore.get(request.session_id)
+    session_id = request.session_id
+    if session is None:
+        if not request.context:
+            raise HTTPException(status_code=404, detail="Chat session expired. Send the profile context again.")
+        session_id = ChatSessionStore.create(request.context, request.lang, history=request.history, session_id=session_id)
+        session = ChatSessionStore.get(session_id)
+
+    messages = build_chat_messages(
+        session["preamble"], request.message, ChatSessionStore.recent_turns(session), summary=session["summary"]
+    )
+    prompt_tokens = estimate_tokens(messages)
+    ChatSessionStore.record_prompt(prompt_tokens)
+
+    async def events():
+        yield _sse({"session_id": session_id}, event="session")
+        if not LLMClient.available("chat"):
+            yield _sse({"token": CHAT_OFFLINE_MESSAGE})
+            yield _sse({"response": CHAT_OFFLINE_MESSAGE, "prompt_tokens": 0}, event="done")
+            return
+
+        parts = []
+        try:
+            async for chunk in LLMClient.stream_async(messages, chain="chat", priority=session["priority"]):
+                parts.append(chunk)
+                yield _sse({"token": chunk})
+        except LLMError as e:
+            print(f"Chat Stream Error: {e}")
+            if not parts:
+                yield _sse({"token": CHAT_ERROR_MESSAGE})
+                yield _sse({"response": CHAT_ERROR_MESSAGE, "prompt_tokens": prompt_tokens}, event="done")
+                return
+            yield _sse({"detail": "Answer interrupted"}, event="error")
+            return
+
+        answer = "".join(parts)
+        ChatSessionStore.append(session_id, request.message, answer)
+        yield _sse({"response": answer, "prompt_tokens": prompt_tokens}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Summary update runs once the answer is out (thread pool, no-op if nothing to fold)
+        background=BackgroundTask(ChatSessionStore.compact, session_id)
+    )
@@ -46,7 +46,8 @@ def get_daily_insights(profile: dict):
         # 2. Get Horoscope
         context = {
             "profession": profile.get("profession"),
-            "marital_status": profile.get("marital_status")
+            "marital_status": profile.get("marital_status"),
+            "subscription_tier": profile.get("subscription_tier", "free")
         }
         lang = profile.get("lang", "en")
         
@@ -6,8 +6,8 @@ from models import Profile, User, AstrologySystem
 from schemas import ProfileCreate, ProfileOut, ProfileUpdate
 from routers.auth_router import get_current_user
 from services.timezone_service import TimezoneService
+from services.chart_snapshot import ChartSnapshotService
 from typing import List
-from datetime import datetime
 import uuid
 
 router = APIRouter(
@@ -38,22 +38,12 @@ async def create_profile(
         date_str = profile_in.birth_date.strftime("%Y-%m-%d")
         time_str = profile_in.birth_time.strftime("%H:%M")
         
-        # Parse date time components for historical lookup
-        dt = datetime.combine(profile_in.birth_date, profile_in.birth_time)
-        
-        # Get Timezone Data
+        # Zone at the birth place and its offset at the birth time (offline, no network)
         tz_data = TimezoneService.get_timezone_data(
             profile_in.latitude, profile_in.longitude, date_str, time_str
         )
         tz_id = tz_data.get("timezone_id", profile_in.timezone_id or "UTC")
-        
-        # Try to get precise historical offset using zoneinfo
-        h_offset = TimezoneService.calculate_historical_offset(
-            tz_id, dt.year, dt.month, dt.day, dt.hour, dt.minute
-        )
-        
-        # If historical calc worked, use it. Else fall back to API current.
-        final_offset = h_offset if h_offset != 0 else tz_data.get("utc_offset", profile_in.utc_offset)
+        final_offset = tz_data.get("utc_offset", profile_in.utc_offset)
         
         # 2. Create Model
         new_profile = Profile(
@@ -82,6 +72,9 @@ async def create_profile(
         db.add(new_profile)
         await db.commit()
         await db.refresh(new_profile)
+
+        # 3. Precompute the chart once, every later read of this profile reuses it
+        await ChartSnapshotService.try_refresh(db, new_profile)
         
         return new_profile
         
@@ -120,6 +113,25 @@ async def get_profile(
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
 
+@router.get("/{profile_id}/chart")
+async def get_profile_chart(
+    profile_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Precomputed natal chart of a saved profile (see ChartSnapshotService)."""
+    result = await db.execute(
+        select(Profile).filter(Profile.id == profile_id, Profile.owner_id == current_user.id)
+    )
+    profile = result.scalars().first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    try:
+        return await ChartSnapshotService.get(db, profile)
+    except Exception as e:
+        print(f"Profile Chart Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/{profile_id}", response_model=ProfileOut)
 async def update_profile(
     profile_id: str,
@@ -137,7 +149,8 @@ async def update_profile(
     update_data = profile_in.model_dump(exclude_unset=True)
     
     # Recalculate Timezone if location or time changes
-    if any(k in update_data for k in ["latitude", "longitude", "birth_date", "birth_time"]):
+    birth_changed = any(k in update_data for k in ["latitude", "longitude", "birth_date", "birth_time"])
+    if birth_changed:
         lat = update_data.get("latitude", profile.latitude)
         lng = update_data.get("longitude", profile.longitude)
         b_date = update_data.get("birth_date", profile.birth_date)
@@ -145,17 +158,10 @@ async def update_profile(
         
         date_str = b_date.strftime("%Y-%m-%d")
         time_str = b_time.strftime("%H:%M")
-        dt = datetime.combine(b_date, b_time)
         
         tz_data = TimezoneService.get_timezone_data(lat, lng, date_str, time_str)
-        tz_id = tz_data.get("timezone_id", "UTC")
-        h_offset = TimezoneService.calculate_historical_offset(
-            tz_id, dt.year, dt.month, dt.day, dt.hour, dt.minute
-        )
-        final_offset = h_offset if h_offset != 0 else tz_data.get("utc_offset", 0)
-        
-        update_data["timezone_id"] = tz_id
-        update_data["utc_offset"] = final_offset
+        update_data["timezone_id"] = tz_data.get("timezone_id", "UTC")
+        update_data["utc_offset"] = tz_data.get("utc_offset", 0)
 
     # Check for phone number update to send alert
     original_phone = profile.phone_number
@@ -165,6 +171,10 @@ async def update_profile(
         
     await db.commit()
     await db.refresh(profile)
+
+    # The stored chart no longer matches the birth fields: recompute it now
+    if birth_changed or "ayanamsa" in update_data:
+        await ChartSnapshotService.try_refresh(db, profile)
     
     # Simulate Sending Alert
     new_phone = profile.phone_number
@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class AIResponseCache:
+    """
+    Cache for LLM responses of the ai_service / numerology generators.
+
+    The key is a fingerprint of (generator, template version, model, lang, prompt).
+    The prompt already carries the chart facts, so it is normalized (whitespace
+    collapsed) instead of re-listing them. Entries expire after the generator's
+    TTL. Memory tier: LRU of AI_CACHE_MAX_ENTRIES. Persistent tier: SQLite file at
+    AI_CACHE_DB (shared by all workers on the host, survives restarts).
+    Only real LLM answers are stored - static fallbacks and errors are not.
+
+    Bump a generator's TEMPLATE_VERSIONS entry when its prompt changes in a way
+    the text fingerprint would not capture (e.g. output parsing).
+    """
+    MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "512"))
+    DB_PATH = os.getenv("AI_CACHE_DB", "")
+    DB_MAX_ROWS = int(os.getenv("AI_CACHE_DB_MAX_ROWS", "20000"))
+
+    DAY = 24 * 3600
+    TTLS = {
+        "vedic_summary": 7 * DAY,          # prompt includes current dasha and transits
+        "vedic_chart_analysis": 30 * DAY,
+        "relationship_analysis": 30 * DAY,
+        "executive_summary": 30 * DAY,
+        "daily_guidance": 6 * 3600,        # transits move, keep it within the day
+        "numerology_insights": 30 * DAY,
+        "report_bundle": 7 * DAY,          # same inputs as vedic_summary
+    }
+    DEFAULT_TTL = DAY
+    TEMPLATE_VERSIONS = {}
+
+    _memory = OrderedDict()
+    _lock = threading.Lock()
+    _db_lock = threading.Lock()
+    _db_initialized = False
+    _db_writes = 0
+    _stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stores": 0, "evictions": 0,
+              "saved_seconds": 0.0, "llm_seconds": 0.0}
+    _per_generator = {}
+
+    @classmethod
+    def normalize_prompt(cls, prompt):
+        return " ".join(str(prompt).split())
+
+    @classmethod
+    def fingerprint(cls, generator, model, prompt, lang="en"):
+        raw = json.dumps([
+            generator,
+            cls.TEMPLATE_VERSIONS.get(generator, 1),
+            model,
+            lang,
+            cls.normalize_prompt(prompt)
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # --- persistent tier ---
+
+    @classmethod
+    def _connect(cls):
+        conn = sqlite3.connect(cls.DB_PATH, timeout=5)
+        if not cls._db_initialized:
+            with cls._db_lock:
+                if not cls._db_initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS ai_response_cache ("
+                        "key TEXT PRIMARY KEY, generator TEXT, payload TEXT, latency REAL, expires_at REAL)"
+                    )
+                    conn.commit()
+                    cls._db_initialized = True
+        return conn
+
+    @classmethod
+    def _disk_get(cls, key):
+        if not cls.DB_PATH:
+            return None
+        try:
+            conn = cls._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload, latency, expires_at FROM ai_response_cache WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            finally:
+                conn.close()
+            return row
+        except Exception as e:
+            print(f"AI cache read error: {e}")
+            return None
+
+    @classmethod
+    def _disk_put(cls, key, generator, payload, latency, expires_at):
+        if not cls.DB_PATH:
+            return
+        try:
+            conn = cls._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_response_cache (key, generator, payload, latency, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, generator, payload, latency, expires_at)
+                )
+                cls._db_writes += 1
+                # Drop expired rows and trim now and then instead of on every write
+                if cls._db_writes % 200 == 0:
+                    conn.execute("DELETE FROM ai_response_cache WHERE expires_at <= ?", (time.time(),))
+                    conn.execute(
+                        "DELETE FROM ai_response_cache WHERE key IN ("
+                        "SELECT key FROM ai_response_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                        (cls.DB_MAX_ROWS,)
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"AI cache write error: {e}")
+
+    # --- lookups ---
+
+    @classmethod
+    def _count(cls, generator, field, amount=1):
+        cls._stats[field] += amount
+        per = cls._per_generator.setdefault(generator, {"hits": 0, "misses": 0, "saved_seconds": 0.0})
+        if field in per:
+            per[field] += amount
+
+    @classmethod
+    def get(cls, generator, key):
+        """Cached value for the key, or None. Every hit returns a fresh copy."""
+        now = time.time()
+        with cls._lock:
+            entry = cls._memory.get(key)
+            if entry is not None and entry[2] > now:
+                cls._memory.move_to_end(key)
+                payload, latency, _ = entry
+                cls._count(generator, "hits")
+                cls._count(generator, "memory_hits")
+                cls._count(generator, "saved_seconds", latency)
+                return json.loads(payload)
+            if entry is not None:
+                del cls._memory[key]
+
+        row = cls._disk_get(key)
+        with cls._lock:
+            if row is None:
+                cls._count(generator, "misses")
+                return None
+            payload, latency, expires_at = row
+            cls._remember(key, payload, latency, expires_at)
+            cls._count(generator, "hits")
+            cls._count(generator, "disk_hits")
+            cls._count(generator, "saved_seconds", latency)
+        return json.loads(payload)
+
+    @classmethod
+    def _remember(cls, key, payload, latency, expires_at):
+        cls._memory[key] = (payload, latency, expires_at)
+        cls._memory.move_to_end(key)
+        while len(cls._memory) > cls.MAX_ENTRIES:
+            cls._memory.popitem(last=False)
+            cls._stats["evictions"] += 1
+
+    @classmethod
+    def put(cls, generator, key, value, latency=0.0):
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            print(f"AI cache skip ({generator}): {e}")
+            return
+        expires_at = time.time() + cls.TTLS.get(generator, cls.DEFAULT_TTL)
+        with cls._lock:
+            cls._remember(key, payload, latency, expires_at)
+            cls._stats["stores"] += 1
+        cls._disk_put(key, generator, payload, latency, expires_at)
+
+    @classmethod
+    def cached(cls, generator, model, prompt, compute, lang="en"):
+        """
+        Returns the cached answer for this prompt, or runs compute() and caches
+        its result. compute returns None when the LLM failed; None is not cached.
+        """
+        key = cls.fingerprint(generator, model, prompt, lang)
+        value = cls.get(generator, key)
+        if value is not None:
+            print(f"AI cache hit: {generator}")
+            return value
+
+        started = time.perf_counter()
+        value = compute()
+        latency = time.perf_counter() - started
+        if value is not None:
+            with cls._lock:
+                cls._stats["llm_seconds"] += latency
+            cls.put(generator, key, value, latency)
+        return value
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            lookups = cls._stats["hits"] + cls._stats["misses"]
+            return dict(
+                cls._stats,
+                size=len(cls._memory),
+                hit_rate=round(cls._stats["hits"] / lookups, 4) if lookups else 0.0,
+                generators={name: dict(v) for name, v in cls._per_generator.items()}
+            )
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._memory.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0.0 if isinstance(cls._stats[name], float) else 0
+            cls._per_generator.clear()
+        if cls.DB_PATH:
+            try:
+                conn = cls._connect()
+                try:
+                    conn.execute("DELETE FROM ai_response_cache")
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"AI cache clear error: {e}")
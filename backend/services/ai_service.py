@@ -3,9 +3,8 @@ AI Service for generating personalized insights using Google Gemini API
 """
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
-
-from groq import Groq
+from services.ai_cache import AIResponseCache
+from services.llm_provider import LLMClient, LLMError, estimate_tokens
 
 # Load environment variables
 load_dotenv()
@@ -20,34 +19,52 @@ try:
 except ImportError:
     W_SIGNS, W_HOUSES, W_PLANETS = {}, {}, {}
 
-client = None
-if GROQ_API_KEY:
-    try:
-        client = Groq(api_key=GROQ_API_KEY)
-    except Exception as e:
-        print(f"Groq Client Init Error: {e}")
-
-model = None
+# Providers, pooling, deadlines and fallback chains live in services/llm_provider.py
 if GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        print("Gemini Client Initialized")
-    except Exception as e:
-        print(f"Gemini Client Init Error: {e}")
+    print("Gemini Client Initialized")
 else:
     print("No GEMINI_API_KEY found")
 
-if client:
+if GROQ_API_KEY:
     print("Groq Client Initialized")
 else:
     print("Groq Client NOT Initialized (API Key missing or invalid)")
 
+
+def ask_llm(generator, prompt, chain="quality", json_mode=False, lang="en", cache=True, temperature=0.7, context=None):
+    """
+    Sends a generator's prompt down an LLMClient chain (see LLMClient.CHAINS).
+    Returns the answer text, or the parsed object with json_mode=True, or None
+    if no provider answered in time - callers then use their static fallback.
+    With cache=True, repeat prompts are served from AIResponseCache.
+    context: the generator's user context; its subscription_tier sets the
+    queue priority when the provider is rate limited.
+    """
+    tier = context.get('subscription_tier') if isinstance(context, dict) else None
+
+    def call():
+        try:
+            return LLMClient.complete(prompt, chain=chain, json_mode=json_mode, temperature=temperature,
+                                      priority=LLMClient.priority_for(tier))
+        except LLMError as e:
+            print(f"AI {generator} unavailable: {e}")
+            return None
+
+    if not cache:
+        return call()
+    return AIResponseCache.cached(generator, LLMClient.signature(chain), prompt, call, lang=lang)
+
+
+def call_groq_api(prompt, model="llama-3.3-70b-versatile"):
+    """Plain-text answer from the Groq chain (used by the KP interpretations), or None."""
+    chain = "fast" if model == "llama-3.1-8b-instant" else "groq"
+    return ask_llm("kp_interpretations", prompt, chain=chain, cache=False)
+
 def generate_numerology_insights(numerology_data, context=None, lang="en"):
     """
     Generate personalized numerology insights using AI
     """
-    if not client and not model:
+    if not LLMClient.available("groq"):
         return get_fallback_insights(numerology_data, lang=lang)
     
     # Context
@@ -106,22 +123,15 @@ Please provide:
 
 {lang_instruction}"""
 
-        if client:
-            # Use Groq
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-            )
+        # Groq only - Gemini fallback removed per User Request
+        answer = ask_llm("numerology", prompt, chain="groq", cache=False, temperature=1.0, context=context)
+        if answer:
             return {
-                "ai_insights": response.choices[0].message.content,
+                "ai_insights": answer,
                 "source": "groq-ai",
                 "ai_model": "llama-3.3-70b-versatile"
             }
-        
-        # Removed Gemini Fallback per User Request
-        elif model:
-             print("Skipping Gemini usage as Groq is enforced.")
-             return get_fallback_insights(numerology_data, lang=lang)
+        return get_fallback_insights(numerology_data, lang=lang)
     
     except Exception as e:
         print(f"AI generation error: {e}")
@@ -213,7 +223,11 @@ def generate_daily_guidance(sign, transits, context=None, outcomes_structure=Non
         retro = "(Retrograde)" if p.get('retrograde') else ""
         sky_data += f"- {p['name']} in {p['sign']} (House {p.get('house')}) {retro}\n"
     
-    lang_instruction = "All values in the JSON (prediction, summary, details, etc.) MUST be in Hindi (Devanagari)." if lang == "hi" else "All values must be in English."
+    daily_languages = {"hi": "Hindi (Devanagari)", "es": "Spanish", "fr": "French"}
+    if lang in daily_languages:
+        lang_instruction = f"All values in the JSON (prediction, summary, details, etc.) MUST be in {daily_languages[lang]}."
+    else:
+        lang_instruction = "All values must be in English."
 
     # Age-aware logic
     age = context.get('age') if context else None
@@ -278,23 +292,8 @@ Make the insights specific to the planetary positions provided.
 {lang_instruction}
 """
     try:
-        if client:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            import json
-            return json.loads(response.choices[0].message.content)
-            import json
-            return json.loads(response.choices[0].message.content)
-            
-        # Removed Gemini Fallback per User Request
-        # elif model:
-        #    ...
-        
-        return None
+        # Groq only - Gemini fallback removed per User Request
+        return ask_llm("daily_guidance", prompt, chain="groq", json_mode=True, lang=lang, context=context)
     except Exception as e:
         print(f"AI Daily Generation Error: {e}")
         return None
@@ -303,7 +302,7 @@ def generate_vedic_ai_summary(name, planets, panchang, dasha, lang="en", context
     """
     Generates a structured, high-quality Vedic summary using Groq (Llama 3.3) or Gemini fallback.
     """
-    if not client and not model:
+    if not LLMClient.available("quality"):
         return None
 
     import json
@@ -451,46 +450,11 @@ Rules: No fear, no medical/legal claims, supportive tone.
 
 JSON only:"""
 
-        # Try Groq with Llama 3.3 (High Quality)
-        if client:
-            try:
-                print(f"Attempting Groq (Llama 3.3) for {name}...")
-                response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama-3.3-70b-versatile",
-                    temperature=0.7,
-                    response_format={"type": "json_object"}
-                )
-                return json.loads(response.choices[0].message.content)
-            except Exception as e1:
-                print(f"Groq 70B failed for {name}: {e1}")
-                # Try Groq with Llama 3.1 8B (Higher Rate Limits/Faster)
-                try:
-                    print(f"Attempting Groq (Llama 3.1 8B) fallback for {name}...")
-                    response = client.chat.completions.create(
-                        messages=[{"role": "user", "content": prompt}],
-                        model="llama-3.1-8b-instant",
-                        temperature=0.7,
-                        response_format={"type": "json_object"}
-                    )
-                    return json.loads(response.choices[0].message.content)
-                except Exception as e2:
-                    print(f"Groq 8B fallback also failed for {name}: {e2}")
-                    
-        # Fallback to Gemini if Groq fails
-        if model:
-            try:
-                print(f"Attempting Gemini Fallback for {name}...")
-                response = model.generate_content(prompt)
-                # Try to parse JSON from response text
-                text = response.text
-                if "```json" in text:
-                    text = text.split("```json")[1].split("```")[0].strip()
-                elif "{" in text:
-                    text = text[text.find("{"):text.rfind("}")+1]
-                return json.loads(text)
-            except Exception as eg:
-                print(f"Gemini fallback failed for {name}: {eg}")
+        # Llama 3.3 70B, hedged/failed over to Llama 3.1 8B, then Gemini
+        print(f"Requesting Vedic AI summary for {name}...")
+        result = ask_llm("vedic_summary", prompt, chain="quality", json_mode=True, lang=lang, context=context)
+        if result is not None:
+            return result
 
         print("AI Service Failed or Unavailable. generating robust fallback...")
         age = context.get('age') if context else None
@@ -625,7 +589,7 @@ def generate_western_ai_summary(name, sun, moon, ascendant, planets, houses=None
     """
     Generates a psychological Western analysis summary using Groq, now including Houses.
     """
-    if not client and not model:
+    if not LLMClient.available("groq"):
         return None
 
     planet_summary = "\n".join([f"- {p['name']} in {p['sign']} at {p.get('position', '??')}° (House {p['house']})" for p in planets])
@@ -717,19 +681,8 @@ Generate the analysis now:"""
 
 
     try:
-        if client:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        
-        # Removed Gemini Fallback
-        # elif model:
-        #    ...
-        
-        return None
+        # Groq only - Gemini fallback removed
+        return ask_llm("western_summary", prompt, chain="groq", cache=False, context=context)
     except Exception as e:
         print(f"Western AI Summary Error: {e}")
         return None
@@ -738,7 +691,7 @@ def generate_executive_summary(name, western_data, vedic_data, numerology_data,
     """
     Generates a high-level executive summary combining all systems.
     """
-    if not client and not model:
+    if not LLMClient.available("groq"):
         return None
 
     # Data Simplification & Research Synthesis
@@ -789,26 +742,8 @@ Exactly one paragraph (max 150 words).
 Respond with the summary text only."""
 
     try:
-        if client:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        if client:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        
-        # Removed Gemini Fallback
-        # elif model:
-        #    ...
-        
-        return None
+        # Groq only - Gemini fallback removed
+        return ask_llm("executive_summary", prompt, chain="groq", lang=lang, context=context)
     except Exception as e:
         print(f"Executive Summary AI Error: {e}")
         return None
@@ -906,36 +841,10 @@ def generate_vedic_chart_analysis(name, planets, panchang, doshas=None, lang="en
     {lang_instruction}
     """
 
-    # Try Groq (Preferred)
-    if client:
-        import time
-        try:
-            # Attempt 1: Fast Model
-            model_to_use = "llama-3.1-8b-instant" 
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=model_to_use,
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
-            print(f"Groq 8B failed for {name}: {e}")
-            
-            try:
-                # Attempt 2: Stronger Model (Fallback)
-                time.sleep(1) # Brief pause to help with rate limits
-                print(f"Attempting Groq (Llama 3.3 70B) fallback for {name}...")
-                response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama-3.3-70b-versatile",
-                    temperature=0.7,
-                    response_format={"type": "json_object"}
-                )
-                return json.loads(response.choices[0].message.content)
-            except Exception as e2:
-                print(f"Groq 70B failed for {name}: {e2}")
-                # Fallback to Static Template below
+    # Llama 3.1 8B first (fast), Llama 3.3 70B if it fails
+    result = ask_llm("vedic_chart_analysis", prompt, chain="fast", json_mode=True, lang=lang)
+    if result is not None:
+        return result
 
     # --- FINAL STATIC FALLBACK (If AI fails or Client missing) ---
     print(f"Using Static Fallback for {name}")
@@ -985,22 +894,48 @@ def generate_vedic_chart_analysis(name, planets, panchang, doshas=None, lang="en
         "life_theme": f"Embracing your {traits[0].lower()} nature to achieve success."
     }
 
-def generate_chat_response(message, profile_context, history=None, lang="en"):
+# Upper bound (estimated tokens) of one chat request: preamble + summary + recent turns + question
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "2500"))
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "250"))
+
+CHAT_OFFLINE_MESSAGE = "I apologize, but I am currently offline. Please try again later."
+CHAT_ERROR_MESSAGE = "I'm having trouble connecting to the stars right now. Please ask again in a moment."
+
+
+def _format_chat_planets(planets):
+    """Compact 'Sun in Leo (H5)' list instead of the raw planet dicts."""
+    if not isinstance(planets, list):
+        return str(planets)
+    parts = []
+    for p in planets:
+        if not isinstance(p, dict):
+            parts.append(str(p))
+            continue
+        text = f"{p.get('name', '?')} in {p.get('sign', '?')}"
+        if p.get('house'):
+            text += f" (H{p.get('house')})"
+        if p.get('is_retrograde') or p.get('retrograde'):
+            text += " R"
+        parts.append(text)
+    return ", ".join(parts)
+
+
+def build_chat_preamble(profile_context, lang="en"):
     """
-    Generate a chat response based on user query and profile context.
+    System prompt of a chat: who Astra is, the user's chart and the answer rules.
+    It only depends on the profile, so a chat session builds it once and every
+    turn sends it unchanged (see services/chat_session.py).
     """
-    if not client and not model:
-        return "I apologize, but I am currently offline. Please try again later."
-
+    profile_context = profile_context or {}
     lang_instruction = "Respond in Hindi." if lang == "hi" else "Respond in English."
-    
+
     # Construct a rich context string from the profile data
     context_str = "User Profile Summary:\n"
     if profile_context:
         # Basic Info
         context_str += f"Name: {profile_context.get('name', 'User')}\n"
         context_str += f"Birth Details: {profile_context.get('date_time', '')}, {profile_context.get('place', '')}\n"
-        
+
         # Vedic Details
         vedic = profile_context.get('vedic', {})
         if vedic:
@@ -1008,22 +943,21 @@ def generate_chat_response(message, profile_context, history=None, lang="en"):
             asc = vedic.get('ascendant')
             if isinstance(asc, dict): asc = asc.get('name', 'Unknown')
             context_str += f"Vedic Ascendant: {asc}\n"
-            
+
             context_str += f"Moon Sign: {vedic.get('moon_sign', 'Unknown')}\n"
             context_str += f"Sun Sign: {vedic.get('sun_sign', 'Unknown')}\n"
-            
+
             nak = vedic.get('nakshatra')
             if isinstance(nak, dict): nak = nak.get('name', 'Unknown')
             context_str += f"Nakshatra: {nak}\n"
 
             # Planets List
             if vedic.get('planets'):
-                context_str += f"Planetary Positions: {vedic.get('planets')}\n"
-            
+                context_str += f"Planetary Positions: {_format_chat_planets(vedic.get('planets'))}\n"
+
             # Current Dasha
             dasha = vedic.get('dasha', {})
             if isinstance(dasha, dict):
-                 context_str += f"Current Mahadasha: {dasha.get('active_mahadasha', '')}\n"
                  context_str += f"Current Mahadasha: {dasha.get('active_mahadasha', '')}\n"
                  context_str += f"Current Antardasha: {dasha.get('active_antardasha', '')}\n"
 
@@ -1045,15 +979,6 @@ def generate_chat_response(message, profile_context, history=None, lang="en"):
         if numero:
             context_str += f"Life Path Number: {numero.get('life_path', 'Unknown')}\n"
 
-    # Incorporate History
-    history_str = ""
-    if history and isinstance(history, list):
-        history_str = "\n**Recent Chat History:**\n"
-        for msg in history:
-            role = "User" if msg.get('role') == 'user' else "Astra"
-            content = msg.get('text', '') or msg.get('content', '')
-            history_str += f"{role}: {content}\n"
-
     # Age Calculation for Chat Context
     age = None
     dob_str = profile_context.get('dob')
@@ -1069,7 +994,7 @@ def generate_chat_response(message, profile_context, history=None, lang="en"):
                     break
                 except: continue
         except: pass
-    
+
     age_guideline = ""
     if age is not None:
         if age <= 12:
@@ -1077,51 +1002,116 @@ def generate_chat_response(message, profile_context, history=None, lang="en"):
         elif age <= 17:
             age_guideline = "CRITICAL: User is a TEENAGER. Focus on exams, hobbies, and identity. Avoid marriage or deep professional talk."
 
-    prompt = f"""You are 'Astra', a wise, empathetic, and expert astrological assistant.
-    
+    return f"""You are 'Astra', a wise, empathetic, and expert astrological assistant.
+
     **Context about the User:**
     {context_str}
     Age: {age if age else 'Unknown'}
 
-    {history_str}
-
-    **User's Question:**
-    "{message}"
-
     **Important Guidelines:**
     1. **Do NOT assume** the user's current status (e.g., married, single, employed) unless explicitly stated in the chat. 
     2. If asked about timing (e.g., "When will I get married?"), DO NOT give a definitive prediction if you don't know their status. Instead, say: "If you are looking to get married, [Period] is favorable. If you are already married, this period indicates [meaning for married life]."
     3. Refer to specific planets, dashas, or transits from the profile context to support your answer.
     4. **Be crisp and authentic.** Provide direct, short answers (max 60 words). Avoid unnecessary pleasantries or filler words.
     5. {age_guideline}
-    6. {lang_instruction}
+    6. {lang_instruction}"""
+
+
+def build_chat_messages(preamble, message, history=None, summary=None, token_budget=None):
+    """
+    Chat messages for one turn: the preamble (plus the summary of older turns),
+    the most recent turns that fit in token_budget, then the question.
+    Older turns are dropped first, then the summary; the preamble and the
+    question are always sent.
+    """
+    token_budget = token_budget or CHAT_TOKEN_BUDGET
+    system = preamble
+    if summary:
+        system += f"\n\n    **Earlier in this conversation:**\n    {summary}"
+    question = {"role": "user", "content": message}
+    if summary and estimate_tokens([{"content": system}, question]) > token_budget:
+        system = preamble
+    used = estimate_tokens([{"content": system}, question])
+
+    turns = []
+    if history and isinstance(history, list):
+        for msg in reversed(history):
+            content = msg.get('text', '') or msg.get('content', '')
+            if not content:
+                continue
+            cost = estimate_tokens(content) + 4
+            if used + cost > token_budget:
+                break
+            used += cost
+            turns.append({"role": "user" if msg.get('role') == 'user' else "assistant", "content": content})
+    turns.reverse()
+    return [{"role": "system", "content": system}] + turns + [question]
+
+
+def _clip_tokens(text, max_tokens, keep="head"):
+    limit = max_tokens * 4
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] if keep == "head" else text[-limit:].split(" ", 1)[-1]
 
-    Answer:"""
+
+def summarize_chat_turns(summary, turns, lang="en"):
+    """
+    Folds turns that left the chat window into the running summary of the
+    conversation. Uses the fast chain; without an LLM it keeps the user's
+    questions verbatim (newest kept when over CHAT_SUMMARY_MAX_TOKENS).
+    """
+    transcript = "\n".join(
+        f"{'User' if t.get('role') == 'user' else 'Astra'}: {t.get('text', '') or t.get('content', '')}" for t in turns
+    )
+    lang_instruction = "Write the summary in Hindi." if lang == "hi" else "Write the summary in English."
+    prompt = f"""Update the running summary of a conversation between a user and 'Astra', an astrology assistant.
+    Keep what the user told about themselves (status, work, plans, concerns), what they asked, and the key guidance and periods Astra gave.
+    Drop pleasantries. Maximum 120 words, plain text. {lang_instruction}
+
+    Current summary:
+    {summary or "(none)"}
+
+    New turns:
+    {transcript}
+
+    Updated summary:"""
+
+    if LLMClient.available("fast"):
+        answer = ask_llm("chat_summary", prompt, chain="fast", cache=False, temperature=0.2)
+        if answer and answer.strip():
+            return _clip_tokens(answer.strip(), CHAT_SUMMARY_MAX_TOKENS)
+
+    asked = [f"User asked: {t.get('text', '') or t.get('content', '')}" for t in turns if t.get('role') == 'user']
+    fallback = " ".join(filter(None, [summary] + asked))
+    return _clip_tokens(fallback, CHAT_SUMMARY_MAX_TOKENS, keep="tail")
+
+
+def generate_chat_response(message, profile_context, history=None, lang="en", preamble=None):
+    """
+    Generate a chat response based on user query and profile context.
+    Pass preamble (from build_chat_preamble) to skip rebuilding the profile part.
+    """
+    if not LLMClient.available("chat") and not GEMINI_API_KEY:
+        return CHAT_OFFLINE_MESSAGE
+
+    if preamble is None:
+        preamble = build_chat_preamble(profile_context, lang)
+    messages = build_chat_messages(preamble, message, history)
+    print(f"Chat prompt: ~{estimate_tokens(messages)} tokens, {len(messages) - 2} history turns")
 
     try:
-        if client:
-            try:
-                response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama-3.3-70b-versatile",
-                    temperature=0.7,
-                )
-                return response.choices[0].message.content
-            except Exception as e:
-                print(f"Groq 70B Chat Error: {e}")
-                # Fallback to Llama 3.1 8B (Faster/Higher Limits)
-                print("Attempting Groq 8B fallback...")
-                response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama-3.1-8b-instant",
-                    temperature=0.7,
-                )
-                return response.choices[0].message.content
+        if LLMClient.available("chat"):
+            # Llama 3.3 70B, hedged/failed over to Llama 3.1 8B (Faster/Higher Limits)
+            answer = ask_llm("chat", messages, chain="chat", cache=False, context=profile_context)
+            if answer:
+                return answer
+            return CHAT_ERROR_MESSAGE
         else:
              return "I apologize, but I can only answer when connected to the Groq AI service. Please check the system configuration."
     except Exception as e:
         print(f"Chat Generation Error: {e}")
-        return "I'm having trouble connecting to the stars right now. Please ask again in a moment."
+        return CHAT_ERROR_MESSAGE
 
 def generate_career_analysis(name, planets, panchang, lang="en", age=None):
     """
@@ -1188,20 +1178,9 @@ def generate_career_analysis(name, planets, panchang, lang="en", age=None):
     """
 
     # Try Groq (Preferred)
-    if client:
-        try:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
-            print(f"Groq Career Analysis failed: {e}")
-            # Proceed to fallback
-
-            # Proceed to fallback
+    result = ask_llm("career_analysis", prompt, chain="groq", json_mode=True, lang=lang, cache=False)
+    if result is not None:
+        return result
 
     # Removed Gemini Fallback per User Request
     # if model:
@@ -1315,17 +1294,9 @@ def generate_relationship_analysis(name, planets, panchang, lang="en", age=None)
     """
 
     # Try Groq (Preferred)
-    if client:
-        try:
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
-            print(f"Groq Relationship Analysis failed: {e}")
+    result = ask_llm("relationship_analysis", prompt, chain="groq", json_mode=True, lang=lang)
+    if result is not None:
+        return result
 
     # FINAL FALLBACK: Rule-Based Generation
     try:
@@ -1364,3 +1335,144 @@ def generate_relationship_analysis(name, planets, panchang, lang="en", age=None)
         print(f"Relationship Fallback Logic Error: {e}")
         return None
 
+
+# Sections of the consolidated report's bundled prompt: name -> (required keys, or str for plain text)
+REPORT_BUNDLE_SECTIONS = {
+    "vedic_summary": ["personality_analysis", "emotional_core", "career_path", "relationships", "life_phase", "dosha_check", "remedies"],
+    "personality": ["overall_personality", "manglik_status", "pitru_dosha_status", "emotional_nature", "strengths", "challenges", "life_theme"],
+    "relationship": ["ideal_partner", "marriage_outlook", "compatibility_style", "challenges", "relationship_tip"],
+    "executive_summary": str,
+    "numerology_insights": str,
+}
+
+def validate_bundle_section(section, value):
+    """True if a bundled section has the shape its standalone generator would return."""
+    spec = REPORT_BUNDLE_SECTIONS.get(section)
+    if spec is str:
+        return isinstance(value, str) and len(value.strip()) > 40
+    if not isinstance(value, dict) or not all(value.get(k) for k in spec):
+        return False
+    if section == "vedic_summary":
+        return all(isinstance(value[k], dict) and value[k].get("content") for k in spec)
+    if section == "personality":
+        return isinstance(value["overall_personality"], list) and isinstance(value["strengths"], list)
+    return True
+
+def generate_report_bundle(name, vedic_data, numerology_data=None, loshu_data=None, western_data=None, sections=None,
+                           context=None, lang="en", dob=None, place=None, age=None):
+    """
+    One LLM request for the consolidated report's AI sections (see REPORT_BUNDLE_SECTIONS).
+    The chart facts are sent once instead of once per generator. Returns
+    {section: value or None}; None means the section was missing or malformed,
+    and the caller runs that section's own generator instead.
+    """
+    sections = [s for s in (sections or REPORT_BUNDLE_SECTIONS) if s in REPORT_BUNDLE_SECTIONS]
+    empty = {s: None for s in sections}
+    if not sections or not vedic_data or not LLMClient.available("quality"):
+        return empty
+
+    planets = vedic_data.get('planets') or []
+    panchang = vedic_data.get('panchang') or {}
+    dasha = vedic_data.get('dasha') or {}
+    doshas = vedic_data.get('doshas') or {}
+    transits = vedic_data.get('transits') or []
+    numerology_data = numerology_data or {}
+
+    def get_val(item):
+        if isinstance(item, dict): return item.get('name', 'N/A')
+        return item if item else 'N/A'
+
+    planet_lines = []
+    for p in planets:
+        dignity_obj = p.get('dignity')
+        status_p = dignity_obj.get('status', 'Neutral') if isinstance(dignity_obj, dict) else 'Neutral'
+        planet_lines.append(f"- {p.get('name', 'Unknown')} in {p.get('sign', 'Unknown')} at {p.get('position', '??')}° (House {p.get('house', '?')}, Status: {status_p})")
+    transit_lines = [f"- {t.get('name', 'Unknown')} in {t.get('sign', 'Unknown')}{' (Retrograde)' if t.get('retrograde') else ''}" for t in transits]
+
+    dosha_lines = []
+    for d_key, d_val in doshas.items():
+        if isinstance(d_val, dict) and d_val.get('present'):
+            dosha_lines.append(f"- {d_key.upper()}: PRESENT (Intensity: {d_val.get('intensity', 'None')}, Logic: {d_val.get('reason', '')})")
+        else:
+            dosha_lines.append(f"- {d_key.upper()}: ABSENT")
+
+    current_m = dasha.get('active_mahadasha', 'Unknown') if isinstance(dasha, dict) else 'Unknown'
+    current_a = dasha.get('active_antardasha', 'Unknown') if isinstance(dasha, dict) else 'Unknown'
+    pan_nak = get_val(panchang.get('nakshatra'))
+
+    profile = f"Name: {name}"
+    if dob: profile += f", DOB: {dob}"
+    if age is not None: profile += f", Age: {age}"
+    if place: profile += f", Place: {place}"
+    if isinstance(context, dict):
+        if context.get('profession'): profile += f", Profession: {context['profession']}"
+        if context.get('marital_status'): profile += f", Marital Status: {context['marital_status']}"
+
+    tier = context.get('subscription_tier', 'free').lower() if isinstance(context, dict) else 'free'
+    if tier in ['paid', 'premium']:
+        tier_instruction = "Paid member: deep explanations, specific timing ranges, personalized remedies."
+    else:
+        tier_instruction = "Free member: high-level encouraging insights, general timing ('this year'), lifestyle remedies only."
+
+    age_filter = ""
+    if age is not None and age < 18:
+        age_filter = "CRITICAL: The user is a MINOR. Never discuss marriage, romance, professional employment or investments. Career = studies and talents, relationships = family and friends."
+
+    loshu_data = loshu_data or {}
+    w_brief = "N/A"
+    if western_data:
+        w_brief = f"Sun: {western_data.get('sun_sign', 'N/A')}, Moon: {western_data.get('moon_sign', 'N/A')}, Asc: {western_data.get('ascendant', 'N/A')}"
+
+    specs = {
+        "vedic_summary": f"""{{ "personality_analysis": {{ "title": "Vedic Life Portrait", "content": {{ "Personality": "3-4 brief bullet points", "Emotional Nature": "...", "Strengths": "...", "Challenges": "...", "Life Theme": "..." }} }}, "emotional_core": {{ "title": "Your Emotional Core (Moon Nakshatra)", "content": "Analyze {pan_nak}, max 80 words" }}, "career_path": {{ "title": "Career & Financial Growth", "content": "max 150 words, no guarantees" }}, "relationships": {{ "title": "Marriage & Relationships", "content": {{ "Needs": "...", "Partner": "...", "Strengths": "...", "Challenges": "...", "Tip": "..." }} }}, "life_phase": {{ "title": "Current Life Phase", "content": "Analyze {current_m}/{current_a}, max 150 words" }}, "dosha_check": {{ "title": "Dosha Awareness", "content": "Use the dosha flags as truth; if present: meaning, intensity, reassurance, 1-2 remedies" }}, "remedies": {{ "title": "Soul Remedies & Alignment", "content": [ {{ "type": "Mantra", "remedy": "..." }}, {{ "type": "Lifestyle Correction", "remedy": "..." }}, {{ "type": "Charity/Donation", "remedy": "..." }} ] }} }} (Vedic language allowed. End Personality with 'This chart shows tendencies, not fixed destiny.' No gemstones.)""",
+        "personality": """{ "overall_personality": ["4 paragraphs of ~50 words: core nature, thinking patterns, social style, inner drive"], "manglik_status": "plain statement", "pitru_dosha_status": "plain statement, framed as ancestral healing if present", "emotional_nature": "60-80 words", "strengths": ["3 strengths, 20-30 words each"], "challenges": ["2 growth areas, 30 words each"], "life_theme": "40 words" } (NO astrological jargon here: no houses, lords, signs, aspects or dasha - write like a life coach.)""",
+        "relationship": """{ "ideal_partner": "max 2 sentences from 7th house/Venus/Jupiter", "marriage_outlook": "...", "compatibility_style": "...", "challenges": ["...", "..."], "relationship_tip": "..." } (Warm, realistic, no fear.)""",
+        "executive_summary": """"One paragraph (max 150 words): the single Soul Mission linking the Western, Vedic and Numerology inputs. Plain text.\"""",
+        "numerology_insights": f""""4 paragraphs under 300 words, plain text with **bold** paragraph titles: The Core Vibration (Life Path/Mulank), Cosmic Alignment (Nakshatra and Sun Sign), The Path to Success (numerology strengths with the current Dasha), Future Outlook.{'' if lang in ('en', 'hi') else f' Write this section in {lang} language.'}\"""",
+    }
+    schema = ",\n".join(f'  "{s}": {specs[s]}' for s in sections)
+
+    lang_instruction = "Write every text value in Hindi (Devanagari script)." if lang == "hi" else "Write every text value in English."
+
+    prompt = f"""You are a world-class Vedic astrologer, numerologist and life coach writing one personal report.
+Write for common users: simple, warm, supportive language. No fear, no medical/legal claims, guidance not fate.
+{tier_instruction}
+{age_filter}
+
+**Profile**: {profile}
+
+**Vedic Chart**:
+Ascendant: {get_val(panchang.get('ascendant'))}
+Panchang: Tithi {get_val(panchang.get('tithi'))}, Nakshatra {pan_nak} (Lord: {panchang.get('nakshatra', {}).get('lord', 'N/A') if isinstance(panchang.get('nakshatra'), dict) else 'N/A'}), Yoga {get_val(panchang.get('yoga'))}, Karana {get_val(panchang.get('karana'))}
+Planets:
+{chr(10).join(planet_lines)}
+Dasha: Mahadasha {current_m}, Antardasha {current_a}
+Dosha flags (absolute source of truth):
+{chr(10).join(dosha_lines) if dosha_lines else '- None calculated'}
+Current transits:
+{chr(10).join(transit_lines) if transit_lines else 'Unavailable'}
+
+**Western**: {w_brief}
+**Numerology**: Life Path {numerology_data.get('life_path', 'N/A')}, Mulank {loshu_data.get('mulank', 'N/A')}, Bhagyank {loshu_data.get('bhagyank', 'N/A')}, Fadic {numerology_data.get('fadic_number', 'N/A')}, Loshu missing numbers {', '.join(map(str, loshu_data.get('missing_numbers', []))) or 'None'}
+
+**Output** strictly valid JSON with exactly these top-level keys:
+{{
+{schema}
+}}
+{lang_instruction}
+
+JSON only:"""
+
+    bundle = ask_llm("report_bundle", prompt, chain="quality", json_mode=True, lang=lang, context=context)
+    if not isinstance(bundle, dict):
+        return empty
+
+    result = {}
+    for section in sections:
+        value = bundle.get(section)
+        if validate_bundle_section(section, value):
+            result[section] = value.strip() if isinstance(value, str) else value
+        else:
+            print(f"Report bundle: section '{section}' missing or malformed, using its own generator")
+            result[section] = None
+    return result
@@ -1,6 +1,6 @@
-from services.kerykeion_engine import KerykeionService
-from datetime import datetime
-import pytz
+import numpy as np
+from services.skyfield_engine import SkyfieldService
+from services.city_index import CityIndex
 
 class AstrocartographyEngine:
     # Curated List of Global Power Centers
@@ -40,6 +40,9 @@ class AstrocartographyEngine:
         "Pluto": {"text": "Power Line", "desc": "Deep transformation and intensity. Life-changing experiences."}
     }
 
+    # World-scale power zones only consider cities at least this big
+    POWER_ZONE_MIN_POPULATION = 1000000
+
     ANGLE_MEANINGS = {
         "Ascendant": "Personal Identity (Best for Self-Reinvention)",
         "Midheaven": "Career & Public Image (Best for Professional Success)",
@@ -48,69 +51,198 @@ class AstrocartographyEngine:
     }
 
     @staticmethod
-    def calculate_power_zones(name, year, month, day, hour, minute):
+    def _wrap180(deg):
+        return (np.asarray(deg) + 180.0) % 360.0 - 180.0
+
+    @staticmethod
+    def _horizon_hour_angle(lat, dec):
+        """
+        Semi-diurnal arc H0 (degrees): the planet rises at hour angle -H0 and sets at +H0,
+        from cos H0 = -tan(lat) * tan(dec). NaN where it never rises or never sets.
+        """
+        x = -np.tan(np.radians(lat)) * np.tan(np.radians(dec))
+        with np.errstate(invalid='ignore'):
+            return np.where(np.abs(x) <= 1.0, np.degrees(np.arccos(np.clip(x, -1.0, 1.0))), np.nan)
+
+    @staticmethod
+    def _equatorial_state(year, month, day, hour, minute, timezone_str="UTC", birth_lat=0.0, birth_lng=0.0):
+        """
+        One location-independent Skyfield pass for the birth instant.
+        Returns (planet names, RA array, Dec array, GAST) in degrees.
+        """
+        from services.birth_instant import BirthInstant
+        t = BirthInstant.resolve(year, month, day, hour, minute, float(birth_lat), float(birth_lng), timezone_str).time()
+        coords, gast = SkyfieldService.calculate_equatorial(t)
+
+        names = list(coords.keys())
+        ra = np.array([coords[n][0] for n in names])
+        dec = np.array([coords[n][1] for n in names])
+        return names, ra, dec, gast
+
+    @staticmethod
+    def _angle_distances(lats, lngs, ra, dec, gast):
         """
-        Identify cities where planets are on the angles (AC, MC, DC, IC)
+        Distance (degrees of longitude / hour angle) from each location to each planet's
+        AC, MC, DC and IC line. Shape (planets, 4, locations) in ANGLE_MEANINGS order.
         """
+        wrap = AstrocartographyEngine._wrap180
+        lats = np.asarray(lats, dtype=float)[None, :]
+        lngs = np.asarray(lngs, dtype=float)[None, :]
+
+        # Planet's local hour angle at each place: 0 on the MC line, 180 on the IC line
+        hour_angle = wrap(gast + lngs - ra[:, None])
+        h0 = AstrocartographyEngine._horizon_hour_angle(lats, dec[:, None])
+
+        d_asc = np.abs(wrap(hour_angle + h0))
+        d_mc = np.abs(hour_angle)
+        d_desc = np.abs(wrap(hour_angle - h0))
+        d_ic = np.abs(wrap(hour_angle - 180.0))
+
+        distances = np.stack([d_asc, d_mc, d_desc, d_ic], axis=1)
+        return np.nan_to_num(distances, nan=np.inf)
+
+    @staticmethod
+    def _gazetteer_candidates(ra, dec, gast, orb):
+        """
+        City indices (CityIndex) that may lie within `orb` of any line, found by
+        querying the grid with a box around each MC/IC meridian and around each
+        latitude band of the AC/DC curves.
+        """
+        wrap = AstrocartographyEngine._wrap180
+        band = CityIndex.CELL_DEG
+        edges = np.clip(np.arange(-90.0, 90.0 + band, band), -89.9, 89.9)
+
+        cells = set()
+        for i in range(len(ra)):
+            mc_lng = float(wrap(ra[i] - gast))
+            for meridian in (mc_lng, mc_lng + 180.0):
+                cells.update(CityIndex.box_cells(-90.0, 90.0, meridian - orb, meridian + orb))
+
+            # H0 is monotonic in latitude, so the curve inside a band lies between its edge values
+            x = -np.tan(np.radians(edges)) * np.tan(np.radians(dec[i]))
+            h0 = np.degrees(np.arccos(np.clip(x, -1.0, 1.0)))
+            for b in range(len(edges) - 1):
+                if (x[b] > 1 and x[b + 1] > 1) or (x[b] < -1 and x[b + 1] < -1):
+                    continue  # planet never rises or sets in this band
+                lo, hi = min(h0[b], h0[b + 1]), max(h0[b], h0[b + 1])
+                for sign in (-1.0, 1.0):  # AC: mc - H0, DC: mc + H0
+                    a, c = mc_lng + sign * lo, mc_lng + sign * hi
+                    cells.update(CityIndex.box_cells(edges[b], edges[b + 1], min(a, c) - orb, max(a, c) + orb))
+
+        return CityIndex.query_cells(cells)
+
+    @staticmethod
+    def _line_hits(names, ra, dec, gast, cities, orb):
+        """(planet, angle, city, distance) for every city within `orb` of a line."""
+        lats = np.array([c['lat'] for c in cities], dtype=float)
+        lngs = np.array([c['lng'] for c in cities], dtype=float)
+        distances = AstrocartographyEngine._angle_distances(lats, lngs, ra, dec, gast)
+
+        angle_names = list(AstrocartographyEngine.ANGLE_MEANINGS.keys())
+        return [
+            (names[p_idx], angle_names[a_idx], cities[c_idx], float(distances[p_idx, a_idx, c_idx]))
+            for p_idx, a_idx, c_idx in zip(*np.nonzero(distances <= orb))
+        ]
+
+    @staticmethod
+    def _gazetteer_hits(names, ra, dec, gast, orb, min_population=0, countries=None):
+        candidates = AstrocartographyEngine._gazetteer_candidates(ra, dec, gast, orb)
+        candidates = CityIndex.filter(candidates, min_population=min_population, countries=countries)
+        cities = [CityIndex.city(i) for i in candidates]
+        return AstrocartographyEngine._line_hits(names, ra, dec, gast, cities, orb) if cities else []
+
+    @staticmethod
+    def find_line_cities(year, month, day, hour, minute, timezone_str="UTC", birth_lat=0.0, birth_lng=0.0,
+                         orb=2.0, per_line=3, min_population=0, countries=None):
+        """
+        Top `per_line` gazetteer cities closest to each planetary line (within `orb`
+        degrees), optionally limited by population and ISO country codes.
+        Returns {"Jupiter/Midheaven": [{city..., "distance": deg}, ...], ...}.
+        """
+        names, ra, dec, gast = AstrocartographyEngine._equatorial_state(
+            year, month, day, hour, minute, timezone_str, birth_lat, birth_lng
+        )
+        hits = AstrocartographyEngine._gazetteer_hits(names, ra, dec, gast, orb, min_population, countries)
+
+        lines = {}
+        for planet, angle_name, city, diff in sorted(hits, key=lambda h: h[3]):
+            bucket = lines.setdefault(f"{planet}/{angle_name}", [])
+            if len(bucket) < per_line:
+                bucket.append(dict(city, distance=round(diff, 3)))
+        return lines
+
+    @staticmethod
+    def calculate_lines(year, month, day, hour, minute, timezone_str="UTC", birth_lat=0.0, birth_lng=0.0, latitudes=None):
+        """
+        Planetary AC/MC/DC/IC lines for the whole world, solved analytically.
+        MC/IC are meridians (single longitudes); AC/DC are curves returned as
+        [lat, lng] points for each latitude where the planet rises/sets.
+        """
+        names, ra, dec, gast = AstrocartographyEngine._equatorial_state(
+            year, month, day, hour, minute, timezone_str, birth_lat, birth_lng
+        )
+        wrap = AstrocartographyEngine._wrap180
+        lats = np.arange(-75.0, 76.0, 1.0) if latitudes is None else np.asarray(latitudes, dtype=float)
+
+        lines = {}
+        for i, name in enumerate(names):
+            mc_lng = float(wrap(ra[i] - gast))
+            h0 = AstrocartographyEngine._horizon_hour_angle(lats, dec[i])
+            ok = ~np.isnan(h0)
+            asc_lngs = wrap(mc_lng - h0[ok])
+            desc_lngs = wrap(mc_lng + h0[ok])
+            lines[name] = {
+                "Ascendant": [[float(la), round(float(lo), 4)] for la, lo in zip(lats[ok], asc_lngs)],
+                "Midheaven": round(mc_lng, 4),
+                "Descendant": [[float(la), round(float(lo), 4)] for la, lo in zip(lats[ok], desc_lngs)],
+                "IC": round(float(wrap(mc_lng + 180.0)), 4)
+            }
+        return lines
+
+    @staticmethod
+    def calculate_power_zones(name, year, month, day, hour, minute, timezone_str="UTC", birth_lat=0.0, birth_lng=0.0, cities=None, orb=6.0, limit=5):
+        """
+        Identify cities where planets are on the angles (AC, MC, DC, IC).
+        Planet positions are computed once; cities are checked against the
+        analytic lines in one vectorized pass. Without an explicit city list the
+        gazetteer (cities above POWER_ZONE_MIN_POPULATION) is searched through
+        its grid index, falling back to the curated CITIES if it is missing.
+        """
+        names, ra, dec, gast = AstrocartographyEngine._equatorial_state(
+            year, month, day, hour, minute, timezone_str, birth_lat, birth_lng
+        )
+
+        if cities is None and CityIndex.available():
+            hits = AstrocartographyEngine._gazetteer_hits(
+                names, ra, dec, gast, orb, min_population=AstrocartographyEngine.POWER_ZONE_MIN_POPULATION
+            )
+            # Many big cities share a line; keep the closest one per line so the zones differ
+            closest = {}
+            for hit in sorted(hits, key=lambda h: h[3]):
+                closest.setdefault((hit[0], hit[1]), hit)
+            hits = list(closest.values())
+        else:
+            cities = AstrocartographyEngine.CITIES if cities is None else cities
+            hits = AstrocartographyEngine._line_hits(names, ra, dec, gast, cities, orb) if cities else []
+
         results = []
-        
-        # We assume simple UTC input for broad scan to avoid timezone hell in loops
-        # Ideally, we convert user birth time to UTC once, then use that.
-        
-        for city in AstrocartographyEngine.CITIES:
-            # Calculate chart for this city
-            # Kerykeion handles the math. We rely on the fact that if we use the same UTC instant,
-            # the planetary longitudes are constant, but the Angles (Asc/MC) rotate with the location (Lat/Lng).
-            
-            try:
-                chart = KerykeionService.calculate_chart(
-                    name, year, month, day, hour, minute, 
-                    city['name'], city['lat'], city['lng'], 
-                    timezone_str="UTC" 
-                )
-                
-                if not chart or 'angles' not in chart: continue
-                
-                angles = chart['angles'] # Ascendant, Midheaven, Descendant, IC (abs degrees)
-                planets = chart['planets']
-                
-                # Check for Conjunctions (Planet w/ Angle)
-                # Orb: 6 degrees
-                ORB = 6.0
-                
-                for p in planets:
-                    p_pos = float(p['position']) # Absolute degree 0-360
-                    
-                    for angle_name, angle_pos in angles.items():
-                        angle_val = float(angle_pos)
-                        
-                        # Calculate difference on circle
-                        diff = abs(p_pos - angle_val)
-                        if diff > 180: diff = 360 - diff
-                        
-                        if diff <= ORB:
-                            # HIT!
-                            planet_meta = AstrocartographyEngine.LINE_MEANINGS.get(p['name'], {"text": f"{p['name']} Line", "desc": "Powerful influence."})
-                            angle_desc = AstrocartographyEngine.ANGLE_MEANINGS.get(angle_name, "Angle")
-                            
-                            results.append({
-                                "city": city['name'],
-                                "lat": city['lat'],
-                                "lng": city['lng'],
-                                "planet": p['name'],
-                                "angle": angle_name,
-                                "line_title": f"{p['name']}/{angle_name} Line",
-                                "effect_title": planet_meta['text'],
-                                "description": f"{planet_meta['desc']} ({angle_desc})",
-                                "intensity": round(10 - diff, 1) # Higher is closer
-                            })
-                            
-            except Exception as e:
-                print(f"ACG Error for {city['name']}: {e}")
-                continue
+        for planet, angle_name, city, diff in hits:
+            planet_meta = AstrocartographyEngine.LINE_MEANINGS.get(planet, {"text": f"{planet} Line", "desc": "Powerful influence."})
+            angle_desc = AstrocartographyEngine.ANGLE_MEANINGS.get(angle_name, "Angle")
+            results.append({
+                "city": city['name'],
+                "lat": city['lat'],
+                "lng": city['lng'],
+                "planet": planet,
+                "angle": angle_name,
+                "line_title": f"{planet}/{angle_name} Line",
+                "effect_title": planet_meta['text'],
+                "description": f"{planet_meta['desc']} ({angle_desc})",
+                "intensity": round(10 - diff, 1) # Higher is closer
+            })
 
         # Sort by Intensity (Closeness to angle)
         results.sort(key=lambda x: x['intensity'], reverse=True)
         
-        # Limit to top 5 locations to avoid noise
-        return results[:5]
+        # Limit to top locations to avoid noise
+        return results[:limit]
@@ -5,9 +5,10 @@ from services.kundali_painter import KundaliPainter
 
 class AstrologyAggregator:
     @staticmethod
-    def get_aggregated_best_prediction(name, year, month, day, hour, minute, city, lat, lng, timezone, lang="en", context=None, vedic_data=None, numerology_data=None, western_data=None):
+    def get_aggregated_best_prediction(name, year, month, day, hour, minute, city, lat, lng, timezone, lang="en", context=None, vedic_data=None, numerology_data=None, western_data=None, executive_summary=None):
         """
         Combines insights from multiple astrological systems with localization.
+        executive_summary: AI summary already generated elsewhere (report bundle); skips the LLM call.
         """
         if not western_data:
             western_data = KerykeionService.calculate_chart(name, year, month, day, hour, minute, city, lat, lng, timezone)
@@ -55,8 +56,8 @@ class AstrologyAggregator:
         western_insight = l["western"]["insight"].format(sign=western_data.get('sun_sign'), asc=western_data.get('ascendant'))
         
         # New: AI Synthesis for Summary
-        ai_summary = None
-        if vedic_data and numerology_data:
+        ai_summary = executive_summary
+        if not ai_summary and vedic_data and numerology_data:
             try:
                 from services.ai_service import generate_executive_summary
                 ai_summary = generate_executive_summary(name, western_data, vedic_data, numerology_data, context=context)
@@ -83,16 +84,16 @@ class AstrologyAggregator:
         }
 
     @staticmethod
-    def get_kundali_svg(name, year, month, day, hour, minute, lat, lng, lang="en", timezone="UTC"):
+    def get_kundali_svg(name, year, month, day, hour, minute, lat, lng, lang="en", timezone="UTC", chart_context=None):
         from services.vedic_astro_engine import VedicAstroEngine
-        sidereal = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone)
+        sidereal = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone, chart_context=chart_context)
         asc_sign = sidereal.get("ascendant", {}).get("sign_id", 1)
         return KundaliPainter.draw_north_indian_chart(sidereal['planets'], f"Lagna Chart (D1)", lang=lang, ascendant_sign=asc_sign)
 
     @staticmethod
-    def get_navamsa_svg(name, year, month, day, hour, minute, lat, lng, lang="en", timezone="UTC"):
+    def get_navamsa_svg(name, year, month, day, hour, minute, lat, lng, lang="en", timezone="UTC", chart_context=None):
         from services.vedic_astro_engine import VedicAstroEngine
-        sidereal = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone)
+        sidereal = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone, chart_context=chart_context)
         d_charts = VedicAstroEngine.calculate_divisional_charts(sidereal)
         navamsa_planets = d_charts.get("D9", [])
         
@@ -346,11 +347,18 @@ class AstrologyAggregator:
             
         return detailed_analysis
 
+    HOROSCOPE_TEMPLATE_SOURCE = "Skyfield Template (Fallback)"
+
     @staticmethod
     def get_dynamic_horoscope(sign, lang="en", context=None, profile_data=None):
         """
         Generates a dynamic horoscope based on advanced planetary transits and aspects.
         If profile_data is provided, calculates personalized Transit-to-Natal aspects.
+
+        The sign-level content is the same for everyone on a given day; it is
+        served from DailyHoroscopeStore when today's batch has produced it and no
+        personal context (profession, marital status, age) shapes the AI text.
+        Only the per-profile metrics are computed per request.
         """
         import datetime
         now = datetime.datetime.now()
@@ -358,320 +366,370 @@ class AstrologyAggregator:
         try:
             # Standardize sign input
             sign = sign.capitalize()
+            if sign not in AstrologyAggregator.ZODIAC_ORDER:
+                raise ValueError(f"Invalid zodiac sign: {sign}")
             
             # Calculate transits using Kerykeion
             lat = profile_data.get('latitude', 51.5) if profile_data else 51.5
             lng = profile_data.get('longitude', 0.0) if profile_data else 0.0
             
-            chart_data = KerykeionService.calculate_chart(
-                "Transit", now.year, now.month, now.day, now.hour, now.minute,
-                "Local", lat, lng
-            )
+            from services.transit_cache import TransitCache
+            chart_data = TransitCache.tropical_chart(lat, lng)
             planets = chart_data['planets']
-            
-            # Calculate Natal Aspects if profile available
-            natal_aspects = []
-            if profile_data and 'birth_date' in profile_data:
-                try:
-                    y, m, d = map(int, profile_data['birth_date'].split('-'))
-                    h, min_ = map(int, profile_data['birth_time'].split(':'))
-                    # Use profile coords for natal approximation if birth coords not distinct
-                    # Ideally profile stores birth_lat/lng separately, but we use what we have
-                    n_lat = profile_data.get('latitude', 0.0)
-                    n_lng = profile_data.get('longitude', 0.0)
-                    
-                    natal_chart = KerykeionService.calculate_chart(
-                        "Natal", y, m, d, h, min_,
-                        "BirthPlace", n_lat, n_lng
-                    )
-                    natal_aspects = AstrologyAggregator._calculate_transit_to_natal(planets, natal_chart['planets'])
-                except Exception as e:
-                    print(f"Natal Analysis Error: {e}")
-            
-            # 1. Aspect Engine: Find interactions between major planets (Universal)
-            aspects = AstrologyAggregator._calculate_aspects(planets)
-            
-            # 2. Sign Analysis
-            zodiac_order = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-                            "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-            
-            if sign not in zodiac_order:
-                raise ValueError(f"Invalid zodiac sign: {sign}")
-                
-            sign_idx = zodiac_order.index(sign)
-            
-            sun_pos = next(p for p in planets if p['name'] == 'Sun')
-            
-            # Calculate Sun House
-            sun_idx = zodiac_order.index(sun_pos['sign'])
-            sun_house = (sun_idx - sign_idx) % 12 + 1
-            
-            # --- Cosmic Metrics Calculation ---
-            # Dynamic Seed for unique results per profile
-            seed_key = f"{profile_data.get('name', 'User')}-{profile_data.get('birth_date', '0000')}-{now.date()}" if profile_data else f"{sign}-{now.date()}"
-            random.seed(seed_key)
-            
-            s_hour = random.randint(6, 20)
-            lucky_time = f"{s_hour:02d}:00 - {s_hour+2:02d}:00"
-            
-            dirs_en = ["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"]
-            dirs_hi = ["उत्तर", "उत्तर-पूर्व", "पूर्व", "दक्षिण-पूर्व", "दक्षिण", "दक्षिण-पश्चिम", "पश्चिम", "उत्तर-पश्चिम"]
-            lucky_direction = random.choice(dirs_hi if lang == "hi" else dirs_en)
-            
-            # Risk Analysis using Personal Aspects if available
-            if natal_aspects:
-                active_aspects = natal_aspects
-                bad_aspects_cnt = len([a for a in active_aspects if a['type'] in ['Square', 'Opposition']])
-                
-                # Check specifics for Personal Hits
-                has_fin_risk = any(a['natal'] in ['Venus', 'Jupiter', '2nd House'] and a['type'] in ['Square', 'Opposition'] for a in active_aspects)
-                has_conf_risk = any(a['natal'] in ['Mars', 'Sun', 'Moon'] and a['type'] in ['Square', 'Opposition'] for a in active_aspects)
-            else:
-                active_aspects = aspects
-                bad_aspects_cnt = len([a for a in active_aspects if a['type'] in ['Square', 'Opposition']])
-                
-                has_fin_risk = any((a['p1'] in ['Jupiter', 'Venus'] or a['p2'] in ['Jupiter', 'Venus']) and a['type'] in ['Square', 'Opposition'] for a in aspects)
-                has_conf_risk = any((a['p1'] in ['Mars', 'Sun'] or a['p2'] in ['Mars', 'Sun']) and a['type'] in ['Square', 'Opposition'] for a in aspects)
-            
-            risk_score = min(15 + (bad_aspects_cnt * 10) + random.randint(0, 25), 95)
-            daily_score = max(100 - risk_score - random.randint(0, 10), 10)
-            
-            conf_prob = "High" if has_conf_risk else ("Medium" if bad_aspects_cnt > 1 else "Low")
-            if lang == "hi":
-                conf_prob = "उच्च" if has_conf_risk else ("मध्यम" if bad_aspects_cnt > 1 else "कम")
-            
-            av_en = ["Signing contracts", "Lending money", "Arguments", "Late travel", "Impulsive buys", "Red clothes", "Neglect health"]
-            av_hi = ["अनुबंध हस्ताक्षर", "पैसा उधार", "बहस", "देर रात यात्रा", "आवेगी खरीदारी", "लाल कपड़े", "स्वास्थ्य की उपेक्षा"]
-            avoid_items = random.sample(av_hi if lang == "hi" else av_en, 2)
-            
-            gemstone_caution = {
-                "risk_score": risk_score,
-                "daily_score": daily_score,
-                "financial_alert": has_fin_risk,
-                "conflict_probability": conf_prob,
-                "avoid": avoid_items
+
+            payload = None
+            if not AstrologyAggregator._is_personal_context(context):
+                from services.horoscope_store import DailyHoroscopeStore
+                payload = DailyHoroscopeStore.get(sign, lang, now.date())
+            if payload is None:
+                payload = AstrologyAggregator.build_sign_horoscope(sign, planets, lang=lang, context=context, now=now)
+
+            metrics = AstrologyAggregator._horoscope_metrics(planets, lang=lang, profile_data=profile_data, sign=sign, now=now)
+            return AstrologyAggregator._layer_horoscope_metrics(payload, metrics, sign, lang)
+        except Exception as e:
+            print(f"Error in dynamic horoscope: {e}")
+            import traceback
+            traceback.print_exc()
+            # Fallback data
+            return {
+                "sign": sign,
+                "prediction": f"The stars are currently recalibrating for {sign}. Focus on intuition and gentle progress today.",
+                "lucky_number": 7,
+                "lucky_color": "Gold",
+                "energy_level": 4,
+                "mood": "Peaceful",
+                "aspects": [],
+                "categories": {},
+                "transits": {"Sun": "Current", "Moon": "Current"},
+                "date": now.strftime("%Y-%m-%d")
             }
-            # ----------------------------------
 
-            # 3. AI Enhancement (Groq/Gemini)
-            # We pass the calculated transit data to the AI
+    ZODIAC_ORDER = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+                    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+    @staticmethod
+    def _is_personal_context(context):
+        """True if the context changes the AI horoscope text (see generate_daily_guidance)."""
+        if not context:
+            return False
+        return any(context.get(k) is not None for k in ("profession", "marital_status", "age"))
+
+    @staticmethod
+    def _horoscope_metrics(planets, lang="en", profile_data=None, sign=None, now=None):
+        """
+        Per-profile part of the daily horoscope: lucky time/direction and the risk
+        metrics, seeded by profile and day, using natal aspects when the profile
+        has birth data.
+        """
+        import datetime
+        now = now or datetime.datetime.now()
+
+        # Calculate Natal Aspects if profile available
+        natal_aspects = []
+        if profile_data and 'birth_date' in profile_data:
             try:
-                from services.ai_service import generate_daily_guidance
-                ai_data = generate_daily_guidance(sign, planets, context=context, lang=lang)
+                y, m, d = map(int, profile_data['birth_date'].split('-'))
+                h, min_ = map(int, profile_data['birth_time'].split(':'))
+                # Use profile coords for natal approximation if birth coords not distinct
+                # Ideally profile stores birth_lat/lng separately, but we use what we have
+                n_lat = profile_data.get('latitude', 0.0)
+                n_lng = profile_data.get('longitude', 0.0)
                 
-                if ai_data:
-                    # Merge AI data with our structure
-                    return {
-                        "sign": sign,
-                        "prediction": ai_data.get("prediction", "Cosmic balance is key today."),
-                        "lucky_number": ai_data.get("lucky_number", 7),
-                        "lucky_color": ai_data.get("lucky_color", "White"),
-                        "lucky_time": lucky_time,
-                        "lucky_direction": lucky_direction,
-                        "gemstone_caution": gemstone_caution,
-                        "energy_level": ai_data.get("energy_level", 3),
-                        "mood": ai_data.get("mood", "Neutral"),
-                        "aspects": aspects[:3],
-                        "categories": ai_data.get("categories", {}),
-                        "transits": {p['name']: p['sign'] for p in planets if p['name'] in ['Sun', 'Moon', 'Mars', 'Jupiter', 'Saturn']},
-                        "date": now.strftime("%Y-%m-%d"),
-                        "source": "AI-Enhanced (Skyfield + Groq)"
-                    }
+                natal_chart = KerykeionService.calculate_chart(
+                    "Natal", y, m, d, h, min_,
+                    "BirthPlace", n_lat, n_lng
+                )
+                natal_aspects = AstrologyAggregator._calculate_transit_to_natal(planets, natal_chart['planets'])
             except Exception as e:
-                print(f"AI Skipped: {e}")
-            
-            # --- Legacy Fallback (Original Template Logic) ---
+                print(f"Natal Analysis Error: {e}")
+
+        aspects = AstrologyAggregator._calculate_aspects(planets)
+
+        # --- Cosmic Metrics Calculation ---
+        # Dynamic Seed for unique results per profile
+        seed_key = f"{profile_data.get('name', 'User')}-{profile_data.get('birth_date', '0000')}-{now.date()}" if profile_data else f"{sign}-{now.date()}"
+        rng = random.Random(seed_key)
+        
+        s_hour = rng.randint(6, 20)
+        lucky_time = f"{s_hour:02d}:00 - {s_hour+2:02d}:00"
+        
+        dirs_en = ["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"]
+        dirs_hi = ["उत्तर", "उत्तर-पूर्व", "पूर्व", "दक्षिण-पूर्व", "दक्षिण", "दक्षिण-पश्चिम", "पश्चिम", "उत्तर-पश्चिम"]
+        lucky_direction = rng.choice(dirs_hi if lang == "hi" else dirs_en)
+        
+        # Risk Analysis using Personal Aspects if available
+        if natal_aspects:
+            active_aspects = natal_aspects
+            bad_aspects_cnt = len([a for a in active_aspects if a['type'] in ['Square', 'Opposition']])
             
-            # 3. Modular Prediction Generator
-            house_themes_en = {
-                1: "self-discovery", 2: "financial stability", 3: "active communication",
-                4: "emotional roots", 5: "creative sparks", 6: "daily efficiency",
-                7: "balanced partnerships", 8: "deep transformation", 9: "expanded horizons",
-                10: "career elevation", 11: "social synergy", 12: "inner reflection"
-            }
-            house_themes_hi = {
-                1: "आत्म-खोज", 2: "वित्तीय स्थिरता", 3: "सक्रिय संचार",
-                4: "भावनात्मक जड़ें", 5: "रचनात्मक चिंगारी", 6: "दैनिक दक्षता",
-                7: "संतुलित साझेदारी", 8: "गहरा परिवर्तन", 9: "विस्तारित क्षितिज",
-                10: "करियर उत्थान", 11: "सामाजिक तालमेल", 12: "आंतरिक चिंतन"
-            }
-            house_themes = house_themes_hi if lang == 'hi' else house_themes_en
+            # Check specifics for Personal Hits
+            has_fin_risk = any(a['natal'] in ['Venus', 'Jupiter', '2nd House'] and a['type'] in ['Square', 'Opposition'] for a in active_aspects)
+            has_conf_risk = any(a['natal'] in ['Mars', 'Sun', 'Moon'] and a['type'] in ['Square', 'Opposition'] for a in active_aspects)
+        else:
+            active_aspects = aspects
+            bad_aspects_cnt = len([a for a in active_aspects if a['type'] in ['Square', 'Opposition']])
             
-            major_impact = ""
-            if aspects:
-                top_aspect = aspects[0]
-                aspect_meanings_en = {
-                    "Conjunction": "is merging with",
-                    "Opposition": "is facing tension from",
-                    "Square": "is challenged by",
-                    "Trine": "is supported by",
-                    "Sextile": "is gaining opportunity from"
-                }
-                aspect_meanings_hi = {
-                    "Conjunction": "के साथ मिल रहा है",
-                    "Opposition": "तनाव का सामना कर रहा है",
-                    "Square": "चुनौती दे रहा है",
-                    "Trine": "का समर्थन प्राप्त है",
-                    "Sextile": "से अवसर प्राप्त कर रहा है"
-                }
-                ams = aspect_meanings_hi if lang == 'hi' else aspect_meanings_en
-                
-                type_name = top_aspect['type']
-                if lang == 'hi':
-                    aspect_map = {"Conjunction": "युति", "Opposition": "प्रतियुति", "Square": "केंद्र", "Trine": "त्रिकोण", "Sextile": "लाभ"}
-                    type_name = aspect_map.get(type_name, type_name)
-                    major_impact = f" {top_aspect['p1']} और {top_aspect['p2']} के बीच एक महत्वपूर्ण {type_name} सुझाव देता है कि {top_aspect['p1']}, {top_aspect['p2']} {ams.get(top_aspect['type'], 'प्रभावित करता है')}।"
-                else:
-                    major_impact = f" A significant {top_aspect['type']} between {top_aspect['p1']} and {top_aspect['p2']} suggests {top_aspect['p1']} {ams.get(top_aspect['type'], 'impacts')} {top_aspect['p2']}."
+            has_fin_risk = any((a['p1'] in ['Jupiter', 'Venus'] or a['p2'] in ['Jupiter', 'Venus']) and a['type'] in ['Square', 'Opposition'] for a in aspects)
+            has_conf_risk = any((a['p1'] in ['Mars', 'Sun'] or a['p2'] in ['Mars', 'Sun']) and a['type'] in ['Square', 'Opposition'] for a in aspects)
+        
+        risk_score = min(15 + (bad_aspects_cnt * 10) + rng.randint(0, 25), 95)
+        daily_score = max(100 - risk_score - rng.randint(0, 10), 10)
+        
+        conf_prob = "High" if has_conf_risk else ("Medium" if bad_aspects_cnt > 1 else "Low")
+        if lang == "hi":
+            conf_prob = "उच्च" if has_conf_risk else ("मध्यम" if bad_aspects_cnt > 1 else "कम")
+        
+        av_en = ["Signing contracts", "Lending money", "Arguments", "Late travel", "Impulsive buys", "Red clothes", "Neglect health"]
+        av_hi = ["अनुबंध हस्ताक्षर", "पैसा उधार", "बहस", "देर रात यात्रा", "आवेगी खरीदारी", "लाल कपड़े", "स्वास्थ्य की उपेक्षा"]
+        avoid_items = rng.sample(av_hi if lang == "hi" else av_en, 2)
+        
+        gemstone_caution = {
+            "risk_score": risk_score,
+            "daily_score": daily_score,
+            "financial_alert": has_fin_risk,
+            "conflict_probability": conf_prob,
+            "avoid": avoid_items
+        }
+        # ----------------------------------
+        return {
+            "lucky_time": lucky_time,
+            "lucky_direction": lucky_direction,
+            "gemstone_caution": gemstone_caution,
+            "natal_aspects": natal_aspects
+        }
 
+    @staticmethod
+    def _layer_horoscope_metrics(payload, metrics, sign, lang="en"):
+        """Sign-level horoscope + per-profile metrics -> the response of the horoscope endpoints."""
+        result = dict(payload)
+        result["lucky_time"] = metrics["lucky_time"]
+        result["lucky_direction"] = metrics["lucky_direction"]
+        result["gemstone_caution"] = metrics["gemstone_caution"]
+
+        natal_aspects = metrics["natal_aspects"]
+        # Template predictions give way to the strongest personal transit
+        if natal_aspects and payload.get("source") == AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE:
+            top = natal_aspects[0] # Most exact aspect
+            interp = AstrologyAggregator._get_transit_meaning(top, lang)
             if lang == "hi":
-                prediction = f"{sign} के लिए आज का आकाशीय ध्यान {house_themes.get(sun_house, 'व्यक्तिगत विकास')} पर है।{major_impact} अधिकतम सामंजस्य के लिए अपने कार्यों को इस ब्रह्मांडीय प्रवाह के साथ संरेखित करें।"
+                 base_pred = f"महत्वपूर्ण: गोचर का {top['transit']} आपके जन्म के {top['natal']} को सक्रिय कर रहा है।"
+                 result["prediction"] = f"{base_pred} {interp} यह {sign} के लिए एक शक्तिशाली समय है।"
             else:
-                prediction = f"The celestial focus for {sign} today is on {house_themes.get(sun_house, 'personal growth')}. {major_impact} Align your actions with this cosmic current for maximum harmony."
-                
-            # Override/Enhance with Personal Transit Prediction if available
-            if natal_aspects:
-                top = natal_aspects[0] # Most exact aspect
-                interp = AstrologyAggregator._get_transit_meaning(top, lang)
-                if lang == "hi":
-                     base_pred = f"महत्वपूर्ण: गोचर का {top['transit']} आपके जन्म के {top['natal']} को सक्रिय कर रहा है।"
-                     prediction = f"{base_pred} {interp} यह {sign} के लिए एक शक्तिशाली समय है।"
-                else:
-                     base_pred = f"Key Personal Transit: {top['transit']} is actively influencing your Natal {top['natal']} ({top['type']})."
-                     prediction = f"{base_pred} {interp} This overrides general trends for {sign}."
+                 base_pred = f"Key Personal Transit: {top['transit']} is actively influencing your Natal {top['natal']} ({top['type']})."
+                 result["prediction"] = f"{base_pred} {interp} This overrides general trends for {sign}."
+        return result
+
+    @staticmethod
+    def build_sign_horoscope(sign, planets, lang="en", context=None, now=None):
+        """
+        Sign-level daily horoscope (no per-profile metrics): AI guidance for the
+        transits, or the template text if the AI is unavailable. This is what the
+        daily batch stores for each sign and language.
+        """
+        import datetime
+        now = now or datetime.datetime.now()
+
+        # 1. Aspect Engine: Find interactions between major planets (Universal)
+        aspects = AstrologyAggregator._calculate_aspects(planets)
+
+        # 2. Sign Analysis
+        zodiac_order = AstrologyAggregator.ZODIAC_ORDER
+        sign_idx = zodiac_order.index(sign)
+        
+        sun_pos = next(p for p in planets if p['name'] == 'Sun')
+        
+        # Calculate Sun House
+        sun_idx = zodiac_order.index(sun_pos['sign'])
+        sun_house = (sun_idx - sign_idx) % 12 + 1
+
+        transits = {p['name']: p['sign'] for p in planets if p['name'] in ['Sun', 'Moon', 'Mars', 'Jupiter', 'Saturn']}
+
+        # 3. AI Enhancement (Groq/Gemini)
+        # We pass the calculated transit data to the AI
+        try:
+            from services.ai_service import generate_daily_guidance
+            ai_data = generate_daily_guidance(sign, planets, context=context, lang=lang)
             
-            # 5. Life Area Insights (Deepened Analysis)
-            # Map planets to areas
-            venus_pos = next(p for p in planets if p['name'] == 'Venus')
-            saturn_pos = next(p for p in planets if p['name'] == 'Saturn')
-            jupiter_pos = next(p for p in planets if p['name'] == 'Jupiter')
-            mars_pos = next(p for p in planets if p['name'] == 'Mars')
-            moon_pos = next(p for p in planets if p['name'] == 'Moon')
-            mercury_pos = next(p for p in planets if p['name'] == 'Mercury')
-
-            # Multilingual Category Titles & Summaries
-            cat_text = {
-                "en": {
-                    "love": {"title": "Love & Relationships", "summary": "Venus in {sign} influences your heart space."},
-                    "career": {"title": "Career & Professional", "summary": "Saturn's placement in {sign} tests your resolve."},
-                    "finance": {"title": "Finance & Wealth", "summary": "Jupiter in {sign} expands your resourcefulness."},
-                    "health": {"title": "Health & Wellness", "summary": "The Moon in {sign} affects your vitality."},
-                    "status": ["Harmonious", "Stable", "Intense", "Transformative", "Growth", "Focus", "Build", "Patience", "Prosperous", "Cautious", "Strategic", "Expanding", "Balanced"]
-                },
-                "hi": {
-                    "love": {"title": "प्रेम और संबंध", "summary": "{sign} में शुक्र आपके हृदय स्थान को प्रभावित करता है।"},
-                    "career": {"title": "करियर और पेशेवर", "summary": "{sign} में शनि का स्थान आपके संकल्प की परीक्षा लेता है।"},
-                    "finance": {"title": "वित्त और धन", "summary": "{sign} में गुरु आपकी साधन संपन्नता का विस्तार करता है।"},
-                    "health": {"title": "स्वास्थ्य और कल्याण", "summary": "{sign} में चंद्रमा आपकी जीवन शक्ति को प्रभावित करता है।"},
-                    "status": ["सामंजस्यपूर्ण", "स्थिर", "तीव्र", "परिवर्तनकारी", "विकास", "फोकस", "निर्माण", "धैर्य", "समृद्ध", "सतर्क", "रणनीतिक", "विस्तार", "संतुलित"]
+            if ai_data:
+                # Merge AI data with our structure
+                return {
+                    "sign": sign,
+                    "prediction": ai_data.get("prediction", "Cosmic balance is key today."),
+                    "lucky_number": ai_data.get("lucky_number", 7),
+                    "lucky_color": ai_data.get("lucky_color", "White"),
+                    "energy_level": ai_data.get("energy_level", 3),
+                    "mood": ai_data.get("mood", "Neutral"),
+                    "aspects": aspects[:3],
+                    "categories": ai_data.get("categories", {}),
+                    "transits": transits,
+                    "date": now.strftime("%Y-%m-%d"),
+                    "source": "AI-Enhanced (Skyfield + Groq)"
                 }
+        except Exception as e:
+            print(f"AI Skipped: {e}")
+        
+        # --- Legacy Fallback (Original Template Logic) ---
+        rng = random.Random(f"{sign}-{now.date()}-details")
+
+        # 3. Modular Prediction Generator
+        house_themes_en = {
+            1: "self-discovery", 2: "financial stability", 3: "active communication",
+            4: "emotional roots", 5: "creative sparks", 6: "daily efficiency",
+            7: "balanced partnerships", 8: "deep transformation", 9: "expanded horizons",
+            10: "career elevation", 11: "social synergy", 12: "inner reflection"
+        }
+        house_themes_hi = {
+            1: "आत्म-खोज", 2: "वित्तीय स्थिरता", 3: "सक्रिय संचार",
+            4: "भावनात्मक जड़ें", 5: "रचनात्मक चिंगारी", 6: "दैनिक दक्षता",
+            7: "संतुलित साझेदारी", 8: "गहरा परिवर्तन", 9: "विस्तारित क्षितिज",
+            10: "करियर उत्थान", 11: "सामाजिक तालमेल", 12: "आंतरिक चिंतन"
+        }
+        house_themes = house_themes_hi if lang == 'hi' else house_themes_en
+        
+        major_impact = ""
+        if aspects:
+            top_aspect = aspects[0]
+            aspect_meanings_en = {
+                "Conjunction": "is merging with",
+                "Opposition": "is facing tension from",
+                "Square": "is challenged by",
+                "Trine": "is supported by",
+                "Sextile": "is gaining opportunity from"
             }
-            ct = cat_text.get(lang, cat_text["en"])
+            aspect_meanings_hi = {
+                "Conjunction": "के साथ मिल रहा है",
+                "Opposition": "तनाव का सामना कर रहा है",
+                "Square": "चुनौती दे रहा है",
+                "Trine": "का समर्थन प्राप्त है",
+                "Sextile": "से अवसर प्राप्त कर रहा है"
+            }
+            ams = aspect_meanings_hi if lang == 'hi' else aspect_meanings_en
             
-            # Detail Generators (Simplified for brevity regarding translation complexity in random strings)
-            # We provide static translated lists for Hindi fallback to ensure quality.
-
-            details_hi = {
-                "love": ["भावनात्मक सुरक्षा पर ध्यान दें।", "प्रियजनों के साथ समय बिताएं।", "नए रिश्तों के लिए खुला रहें।"],
-                "career": ["कड़ी मेहनत का फल मिलेगा।", "नई जिम्मेदारियों के लिए तैयार रहें।", "धैर्य रखें और योजना पर टिके रहें।"],
-                "finance": ["खर्चों पर नियंत्रण रखें।", "दीर्घकालिक निवेश पर विचार करें।", "वित्तीय योजना बनाने का अच्छा समय है।"],
-                "health": ["अपने शरीर की सुनें।", "हल्का व्यायाम करें।", "प्रचुर मात्रा में पानी पिएं।"]
+            type_name = top_aspect['type']
+            if lang == 'hi':
+                aspect_map = {"Conjunction": "युति", "Opposition": "प्रतियुति", "Square": "केंद्र", "Trine": "त्रिकोण", "Sextile": "लाभ"}
+                type_name = aspect_map.get(type_name, type_name)
+                major_impact = f" {top_aspect['p1']} और {top_aspect['p2']} के बीच एक महत्वपूर्ण {type_name} सुझाव देता है कि {top_aspect['p1']}, {top_aspect['p2']} {ams.get(top_aspect['type'], 'प्रभावित करता है')}।"
+            else:
+                major_impact = f" A significant {top_aspect['type']} between {top_aspect['p1']} and {top_aspect['p2']} suggests {top_aspect['p1']} {ams.get(top_aspect['type'], 'impacts')} {top_aspect['p2']}."
+
+        if lang == "hi":
+            prediction = f"{sign} के लिए आज का आकाशीय ध्यान {house_themes.get(sun_house, 'व्यक्तिगत विकास')} पर है।{major_impact} अधिकतम सामंजस्य के लिए अपने कार्यों को इस ब्रह्मांडीय प्रवाह के साथ संरेखित करें।"
+        else:
+            prediction = f"The celestial focus for {sign} today is on {house_themes.get(sun_house, 'personal growth')}. {major_impact} Align your actions with this cosmic current for maximum harmony."
+
+        # 5. Life Area Insights (Deepened Analysis)
+        # Map planets to areas
+        venus_pos = next(p for p in planets if p['name'] == 'Venus')
+        saturn_pos = next(p for p in planets if p['name'] == 'Saturn')
+        jupiter_pos = next(p for p in planets if p['name'] == 'Jupiter')
+        mars_pos = next(p for p in planets if p['name'] == 'Mars')
+        moon_pos = next(p for p in planets if p['name'] == 'Moon')
+        mercury_pos = next(p for p in planets if p['name'] == 'Mercury')
+
+        # Multilingual Category Titles & Summaries
+        cat_text = {
+            "en": {
+                "love": {"title": "Love & Relationships", "summary": "Venus in {sign} influences your heart space."},
+                "career": {"title": "Career & Professional", "summary": "Saturn's placement in {sign} tests your resolve."},
+                "finance": {"title": "Finance & Wealth", "summary": "Jupiter in {sign} expands your resourcefulness."},
+                "health": {"title": "Health & Wellness", "summary": "The Moon in {sign} affects your vitality."},
+                "status": ["Harmonious", "Stable", "Intense", "Transformative", "Growth", "Focus", "Build", "Patience", "Prosperous", "Cautious", "Strategic", "Expanding", "Balanced"]
+            },
+            "hi": {
+                "love": {"title": "प्रेम और संबंध", "summary": "{sign} में शुक्र आपके हृदय स्थान को प्रभावित करता है।"},
+                "career": {"title": "करियर और पेशेवर", "summary": "{sign} में शनि का स्थान आपके संकल्प की परीक्षा लेता है।"},
+                "finance": {"title": "वित्त और धन", "summary": "{sign} में गुरु आपकी साधन संपन्नता का विस्तार करता है।"},
+                "health": {"title": "स्वास्थ्य और कल्याण", "summary": "{sign} में चंद्रमा आपकी जीवन शक्ति को प्रभावित करता है।"},
+                "status": ["सामंजस्यपूर्ण", "स्थिर", "तीव्र", "परिवर्तनकारी", "विकास", "फोकस", "निर्माण", "धैर्य", "समृद्ध", "सतर्क", "रणनीतिक", "विस्तार", "संतुलित"]
             }
+        }
+        ct = cat_text.get(lang, cat_text["en"])
+        
+        # Detail Generators (Simplified for brevity regarding translation complexity in random strings)
+        # We provide static translated lists for Hindi fallback to ensure quality.
 
-            categories = {
-                "love": {
-                    "title": ct["love"]["title"],
-                    "summary": ct["love"]["summary"].format(sign=venus_pos['sign']),
-                    "details": details_hi["love"] if lang == "hi" else [
-                        f"With Venus transiting {venus_pos['sign']}, your approach to affection is currently colored by {random.choice(['the need for intellectual stimulation', 'deeply rooted emotional security', 'a desire for grand romantic gestures', 'practical acts of service'])}.",
-                        f"The alignment suggests that {random.choice(['open communication about long-term goals', 'physical proximity and touch', 'sharing a new experience together', 'expressing gratitude for small things'])} will strengthen your bond significantly.",
-                        f"If single, this cosmic frequency attracts {random.choice(['mentally engaging partners', 'someone who feels like home', 'dynamic and adventurous individuals', 'reliable and grounded souls'])}."
-                    ],
-                    "status": random.choice(ct["status"][:4])
-                },
-                "career": {
-                    "title": ct["career"]["title"],
-                    "summary": ct["career"]["summary"].format(sign=saturn_pos['sign']),
-                    "details": details_hi["career"] if lang == "hi" else [
-                        f"The presence of Saturn in {saturn_pos['sign']} puts a spotlight on your {random.choice(['professional boundaries', 'long-term legacy', 'daily work methodology', 'public reputation'])}.",
-                        f"You may feel a slight pressure to {random.choice(['reorganize your workspace', 'revisit a project from the past', 'take on more leadership responsibility', 'refine your technical skills'])}.",
-                        f"This is not a time for shortcuts; rather, it's a period where {random.choice(['meticulous attention to detail', 'steady, patient progress', 'networking with industry elders', 'consistency in your routine'])} will yield the greatest rewards."
-                    ],
-                    "status": random.choice(ct["status"][4:8])
-                },
-                "finance": {
-                    "title": ct["finance"]["title"],
-                    "summary": ct["finance"]["summary"].format(sign=jupiter_pos['sign']),
-                    "details": details_hi["finance"] if lang == "hi" else [
-                        f"Jupiter's current transit through {jupiter_pos['sign']} indicates a potential for {random.choice(['unexpected financial gains', 'a shift in how you value your time', 'opportunities for secondary income', 'better management of shared resources'])}.",
-                        f"While the energy is expansive, the square aspect to {random.choice(['Mars', 'Saturn', 'Pluto', 'Sun'])} warns against {random.choice(['impulsive luxury purchases', 'investing without research', 'over-extending your credit', 'ignoring small recurring expenses'])}.",
-                        f"Focusing on {random.choice(['long-term asset building', 'diversifying your portfolio', 'education as an investment', 'clear communication with financial partners'])} is highly favored today."
-                    ],
-                    "status": random.choice(ct["status"][8:12])
-                },
-                "health": {
-                    "title": ct["health"]["title"],
-                    "summary": ct["health"]["summary"].format(sign=moon_pos['sign']),
-                    "details": details_hi["health"] if lang == "hi" else [
-                        f"Listen to your body today.",
-                        f"Good time for gentle exercise.",
-                        f"Stay hydrated."
-                    ],
-                    "status": ct["status"][12]
-                },
-                "remedies": {
-                    "solution": {
-                        "physical": "योग और प्राणायाम का अभ्यास करें।" if lang == "hi" else "Practice Yoga and Pranayama.",
-                        "meditative": "ओम मंत्र का जाप करें।" if lang == "hi" else "Chant 'Om' mantra for inner peace.",
-                        "behavioral": "दूसरों के प्रति दयालु रहें।" if lang == "hi" else "Practice kindness towards others."
-                    }
+        details_hi = {
+            "love": ["भावनात्मक सुरक्षा पर ध्यान दें।", "प्रियजनों के साथ समय बिताएं।", "नए रिश्तों के लिए खुला रहें।"],
+            "career": ["कड़ी मेहनत का फल मिलेगा।", "नई जिम्मेदारियों के लिए तैयार रहें।", "धैर्य रखें और योजना पर टिके रहें।"],
+            "finance": ["खर्चों पर नियंत्रण रखें।", "दीर्घकालिक निवेश पर विचार करें।", "वित्तीय योजना बनाने का अच्छा समय है।"],
+            "health": ["अपने शरीर की सुनें।", "हल्का व्यायाम करें।", "प्रचुर मात्रा में पानी पिएं।"]
+        }
+
+        categories = {
+            "love": {
+                "title": ct["love"]["title"],
+                "summary": ct["love"]["summary"].format(sign=venus_pos['sign']),
+                "details": details_hi["love"] if lang == "hi" else [
+                    f"With Venus transiting {venus_pos['sign']}, your approach to affection is currently colored by {rng.choice(['the need for intellectual stimulation', 'deeply rooted emotional security', 'a desire for grand romantic gestures', 'practical acts of service'])}.",
+                    f"The alignment suggests that {rng.choice(['open communication about long-term goals', 'physical proximity and touch', 'sharing a new experience together', 'expressing gratitude for small things'])} will strengthen your bond significantly.",
+                    f"If single, this cosmic frequency attracts {rng.choice(['mentally engaging partners', 'someone who feels like home', 'dynamic and adventurous individuals', 'reliable and grounded souls'])}."
+                ],
+                "status": rng.choice(ct["status"][:4])
+            },
+            "career": {
+                "title": ct["career"]["title"],
+                "summary": ct["career"]["summary"].format(sign=saturn_pos['sign']),
+                "details": details_hi["career"] if lang == "hi" else [
+                    f"The presence of Saturn in {saturn_pos['sign']} puts a spotlight on your {rng.choice(['professional boundaries', 'long-term legacy', 'daily work methodology', 'public reputation'])}.",
+                    f"You may feel a slight pressure to {rng.choice(['reorganize your workspace', 'revisit a project from the past', 'take on more leadership responsibility', 'refine your technical skills'])}.",
+                    f"This is not a time for shortcuts; rather, it's a period where {rng.choice(['meticulous attention to detail', 'steady, patient progress', 'networking with industry elders', 'consistency in your routine'])} will yield the greatest rewards."
+                ],
+                "status": rng.choice(ct["status"][4:8])
+            },
+            "finance": {
+                "title": ct["finance"]["title"],
+                "summary": ct["finance"]["summary"].format(sign=jupiter_pos['sign']),
+                "details": details_hi["finance"] if lang == "hi" else [
+                    f"Jupiter's current transit through {jupiter_pos['sign']} indicates a potential for {rng.choice(['unexpected financial gains', 'a shift in how you value your time', 'opportunities for secondary income', 'better management of shared resources'])}.",
+                    f"While the energy is expansive, the square aspect to {rng.choice(['Mars', 'Saturn', 'Pluto', 'Sun'])} warns against {rng.choice(['impulsive luxury purchases', 'investing without research', 'over-extending your credit', 'ignoring small recurring expenses'])}.",
+                    f"Focusing on {rng.choice(['long-term asset building', 'diversifying your portfolio', 'education as an investment', 'clear communication with financial partners'])} is highly favored today."
+                ],
+                "status": rng.choice(ct["status"][8:12])
+            },
+            "health": {
+                "title": ct["health"]["title"],
+                "summary": ct["health"]["summary"].format(sign=moon_pos['sign']),
+                "details": details_hi["health"] if lang == "hi" else [
+                    f"Listen to your body today.",
+                    f"Good time for gentle exercise.",
+                    f"Stay hydrated."
+                ],
+                "status": ct["status"][12]
+            },
+            "remedies": {
+                "solution": {
+                    "physical": "योग और प्राणायाम का अभ्यास करें।" if lang == "hi" else "Practice Yoga and Pranayama.",
+                    "meditative": "ओम मंत्र का जाप करें।" if lang == "hi" else "Chant 'Om' mantra for inner peace.",
+                    "behavioral": "दूसरों के प्रति दयालु रहें।" if lang == "hi" else "Practice kindness towards others."
                 }
             }
+        }
 
-            # 6. Final Payload
-            random.seed(f"{sign}-{now.date()}")
-            
-            colors_en = ["Royal Blue", "Crimson", "Emerald", "Gold", "Violet", "Azure", "Saffron"]
-            colors_hi = ["शाही नीला", "गहरा लाल", "पन्ना हरा", "सुसहरी", "बैंगनी", "आसमानी", "केसरिया"]
-            lucky_color = random.choice(colors_hi if lang == "hi" else colors_en)
-            
-            moods_en = ["Ambitious", "Reflective", "Radiant", "Grounded", "Inspired", "Resilient"]
-            moods_hi = ["महत्वाकांक्षी", "चिंतनशील", "तेजस्वी", "स्थिर", "प्रेरित", "लचीला"]
-            mood = random.choice(moods_hi if lang == "hi" else moods_en)
+        # 6. Final Payload
+        rng = random.Random(f"{sign}-{now.date()}")
+        
+        colors_en = ["Royal Blue", "Crimson", "Emerald", "Gold", "Violet", "Azure", "Saffron"]
+        colors_hi = ["शाही नीला", "गहरा लाल", "पन्ना हरा", "सुसहरी", "बैंगनी", "आसमानी", "केसरिया"]
+        lucky_color = rng.choice(colors_hi if lang == "hi" else colors_en)
+        
+        moods_en = ["Ambitious", "Reflective", "Radiant", "Grounded", "Inspired", "Resilient"]
+        moods_hi = ["महत्वाकांक्षी", "चिंतनशील", "तेजस्वी", "स्थिर", "प्रेरित", "लचीला"]
+        mood = rng.choice(moods_hi if lang == "hi" else moods_en)
 
-            return {
-                "sign": sign,
-                "prediction": prediction,
-                "lucky_number": random.randint(1, 99),
-                "lucky_color": lucky_color,
-                "lucky_time": lucky_time,
-                "lucky_direction": lucky_direction,
-                "gemstone_caution": gemstone_caution,
-                "energy_level": random.randint(3, 5),
-                "mood": mood,
-                "aspects": aspects[:3],
-                "categories": categories,
-                "transits": {p['name']: p['sign'] for p in planets if p['name'] in ['Sun', 'Moon', 'Mars', 'Jupiter', 'Saturn']},
-                "date": now.strftime("%Y-%m-%d"),
-                 "source": "Skyfield Template (Fallback)"
-            }
-        except Exception as e:
-            print(f"Error in dynamic horoscope: {e}")
-            import traceback
-            traceback.print_exc()
-            # Fallback data
-            return {
-                "sign": sign,
-                "prediction": f"The stars are currently recalibrating for {sign}. Focus on intuition and gentle progress today.",
-                "lucky_number": 7,
-                "lucky_color": "Gold",
-                "energy_level": 4,
-                "mood": "Peaceful",
-                "aspects": [],
-                "categories": {},
-                "transits": {"Sun": "Current", "Moon": "Current"},
-                "date": now.strftime("%Y-%m-%d")
-            }
+        return {
+            "sign": sign,
+            "prediction": prediction,
+            "lucky_number": rng.randint(1, 99),
+            "lucky_color": lucky_color,
+            "energy_level": rng.randint(3, 5),
+            "mood": mood,
+            "aspects": aspects[:3],
+            "categories": categories,
+            "transits": transits,
+            "date": now.strftime("%Y-%m-%d"),
+            "source": AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE
+        }
 
     @staticmethod
     def _calculate_aspects(planets):
@@ -1011,20 +1069,24 @@ Generate predictions now based on authentic KP principles:"""
         return interpretations
 
     @staticmethod
-    def get_vedic_full_report(name, year, month, day, hour, minute, lat, lng, lang="en", timezone=None, context=None):
+    def get_vedic_full_report(name, year, month, day, hour, minute, lat, lng, lang="en", timezone=None, context=None, chart_context=None, include_ai_summary=True):
         from services.vedic_astro_engine import VedicAstroEngine
         from concurrent.futures import ThreadPoolExecutor
         import datetime
         
+        # 0. One shared Skyfield pass for every section of this report
+        if chart_context is None:
+            chart_context = VedicAstroEngine.get_chart_context(year, month, day, hour, minute, lat, lng, timezone_str=timezone)
+        
         # 1. Essential Base Data (Sync because others depend on it)
         sidereal_data = VedicAstroEngine.calculate_sidereal_planets(
-            year, month, day, hour, minute, lat, lng, timezone_str=timezone
+            year, month, day, hour, minute, lat, lng, timezone_str=timezone, chart_context=chart_context
         )
         
         with ThreadPoolExecutor() as executor:
             # Parallel Calculations
-            panchang_future = executor.submit(VedicAstroEngine.calculate_panchang, year, month, day, hour, minute, lat, lng, timezone_str=timezone)
-            dasha_future = executor.submit(VedicAstroEngine.calculate_vimshottari_dasha, year, month, day, hour, minute, lat, lng, timezone_str=timezone)
+            panchang_future = executor.submit(VedicAstroEngine.calculate_panchang, year, month, day, hour, minute, lat, lng, timezone_str=timezone, chart_context=chart_context)
+            dasha_future = executor.submit(VedicAstroEngine.calculate_vimshottari_dasha, year, month, day, hour, minute, lat, lng, timezone_str=timezone, chart_context=chart_context)
             divisional_future = executor.submit(VedicAstroEngine.calculate_divisional_charts, sidereal_data)
             remedies_future = executor.submit(VedicAstroEngine.calculate_remedies, sidereal_data, lang=lang)
             kp_future = executor.submit(VedicAstroEngine.calculate_kp_system, sidereal_data)
@@ -1044,7 +1106,8 @@ Generate predictions now based on authentic KP principles:"""
             # Map Angles to Houses (Approximate KP Cusps for Angles)
             # Use a separate future for Kerykeion which can be slow
             kerykeion_future = executor.submit(
-                KerykeionService.calculate_chart, name, year, month, day, hour, minute, "", lat, lng, timezone_str=timezone
+                KerykeionService.calculate_chart, name, year, month, day, hour, minute, "", lat, lng, timezone_str=timezone,
+                chart_context=chart_context
             )
             
             # Parallel Step 3: Graha Effects & Transits
@@ -1052,10 +1115,8 @@ Generate predictions now based on authentic KP principles:"""
             
             def get_transits():
                 try:
-                    now = datetime.datetime.now()
-                    return VedicAstroEngine.calculate_sidereal_planets(
-                        now.year, now.month, now.day, now.hour, now.minute, lat, lng, timezone_str=timezone
-                    ).get('planets', [])
+                    from services.transit_cache import TransitCache
+                    return TransitCache.sidereal_planets(lat, lng)
                 except Exception as te:
                     print(f"Transit Calculation Error: {te}")
                     return []
@@ -1081,15 +1142,17 @@ Generate predictions now based on authentic KP principles:"""
             current_transits = transits_future.result()
 
             # Parallel Step 4: AI Summary (Final high-latency task)
-            try:
-                from services.ai_service import generate_vedic_ai_summary
-                ai_summary = generate_vedic_ai_summary(
-                    name, sidereal_data['planets'], panchang, dasha, 
-                    lang=lang, context=context, doshas=doshas, transits=current_transits
-                )
-            except Exception as e:
-                print(f"AI Summary Error: {e}")
-                ai_summary = None
+            # Skipped when the caller requests it as part of a bundled prompt (ReportGenerator)
+            ai_summary = None
+            if include_ai_summary:
+                try:
+                    from services.ai_service import generate_vedic_ai_summary
+                    ai_summary = generate_vedic_ai_summary(
+                        name, sidereal_data['planets'], panchang, dasha, 
+                        lang=lang, context=context, doshas=doshas, transits=current_transits
+                    )
+                except Exception as e:
+                    print(f"AI Summary Error: {e}")
 
         return {
             "ayanamsa": sidereal_data["ayanamsa"],
@@ -1111,15 +1174,9 @@ Generate predictions now based on authentic KP principles:"""
     
     @staticmethod
     def get_current_transits(lat, lng, timezone="Asia/Kolkata"):
-        import datetime
-        now = datetime.datetime.now()
-        # Calculate current sidereal positions
-        from services.vedic_astro_engine import VedicAstroEngine
-        
-        transit_data = VedicAstroEngine.calculate_sidereal_planets(
-            now.year, now.month, now.day, now.hour, now.minute, lat, lng, timezone_str=timezone
-        )
-        return transit_data['planets']
+        # Current sidereal positions from the shared time-bucketed transit cache
+        from services.transit_cache import TransitCache
+        return TransitCache.sidereal_planets(lat, lng)
 
     @staticmethod
     def _get_vedic_insight(sun_sign, lang="en", vedic_data=None):
@@ -1199,10 +1256,8 @@ Generate predictions now based on authentic KP principles:"""
         # 1. Retrograde Check (Using Current Transits)
         # We assume Greenwich for global transits
         try:
-            transits = KerykeionService.calculate_chart(
-                "Transit", now.year, now.month, now.day, now.hour, now.minute,
-                "Greenwich", 51.5, 0.0
-            )
+            from services.transit_cache import TransitCache
+            transits = TransitCache.tropical_chart(51.5, 0.0)
             
             for p in transits['planets']:
                 # Dynamic Retrograde Check using Skyfield Data
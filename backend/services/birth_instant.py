@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import OrderedDict
+from services.timezone_service import TimezoneService
+
+
+class BirthInstant:
+    """
+    A birth moment normalized once: local wall time + resolved zone -> UTC
+    (to the second) -> Skyfield Time.
+
+    Every engine used to repeat the zone resolution, pytz localize/astimezone
+    and ts.utc(...) for the same birth data, a dozen times per report. resolve()
+    returns one shared, immutable instance per (local time, zone, lat, lng) from
+    a bounded LRU, and its Skyfield Time is built on first use only. Pass it to
+    SkyfieldService.calculate_positions / calculate_angles via `instant=`.
+
+    utc is (year, month, day, hour, minute, second) and the Time is built from
+    all of it - the engines used to cut birth times to whole minutes.
+    """
+    MAX_INSTANTS = int(os.getenv("BIRTH_INSTANT_CACHE_SIZE", "4096"))
+
+    _instants = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    __slots__ = ("local", "timezone", "lat", "lng", "utc_datetime", "_time")
+
+    def __init__(self, local, timezone, lat, lng):
+        self.local = tuple(local)  # (year, month, day, hour, minute, second) wall time
+        self.timezone = timezone
+        self.lat = float(lat)
+        self.lng = float(lng)
+        self.utc_datetime = TimezoneService.to_utc_datetime(*self.local[:5], self.lat, self.lng, timezone, second=self.local[5])
+        self._time = None
+
+    def __repr__(self):
+        return f"BirthInstant({self.utc_datetime.isoformat()}Z, {self.timezone}, {self.lat}, {self.lng})"
+
+    @property
+    def utc(self):
+        d = self.utc_datetime
+        return (d.year, d.month, d.day, d.hour, d.minute, d.second)
+
+    def time(self):
+        """Skyfield Time of the instant (built once per instance)."""
+        if self._time is None:
+            from services.skyfield_engine import SkyfieldService
+            SkyfieldService._init_skyfield()
+            self._time = SkyfieldService._ts.utc(*self.utc)
+        return self._time
+
+    @property
+    def jd(self):
+        """Julian date (TT)."""
+        return float(self.time().tt)
+
+    @classmethod
+    def resolve(cls, year, month, day, hour, minute, lat, lng, timezone_str=None, second=0):
+        """
+        Shared instant for a local birth time. A missing zone is resolved from
+        the coordinates; an explicit UTC is respected (as in SkyfieldService).
+        """
+        timezone = TimezoneService.resolve_timezone(timezone_str, lat, lng)
+        local = (int(year), int(month), int(day), int(hour), int(minute), int(second))
+        key = (local, timezone, round(float(lat), 6), round(float(lng), 6))
+        with cls._lock:
+            instant = cls._instants.get(key)
+            if instant is not None:
+                cls._instants.move_to_end(key)
+                cls._stats["hits"] += 1
+                return instant
+            cls._stats["misses"] += 1
+
+        instant = cls(local, timezone, lat, lng)
+        with cls._lock:
+            cls._instants[key] = instant
+            cls._instants.move_to_end(key)
+            while len(cls._instants) > cls.MAX_INSTANTS:
+                cls._instants.popitem(last=False)
+                cls._stats["evictions"] += 1
+        return instant
+
+    @classmethod
+    def from_utc(cls, utc, lat, lng):
+        """Instant for UTC components (year, month, day, hour, minute[, second])."""
+        utc = tuple(utc)
+        return cls.resolve(*utc[:5], lat, lng, timezone_str="UTC", second=utc[5] if len(utc) > 5 else 0)
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            return dict(cls._stats, size=len(cls._instants), max_size=cls.MAX_INSTANTS)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._instants.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0
@@ -0,0 +1,123 @@
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from services.chart_worker import ChartWorkerPool
+from services.chart_store import ChartDiskStore
+
+
+class ChartContext:
+    """
+    Memoized Skyfield pass for a single chart instant - the natal chart cache.
+
+    Keyed by (UTC instant, lat, lng, ayanamsa, engine version). Every engine method
+    that works on the same birth data (sidereal planets, panchang, dasha, Kundali
+    SVGs, Kerykeion angles) can accept the same context, so one report runs Skyfield
+    once instead of once per section, and repeat views of the same profile reuse it.
+
+    Tiers: bounded in-memory LRU per process, then the optional SQLite store shared
+    by all workers (see ChartDiskStore / CHART_CACHE_DB).
+    """
+    MAX_CONTEXTS = 256
+    # Bump whenever the Skyfield pass changes output, so cached charts are not reused
+    ENGINE_VERSION = "skyfield-de421-1"
+
+    _contexts = OrderedDict()
+    _contexts_lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0, "evictions": 0, "disk_hits": 0, "disk_misses": 0}
+
+    def __init__(self, utc, lat, lng, ayanamsa, persistent=True):
+        self.utc = tuple(utc)  # (year, month, day, hour, minute[, second]) already in UTC
+        self.lat = float(lat)
+        self.lng = float(lng)
+        self.ayanamsa = ayanamsa
+        # Short-lived charts (e.g. "now" transits) stay out of the disk tier
+        self.persistent = persistent
+        self._values = {}
+        # Re-entrant: derived values (e.g. sidereal) are built from memoized ones
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(utc, lat, lng, ayanamsa):
+        return (tuple(utc), round(float(lat), 6), round(float(lng), 6), round(float(ayanamsa), 6), ChartContext.ENGINE_VERSION)
+
+    @property
+    def key(self):
+        return ChartContext.make_key(self.utc, self.lat, self.lng, self.ayanamsa)
+
+    @property
+    def digest(self):
+        """Canonical content hash of the key, used by the shared disk tier."""
+        return hashlib.sha256(json.dumps(self.key, separators=(',', ':')).encode()).hexdigest()
+
+    @classmethod
+    def get(cls, utc, lat, lng, ayanamsa):
+        """
+        Returns the shared context for this instant, creating it if needed.
+        Bounded LRU so long-running workers don't grow without limit.
+        """
+        key = cls.make_key(utc, lat, lng, ayanamsa)
+        with cls._contexts_lock:
+            ctx = cls._contexts.get(key)
+            if ctx is not None:
+                cls._contexts.move_to_end(key)
+                cls._stats["hits"] += 1
+                return ctx
+
+            cls._stats["misses"] += 1
+            ctx = cls(utc, lat, lng, ayanamsa)
+            cls._contexts[key] = ctx
+            while len(cls._contexts) > cls.MAX_CONTEXTS:
+                cls._contexts.popitem(last=False)
+                cls._stats["evictions"] += 1
+            return ctx
+
+    @classmethod
+    def clear(cls):
+        with cls._contexts_lock:
+            cls._contexts.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0
+
+    @classmethod
+    def stats(cls):
+        with cls._contexts_lock:
+            return dict(cls._stats, size=len(cls._contexts), max_size=cls.MAX_CONTEXTS, disk=ChartDiskStore.enabled())
+
+    def memoize(self, name, factory):
+        """
+        Computes `factory()` once per context. Concurrent callers asking for the
+        same value wait for the first computation instead of repeating it.
+        """
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = factory()
+            return self._values[name]
+
+    def _load_or_compute(self):
+        if not (self.persistent and ChartDiskStore.enabled()):
+            return ChartWorkerPool.compute(self.utc, self.lat, self.lng)
+
+        digest = self.digest
+        stored = ChartDiskStore.get(digest)
+        with ChartContext._contexts_lock:
+            ChartContext._stats["disk_hits" if stored else "disk_misses"] += 1
+        if stored:
+            return stored[0], stored[1]
+
+        positions, angles = ChartWorkerPool.compute(self.utc, self.lat, self.lng)
+        ChartDiskStore.put(digest, ChartContext.ENGINE_VERSION, [positions, angles])
+        return positions, angles
+
+    def _skyfield_pass(self):
+        # Positions and angles come from one job so a worker-pool round trip covers both
+        return self.memoize("skyfield", self._load_or_compute)
+
+    def tropical_positions(self):
+        """Tropical planet list as returned by SkyfieldService.calculate_positions."""
+        return copy.deepcopy(self._skyfield_pass()[0])
+
+    def angles(self):
+        """Tropical AC/MC/DC/IC as returned by SkyfieldService.calculate_angles."""
+        return dict(self._skyfield_pass()[1])
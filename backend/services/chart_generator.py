@@ -4,7 +4,11 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import matplotlib.patches as patches
 import io
+import time
 import numpy as np
+from services.chart_layout import (
+    lagna_north_placements, navamsa_north_placements, lagna_south_placements, navamsa_south_placements
+)
 
 class ChartGenerator:
     @staticmethod
@@ -385,32 +389,7 @@ class ChartGenerator:
         Generate Lagna (D1) chart in North Indian style
         planets_data: dict with 'planets' list and 'ascendant' info
         """
-        planets = []
-        for p in planets_data.get('planets', []):
-            # Get planet degree (position in sign)
-            degree = p.get('position')
-            try:
-                degree_str = f"{int(float(degree)):02d}" if degree is not None else ""
-            except (ValueError, TypeError):
-                degree_str = ""
-            
-            planets.append({
-                'planet': p.get('name', p.get('planet', '')),
-                'house': p.get('house', 1),
-                'degree': degree_str
-            })
-        
-        # Add ascendant marker with degree
-        asc_house = 1  # Ascendant is always in house 1
-        asc_long = planets_data.get('ascendant', {}).get('longitude')
-        try:
-            asc_degree = float(asc_long or 0) % 30
-            asc_degree_str = f"{int(asc_degree):02d}"
-        except (ValueError, TypeError):
-            asc_degree_str = "00"
-        planets.append({'planet': 'Asc', 'house': asc_house, 'degree': asc_degree_str})
-        
-        return ChartGenerator.generate_north_indian_chart(planets, asc_house)
+        return ChartGenerator.generate_north_indian_chart(lagna_north_placements(planets_data), 1)
 
     @staticmethod
     def generate_navamsa_chart_north_indian(navamsa_data):
@@ -418,16 +397,7 @@ class ChartGenerator:
         Generate Navamsa (D9) chart in North Indian style
         navamsa_data: dict with D9 planet positions
         """
-        planets = []
-        d9_planets = navamsa_data.get('D9', [])
-        
-        for p in d9_planets:
-            planets.append({
-                'planet': p.get('name', ''),
-                'house': p.get('house', 1)
-            })
-        
-        return ChartGenerator.generate_north_indian_chart(planets)
+        return ChartGenerator.generate_north_indian_chart(navamsa_north_placements(navamsa_data))
 
     @staticmethod
     def generate_lagna_chart_south_indian(planets_data):
@@ -435,41 +405,7 @@ class ChartGenerator:
         Generate Lagna (D1) chart in South Indian style
         planets_data: dict with 'planets' list
         """
-        planets = []
-        for p in planets_data.get('planets', []):
-            # Get sign index (1-12)
-            sign = p.get('sign', '')
-            sign_map = {
-                'Aries': 1, 'Taurus': 2, 'Gemini': 3, 'Cancer': 4,
-                'Leo': 5, 'Virgo': 6, 'Libra': 7, 'Scorpio': 8,
-                'Sagittarius': 9, 'Capricorn': 10, 'Aquarius': 11, 'Pisces': 12
-            }
-            sign_id = sign_map.get(sign, 1)
-            
-            # Get planet degree
-            degree = p.get('position')
-            try:
-                degree_str = f"{int(float(degree)):02d}" if degree is not None else ""
-            except (ValueError, TypeError):
-                degree_str = ""
-            
-            planets.append({
-                'planet': p.get('name', p.get('planet', '')),
-                'sign_id': sign_id,
-                'degree': degree_str
-            })
-        
-        # Add ascendant with degree
-        asc_sign = planets_data.get('ascendant', {}).get('sign', 'Aries')
-        asc_degree = planets_data.get('ascendant', {}).get('longitude', 0) % 30
-        asc_degree_str = f"{int(asc_degree):02d}"
-        planets.append({
-            'planet': 'Asc',
-            'sign_id': sign_map.get(asc_sign, 1),
-            'degree': asc_degree_str
-        })
-        
-        return ChartGenerator.generate_south_indian_chart_image(planets)
+        return ChartGenerator.generate_south_indian_chart_image(lagna_south_placements(planets_data))
 
     @staticmethod
     def generate_navamsa_chart_south_indian(navamsa_data):
@@ -477,20 +413,22 @@ class ChartGenerator:
         Generate Navamsa (D9) chart in South Indian style
         navamsa_data: dict with D9 planet positions
         """
-        planets = []
-        d9_planets = navamsa_data.get('D9', [])
-        
-        sign_map = {
-            'Aries': 1, 'Taurus': 2, 'Gemini': 3, 'Cancer': 4,
-            'Leo': 5, 'Virgo': 6, 'Libra': 7, 'Scorpio': 8,
-            'Sagittarius': 9, 'Capricorn': 10, 'Aquarius': 11, 'Pisces': 12
-        }
-        
-        for p in d9_planets:
-            sign = p.get('sign', 'Aries')
-            planets.append({
-                'planet': p.get('name', ''),
-                'sign_id': sign_map.get(sign, 1)
-            })
-        
-        return ChartGenerator.generate_south_indian_chart_image(planets)
+        return ChartGenerator.generate_south_indian_chart_image(navamsa_south_placements(navamsa_data))
+
+# Figures of the consolidated PDF report, by kind (see services/report_figures.py)
+FIGURE_RENDERERS = {
+    "lagna_north": ChartGenerator.generate_lagna_chart_north_indian,
+    "navamsa_north": ChartGenerator.generate_navamsa_chart_north_indian,
+    "south": ChartGenerator.generate_south_indian_chart_image,
+    "astro_map": ChartGenerator.generate_astro_map_image,
+}
+
+
+def render_figure(kind, data):
+    """
+    Renders one report figure and returns (png bytes, seconds spent).
+    Module-level and bytes in/out so it can run in the compute process pool.
+    """
+    started = time.perf_counter()
+    buf = FIGURE_RENDERERS[kind](data)
+    return buf.getvalue(), time.perf_counter() - started
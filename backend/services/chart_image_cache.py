@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ChartImageCache:
+    """
+    Rendered PNGs of the /api/chart/{lagna,navamsa}/{north,south} endpoints.
+
+    A chart image only depends on the style and on what is drawn in each box:
+    planet, house (North) or sign (South) and the degree label. The key is a
+    fingerprint of exactly that, so every user with the same placements, and
+    every repeat view, gets the same entry instead of a new matplotlib render.
+    The fingerprint doubles as the ETag: a client that sends it back in
+    If-None-Match gets a 304 without any rendering or base64 payload.
+
+    Memory LRU of CHART_IMAGE_CACHE_MAX_ENTRIES per worker. Bump RENDER_VERSION
+    when ChartGenerator's drawing changes, so old images (and ETags) go stale.
+    """
+    MAX_ENTRIES = int(os.getenv("CHART_IMAGE_CACHE_MAX_ENTRIES", "1024"))
+    RENDER_VERSION = 1
+
+    _memory = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0, "render_seconds": 0.0}
+
+    @classmethod
+    def fingerprint(cls, style, placements):
+        # Order is kept: a box lists its planets in input order (fixed planet order from the engine)
+        raw = json.dumps([
+            cls.RENDER_VERSION,
+            style,
+            [[p.get('planet') or p.get('name') or '', p.get('house'), p.get('sign_id'), p.get('degree') or '']
+             for p in placements]
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def etag(cls, fingerprint):
+        return f'"{fingerprint[:32]}"'
+
+    @classmethod
+    def not_modified(cls, if_none_match, etag):
+        """True if the If-None-Match header value covers this ETag."""
+        if not if_none_match:
+            return False
+        tags = [t.strip() for t in if_none_match.split(",")]
+        matched = "*" in tags or etag in tags or f"W/{etag}" in tags
+        if matched:
+            with cls._lock:
+                cls._stats["not_modified"] += 1
+        return matched
+
+    @classmethod
+    def _render(cls, style, placements):
+        from services.chart_generator import ChartGenerator
+        if style == "north":
+            return ChartGenerator.generate_north_indian_chart(placements)
+        return ChartGenerator.generate_south_indian_chart_image(placements)
+
+    @classmethod
+    def get_image(cls, style, placements, fingerprint=None):
+        """PNG data URI of the chart, rendered only on a cache miss."""
+        key = fingerprint or cls.fingerprint(style, placements)
+        with cls._lock:
+            image = cls._memory.get(key)
+            if image is not None:
+                cls._memory.move_to_end(key)
+                cls._stats["hits"] += 1
+                return image
+            cls._stats["misses"] += 1
+
+        started = time.perf_counter()
+        buf = cls._render(style, placements)
+        image = f"data:image/png;base64,{base64.b64encode(buf.getvalue()).decode('utf-8')}"
+        elapsed = time.perf_counter() - started
+
+        with cls._lock:
+            cls._stats["render_seconds"] += elapsed
+            cls._memory[key] = image
+            cls._memory.move_to_end(key)
+            while len(cls._memory) > cls.MAX_ENTRIES:
+                cls._memory.popitem(last=False)
+                cls._stats["evictions"] += 1
+        return image
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            lookups = cls._stats["hits"] + cls._stats["misses"]
+            return dict(
+                cls._stats,
+                render_seconds=round(cls._stats["render_seconds"], 3),
+                size=len(cls._memory),
+                hit_rate=round(cls._stats["hits"] / lookups, 4) if lookups else 0.0
+            )
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._memory.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0 if name != "render_seconds" else 0.0
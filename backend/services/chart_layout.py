@@ -0,0 +1,111 @@
+"""
+Placement lists of the chart figures, shared by the matplotlib (ChartGenerator)
+and ReportLab (VectorChartGenerator) renderers. No drawing dependencies here.
+"""
+
+SIGN_IDS = {
+    'Aries': 1, 'Taurus': 2, 'Gemini': 3, 'Cancer': 4,
+    'Leo': 5, 'Virgo': 6, 'Libra': 7, 'Scorpio': 8,
+    'Sagittarius': 9, 'Capricorn': 10, 'Aquarius': 11, 'Pisces': 12
+}
+
+
+def lagna_north_placements(planets_data):
+    """
+    House placements of the Lagna (D1) North Indian chart, Asc included.
+    planets_data: dict with 'planets' list and 'ascendant' info
+    """
+    planets = []
+    for p in planets_data.get('planets', []):
+        # Get planet degree (position in sign)
+        degree = p.get('position')
+        try:
+            degree_str = f"{int(float(degree)):02d}" if degree is not None else ""
+        except (ValueError, TypeError):
+            degree_str = ""
+
+        planets.append({
+            'planet': p.get('name', p.get('planet', '')),
+            'house': p.get('house', 1),
+            'degree': degree_str
+        })
+
+    # Add ascendant marker with degree
+    asc_house = 1  # Ascendant is always in house 1
+    asc_long = planets_data.get('ascendant', {}).get('longitude')
+    try:
+        asc_degree = float(asc_long or 0) % 30
+        asc_degree_str = f"{int(asc_degree):02d}"
+    except (ValueError, TypeError):
+        asc_degree_str = "00"
+    planets.append({'planet': 'Asc', 'house': asc_house, 'degree': asc_degree_str})
+    return planets
+
+
+def navamsa_north_placements(navamsa_data):
+    """
+    House placements of the Navamsa (D9) North Indian chart.
+    navamsa_data: dict with D9 planet positions
+    """
+    planets = []
+    d9_planets = navamsa_data.get('D9', [])
+
+    for p in d9_planets:
+        planets.append({
+            'planet': p.get('name', ''),
+            'house': p.get('house', 1)
+        })
+    return planets
+
+
+def lagna_south_placements(planets_data):
+    """
+    Sign placements of the Lagna (D1) South Indian chart, Asc included.
+    planets_data: dict with 'planets' list
+    """
+    planets = []
+    for p in planets_data.get('planets', []):
+        # Get planet degree
+        degree = p.get('position')
+        try:
+            degree_str = f"{int(float(degree)):02d}" if degree is not None else ""
+        except (ValueError, TypeError):
+            degree_str = ""
+
+        planets.append({
+            'planet': p.get('name', p.get('planet', '')),
+            'sign_id': SIGN_IDS.get(p.get('sign', ''), 1),
+            'degree': degree_str
+        })
+
+    # Add ascendant with degree
+    asc_sign = planets_data.get('ascendant', {}).get('sign', 'Aries')
+    asc_degree = planets_data.get('ascendant', {}).get('longitude', 0) % 30
+    planets.append({
+        'planet': 'Asc',
+        'sign_id': SIGN_IDS.get(asc_sign, 1),
+        'degree': f"{int(asc_degree):02d}"
+    })
+    return planets
+
+
+def navamsa_south_placements(navamsa_data):
+    """
+    Sign placements of the Navamsa (D9) South Indian chart.
+    navamsa_data: dict with D9 planet positions
+    """
+    planets = []
+    for p in navamsa_data.get('D9', []):
+        planets.append({
+            'planet': p.get('name', ''),
+            'sign_id': SIGN_IDS.get(p.get('sign', 'Aries'), 1)
+        })
+    return planets
+
+
+CHART_PLACEMENTS = {
+    ("lagna", "north"): lagna_north_placements,
+    ("lagna", "south"): lagna_south_placements,
+    ("navamsa", "north"): navamsa_north_placements,
+    ("navamsa", "south"): navamsa_south_placements,
+}
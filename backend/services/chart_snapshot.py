@@ -0,0 +1,154 @@
+import json
+import hashlib
+from datetime import datetime
+from sqlalchemy.future import select
+from models import ChartSnapshot
+from services.chart_context import ChartContext
+from services.compute_dispatcher import ComputeDispatcher
+
+
+def compute_snapshot(details):
+    """
+    Full natal chart of a birth details dict (see ChartSnapshotService.birth_details),
+    as plain JSON data. Module level so it can run on the compute pool.
+    """
+    from services.vedic_astro_engine import VedicAstroEngine
+
+    args = (details['year'], details['month'], details['day'], details['hour'], details['minute'],
+            details['lat'], details['lng'])
+    timezone_str = details.get('timezone')
+    ctx = VedicAstroEngine.get_chart_context(*args, timezone_str=timezone_str)
+    sidereal = VedicAstroEngine.calculate_sidereal_planets(*args, timezone_str=timezone_str, chart_context=ctx)
+    tree = VedicAstroEngine.get_dasha_tree(*args, timezone_str=timezone_str, chart_context=ctx)
+    moon = next(p for p in sidereal['planets'] if p['name'] == 'Moon')
+
+    return {
+        "utc": list(ctx.utc),
+        "sidereal": sidereal,
+        "tropical": ctx.tropical_positions(),
+        "angles": ctx.angles(),
+        "moon": {"sign": moon['sign'], "sign_id": moon['sign_id'], "nakshatra": moon['nakshatra']},
+        # The tree is rebuilt from these two values (DashaTree(cycle_start, ruler_index))
+        "dasha": {"cycle_start": tree.cycle_start.isoformat(), "ruler_index": tree.ruler_index},
+        "doshas": VedicAstroEngine.calculate_doshas(sidereal)
+    }
+
+
+class ChartSnapshotService:
+    """
+    Precomputed natal chart per saved profile (table chart_snapshots).
+
+    Sidereal/tropical positions, angles, Moon nakshatra, the dasha tree seed and
+    doshas, stored as JSON next to the profile. Written when a profile is created
+    or its birth fields change, otherwise computed lazily on first read. A row is
+    stale when its engine version or the hash of the birth fields it was computed
+    from no longer match, so reads for saved profiles are one indexed row fetch.
+    """
+    # Bump SNAPSHOT_VERSION when the snapshot layout changes
+    SNAPSHOT_VERSION = 1
+    ENGINE_VERSION = f"{ChartContext.ENGINE_VERSION}/snapshot-{SNAPSHOT_VERSION}"
+    BIRTH_FIELDS = ("birth_date", "birth_time", "latitude", "longitude", "timezone_id", "ayanamsa")
+
+    @staticmethod
+    def birth_details(profile):
+        """Engine input dict (as used by MatchingService) for a Profile row."""
+        # Handle if birth_time is a string or a time object
+        if isinstance(profile.birth_time, str):
+            h, m = map(int, profile.birth_time.split(':')[:2])
+        else:
+            h, m = profile.birth_time.hour, profile.birth_time.minute
+        return {
+            "name": profile.name,
+            "year": profile.birth_date.year,
+            "month": profile.birth_date.month,
+            "day": profile.birth_date.day,
+            "hour": h,
+            "minute": m,
+            "lat": profile.latitude,
+            "lng": profile.longitude,
+            "timezone": profile.timezone_id
+        }
+
+    @classmethod
+    def birth_key(cls, profile):
+        raw = json.dumps([str(getattr(profile, field, None)) for field in cls.BIRTH_FIELDS])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    async def _fetch_many(cls, db, entries):
+        """
+        Snapshot data for [(profile_id, birth_key, details)]: one query for the stored
+        rows, missing or stale charts computed concurrently on the compute pool and
+        written in one commit. Works on plain values only, so a rollback by the caller
+        never leaves us reading expired ORM attributes.
+        """
+        import asyncio
+        ids = [profile_id for profile_id, _, _ in entries]
+        result = await db.execute(select(ChartSnapshot).where(ChartSnapshot.profile_id.in_(ids)))
+        stored = {row.profile_id: row for row in result.scalars().all()}
+
+        data, stale = {}, []
+        for profile_id, birth_key, details in entries:
+            row = stored.get(profile_id)
+            if row is not None and row.engine_version == cls.ENGINE_VERSION and row.birth_key == birth_key:
+                data[profile_id] = row.data
+            else:
+                stale.append((profile_id, birth_key, details))
+        if not stale:
+            return data
+
+        computed = await asyncio.gather(*[ComputeDispatcher.run_cpu(compute_snapshot, d) for _, _, d in stale])
+        for (profile_id, birth_key, _), chart in zip(stale, computed):
+            row = stored.get(profile_id)
+            if row is None:
+                row = ChartSnapshot(profile_id=profile_id)
+                db.add(row)
+            row.engine_version = cls.ENGINE_VERSION
+            row.birth_key = birth_key
+            row.data = chart
+            row.created_at = datetime.utcnow()
+            data[profile_id] = chart
+        await db.commit()
+        return data
+
+    @classmethod
+    async def get(cls, db, profile):
+        """Snapshot data of a saved profile, computed on first read or when stale."""
+        profile_id = profile.id
+        data = await cls._fetch_many(db, [(profile_id, cls.birth_key(profile), cls.birth_details(profile))])
+        return data[profile_id]
+
+    @classmethod
+    async def try_refresh(cls, db, profile):
+        """
+        For profile create/update: makes sure the stored chart matches the birth fields.
+        A failure is logged and left to the next read.
+        """
+        try:
+            await cls.get(db, profile)
+        except Exception as e:
+            print(f"Chart snapshot precompute failed for profile {profile.id}: {e}")
+            await db.rollback()
+            await db.refresh(profile)
+
+    @classmethod
+    async def details_with_snapshots(cls, db, *profiles):
+        """
+        birth_details of each profile plus its stored chart under "snapshot" (used by
+        MatchingService). If the snapshots fail, the engines compute from birth data.
+        """
+        entries = [(p.id, cls.birth_key(p), cls.birth_details(p)) for p in profiles]
+        try:
+            data = await cls._fetch_many(db, [(pid, key, dict(d)) for pid, key, d in entries])
+            for profile_id, _, details in entries:
+                details["snapshot"] = data[profile_id]
+        except Exception as e:
+            print(f"Chart snapshot read failed, computing from birth data: {e}")
+            await db.rollback()
+        return [details for _, _, details in entries]
+
+    @staticmethod
+    def dasha_tree(data):
+        from services.dasha_tree import DashaTree
+        dasha = data["dasha"]
+        return DashaTree(datetime.fromisoformat(dasha["cycle_start"]), dasha["ruler_index"])
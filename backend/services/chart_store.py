@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+
+class ChartDiskStore:
+    """
+    Optional SQLite tier behind the in-memory ChartContext LRU.
+
+    Enabled by setting CHART_CACHE_DB to a file path. All gunicorn workers on the
+    host open the same file, so a chart computed by one worker is a disk hit for
+    the others and survives restarts. Stores the raw Skyfield pass (positions,
+    angles) as JSON keyed by the ChartContext digest. SQLite errors are logged
+    and the chart is computed as usual.
+    """
+    PATH = os.getenv("CHART_CACHE_DB", "")
+    MAX_ROWS = int(os.getenv("CHART_CACHE_DB_MAX_ROWS", "100000"))
+
+    _init_lock = threading.Lock()
+    _initialized = False
+    _writes = 0
+
+    @classmethod
+    def enabled(cls):
+        return bool(cls.PATH)
+
+    @classmethod
+    def _connect(cls):
+        conn = sqlite3.connect(cls.PATH, timeout=5)
+        if not cls._initialized:
+            with cls._init_lock:
+                if not cls._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS natal_chart_cache ("
+                        "key TEXT PRIMARY KEY, engine_version TEXT, payload TEXT, created_at REAL)"
+                    )
+                    conn.commit()
+                    cls._initialized = True
+        return conn
+
+    @classmethod
+    def get(cls, key):
+        try:
+            conn = cls._connect()
+            try:
+                row = conn.execute("SELECT payload FROM natal_chart_cache WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Chart disk cache read error: {e}")
+            return None
+
+    @classmethod
+    def put(cls, key, engine_version, payload):
+        try:
+            conn = cls._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO natal_chart_cache (key, engine_version, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (key, engine_version, json.dumps(payload), time.time())
+                )
+                cls._writes += 1
+                # Trim now and then instead of on every write
+                if cls._writes % 500 == 0:
+                    conn.execute(
+                        "DELETE FROM natal_chart_cache WHERE key IN ("
+                        "SELECT key FROM natal_chart_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                        (cls.MAX_ROWS,)
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Chart disk cache write error: {e}")
+
+    @classmethod
+    def clear(cls):
+        if not cls.enabled():
+            return
+        try:
+            conn = cls._connect()
+            try:
+                conn.execute("DELETE FROM natal_chart_cache")
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Chart disk cache clear error: {e}")
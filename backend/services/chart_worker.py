@@ -0,0 +1,54 @@
+import os
+from services.skyfield_engine import SkyfieldService
+from services.birth_instant import BirthInstant
+from services.compute_dispatcher import ComputeDispatcher
+
+# True inside compute pool processes, so chart jobs never re-dispatch to the pool
+_IN_WORKER = False
+
+
+def warm_up():
+    """
+    Process pool initializer: loads the timescale and DE421 once per worker,
+    so the first chart job does not pay the ephemeris load.
+    """
+    global _IN_WORKER
+    _IN_WORKER = True
+    SkyfieldService._init_skyfield()
+
+
+def compute_chart(utc, lat, lng):
+    """
+    One Skyfield pass for a UTC instant (year, month, day, hour, minute[, second]).
+    Returns (tropical positions, angles) as plain lists/dicts - cheap to pickle.
+    """
+    instant = BirthInstant.from_utc(utc, lat, lng)
+    positions = SkyfieldService.calculate_positions(*utc[:5], lat, lng, timezone_str='UTC', instant=instant)
+    angles = SkyfieldService.calculate_angles(*utc[:5], lat, lng, timezone_str='UTC', instant=instant)
+    return positions, angles
+
+
+class ChartWorkerPool:
+    """
+    Worker-pool engine mode for Skyfield chart passes.
+
+    With CHART_ENGINE_MODE=process, ChartContext sends its Skyfield pass to the
+    ComputeDispatcher process pool (DE421 preloaded per worker) instead of running
+    it on the calling thread. Skyfield is GIL-bound, so this is what lets several
+    reports' ephemeris work run on separate cores. Default is inline.
+    """
+    MODE = os.getenv("CHART_ENGINE_MODE", "inline").lower()
+
+    @classmethod
+    def enabled(cls):
+        return cls.MODE == "process" and ComputeDispatcher.USE_PROCESSES and not _IN_WORKER
+
+    @classmethod
+    def compute(cls, utc, lat, lng):
+        """Blocking; returns (positions, angles). Falls back to inline on pool errors."""
+        if cls.enabled():
+            try:
+                return ComputeDispatcher.run_cpu_sync(compute_chart, tuple(utc), lat, lng)
+            except Exception as e:
+                print(f"Chart worker pool failed, computing inline: {e}")
+        return compute_chart(utc, lat, lng)
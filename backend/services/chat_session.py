@@ -0,0 +1,188 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+from services.llm_provider import LLMClient
+
+
+class ChatSessionStore:
+    """
+    Server-side state of /api/chat conversations, keyed by session id.
+
+    A session keeps the chat preamble (system prompt with the user's chart, built
+    once by ai_service.build_chat_preamble) and the conversation, so a follow-up
+    turn only sends the new message.
+
+    The conversation is a rolling window of the last CHAT_HISTORY_WINDOW messages
+    plus a summary of everything older. Messages leaving the window wait in
+    "pending" (still sent with the turn) until CHAT_COMPACT_BATCH of them have
+    piled up; compact() then folds them into the summary after the answer has
+    been sent, so it never delays a turn. With the summary capped, the prompt
+    size (and latency) of a turn does not grow with the conversation.
+
+    Sessions live in this worker's memory: they expire after
+    CHAT_SESSION_TTL_SECONDS without use, the least recently used ones are
+    dropped past CHAT_SESSION_MAX. A client whose session is unknown (expired,
+    restart, or another worker) sends the profile context again and gets a new
+    session.
+    """
+    TTL_SECONDS = int(os.getenv("CHAT_SESSION_TTL_SECONDS", "3600"))
+    MAX_SESSIONS = int(os.getenv("CHAT_SESSION_MAX", "2000"))
+    WINDOW_MESSAGES = int(os.getenv("CHAT_HISTORY_WINDOW", "8"))
+    COMPACT_BATCH = int(os.getenv("CHAT_COMPACT_BATCH", "4"))
+
+    _sessions = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {"created": 0, "reused": 0, "expired": 0, "evicted": 0, "compactions": 0,
+              "prompts": 0, "prompt_tokens": 0, "max_prompt_tokens": 0}
+
+    @classmethod
+    def _expire(cls, now):
+        expired = [sid for sid, s in cls._sessions.items() if now - s["updated"] > cls.TTL_SECONDS]
+        for sid in expired:
+            del cls._sessions[sid]
+        cls._stats["expired"] += len(expired)
+
+    @classmethod
+    def create(cls, profile_context, lang="en", history=None, session_id=None):
+        """Builds the preamble for the profile and returns the new session id."""
+        from services.ai_service import build_chat_preamble
+        preamble = build_chat_preamble(profile_context, lang)
+        session_id = session_id or uuid.uuid4().hex
+        now = time.time()
+        with cls._lock:
+            cls._expire(now)
+            session = {
+                "preamble": preamble,
+                "lang": lang,
+                "priority": LLMClient.priority_for((profile_context or {}).get('subscription_tier')),
+                "history": [],
+                "pending": [],
+                "summary": "",
+                "compacting": False,
+                "created": now,
+                "updated": now,
+            }
+            cls._sessions[session_id] = session
+            for msg in history or []:
+                content = msg.get('text', '') or msg.get('content', '')
+                if content:
+                    session["history"].append({"role": "user" if msg.get('role') == 'user' else "assistant", "content": content})
+            cls._slide(session)
+            cls._sessions.move_to_end(session_id)
+            while len(cls._sessions) > cls.MAX_SESSIONS:
+                cls._sessions.popitem(last=False)
+                cls._stats["evicted"] += 1
+            cls._stats["created"] += 1
+        return session_id
+
+    @classmethod
+    def _slide(cls, session):
+        overflow = len(session["history"]) - cls.WINDOW_MESSAGES
+        if overflow > 0:
+            session["pending"].extend(session["history"][:overflow])
+            del session["history"][:overflow]
+
+    @classmethod
+    def get(cls, session_id):
+        """Snapshot of the session (preamble, lang, history, summary), or None if unknown/expired."""
+        if not session_id:
+            return None
+        now = time.time()
+        with cls._lock:
+            session = cls._sessions.get(session_id)
+            if session is None:
+                return None
+            if now - session["updated"] > cls.TTL_SECONDS:
+                del cls._sessions[session_id]
+                cls._stats["expired"] += 1
+                return None
+            session["updated"] = now
+            cls._sessions.move_to_end(session_id)
+            cls._stats["reused"] += 1
+            return dict(session, history=list(session["history"]), pending=list(session["pending"]))
+
+    @classmethod
+    def append(cls, session_id, message, answer):
+        """
+        Records one finished turn (user message and assistant answer).
+        Returns True when older messages are waiting to be compacted.
+        """
+        with cls._lock:
+            session = cls._sessions.get(session_id)
+            if session is None:
+                return False
+            session["history"].append({"role": "user", "content": message})
+            session["history"].append({"role": "assistant", "content": answer})
+            cls._slide(session)
+            session["updated"] = time.time()
+            return len(session["pending"]) >= cls.COMPACT_BATCH and not session["compacting"]
+
+    @classmethod
+    def compact(cls, session_id):
+        """
+        Folds the pending messages into the session summary (one fast LLM call,
+        see ai_service.summarize_chat_turns). Blocking - run it after the
+        response, e.g. as a background task. No-op until COMPACT_BATCH messages
+        are pending.
+        """
+        from services.ai_service import summarize_chat_turns
+        with cls._lock:
+            session = cls._sessions.get(session_id)
+            if session is None or len(session["pending"]) < cls.COMPACT_BATCH or session["compacting"]:
+                return False
+            session["compacting"] = True
+            summary, turns, lang = session["summary"], list(session["pending"]), session["lang"]
+
+        try:
+            new_summary = summarize_chat_turns(summary, turns, lang)
+        except Exception as e:
+            print(f"Chat compaction error: {e}")
+            new_summary = None
+
+        with cls._lock:
+            session["compacting"] = False
+            if new_summary is None:
+                return False
+            session["summary"] = new_summary
+            # Turns that arrived while summarizing stay pending for the next run
+            del session["pending"][:len(turns)]
+            cls._stats["compactions"] += 1
+        return True
+
+    @classmethod
+    def recent_turns(cls, session):
+        """Messages to send with the next turn: not yet summarized + the window."""
+        return session["pending"] + session["history"]
+
+    @classmethod
+    def record_prompt(cls, tokens):
+        """Tracks the size of the prompts sent for session turns (estimated tokens)."""
+        with cls._lock:
+            cls._stats["prompts"] += 1
+            cls._stats["prompt_tokens"] += tokens
+            cls._stats["max_prompt_tokens"] = max(cls._stats["max_prompt_tokens"], tokens)
+
+    @classmethod
+    def drop(cls, session_id):
+        with cls._lock:
+            cls._sessions.pop(session_id, None)
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            prompts = cls._stats["prompts"]
+            return dict(
+                cls._stats,
+                size=len(cls._sessions),
+                avg_prompt_tokens=round(cls._stats["prompt_tokens"] / prompts, 1) if prompts else 0.0
+            )
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._sessions.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0
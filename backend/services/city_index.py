@@ -0,0 +1,123 @@
+import os
+import csv
+import gzip
+import math
+import threading
+import numpy as np
+
+
+class CityIndex:
+    """
+    Offline world gazetteer with a lat/lng grid index.
+
+    Data: data/cities15000.csv.gz - GeoNames "cities15000" (every city with
+    population >= 15,000, ~34k rows; GeoNames, CC BY 4.0). Loaded lazily once per
+    process into numpy columns. Cities are bucketed into CELL_DEG x CELL_DEG cells
+    so a box query only touches the cells it overlaps instead of every row.
+    """
+    DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cities15000.csv.gz")
+    CELL_DEG = 2.0
+
+    _loaded = False
+    _lock = threading.Lock()
+    names = []
+    country_codes = None
+    countries = []
+    lat = None
+    lng = None
+    population = None
+    _cells = {}
+
+    @classmethod
+    def load(cls):
+        if cls._loaded:
+            return
+        with cls._lock:
+            if cls._loaded:
+                return
+            names, codes, countries, lats, lngs, pops = [], [], [], [], [], []
+            with gzip.open(cls.DATA_PATH, "rt", encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    names.append(row["name"])
+                    codes.append(row["country_code"])
+                    countries.append(row["country"])
+                    lats.append(float(row["lat"]))
+                    lngs.append(float(row["lng"]))
+                    pops.append(int(row["population"]))
+
+            cls.names = names
+            cls.countries = countries
+            cls.country_codes = np.array(codes)
+            cls.lat = np.array(lats)
+            cls.lng = np.array(lngs)
+            cls.population = np.array(pops, dtype=np.int64)
+
+            cells = {}
+            for i, key in enumerate(zip(cls._cell_lat(cls.lat), cls._cell_lng(cls.lng))):
+                cells.setdefault(key, []).append(i)
+            cls._cells = {key: np.array(idx) for key, idx in cells.items()}
+            cls._loaded = True
+            print(f"City index loaded: {len(names)} cities, {len(cls._cells)} cells")
+
+    @classmethod
+    def available(cls):
+        return os.path.exists(cls.DATA_PATH)
+
+    @classmethod
+    def _cell_lat(cls, lat):
+        return np.floor((np.asarray(lat) + 90.0) / cls.CELL_DEG).astype(int)
+
+    @classmethod
+    def _cell_lng(cls, lng):
+        return np.floor(((np.asarray(lng) + 180.0) % 360.0) / cls.CELL_DEG).astype(int)
+
+    @classmethod
+    def box_cells(cls, lat_min, lat_max, lng_min, lng_max):
+        """
+        Grid cell keys overlapping the box. Longitudes may cross the antimeridian
+        (e.g. lng_max > 180); a span of 360 or more covers every longitude.
+        """
+        n_lng = int(round(360.0 / cls.CELL_DEG))
+        lat_cells = range(int(cls._cell_lat(max(lat_min, -90.0))), int(cls._cell_lat(min(lat_max, 89.999))) + 1)
+        span = lng_max - lng_min
+        if span >= 360.0:
+            lng_cells = range(n_lng)
+        else:
+            first = int(cls._cell_lng(lng_min))
+            count = int(math.ceil(span / cls.CELL_DEG)) + 1
+            lng_cells = [(first + k) % n_lng for k in range(min(count, n_lng))]
+        return [(a, b) for a in lat_cells for b in lng_cells]
+
+    @classmethod
+    def query_cells(cls, cells):
+        """Indices of all cities in the given grid cells."""
+        cls.load()
+        found = [cls._cells[key] for key in set(cells) if key in cls._cells]
+        return np.concatenate(found) if found else np.array([], dtype=int)
+
+    @classmethod
+    def query_box(cls, lat_min, lat_max, lng_min, lng_max):
+        """Indices of cities in the cells overlapping the box (a superset of the cities inside it)."""
+        return cls.query_cells(cls.box_cells(lat_min, lat_max, lng_min, lng_max))
+
+    @classmethod
+    def filter(cls, indices, min_population=0, countries=None):
+        """Applies population / country (ISO code) filters to a set of city indices."""
+        cls.load()
+        indices = np.asarray(indices, dtype=int)
+        if min_population:
+            indices = indices[cls.population[indices] >= min_population]
+        if countries:
+            indices = indices[np.isin(cls.country_codes[indices], [c.upper() for c in countries])]
+        return indices
+
+    @classmethod
+    def city(cls, i):
+        """Gazetteer row as the dict shape used by AstrocartographyEngine.CITIES."""
+        return {
+            "name": f"{cls.names[i]}, {cls.countries[i]}",
+            "lat": float(cls.lat[i]),
+            "lng": float(cls.lng[i]),
+            "country_code": str(cls.country_codes[i]),
+            "population": int(cls.population[i])
+        }
@@ -0,0 +1,133 @@
+import os
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _init_cpu_worker():
+    # Imported here: chart_worker itself depends on ComputeDispatcher
+    from services.chart_worker import warm_up
+    warm_up()
+
+
+def _noop():
+    return None
+
+
+class ComputeDispatcher:
+    """
+    Central place for running blocking work from async routes.
+
+    - run_io:  AI / HTTP calls (Groq, Gemini, geocoding). Bounded thread pool,
+               threads mostly wait on the network so the GIL is not a problem.
+    - run_cpu: Skyfield ephemeris math and PDF rendering. Process pool, so a long
+               chart or ReportLab job does not stall the event loop or the GIL
+               of the uvicorn worker serving other requests.
+
+    Concurrency per class of work is configured through env vars:
+        COMPUTE_IO_WORKERS     (default 8)
+        COMPUTE_CPU_WORKERS    (default 2)
+        COMPUTE_USE_PROCESSES  (default true; false runs CPU work on threads)
+
+    Compute processes preload DE421 at start (services/chart_worker.warm_up).
+    Functions sent to run_cpu must be picklable (module-level functions or
+    staticmethods) and so must their arguments and results.
+    """
+    IO_WORKERS = int(os.getenv("COMPUTE_IO_WORKERS", "8"))
+    CPU_WORKERS = int(os.getenv("COMPUTE_CPU_WORKERS", "2"))
+    USE_PROCESSES = os.getenv("COMPUTE_USE_PROCESSES", "true").lower() == "true"
+
+    _io_pool = None
+    _cpu_pool = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_io_pool(cls):
+        with cls._lock:
+            if cls._io_pool is None:
+                cls._io_pool = ThreadPoolExecutor(max_workers=cls.IO_WORKERS, thread_name_prefix="compute-io")
+            return cls._io_pool
+
+    @classmethod
+    def _get_cpu_pool(cls):
+        with cls._lock:
+            if cls._cpu_pool is None:
+                if cls.USE_PROCESSES:
+                    cls._cpu_pool = ProcessPoolExecutor(max_workers=cls.CPU_WORKERS, initializer=_init_cpu_worker)
+                else:
+                    cls._cpu_pool = ThreadPoolExecutor(max_workers=cls.CPU_WORKERS, thread_name_prefix="compute-cpu")
+            return cls._cpu_pool
+
+    @classmethod
+    async def run_io(cls, fn, *args, **kwargs):
+        """Runs a blocking network-bound call on the bounded I/O thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._get_io_pool(), partial(fn, *args, **kwargs))
+
+    @classmethod
+    async def run_cpu(cls, fn, *args, **kwargs):
+        """
+        Runs CPU-bound work (ephemeris, PDF) on the compute pool.
+        If the process pool dies (e.g. a worker was OOM-killed) it is rebuilt once
+        before giving up.
+        """
+        loop = asyncio.get_running_loop()
+        call = partial(fn, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(cls._get_cpu_pool(), call)
+        except BrokenProcessPool:
+            print("Compute process pool broken, restarting it")
+            cls._reset_cpu_pool()
+            return await loop.run_in_executor(cls._get_cpu_pool(), call)
+
+    @classmethod
+    def run_cpu_sync(cls, fn, *args, **kwargs):
+        """Blocking variant of run_cpu for sync code (report generation threads)."""
+        try:
+            return cls._get_cpu_pool().submit(fn, *args, **kwargs).result()
+        except BrokenProcessPool:
+            print("Compute process pool broken, restarting it")
+            cls._reset_cpu_pool()
+            return cls._get_cpu_pool().submit(fn, *args, **kwargs).result()
+
+    @classmethod
+    def submit_cpu(cls, fn, *args, **kwargs):
+        """
+        Non-blocking: queues CPU work on the compute pool and returns its
+        concurrent.futures.Future, for callers that fan out several jobs at once
+        (PDF figures). The caller handles BrokenProcessPool from result().
+        """
+        try:
+            return cls._get_cpu_pool().submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            print("Compute process pool broken, restarting it")
+            cls._reset_cpu_pool()
+            return cls._get_cpu_pool().submit(fn, *args, **kwargs)
+
+    @classmethod
+    def warm_up(cls):
+        """Starts the compute processes ahead of the first request (each loads DE421 once)."""
+        if not cls.USE_PROCESSES:
+            return
+        pool = cls._get_cpu_pool()
+        for _ in range(cls.CPU_WORKERS):
+            pool.submit(_noop)
+
+    @classmethod
+    def _reset_cpu_pool(cls):
+        with cls._lock:
+            pool, cls._cpu_pool = cls._cpu_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            pools = [cls._io_pool, cls._cpu_pool]
+            cls._io_pool = None
+            cls._cpu_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
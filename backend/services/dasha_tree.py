@@ -0,0 +1,120 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from services.vedic_astro_engine import VedicAstroEngine
+
+
+class DashaTree:
+    """
+    Vimshottari dasha periods as flat, array-backed levels.
+
+    Each level (maha, antar, pratyantar) keeps start/end times as float days since
+    EPOCH plus the lord index into VedicAstroEngine.DASHA_PLANETS. Period i of a
+    level is the parent of periods 9*i .. 9*i+8 of the next level, and every level
+    is sorted by time, so "active at t" and "overlapping [a, b]" are bisects.
+    Times are naive datetimes in the same frame as the birth time (local).
+    """
+    LEVELS = ("maha", "antar", "pratyantar")
+    EPOCH = datetime(1970, 1, 1)
+    DAYS_PER_YEAR = 365.2425
+    TOTAL_YEARS = 120.0
+
+    def __init__(self, cycle_start, ruler_index, cycles=15):
+        self.cycle_start = cycle_start
+        self.ruler_index = ruler_index
+        planets = VedicAstroEngine.DASHA_PLANETS
+
+        origin = self._to_days(cycle_start)
+        self.starts = {level: array('d') for level in self.LEVELS}
+        self.ends = {level: array('d') for level in self.LEVELS}
+        self.lords = {level: array('b') for level in self.LEVELS}
+
+        # (start, lord index, length in years) of the periods at the level above
+        parents = []
+        t = origin
+        for i in range(cycles):
+            idx = (ruler_index + i) % 9
+            years = planets[idx][1]
+            parents.append((t, idx, years))
+            t += years * self.DAYS_PER_YEAR
+        self._fill("maha", parents)
+
+        # Sub-periods run in dasha order from the parent's lord, each (parent * own) / 120 long
+        for level in self.LEVELS[1:]:
+            children = []
+            for start, idx, years in parents:
+                t = start
+                for j in range(9):
+                    s_idx = (idx + j) % 9
+                    s_years = years * planets[s_idx][1] / self.TOTAL_YEARS
+                    children.append((t, s_idx, s_years))
+                    t += s_years * self.DAYS_PER_YEAR
+            self._fill(level, children)
+            parents = children
+
+    def _fill(self, level, periods):
+        for start, idx, years in periods:
+            self.starts[level].append(start)
+            self.ends[level].append(start + years * self.DAYS_PER_YEAR)
+            self.lords[level].append(idx)
+
+    @classmethod
+    def _to_days(cls, when):
+        return (when - cls.EPOCH) / timedelta(days=1)
+
+    @classmethod
+    def _from_days(cls, days):
+        return cls.EPOCH + timedelta(days=days)
+
+    @classmethod
+    def from_moon(cls, moon_longitude, birth_dt, cycles=15):
+        """Tree for a birth moment from the Moon's sidereal longitude (balance of dasha at birth)."""
+        nak_span = 360 / 27
+        nak_index = int(moon_longitude // nak_span) % 27
+        ruler_index = nak_index % 9
+
+        total_years = VedicAstroEngine.DASHA_PLANETS[ruler_index][1]
+        traversed = moon_longitude - nak_index * nak_span
+        balance_years = ((nak_span - traversed) / nak_span) * total_years
+
+        cycle_start = birth_dt - timedelta(days=(total_years - balance_years) * cls.DAYS_PER_YEAR)
+        return cls(cycle_start, ruler_index, cycles=cycles)
+
+    def __len__(self):
+        return len(self.starts["maha"])
+
+    def period(self, level, index):
+        """Period `index` of `level` as {"planet", "start", "end", "level", "index"}."""
+        return {
+            "planet": VedicAstroEngine.DASHA_PLANETS[self.lords[level][index]][0],
+            "start": self._from_days(self.starts[level][index]),
+            "end": self._from_days(self.ends[level][index]),
+            "level": level,
+            "index": index
+        }
+
+    def active_index(self, when, level="maha"):
+        """Index of the period of `level` running at `when` (start <= when < end), or None."""
+        t = self._to_days(when)
+        i = bisect_right(self.starts[level], t) - 1
+        if i >= 0 and t < self.ends[level][i]:
+            return i
+        return None
+
+    def active(self, when, level="maha"):
+        i = self.active_index(when, level)
+        return self.period(level, i) if i is not None else None
+
+    def active_chain(self, when):
+        """{"maha": period, "antar": period, "pratyantar": period} at `when` (values None outside the tree)."""
+        return {level: self.active(when, level) for level in self.LEVELS}
+
+    def overlapping(self, start, end, level="maha"):
+        """Periods of `level` that overlap [start, end)."""
+        a, b = self._to_days(start), self._to_days(end)
+        first = bisect_right(self.ends[level], a)
+        last = bisect_left(self.starts[level], b)
+        return [self.period(level, i) for i in range(first, last)]
+
+    def parent_index(self, index):
+        return index // 9
@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import sqlite3
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DailyHoroscopeStore:
+    """
+    Precomputed sign-level daily horoscopes: the 12 signs x LANGS for a day,
+    plus the transit snapshot they were written from.
+
+    generate_day() is the batch job. It runs in a scheduler thread started at app
+    startup (HOROSCOPE_SCHEDULER=0 turns it off), or from cron via
+    `python -m services.horoscope_store [YYYY-MM-DD]`. get() serves
+    AstrologyAggregator.get_dynamic_horoscope, which only adds the per-profile
+    metrics. Memory tier per worker; SQLite tier at HOROSCOPE_DB shared by the
+    workers on the host (one of them claims the day's run). Without HOROSCOPE_DB
+    each worker runs the job for itself. Template entries are not held in the
+    memory tier when SQLite is shared, so every worker picks up a retry's AI text.
+
+    If the AI is unavailable the template horoscope is stored so the day is
+    covered; the next run (every HOROSCOPE_RETRY_SECONDS) retries those entries.
+    All entries of a day are generated from the same stored transit snapshot.
+    """
+    DB_PATH = os.getenv("HOROSCOPE_DB", "")
+    LANGS = tuple(l.strip() for l in os.getenv("HOROSCOPE_LANGS", "en,hi,es,fr").split(",") if l.strip())
+    RETRY_SECONDS = int(os.getenv("HOROSCOPE_RETRY_SECONDS", "1800"))
+    SCHEDULER_ENABLED = os.getenv("HOROSCOPE_SCHEDULER", "1") != "0"
+    WORKERS = 3  # concurrent LLM calls of a run; the provider rate limiter queues the rest
+    LOCATION = (51.5, 0.0)  # default transit location of /api/horoscope/{sign}
+    BATCH_CONTEXT = {"subscription_tier": "background"}  # queue behind user requests
+
+    _memory = {}
+    _snapshots = {}
+    _lock = threading.Lock()
+    _db_lock = threading.Lock()
+    _db_initialized = False
+    _scheduler = None
+    _stats = {"hits": 0, "misses": 0, "runs": 0, "generated": 0, "ai": 0, "template": 0}
+
+    @staticmethod
+    def _day(day=None):
+        if day is None:
+            return datetime.date.today().isoformat()
+        return day if isinstance(day, str) else day.isoformat()
+
+    # --- persistent tier ---
+
+    @classmethod
+    def _connect(cls):
+        conn = sqlite3.connect(cls.DB_PATH, timeout=5)
+        if not cls._db_initialized:
+            with cls._db_lock:
+                if not cls._db_initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS daily_horoscope ("
+                        "day TEXT, sign TEXT, lang TEXT, source TEXT, payload TEXT, created_at REAL, "
+                        "PRIMARY KEY (day, sign, lang))"
+                    )
+                    conn.execute("CREATE TABLE IF NOT EXISTS horoscope_transits (day TEXT PRIMARY KEY, payload TEXT)")
+                    conn.execute("CREATE TABLE IF NOT EXISTS horoscope_runs (day TEXT PRIMARY KEY, owner TEXT, started_at REAL)")
+                    conn.commit()
+                    cls._db_initialized = True
+        return conn
+
+    @classmethod
+    def _db(cls, sql, params=(), fetch=False):
+        if not cls.DB_PATH:
+            return None
+        try:
+            conn = cls._connect()
+            try:
+                cursor = conn.execute(sql, params)
+                if fetch:
+                    return cursor.fetchall()
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Horoscope store DB error: {e}")
+            return None
+
+    # --- lookups ---
+
+    @classmethod
+    def _memoize(cls, key, payload, source):
+        """
+        Keeps a payload in the memory tier. With the SQLite tier, template entries
+        are not kept: a retry may replace them from another worker, so they are
+        read from the database until the AI text is there.
+        """
+        from services.astrology_aggregator import AstrologyAggregator
+        with cls._lock:
+            if cls.DB_PATH and source == AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE:
+                cls._memory.pop(key, None)
+            else:
+                cls._memory[key] = payload
+
+    @classmethod
+    def get(cls, sign, lang="en", day=None):
+        """Stored horoscope (fresh copy) for the sign/language/day, or None."""
+        key = (cls._day(day), sign, lang)
+        with cls._lock:
+            payload = cls._memory.get(key)
+        if payload is None:
+            rows = cls._db("SELECT payload, source FROM daily_horoscope WHERE day = ? AND sign = ? AND lang = ?", key, fetch=True)
+            if rows:
+                payload = rows[0][0]
+                cls._memoize(key, payload, rows[0][1])
+        with cls._lock:
+            cls._stats["hits" if payload is not None else "misses"] += 1
+        return json.loads(payload) if payload is not None else None
+
+    @classmethod
+    def put(cls, sign, lang, day, value):
+        day = cls._day(day)
+        payload = json.dumps(value, ensure_ascii=False)
+        cls._memoize((day, sign, lang), payload, value.get("source", ""))
+        with cls._lock:
+            # Keep today and yesterday (requests around midnight)
+            oldest = (datetime.date.fromisoformat(day) - datetime.timedelta(days=1)).isoformat()
+            for old in [k for k in cls._memory if k[0] < oldest]:
+                del cls._memory[old]
+        cls._db(
+            "INSERT OR REPLACE INTO daily_horoscope (day, sign, lang, source, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (day, sign, lang, value.get("source", ""), payload, time.time())
+        )
+
+    @classmethod
+    def transit_snapshot(cls, day=None):
+        """Transit positions the day's horoscopes were generated from, or None."""
+        day = cls._day(day)
+        with cls._lock:
+            snapshot = cls._snapshots.get(day)
+        if snapshot is None:
+            rows = cls._db("SELECT payload FROM horoscope_transits WHERE day = ?", (day,), fetch=True)
+            if rows:
+                snapshot = json.loads(rows[0][0])
+                with cls._lock:
+                    cls._snapshots[day] = snapshot
+        return snapshot
+
+    @classmethod
+    def _compute_snapshot(cls, day):
+        from services.transit_cache import TransitCache
+        from services.kerykeion_engine import KerykeionService
+        from services.astrology_aggregator import AstrologyAggregator
+        lat, lng = cls.LOCATION
+        if day == datetime.date.today().isoformat():
+            chart = TransitCache.tropical_chart(lat, lng)
+        else:
+            d = datetime.date.fromisoformat(day)
+            chart = KerykeionService.calculate_chart("Transit", d.year, d.month, d.day, 12, 0, "Transit", lat, lng, timezone_str="UTC")
+        snapshot = {
+            "day": day,
+            "computed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "location": {"lat": lat, "lng": lng},
+            "planets": chart["planets"],
+            "aspects": AstrologyAggregator._calculate_aspects(chart["planets"]),
+        }
+        with cls._lock:
+            cls._snapshots = {day: snapshot}
+        cls._db("INSERT OR REPLACE INTO horoscope_transits (day, payload) VALUES (?, ?)", (day, json.dumps(snapshot)))
+        return snapshot
+
+    # --- batch job ---
+
+    @classmethod
+    def pending(cls, day=None):
+        """(sign, lang) pairs of the day that are missing or only have the template text."""
+        from services.astrology_aggregator import AstrologyAggregator
+        day = cls._day(day)
+        done = set()
+        rows = cls._db("SELECT sign, lang FROM daily_horoscope WHERE day = ? AND source != ?",
+                       (day, AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE), fetch=True)
+        if rows is not None:
+            done = set(rows)
+        else:
+            with cls._lock:
+                for (d, sign, lang), payload in cls._memory.items():
+                    if d == day and json.loads(payload).get("source") != AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE:
+                        done.add((sign, lang))
+        return [(sign, lang) for lang in cls.LANGS for sign in AstrologyAggregator.ZODIAC_ORDER if (sign, lang) not in done]
+
+    @classmethod
+    def _claim(cls, day):
+        """One worker per host runs a day's batch; a claim older than RETRY_SECONDS can be taken over."""
+        if not cls.DB_PATH:
+            return True
+        owner = f"{os.getpid()}-{threading.get_ident()}"
+        now = time.time()
+        if cls._db("INSERT OR IGNORE INTO horoscope_runs (day, owner, started_at) VALUES (?, ?, ?)", (day, owner, now)):
+            return True
+        taken = cls._db("UPDATE horoscope_runs SET owner = ?, started_at = ? WHERE day = ? AND started_at < ?",
+                        (owner, now, day, now - cls.RETRY_SECONDS))
+        return bool(taken)
+
+    @classmethod
+    def generate_day(cls, day=None, force=False):
+        """
+        Generates (or completes) the stored horoscopes of a day. Returns a summary;
+        skipped=True when everything was already there or another worker runs it.
+        """
+        from services.astrology_aggregator import AstrologyAggregator
+        day = cls._day(day)
+        todo = [(s, l) for l in cls.LANGS for s in AstrologyAggregator.ZODIAC_ORDER] if force else cls.pending(day)
+        if not todo or not cls._claim(day):
+            return {"day": day, "skipped": True, "pending": len(todo)}
+
+        started = time.perf_counter()
+        snapshot = (not force and cls.transit_snapshot(day)) or cls._compute_snapshot(day)
+        now = datetime.datetime.combine(datetime.date.fromisoformat(day), datetime.time(12, 0))
+
+        def generate(item):
+            sign, lang = item
+            payload = AstrologyAggregator.build_sign_horoscope(
+                sign, snapshot["planets"], lang=lang, context=dict(cls.BATCH_CONTEXT), now=now
+            )
+            cls.put(sign, lang, day, payload)
+            return payload.get("source") != AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE
+
+        with ThreadPoolExecutor(max_workers=cls.WORKERS, thread_name_prefix="horoscope-batch") as pool:
+            results = list(pool.map(generate, todo))
+
+        ai = sum(results)
+        with cls._lock:
+            cls._stats["runs"] += 1
+            cls._stats["generated"] += len(results)
+            cls._stats["ai"] += ai
+            cls._stats["template"] += len(results) - ai
+        elapsed = time.perf_counter() - started
+        print(f"Daily horoscopes {day}: {len(results)} generated ({ai} AI, {len(results) - ai} template) in {elapsed:.1f}s")
+        return {"day": day, "skipped": False, "generated": len(results), "ai": ai,
+                "template": len(results) - ai, "seconds": round(elapsed, 2)}
+
+    @classmethod
+    def start_scheduler(cls):
+        """Daemon thread: runs today's batch at startup and after midnight, retries incomplete days (idempotent)."""
+        if cls._scheduler is not None or not cls.SCHEDULER_ENABLED:
+            return
+
+        def loop():
+            time.sleep(15)  # let the worker finish starting up
+            while True:
+                try:
+                    cls.generate_day()
+                except Exception as e:
+                    print(f"Daily horoscope batch error: {e}")
+                now = datetime.datetime.now()
+                next_day = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(0, 1))
+                wait = (next_day - now).total_seconds()
+                if cls.pending():
+                    wait = min(wait, cls.RETRY_SECONDS)
+                time.sleep(max(30, wait))
+
+        cls._scheduler = threading.Thread(target=loop, name="horoscope-scheduler", daemon=True)
+        cls._scheduler.start()
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            return dict(cls._stats, size=len(cls._memory))
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._memory.clear()
+            cls._snapshots.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0
+        for table in ("daily_horoscope", "horoscope_transits", "horoscope_runs"):
+            cls._db(f"DELETE FROM {table}")
+
+
+if __name__ == "__main__":
+    import sys
+    days = [a for a in sys.argv[1:] if not a.startswith("--")]
+    print(DailyHoroscopeStore.generate_day(days[0] if days else None, force="--force" in sys.argv))
@@ -10,26 +10,29 @@ from pathlib import Path
 import json
 import random
 from services.skyfield_engine import SkyfieldService
+from services.timezone_service import TimezoneService
+from services.birth_instant import BirthInstant
 from services.svg_painter import SVGPainter
 
 class KerykeionService:
     @staticmethod
-    def calculate_chart(name: str, year: int, month: int, day: int, hour: int, minute: int, city: str, lat: float, lng: float, timezone_str: str = "Asia/Kolkata", lang: str = "en"):
+    def calculate_chart(name: str, year: int, month: int, day: int, hour: int, minute: int, city: str, lat: float, lng: float, timezone_str: str = "Asia/Kolkata", lang: str = "en", chart_context=None):
         """
         Calculates the natal chart using Kerykeion.
-        IRONCLAD TIMEZONE SAFETY: Enforces Asia/Kolkata for Indian coordinates.
+        IRONCLAD TIMEZONE SAFETY: Resolves the zone from the birth coordinates.
+        In Skyfield mode, a ChartContext (see VedicAstroEngine.get_chart_context) reuses its memoized positions.
         """
-        # IRONCLAD OVERRIDE: Strict geographical enforcement for India
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        if not timezone_str or str(timezone_str).upper() in ["UTC", "GMT", "NONE"]:
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
+        # IRONCLAD OVERRIDE: a missing zone (or UTC/GMT sent for an Indian birth place) becomes the local zone
+        timezone_str = TimezoneService.resolve_timezone(timezone_str, lat, lng, replace_utc=True)
         
         try:
             if MOCK_MODE:
-                planets = SkyfieldService.calculate_positions(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
+                instant = None
+                if chart_context is not None:
+                    planets = chart_context.tropical_positions()
+                else:
+                    instant = BirthInstant.resolve(year, month, day, hour, minute, lat, lng, timezone_str)
+                    planets = SkyfieldService.calculate_positions(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str, instant=instant)
                 
                 # Extract signs for summary
                 sun_sign = next(p['sign'] for p in planets if p['name'] == 'Sun')
@@ -39,7 +42,10 @@ class KerykeionService:
                 
                 # Calculate precise angles for Astrocartography
                 # CRITICAL: Must pass timezone_str to prevent incorrect default conversion
-                angles = SkyfieldService.calculate_angles(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
+                if chart_context is not None:
+                    angles = chart_context.angles()
+                else:
+                    angles = SkyfieldService.calculate_angles(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str, instant=instant)
 
                 return {
                     "sun_sign": sun_sign,
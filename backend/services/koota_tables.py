@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class KootaTables:
+    """
+    Ashta-Koota (Guna Milan) points for every bride/groom combination, built once
+    at import.
+
+    Guna Milan only depends on the two Moon nakshatras and rashis, so each koota
+    is a small table indexed [bride, groom]: 27x27 for the nakshatra kootas, 12x12
+    for the rashi kootas. TOTAL combines all eight over the 108 nakshatra quarters
+    (padas), which also fix the rashi, stored in half points as uint8 (~11 KB):
+    score() is one array read.
+
+    The rules are the ones of MatchingService._calc_* (test_koota_tables.py checks
+    every cell against them), written as array operations.
+    """
+    RASHIS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+              "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+    # (name, indexed by, max points) in Ashta-Koota order
+    KOOTAS = [
+        ("Varna", "rashi", 1), ("Vashya", "rashi", 2), ("Tara", "nakshatra", 3), ("Yoni", "nakshatra", 4),
+        ("Graha Maitri", "rashi", 5), ("Gana", "nakshatra", 6), ("Bhakoot", "rashi", 7), ("Nadi", "nakshatra", 8)
+    ]
+
+    # Attributes per rashi (Aries = 0) / nakshatra (Ashwini = 0)
+    VARNA_RANK = [3, 2, 1, 4, 3, 2, 1, 4, 3, 2, 1, 4]
+    VARNA_NAMES = {4: "Brahmin", 3: "Kshatriya", 2: "Vaishya", 1: "Shudra"}
+    VASHYA = [0, 0, 1, 2, 3, 1, 1, 4, 0, 0, 1, 2]
+    VASHYA_NAMES = ["Chatuspada", "Manav", "Jalchar", "Vanachar", "Keeta"]
+    LORDS = ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]
+    YONI = ["Horse", "Elephant", "Sheep", "Serpent", "Serpent", "Dog", "Cat", "Cat", "Rat", "Rat", "Cow", "Cow",
+            "Buffalo", "Buffalo", "Tiger", "Tiger", "Deer", "Deer", "Dog", "Monkey", "Monkey", "Elephant", "Lion",
+            "Lion", "Horse", "Sheep", "Monkey"]
+    YONI_ENEMIES = {"Snake": "Mongoose", "Rat": "Cat", "Lion": "Elephant", "Tiger": "Cow", "Horse": "Buffalo",
+                    "Dog": "Deer", "Monkey": "Sheep"}
+    GANA = [0, 1, 0, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 0, 0, 2, 2, 1, 1, 0]
+    GANA_NAMES = ["Deva", "Manushya", "Rakshasa"]
+    NADI = [0, 1, 2, 2, 1, 0, 0, 1, 2, 2, 1, 0, 0, 1, 2, 2, 1, 0, 0, 1, 2, 2, 1, 0, 0, 1, 2]
+    NADI_NAMES = ["Adi", "Madhya", "Antya"]
+
+    POINTS = {}   # koota name -> float32 [bride, groom] table
+    TOTAL = None  # uint8 [bride quarter, groom quarter], half points
+
+    @classmethod
+    def _build(cls):
+        rb, rg = np.meshgrid(np.arange(12), np.arange(12), indexing="ij")
+        nb, ng = np.meshgrid(np.arange(27), np.arange(27), indexing="ij")
+
+        varna = np.array(cls.VARNA_RANK)
+        vashya = np.array(cls.VASHYA)
+        same_vashya = vashya[rb] == vashya[rg]
+        one_vanachar = (vashya[rb] == 3) != (vashya[rg] == 3)
+
+        lords = np.array(cls.LORDS)
+        first, second = {"Sun", "Moon", "Mars", "Jupiter"}, {"Mercury", "Venus", "Saturn"}
+        in_first = np.isin(lords, list(first))
+        in_second = np.isin(lords, list(second))
+        mercury = lords == "Mercury"
+        same_group = (in_first[rb] & in_first[rg]) | (in_second[rb] & in_second[rg])
+        mercury_friend = (mercury[rg] & in_first[rb]) | (mercury[rb] & in_first[rg])
+
+        bhakoot_dist = (rg - rb) % 12 + 1
+        bhakoot_bad = np.isin(bhakoot_dist, [2, 12, 5, 9, 6, 8]) & (rb != rg)
+
+        def tara_ok(dist):
+            return ~np.isin(dist % 9 + 1, [3, 5, 7])
+        tara = (tara_ok((ng - nb) % 27).astype(float) * 1.5 + tara_ok((nb - ng) % 27) * 1.5).astype(int)
+
+        yoni_names = sorted(set(cls.YONI))
+        yoni = np.array([yoni_names.index(y) for y in cls.YONI])
+        enemies = np.zeros((len(yoni_names), len(yoni_names)), dtype=bool)
+        for a, b in cls.YONI_ENEMIES.items():
+            if a in yoni_names and b in yoni_names:
+                i, j = yoni_names.index(a), yoni_names.index(b)
+                enemies[i, j] = enemies[j, i] = True
+
+        gana = np.array(cls.GANA)
+        deva_manushya = np.isin(gana[nb], [0, 1]) & np.isin(gana[ng], [0, 1])
+        nadi = np.array(cls.NADI)
+
+        points = {
+            "Varna": (varna[rg] >= varna[rb]) * 1.0,
+            "Vashya": np.where(same_vashya, 2.0, np.where(one_vanachar, 0.0, 1.0)),
+            "Tara": tara * 1.0,
+            "Yoni": np.where(yoni[nb] == yoni[ng], 4.0, np.where(enemies[yoni[nb], yoni[ng]], 0.0, 2.0)),
+            "Graha Maitri": np.where(lords[rb] == lords[rg], 5.0,
+                                     np.where(same_group, 4.0, np.where(mercury_friend, 3.0, 0.5))),
+            "Gana": np.where(gana[nb] == gana[ng], 6.0, np.where(deva_manushya, 5.0, 1.0)),
+            "Bhakoot": np.where(bhakoot_bad, 0.0, 7.0),
+            "Nadi": np.where(nadi[nb] != nadi[ng], 8.0, 0.0)
+        }
+        cls.POINTS = {name: table.astype(np.float32) for name, table in points.items()}
+
+        # Nakshatra quarter q (0-107): nakshatra q // 4, pada q % 4 + 1, rashi q // 9
+        qb, qg = np.meshgrid(np.arange(108), np.arange(108), indexing="ij")
+        total = np.zeros((108, 108))
+        for name, kind, _ in cls.KOOTAS:
+            if kind == "nakshatra":
+                total += points[name][qb // 4, qg // 4]
+            else:
+                total += points[name][qb // 9, qg // 9]
+        cls.TOTAL = np.round(total * 2).astype(np.uint8)
+
+    @staticmethod
+    def quarter(nak, pada=1):
+        """Nakshatra quarter index (0-107) of a 0-based nakshatra and 1-based pada."""
+        return nak * 4 + (pada - 1)
+
+    @classmethod
+    def score(cls, b_nak, g_nak, b_pada=1, g_pada=1):
+        """
+        Total Guna Milan points for 0-based Moon nakshatras and 1-based padas
+        (the pada fixes the rashi of nakshatras that span two signs). Works
+        element-wise on numpy arrays too.
+        """
+        half = cls.TOTAL[cls.quarter(b_nak, b_pada), cls.quarter(g_nak, g_pada)]
+        return half / 2.0
+
+    @classmethod
+    def koota_points(cls, b_nak, b_rashi, g_nak, g_rashi):
+        """{koota name: points} for 0-based nakshatra/rashi indices (arrays allowed)."""
+        idx = {"nakshatra": (b_nak, g_nak), "rashi": (b_rashi, g_rashi)}
+        return {name: cls.POINTS[name][idx[kind]] for name, kind, _ in cls.KOOTAS}
+
+    @classmethod
+    def attributes(cls, nak, rashi):
+        """Koota attribute of one person per koota (Varna, Vashya, ... labels)."""
+        return {
+            "Varna": cls.VARNA_NAMES[cls.VARNA_RANK[rashi]],
+            "Vashya": cls.VASHYA_NAMES[cls.VASHYA[rashi]],
+            "Tara": "Nakshatra " + str(nak + 1),
+            "Yoni": cls.YONI[nak],
+            "Graha Maitri": cls.LORDS[rashi],
+            "Gana": cls.GANA_NAMES[cls.GANA[nak]],
+            "Bhakoot": cls.RASHIS[rashi],
+            "Nadi": cls.NADI_NAMES[cls.NADI[nak]]
+        }
+
+
+KootaTables._build()
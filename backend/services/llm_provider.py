@@ -0,0 +1,621 @@
+import os
+import copy
+import json
+import time
+import asyncio
+import hashlib
+import threading
+import concurrent.futures
+
+import httpx
+
+from services.rate_limiter import TokenBucketLimiter
+
+
+class LLMError(Exception):
+    """Every provider of a chain failed or the deadline ran out."""
+
+
+def parse_json_text(text):
+    """JSON object from a model answer, tolerating ```json fences and leading prose."""
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "{" in text:
+        text = text[text.find("{"):text.rfind("}") + 1]
+    return json.loads(text)
+
+
+def as_messages(prompt):
+    """Chat messages for a prompt given as text or as [{"role", "content"}, ...]."""
+    if isinstance(prompt, list):
+        return prompt
+    return [{"role": "user", "content": prompt}]
+
+
+def as_text(prompt):
+    """Single text prompt for providers without chat roles."""
+    if isinstance(prompt, list):
+        return "\n\n".join(f"{m['role'].upper()}: {m['content']}" if m['role'] != "system" else m['content'] for m in prompt)
+    return prompt
+
+
+def is_rate_limit_error(e):
+    """429 from Groq (RateLimitError) or Gemini (ResourceExhausted)."""
+    return getattr(e, "status_code", None) == 429 or getattr(e, "code", None) == 429 or \
+        type(e).__name__ in ("RateLimitError", "ResourceExhausted")
+
+
+def estimate_tokens(prompt):
+    """
+    Rough token count of a text or message-list prompt (~4 characters per token
+    plus a few per message), good enough for budgets without a tokenizer.
+    """
+    if isinstance(prompt, list):
+        return sum(estimate_tokens(m.get("content", "")) + 4 for m in prompt)
+    return (len(prompt or "") + 3) // 4
+
+
+class LLMProvider:
+    """
+    One model behind one API. complete() returns the answer text or raises;
+    stream() yields it in chunks. A prompt is text or a list of chat messages.
+    """
+    kind = "base"
+
+    def __init__(self, model):
+        self.model = model
+
+    def available(self):
+        return True
+
+    async def complete(self, prompt, json_mode=False, temperature=0.7, timeout=30.0):
+        raise NotImplementedError
+
+    async def stream(self, prompt, temperature=0.7, timeout=30.0):
+        yield await self.complete(prompt, temperature=temperature, timeout=timeout)
+
+    async def close(self):
+        pass
+
+    def __repr__(self):
+        return f"{self.kind}:{self.model}"
+
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions over one pooled httpx connection pool (shared by all Groq models)."""
+    kind = "groq"
+    MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+    _client = None
+    _http = None
+
+    def available(self):
+        return bool(os.getenv("GROQ_API_KEY"))
+
+    @classmethod
+    def _get_client(cls):
+        # Only ever touched from the LLMClient loop thread
+        if cls._client is None:
+            from groq import AsyncGroq
+            cls._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=cls.MAX_CONNECTIONS, max_keepalive_connections=cls.MAX_CONNECTIONS),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+            # Retries are the chain's job - a retrying SDK would eat the deadline
+            cls._client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=cls._http, max_retries=0)
+        return cls._client
+
+    async def complete(self, prompt, json_mode=False, temperature=0.7, timeout=30.0):
+        kwargs = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        response = await self._get_client().chat.completions.create(
+            messages=as_messages(prompt),
+            model=self.model,
+            temperature=temperature,
+            timeout=timeout,
+            **kwargs
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, prompt, temperature=0.7, timeout=30.0):
+        response = await self._get_client().chat.completions.create(
+            messages=as_messages(prompt),
+            model=self.model,
+            temperature=temperature,
+            timeout=timeout,
+            stream=True
+        )
+        async for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    async def close(self):
+        if GroqProvider._http is not None:
+            await GroqProvider._http.aclose()
+            GroqProvider._http = None
+            GroqProvider._client = None
+
+
+class GeminiProvider(LLMProvider):
+    kind = "gemini"
+
+    _configured = False
+
+    def available(self):
+        return bool(os.getenv("GEMINI_API_KEY"))
+
+    def _model(self):
+        import google.generativeai as genai
+        if not GeminiProvider._configured:
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            GeminiProvider._configured = True
+        return genai.GenerativeModel(self.model)
+
+    async def complete(self, prompt, json_mode=False, temperature=0.7, timeout=30.0):
+        response = await self._model().generate_content_async(
+            as_text(prompt),
+            generation_config={"temperature": temperature},
+            request_options={"timeout": timeout}
+        )
+        return response.text
+
+    async def stream(self, prompt, temperature=0.7, timeout=30.0):
+        response = await self._model().generate_content_async(
+            as_text(prompt),
+            generation_config={"temperature": temperature},
+            request_options={"timeout": timeout},
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline provider for tests and local runs (LLM_PROVIDER=stub).
+    reply: fixed text, or callable(prompt, json_mode) -> text. Default: a small
+    canned answer. delay simulates latency, fail makes every call raise,
+    chunk_delay spaces out streamed words.
+    """
+    kind = "stub"
+
+    def __init__(self, model="stub", reply=None, delay=0.0, fail=False, chunk_delay=0.0):
+        super().__init__(model)
+        self.reply = reply
+        self.delay = delay
+        self.fail = fail
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    async def complete(self, prompt, json_mode=False, temperature=0.7, timeout=30.0):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"stub {self.model} failure")
+        if callable(self.reply):
+            return self.reply(prompt, json_mode)
+        if self.reply is not None:
+            return self.reply
+        if json_mode:
+            return json.dumps({"stub": True, "model": self.model})
+        return f"[{self.model}] offline answer"
+
+    async def stream(self, prompt, temperature=0.7, timeout=30.0):
+        # delay applies before the first chunk (time to first token)
+        text = await self.complete(prompt, temperature=temperature, timeout=timeout)
+        for i, word in enumerate(text.split(" ")):
+            if i and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield word if i == 0 else " " + word
+
+
+class LLMClient:
+    """
+    Async LLM layer used by the ai_service generators.
+
+    CHAINS declares, per use case, which provider/model to try in order, the
+    total deadline for the whole chain, and whether to hedge: with hedging on,
+    if the current model has not answered within LLM_HEDGE_MS the next one is
+    started in parallel and the first good answer wins. A failed step moves to
+    the next one immediately. All calls run on one background event loop that
+    owns the pooled HTTP connections; sync code calls complete(), async code
+    awaits complete_async() or iterates stream_async().
+
+    Each provider/model with a RATE_LIMITS entry gets a token bucket
+    (LLM_RATE_LIMITS="kind:model=rpm,..." overrides). Calls wait for a slot in
+    priority order - paid tiers first, see priority_for() - and a step whose
+    queue is longer than the time left fails over like any other error.
+    Identical concurrent requests (same chain, mode and prompt) share one
+    in-flight call instead of each spending a slot.
+
+    Callers never wait longer than the chain deadline plus LLM_WAIT_GRACE_SECONDS,
+    and a forked child (compute pool) starts its own loop instead of waiting
+    on the parent's.
+    """
+    DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+    HEDGE_MS = int(os.getenv("LLM_HEDGE_MS", "6000"))
+    # Extra wait past the chain deadline before a caller gives up on the loop
+    WAIT_GRACE_SECONDS = float(os.getenv("LLM_WAIT_GRACE_SECONDS", "5"))
+    PROVIDER_MODE = os.getenv("LLM_PROVIDER", "").lower()
+
+    GROQ_70B = ("groq", "llama-3.3-70b-versatile")
+    GROQ_8B = ("groq", "llama-3.1-8b-instant")
+    GEMINI_FLASH = ("gemini", "gemini-1.5-flash")
+
+    CHAINS = {
+        # Long structured reports: best model first, fast model as hedge, Gemini last
+        "quality": {"steps": [GROQ_70B, GROQ_8B, GEMINI_FLASH], "deadline": 40, "hedge": True},
+        # Groq 70B only (generators that never used another model)
+        "groq": {"steps": [GROQ_70B], "deadline": 30, "hedge": False},
+        # Fast model first, 70B if it fails
+        "fast": {"steps": [GROQ_8B, GROQ_70B], "deadline": 30, "hedge": False},
+        # Interactive chat: short deadline, hedge to the fast model
+        "chat": {"steps": [GROQ_70B, GROQ_8B], "deadline": 20, "hedge": True},
+        # Kundali matching narrative
+        "match": {"steps": [GROQ_70B, GEMINI_FLASH], "deadline": 25, "hedge": False},
+    }
+
+    PROVIDERS = {"groq": GroqProvider, "gemini": GeminiProvider, "stub": StubProvider}
+
+    # Requests per minute (free-tier API quotas)
+    RATE_LIMITS = {
+        "groq:llama-3.3-70b-versatile": 30,
+        "groq:llama-3.1-8b-instant": 30,
+        "gemini:gemini-1.5-flash": 15,
+    }
+    for _entry in filter(None, os.getenv("LLM_RATE_LIMITS", "").split(",")):
+        _name, _, _rpm = _entry.partition("=")
+        RATE_LIMITS[_name.strip()] = int(_rpm)
+
+    PRIORITY_PAID = 0
+    PRIORITY_FREE = 1
+    PRIORITY_BACKGROUND = 2  # batch jobs, prefetches
+    PAID_TIERS = ("paid", "premium", "pro")
+
+    _instances = {}
+    _override = None
+    _loop = None
+    _loop_lock = threading.Lock()
+    _limiters = {}
+    _inflight = {}
+    _stats = {"calls": 0, "succeeded": 0, "failed": 0, "hedged": 0, "failovers": 0, "coalesced": 0}
+
+    @classmethod
+    def priority_for(cls, tier):
+        """
+        Queue priority for a profile's subscription_tier (lower goes first).
+        "background" marks batch jobs, which queue behind every user.
+        """
+        tier = str(tier or "").lower()
+        if tier == "background":
+            return cls.PRIORITY_BACKGROUND
+        return cls.PRIORITY_PAID if tier in cls.PAID_TIERS else cls.PRIORITY_FREE
+
+    # --- providers ---
+
+    @classmethod
+    def set_provider_override(cls, provider):
+        """
+        Routes chain steps to test providers: a single provider for every step,
+        or {model name: provider} for some steps. None restores the real chains.
+        """
+        cls._override = provider
+
+    @classmethod
+    def _provider(cls, kind, model):
+        if isinstance(cls._override, dict):
+            if model in cls._override:
+                return cls._override[model]
+        elif cls._override is not None:
+            return cls._override
+        if cls.PROVIDER_MODE == "stub":
+            kind = "stub"
+        key = (kind, model)
+        if key not in cls._instances:
+            cls._instances[key] = cls.PROVIDERS[kind](model)
+        return cls._instances[key]
+
+    @classmethod
+    def providers(cls, chain):
+        seen, providers = set(), []
+        for kind, model in cls.CHAINS[chain]["steps"]:
+            p = cls._provider(kind, model)
+            if p.available() and id(p) not in seen:
+                seen.add(id(p))
+                providers.append(p)
+        return providers
+
+    @classmethod
+    def available(cls, chain="quality"):
+        return bool(cls.providers(chain))
+
+    @classmethod
+    def signature(cls, chain):
+        """Models of a chain, for cache keys."""
+        return "+".join(model for _, model in cls.CHAINS[chain]["steps"])
+
+    # --- chain execution ---
+
+    @classmethod
+    def _limiter(cls, provider):
+        key = repr(provider)
+        limiter = cls._limiters.get(key)
+        if limiter is None and key in cls.RATE_LIMITS:
+            limiter = cls._limiters[key] = TokenBucketLimiter(key, cls.RATE_LIMITS[key])
+        return limiter
+
+    @classmethod
+    async def _acquire(cls, provider, priority, timeout):
+        """Waits for the provider's rate limit slot; returns the time left of timeout."""
+        limiter = cls._limiter(provider)
+        if limiter is None:
+            return timeout
+        started = time.monotonic()
+        await limiter.acquire(priority, timeout)
+        return max(0.1, timeout - (time.monotonic() - started))
+
+    @classmethod
+    def _note_failure(cls, provider, e):
+        limiter = cls._limiter(provider)
+        if limiter is not None and is_rate_limit_error(e):
+            limiter.penalize()
+
+    @classmethod
+    async def _attempt(cls, provider, prompt, json_mode, temperature, timeout, priority=1):
+        timeout = await cls._acquire(provider, priority, timeout)
+        try:
+            text = await asyncio.wait_for(
+                provider.complete(prompt, json_mode=json_mode, temperature=temperature, timeout=timeout),
+                timeout
+            )
+        except Exception as e:
+            cls._note_failure(provider, e)
+            raise
+        # A malformed JSON answer counts as a failure so the chain moves on
+        return parse_json_text(text) if json_mode else text
+
+    @classmethod
+    def _plan(cls, chain, deadline, hedge_ms):
+        spec = cls.CHAINS[chain]
+        providers = cls.providers(chain)
+        if not providers:
+            raise LLMError(f"No LLM provider configured for chain '{chain}'")
+        deadline = deadline or spec.get("deadline", cls.DEADLINE_SECONDS)
+        if hedge_ms is None:
+            hedge_ms = cls.HEDGE_MS if spec.get("hedge") else 0
+        cls._stats["calls"] += 1
+        return providers, deadline, hedge_ms
+
+    @classmethod
+    async def _race(cls, chain, providers, attempt, deadline, hedge_ms):
+        """
+        Runs attempt(provider, timeout) down the chain: next step on failure,
+        or in parallel once the current one is hedge_ms late. First success wins.
+        """
+        end = time.monotonic() + deadline
+        pending = {}
+        errors = []
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            provider = providers[next_index]
+            next_index += 1
+            remaining = max(0.1, end - time.monotonic())
+            task = asyncio.ensure_future(attempt(provider, remaining))
+            pending[task] = provider
+
+        launch()
+        try:
+            while pending:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                can_hedge = hedge_ms > 0 and next_index < len(providers)
+                wait = min(remaining, hedge_ms / 1000.0) if can_hedge else remaining
+                done, _ = await asyncio.wait(list(pending), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if can_hedge:
+                        cls._stats["hedged"] += 1
+                        print(f"LLM hedge ({chain}): {providers[next_index]} after {hedge_ms} ms")
+                        launch()
+                        continue
+                    break
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        cls._stats["succeeded"] += 1
+                        return task.result()
+                    errors.append(f"{provider}: {task.exception()!r}")
+                    print(f"LLM {provider} failed ({chain}): {task.exception()!r}")
+
+                if not pending and next_index < len(providers):
+                    cls._stats["failovers"] += 1
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        cls._stats["failed"] += 1
+        reason = "; ".join(errors) if errors else f"deadline of {deadline}s exceeded"
+        raise LLMError(f"LLM chain '{chain}' failed: {reason}")
+
+    @classmethod
+    async def _run(cls, prompt, chain, json_mode, temperature, deadline, hedge_ms, priority=1):
+        """
+        Single-flight wrapper around the chain: a request identical to one in
+        flight waits for that call's answer (its own copy) instead of a new one.
+        """
+        key = hashlib.sha256(json.dumps([chain, json_mode, temperature, prompt], sort_keys=True).encode("utf-8")).hexdigest()
+        task = cls._inflight.get(key)
+        if task is not None:
+            cls._stats["coalesced"] += 1
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(cls._run_chain(prompt, chain, json_mode, temperature, deadline, hedge_ms, priority))
+        cls._inflight[key] = task
+        task.add_done_callback(lambda _: cls._inflight.pop(key, None))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    @classmethod
+    async def _run_chain(cls, prompt, chain, json_mode, temperature, deadline, hedge_ms, priority):
+        providers, deadline, hedge_ms = cls._plan(chain, deadline, hedge_ms)
+
+        async def attempt(provider, timeout):
+            return await cls._attempt(provider, prompt, json_mode, temperature, timeout, priority)
+
+        return await cls._race(chain, providers, attempt, deadline, hedge_ms)
+
+    @classmethod
+    async def _run_stream(cls, emit, prompt, chain, temperature, deadline, hedge_ms, priority=1):
+        """
+        Streams the answer through emit(chunk). The chain races for the first
+        chunk (failover / hedging as in _race); once a provider has produced
+        text the answer is committed to it.
+        """
+        providers, deadline, hedge_ms = cls._plan(chain, deadline, hedge_ms)
+        end = time.monotonic() + deadline
+
+        async def open_stream(provider, timeout):
+            timeout = await cls._acquire(provider, priority, timeout)
+            chunks = provider.stream(prompt, temperature=temperature, timeout=timeout)
+            try:
+                first = await asyncio.wait_for(chunks.__anext__(), timeout)
+            except Exception as e:
+                cls._note_failure(provider, e)
+                raise
+            return chunks, first
+
+        chunks, first = await cls._race(chain, providers, open_stream, deadline, hedge_ms)
+        emit(first)
+        async for chunk in chunks:
+            if time.monotonic() > end:
+                raise LLMError(f"LLM chain '{chain}' stream exceeded its deadline of {deadline}s")
+            emit(chunk)
+
+    # --- entry points ---
+
+    @classmethod
+    def _get_loop(cls):
+        with cls._loop_lock:
+            if cls._loop is None or cls._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+    @classmethod
+    def _after_fork(cls):
+        """
+        In a forked child (compute pool) the loop thread does not exist: drop the
+        loop and everything bound to it so the next call starts a fresh one.
+        """
+        cls._loop_lock = threading.Lock()
+        cls._loop = None
+        cls._inflight = {}
+        cls._limiters = {}
+        GroqProvider._client = None
+        GroqProvider._http = None
+
+    @classmethod
+    def _wait_seconds(cls, chain, deadline):
+        """How long a caller waits for the loop: the chain deadline plus a grace period."""
+        return (deadline or cls.CHAINS[chain].get("deadline", cls.DEADLINE_SECONDS)) + cls.WAIT_GRACE_SECONDS
+
+    @classmethod
+    def complete(cls, prompt, chain="quality", json_mode=False, temperature=0.7, deadline=None, hedge_ms=None,
+                 priority=PRIORITY_FREE):
+        """
+        Blocking call. Returns the answer text (or the parsed object with
+        json_mode=True) from the first chain step that succeeds; raises LLMError.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            cls._run(prompt, chain, json_mode, temperature, deadline, hedge_ms, priority), cls._get_loop()
+        )
+        wait = cls._wait_seconds(chain, deadline)
+        try:
+            return future.result(timeout=wait)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            cls._stats["failed"] += 1
+            raise LLMError(f"LLM chain '{chain}' gave no answer within {wait}s")
+
+    @classmethod
+    async def complete_async(cls, prompt, chain="quality", json_mode=False, temperature=0.7, deadline=None, hedge_ms=None,
+                             priority=PRIORITY_FREE):
+        """complete() for async callers; runs on the shared LLM loop without blocking theirs."""
+        future = asyncio.run_coroutine_threadsafe(
+            cls._run(prompt, chain, json_mode, temperature, deadline, hedge_ms, priority), cls._get_loop()
+        )
+        wait = cls._wait_seconds(chain, deadline)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), wait)
+        except asyncio.TimeoutError:
+            cls._stats["failed"] += 1
+            raise LLMError(f"LLM chain '{chain}' gave no answer within {wait}s")
+
+    @classmethod
+    async def stream_async(cls, prompt, chain="chat", temperature=0.7, deadline=None, hedge_ms=None, priority=PRIORITY_FREE):
+        """
+        Async generator of answer chunks for async callers (e.g. an SSE response).
+        The provider stream runs on the LLM loop; chunks are handed over to the
+        caller's loop as they arrive. Raises LLMError if no provider answers.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def emit(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        async def produce():
+            try:
+                await cls._run_stream(lambda chunk: emit(("chunk", chunk)), prompt, chain, temperature, deadline, hedge_ms, priority)
+                emit(("done", None))
+            except Exception as e:
+                emit(("error", e))
+
+        future = asyncio.run_coroutine_threadsafe(produce(), cls._get_loop())
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "chunk":
+                    yield value
+                elif kind == "error":
+                    raise value if isinstance(value, LLMError) else LLMError(f"LLM stream failed: {value!r}")
+                else:
+                    return
+        finally:
+            # Consumer gone (client disconnected): stop reading from the provider
+            future.cancel()
+
+    @classmethod
+    def stats(cls):
+        return dict(cls._stats, limits={name: limiter.snapshot() for name, limiter in list(cls._limiters.items())})
+
+    @classmethod
+    def shutdown(cls):
+        """Closes pooled connections and stops the loop thread."""
+        with cls._loop_lock:
+            loop = cls._loop
+            cls._loop = None
+        if loop is None:
+            return
+        async def close_all():
+            await asyncio.gather(*[p.close() for p in cls._instances.values()], return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_all(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"LLM client shutdown error: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+# A compute process forked after the loop thread started must not reuse its loop
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=LLMClient._after_fork)
@@ -1,25 +1,32 @@
 from services.vedic_astro_engine import VedicAstroEngine
-from services.ai_service import client, model
-import json
+from services.llm_provider import LLMClient, LLMError
+from services.koota_tables import KootaTables
+import copy
 
 class MatchingService:
     @staticmethod
     def calculate_ashta_koota(bride_details, groom_details, lang="en"):
         """
-        Calculates Ashta-Koota points between bride and groom.
+        Calculates Ashta-Koota points between bride and groom, with the AI analysis.
         bride_details, groom_details: dicts with year, month, day, hour, minute, lat, lng, timezone
+        and optionally "snapshot" (a saved profile's precomputed chart, see ChartSnapshotService)
+        """
+        match_result, ai_inputs = MatchingService.calculate_match_data(bride_details, groom_details)
+        match_result["ai_analysis"] = MatchingService.generate_ai_analysis(**ai_inputs, lang=lang)
+        return match_result
+
+    @staticmethod
+    def calculate_match_data(bride_details, groom_details):
+        """
+        The computed part of calculate_ashta_koota (kootas, doshas, dasha, navamsa,
+        transits) without the AI analysis. Returns (match_result, ai_inputs):
+        match_result has "ai_analysis" set to None, ai_inputs are the keyword
+        arguments for generate_ai_analysis. Routes run this on the compute pool and
+        the AI call on the I/O pool, so a slow LLM never holds a chart worker.
         """
         # 1. Get Astrological Info for both
-        bride_astro = VedicAstroEngine.calculate_sidereal_planets(
-            bride_details['year'], bride_details['month'], bride_details['day'],
-            bride_details['hour'], bride_details['minute'], bride_details['lat'], bride_details['lng'],
-            timezone_str=bride_details.get('timezone', 'UTC')
-        )
-        groom_astro = VedicAstroEngine.calculate_sidereal_planets(
-            groom_details['year'], groom_details['month'], groom_details['day'],
-            groom_details['hour'], groom_details['minute'], groom_details['lat'], groom_details['lng'],
-            timezone_str=groom_details.get('timezone', 'UTC')
-        )
+        bride_astro = MatchingService._sidereal(bride_details)
+        groom_astro = MatchingService._sidereal(groom_details)
 
         def get_planet(astro_raw, name):
             for p in astro_raw['planets']:
@@ -34,57 +41,28 @@ class MatchingService:
             raise Exception("Moon position not found in calculations.")
 
         # Extract Indices
-        # Nakshatra Index (0-26)
-        b_nak_idx = MatchingService._get_nak_idx(b_moon['nakshatra']['name'])
-        g_nak_idx = MatchingService._get_nak_idx(g_moon['nakshatra']['name'])
+        # Nakshatra Index (0-26), straight from the engine's 1-based index
+        b_nak_idx = b_moon['nakshatra']['index'] - 1
+        g_nak_idx = g_moon['nakshatra']['index'] - 1
         
         # Rashi Index (0-11: Aries is 0)
-        rashis = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-        b_rashi_idx = rashis.index(b_moon['sign'])
-        g_rashi_idx = rashis.index(g_moon['sign'])
-
-        kootas = []
-        total_score = 0
-
-        # --- 1. VARNA (Max 1) ---
-        varna_points, b_varna, g_varna = MatchingService._calc_varna(b_rashi_idx, g_rashi_idx)
-        kootas.append({"name": "Varna", "significance": "Working personality & Ego", "bride_val": b_varna, "groom_val": g_varna, "points": varna_points, "max_points": 1})
-        total_score += varna_points
-
-        # --- 2. VASHYA (Max 2) ---
-        vashya_points, b_vashya, g_vashya = MatchingService._calc_vashya(b_rashi_idx, g_rashi_idx)
-        kootas.append({"name": "Vashya", "significance": "Dominance and Control", "bride_val": b_vashya, "groom_val": g_vashya, "points": vashya_points, "max_points": 2})
-        total_score += vashya_points
-
-        # --- 3. TARA (Max 3) ---
-        tara_points = MatchingService._calc_tara(b_nak_idx, g_nak_idx)
-        kootas.append({"name": "Tara", "significance": "Destiny and Luck", "bride_val": "Nakshatra " + str(b_nak_idx + 1), "groom_val": "Nakshatra " + str(g_nak_idx + 1), "points": tara_points, "max_points": 3})
-        total_score += tara_points
-
-        # --- 4. YONI (Max 4) ---
-        yoni_points, b_yoni, g_yoni = MatchingService._calc_yoni(b_nak_idx, g_nak_idx)
-        kootas.append({"name": "Yoni", "significance": "Physical & Intimate Compatibility", "bride_val": b_yoni, "groom_val": g_yoni, "points": yoni_points, "max_points": 4})
-        total_score += yoni_points
-
-        # --- 5. GRAHA MAITRI (Max 5) ---
-        maitri_points, b_lord, g_lord = MatchingService._calc_maitri(b_rashi_idx, g_rashi_idx)
-        kootas.append({"name": "Graha Maitri", "significance": "Mental and Intellectual Bond", "bride_val": b_lord, "groom_val": g_lord, "points": maitri_points, "max_points": 5})
-        total_score += maitri_points
-
-        # --- 6. GANA (Max 6) ---
-        gana_points, b_gana, g_gana = MatchingService._calc_gana(b_nak_idx, g_nak_idx)
-        kootas.append({"name": "Gana", "significance": "Temperament and Behavior", "bride_val": b_gana, "groom_val": g_gana, "points": gana_points, "max_points": 6})
-        total_score += gana_points
-
-        # --- 7. BHAKOOT (Max 7) ---
-        bhakoot_points = MatchingService._calc_bhakoot(b_rashi_idx, g_rashi_idx)
-        kootas.append({"name": "Bhakoot", "significance": "Emotional and Family Life", "bride_val": rashis[b_rashi_idx], "groom_val": rashis[g_rashi_idx], "points": bhakoot_points, "max_points": 7})
-        total_score += bhakoot_points
-
-        # --- 8. NADI (Max 8) ---
-        nadi_points, b_nadi, g_nadi = MatchingService._calc_nadi(b_nak_idx, g_nak_idx)
-        kootas.append({"name": "Nadi", "significance": "Health and Genetic Compatibility", "bride_val": b_nadi, "groom_val": g_nadi, "points": nadi_points, "max_points": 8})
-        total_score += nadi_points
+        rashis = KootaTables.RASHIS
+        b_rashi_idx = b_moon['sign_id'] - 1
+        g_rashi_idx = g_moon['sign_id'] - 1
+
+        # All eight kootas are lookups in the precomputed tables (services/koota_tables.py)
+        points = KootaTables.koota_points(b_nak_idx, b_rashi_idx, g_nak_idx, g_rashi_idx)
+        b_attrs = KootaTables.attributes(b_nak_idx, b_rashi_idx)
+        g_attrs = KootaTables.attributes(g_nak_idx, g_rashi_idx)
+        kootas = [{
+            "name": name,
+            "significance": MatchingService.KOOTA_SIGNIFICANCE[name],
+            "bride_val": b_attrs[name],
+            "groom_val": g_attrs[name],
+            "points": MatchingService._points(points[name]),
+            "max_points": max_points
+        } for name, _, max_points in KootaTables.KOOTAS]
+        total_score = sum(k['points'] for k in kootas)
 
         # Manglik Analysis
         b_manglik = MatchingService._is_manglik_check(bride_astro, get_planet)
@@ -126,17 +104,20 @@ class MatchingService:
                 'seventh_lord_dignity': seventh_lord_dignity
             }
         
-        bride_brief = prepare_brief(bride_astro, bride_details)
-        groom_brief = prepare_brief(groom_astro, groom_details)
-        
-        # AI Summary with enhanced context
-        ai_analysis = MatchingService.generate_ai_analysis(
-            bride_brief, groom_brief,
-            kootas, total_score, b_manglik, g_manglik, doshas,
-            dasha_sync, navamsa_compat, lang=lang
-        )
+        # Enhanced context for the AI summary (see generate_ai_analysis)
+        ai_inputs = {
+            "bride_brief": prepare_brief(bride_astro, bride_details),
+            "groom_brief": prepare_brief(groom_astro, groom_details),
+            "kootas": kootas,
+            "total_score": total_score,
+            "b_manglik": b_manglik,
+            "g_manglik": g_manglik,
+            "doshas": doshas,
+            "dasha_sync": dasha_sync,
+            "navamsa_compat": navamsa_compat
+        }
 
-        return {
+        match_result = {
             "total_score": total_score,
             "summary": MatchingService._get_static_summary(total_score),
             "koota_details": kootas,
@@ -156,12 +137,87 @@ class MatchingService:
             },
             "manglik_summary": MatchingService._get_manglik_summary(b_manglik, g_manglik),
             "doshas": doshas,
-            "ai_analysis": ai_analysis,
+            "ai_analysis": None,
             "dasha_synchronization": dasha_sync,
             "navamsa_compatibility": navamsa_compat,
             "transit_analysis": transit_analysis,
             "marriage_windows": marriage_windows
         }
+        return match_result, ai_inputs
+
+    KOOTA_SIGNIFICANCE = {
+        "Varna": "Working personality & Ego",
+        "Vashya": "Dominance and Control",
+        "Tara": "Destiny and Luck",
+        "Yoni": "Physical & Intimate Compatibility",
+        "Graha Maitri": "Mental and Intellectual Bond",
+        "Gana": "Temperament and Behavior",
+        "Bhakoot": "Emotional and Family Life",
+        "Nadi": "Health and Genetic Compatibility"
+    }
+
+    @staticmethod
+    def _points(value):
+        """Table value as the int/float the per-koota rules return (e.g. 5, 0.5)."""
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+    @staticmethod
+    def rank_candidates(base_details, candidates, base_role="bride", limit=None):
+        """
+        Guna Milan of one person against many candidates, best first.
+        base_details / candidates: details dicts as for calculate_ashta_koota (with
+        "snapshot" when available, and "profile_id" to identify candidates).
+        base_role: "bride" or "groom" - the role of base_details in every pair.
+        The base chart is computed once; the eight kootas are KootaTables lookups over
+        all candidates at once. No dasha, transit or AI analysis - run calculate_ashta_koota
+        on a chosen pair for the full report.
+        """
+        import numpy as np
+
+        def moon_of(details):
+            astro = MatchingService._sidereal(details)
+            moon = next(p for p in astro['planets'] if p['name'] == 'Moon')
+            manglik = MatchingService._is_manglik_check(astro, lambda a, name: next((p for p in a['planets'] if p['name'] == name), None))
+            return moon, manglik
+
+        base_moon, base_manglik = moon_of(base_details)
+        moons = [moon_of(c) for c in candidates]
+        if not moons:
+            return []
+
+        nak = np.array([m['nakshatra']['index'] - 1 for m, _ in moons])
+        rashi = np.array([m['sign_id'] - 1 for m, _ in moons])
+        base_nak = np.full(len(moons), base_moon['nakshatra']['index'] - 1)
+        base_rashi = np.full(len(moons), base_moon['sign_id'] - 1)
+        if base_role == "bride":
+            pairs = {"nakshatra": (base_nak, nak), "rashi": (base_rashi, rashi)}
+        else:
+            pairs = {"nakshatra": (nak, base_nak), "rashi": (rashi, base_rashi)}
+
+        points = KootaTables.koota_points(pairs["nakshatra"][0], pairs["rashi"][0], pairs["nakshatra"][1], pairs["rashi"][1])
+        totals = sum(points.values())
+
+        ranked = []
+        for i in np.argsort(-totals, kind="stable")[:limit]:
+            candidate = candidates[i]
+            moon, manglik = moons[i]
+            kootas = [{"name": name, "points": MatchingService._points(points[name][i]), "max_points": max_points}
+                      for name, _, max_points in KootaTables.KOOTAS]
+            total = MatchingService._points(totals[i])
+            ranked.append({
+                "profile_id": candidate.get('profile_id'),
+                "name": candidate.get('name'),
+                "total_score": total,
+                "summary": MatchingService._get_static_summary(total),
+                "koota_details": kootas,
+                "doshas": MatchingService._get_dosha_analysis(kootas),
+                "rashi": moon['sign'],
+                "nakshatra": moon['nakshatra']['name'],
+                "is_manglik": manglik['is_manglik'],
+                "manglik_summary": MatchingService._get_manglik_summary(base_manglik, manglik)
+            })
+        return ranked
 
     @staticmethod
     def _is_manglik_check(astro_data, find_func):
@@ -173,15 +229,8 @@ class MatchingService:
         status = "Manglik" if is_manglik else "Non-Manglik"
         return {"is_manglik": is_manglik, "status": status, "house": house}
 
-    @staticmethod
-    def _get_nak_idx(nak_name):
-        naks = [
-            "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-            "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-            "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishtha", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-        ]
-        return naks.index(nak_name) if nak_name in naks else 0
-
+    # Per-pair koota rules. KootaTables precomputes them for every combination;
+    # they stay here as the readable reference the tables are tested against.
     @staticmethod
     def _calc_varna(b_idx, g_idx):
         mapping = {3: 4, 7: 4, 11: 4, 0: 3, 4: 3, 8: 3, 1: 2, 5: 2, 9: 2, 2: 1, 6: 1, 10: 1}
@@ -354,26 +403,11 @@ IMPORTANT: Format each section header as plain bold text WITHOUT any special cha
 
 Answer:"""
 
-        # Try Groq first
-        if client:
-            try:
-                response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}], 
-                    model="llama-3.3-70b-versatile", 
-                    temperature=0.7,
-                    timeout=20 
-                )
-                return response.choices[0].message.content
-            except Exception as e:
-                print(f"Groq AI Match Error: {e}")
-
-        # Fallback to Gemini
-        if model:
-            try:
-                response = model.generate_content(prompt)
-                return response.text
-            except Exception as e:
-                print(f"Gemini AI Match Error: {e}")
+        # Groq first, Gemini as fallback
+        try:
+            return LLMClient.complete(prompt, chain="match")
+        except LLMError as e:
+            print(f"AI Match Error: {e}")
 
         # Rule-based fallback analysis
         return MatchingService._generate_fallback_analysis(
@@ -524,61 +558,56 @@ Answer:"""
         
         return "\n".join(analysis)
 
+    @staticmethod
+    def _sidereal(details):
+        """Sidereal chart for a bride/groom details dict, from its snapshot when it has one."""
+        if details.get('snapshot'):
+            return copy.deepcopy(details['snapshot']['sidereal'])
+        return VedicAstroEngine.calculate_sidereal_planets(
+            details['year'], details['month'], details['day'],
+            details['hour'], details['minute'], details['lat'], details['lng'],
+            timezone_str=details.get('timezone', 'UTC')
+        )
+
+    @staticmethod
+    def _dasha_tree(details):
+        """Shared Vimshottari DashaTree for a bride/groom details dict."""
+        from services.vedic_astro_engine import VedicAstroEngine
+        if details.get('snapshot'):
+            from services.chart_snapshot import ChartSnapshotService
+            return ChartSnapshotService.dasha_tree(details['snapshot'])
+        return VedicAstroEngine.get_dasha_tree(
+            details['year'], details['month'], details['day'],
+            details['hour'], details['minute'],
+            details['lat'], details['lng'],
+            timezone_str=details.get('timezone', 'Asia/Kolkata')
+        )
+
     @staticmethod
     def _analyze_dasha_synchronization(bride_astro, groom_astro, bride_details, groom_details):
         """Analyze Dasha period synchronization between bride and groom"""
         from datetime import datetime, timedelta
-        from services.vedic_astro_engine import VedicAstroEngine
         
         try:
-            # Calculate Dasha for both
+            # Shared dasha trees (memoized per chart) - current Mahadasha is a bisect, not a date-string scan
             print(f"Calculating Dasha for Bride: {bride_details.get('name', 'Unknown')}")
-            bride_dasha = VedicAstroEngine.calculate_vimshottari_dasha(
-                bride_details['year'], bride_details['month'], bride_details['day'],
-                bride_details['hour'], bride_details['minute'],
-                bride_details['lat'], bride_details['lng'],
-                timezone_str=bride_details.get('timezone', 'Asia/Kolkata')
-            )
-            
+            bride_tree = MatchingService._dasha_tree(bride_details)
             print(f"Calculating Dasha for Groom: {groom_details.get('name', 'Unknown')}")
-            groom_dasha = VedicAstroEngine.calculate_vimshottari_dasha(
-                groom_details['year'], groom_details['month'], groom_details['day'],
-                groom_details['hour'], groom_details['minute'],
-                groom_details['lat'], groom_details['lng'],
-                timezone_str=groom_details.get('timezone', 'Asia/Kolkata')
-            )
-            
-            print(f"Bride Dasha timeline count: {len(bride_dasha.get('timeline', []))}")
-            print(f"Groom Dasha timeline count: {len(groom_dasha.get('timeline', []))}")
-            
+            groom_tree = MatchingService._dasha_tree(groom_details)
+
+            def as_entry(period):
+                if not period:
+                    return None
+                return {
+                    "planet": period['planet'],
+                    "start": period['start'].strftime("%Y-%m-%d"),
+                    "end": period['end'].strftime("%Y-%m-%d")
+                }
+
             # Get current Mahadasha for both
             current_date = datetime.now()
-            bride_current = None
-            groom_current = None
-            
-            for d in bride_dasha.get('timeline', []):
-                if d.get('start') and d.get('end'):
-                    try:
-                        start_date = datetime.strptime(d['start'], '%Y-%m-%d')
-                        end_date = datetime.strptime(d['end'], '%Y-%m-%d')
-                        if start_date <= current_date <= end_date:
-                            bride_current = d
-                            break
-                    except Exception as e:
-                        print(f"Date parsing error for bride: {e}")
-                        continue
-            
-            for d in groom_dasha.get('timeline', []):
-                if d.get('start') and d.get('end'):
-                    try:
-                        start_date = datetime.strptime(d['start'], '%Y-%m-%d')
-                        end_date = datetime.strptime(d['end'], '%Y-%m-%d')
-                        if start_date <= current_date <= end_date:
-                            groom_current = d
-                            break
-                    except Exception as e:
-                        print(f"Date parsing error for groom: {e}")
-                        continue
+            bride_current = as_entry(bride_tree.active(current_date, "maha"))
+            groom_current = as_entry(groom_tree.active(current_date, "maha"))
             
             print(f"Bride current Dasha: {bride_current}")
             print(f"Groom current Dasha: {groom_current}")
@@ -616,9 +645,9 @@ Answer:"""
                 analysis.append(f"Groom: {g_planet} Dasha until {groom_current.get('end', 'N/A')}")
             else:
                 # If we can't find current Dasha, use the first available
-                if bride_dasha.get('timeline') and groom_dasha.get('timeline'):
-                    bride_current = bride_dasha['timeline'][0] if bride_dasha['timeline'] else None
-                    groom_current = groom_dasha['timeline'][0] if groom_dasha['timeline'] else None
+                if len(bride_tree) and len(groom_tree):
+                    bride_current = as_entry(bride_tree.period("maha", 0))
+                    groom_current = as_entry(groom_tree.period("maha", 0))
                     
                     if bride_current and groom_current:
                         b_planet = bride_current.get('planet', 'Unknown')
@@ -710,12 +739,9 @@ Answer:"""
         from services.vedic_astro_engine import VedicAstroEngine
         
         try:
-            # Get current transit positions
-            now = datetime.now()
-            transit_data = VedicAstroEngine.calculate_sidereal_planets(
-                now.year, now.month, now.day, now.hour, now.minute,
-                0, 0, timezone_str='UTC'  # Generic location for transits
-            )
+            # Get current transit positions (generic location, shared transit cache)
+            from services.transit_cache import TransitCache
+            transit_data = {"planets": TransitCache.sidereal_planets(0, 0)}
             
             analysis = []
             favorability_score = 5
@@ -764,26 +790,10 @@ Answer:"""
     def _calculate_marriage_windows(bride_astro, groom_astro, bride_details, groom_details):
         """Calculate auspicious marriage timing windows"""
         from datetime import datetime, timedelta
-        from services.vedic_astro_engine import VedicAstroEngine
         
         try:
-            # Calculate Dasha periods
-            bride_dasha = VedicAstroEngine.calculate_vimshottari_dasha(
-                bride_details['year'], bride_details['month'], bride_details['day'],
-                bride_details['hour'], bride_details['minute'],
-                bride_details['lat'], bride_details['lng'],
-                timezone_str=bride_details.get('timezone', 'Asia/Kolkata')
-            )
-            
-            groom_dasha = VedicAstroEngine.calculate_vimshottari_dasha(
-                groom_details['year'], groom_details['month'], groom_details['day'],
-                groom_details['hour'], groom_details['minute'],
-                groom_details['lat'], groom_details['lng'],
-                timezone_str=groom_details.get('timezone', 'Asia/Kolkata')
-            )
-            
-            # Beneficial planets for marriage
-            beneficial_planets = ['Venus', 'Jupiter', 'Mercury', 'Moon']
+            bride_tree = MatchingService._dasha_tree(bride_details)
+            groom_tree = MatchingService._dasha_tree(groom_details)
             
             # Find upcoming favorable periods (next 5 years)
             current_date = datetime.now()
@@ -795,33 +805,16 @@ Answer:"""
             # For simplicity, we use the standard benefics
             beneficial_planets = ['Venus', 'Jupiter', 'Mercury', 'Moon']
             
-            # Get full timelines including Antardashas if available
-            # Check if dasha has Antardashas (it should if calculated correctly)
-            bride_timeline = bride_dasha.get('timeline', [])
-            groom_timeline = groom_dasha.get('timeline', [])
+            def get_favorable_sub_periods(tree):
+                # Mahadashas overlapping the window, straight from the tree (datetimes, no parsing)
+                return [
+                    dict(p, level="Mahadasha")
+                    for p in tree.overlapping(current_date, max_future, "maha")
+                    if p['planet'] in beneficial_planets
+                ]
 
-            # Combine Mahadasha and Antardasha for more precision
-            # If the engine returns Antardashas in a nested way, we should flatten or handle them
-            
-            def get_favorable_sub_periods(dasha_data):
-                favorable = []
-                # Fallback if only Mahadashas are in timeline
-                for p in dasha_data.get('timeline', []):
-                    if p.get('planet') in beneficial_planets:
-                        try:
-                            f = {
-                                "planet": p['planet'],
-                                "start": datetime.strptime(p['start'], '%Y-%m-%d'),
-                                "end": datetime.strptime(p['end'], '%Y-%m-%d'),
-                                "level": "Mahadasha"
-                            }
-                            if f['end'] > current_date and f['start'] < max_future:
-                                favorable.append(f)
-                        except: continue
-                return favorable
-
-            bride_favorable = get_favorable_sub_periods(bride_dasha)
-            groom_favorable = get_favorable_sub_periods(groom_dasha)
+            bride_favorable = get_favorable_sub_periods(bride_tree)
+            groom_favorable = get_favorable_sub_periods(groom_tree)
 
             # Strategy: Find overlaps of favorable periods
             for bf in bride_favorable:
@@ -10,7 +10,8 @@ from services.phillips_interpretations import get_interpretation, get_karmic_les
 from services.hilary_numerology_service import HilaryNumerologyService
 from services.loshu_service import LoshuService
 
-from groq import Groq
+from services.llm_provider import LLMClient, LLMError
+from services.ai_cache import AIResponseCache
 
 # API Configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
@@ -20,6 +21,12 @@ RAPIDAPI_HOST = "numerology-api4.p.rapidapi.com"
 ROXY_API_KEY = os.getenv("ROXY_API_KEY", "")
 ROXY_API_BASE = "https://roxyapi.com/api/v1"
 
+def attach_ai_insights(data, ai_insights):
+    if ai_insights:
+        data["ai_insights"] = ai_insights
+        data["source"] = "groq-ai"
+        data["ai_model"] = "llama-3.3-70b-versatile"
+
 def generate_ai_insights(name, birth_date_str, numerology_data, loshu_data=None, vedic_data=None, western_data=None, context=None, lang="en"):
     """
     Generates personalized numerology insights using Groq AI.
@@ -56,8 +63,6 @@ def generate_ai_insights(name, birth_date_str, numerology_data, loshu_data=None,
 
     print(f"Generating insights using Groq API (Model: llama-3.3-70b-versatile)...")
     try:
-        client = Groq(api_key=GROQ_API_KEY)
-        
         # Context String
         ctx_str = ""
         if context:
@@ -130,16 +135,17 @@ def generate_ai_insights(name, birth_date_str, numerology_data, loshu_data=None,
         IMPORTANT: Provide the response in {lang} language.
         """
         
-        response = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-        )
-        return response.choices[0].message.content
+        def call_llm():
+            try:
+                tier = context.get('subscription_tier') if isinstance(context, dict) else None
+                return LLMClient.complete(prompt, chain="groq", temperature=1.0, priority=LLMClient.priority_for(tier))
+            except LLMError as e:
+                print(f"Groq API Error: {e}")
+                return None
+
+        # Repeat reports for the same profile reuse the cached answer
+        answer = AIResponseCache.cached("numerology_insights", LLMClient.signature("groq"), prompt, call_llm, lang=lang)
+        return answer if answer else get_fallback()
     except Exception as e:
         print(f"Groq API Error: {e}")
         return get_fallback()
@@ -273,10 +279,11 @@ def calculate_numerology_fallback(name, year, month, day):
     
     return result
 
-def get_numerology_data(name, year, month, day, vedic_data=None, western_data=None, context=None, lang="en", gender="male"):
+def get_numerology_data(name, year, month, day, vedic_data=None, western_data=None, context=None, lang="en", gender="male", include_ai_insights=True):
     """
     Get numerology data from external APIs with Phillips fallback
     Parallelized version to handle external API latency.
+    include_ai_insights=False leaves the AI reading to the caller (report bundle).
     """
     from concurrent.futures import ThreadPoolExecutor
     
@@ -316,16 +323,13 @@ def get_numerology_data(name, year, month, day, vedic_data=None, western_data=No
             data["science_of_success"] = None
         
         # Parallel Step 2: AI Insights (Dependent on previous results)
-        ai_insights = generate_ai_insights(
-            name, f"{year}-{month:02d}-{day:02d}", data,
-            loshu_data=loshu_data, vedic_data=vedic_data, 
-            western_data=western_data, context=context, lang=lang
-        )
-        
-        if ai_insights:
-            data["ai_insights"] = ai_insights
-            data["source"] = "groq-ai"
-            data["ai_model"] = "llama-3.3-70b-versatile"
+        if include_ai_insights:
+            ai_insights = generate_ai_insights(
+                name, f"{year}-{month:02d}-{day:02d}", data,
+                loshu_data=loshu_data, vedic_data=vedic_data, 
+                western_data=western_data, context=context, lang=lang
+            )
+            attach_ai_insights(data, ai_insights)
 
     return data
 
@@ -9,7 +9,8 @@ import io
 import os
 import math
 import html
-from services.chart_generator import ChartGenerator
+import time
+from services.report_figures import FigureBatch
 from reportlab.graphics.shapes import Drawing, PolyLine, Rect, String
 
 class PDFReportService:
@@ -91,7 +92,102 @@ class PDFReportService:
         canvas.restoreState()
 
     @staticmethod
-    def generate_pdf_report(report_data, lang="en"):
+    def _south_indian_planets(vedic_data, sign_map):
+        """D1 placements (plus Asc) in the sign_id form of the South Indian chart."""
+        si_planets = []
+        for p in vedic_data.get('planets') or []:
+            sign_name = p.get('sign', 'Aries')
+            sign_id = sign_map.get(sign_name, 1)
+            try:
+                pos = p.get('position')
+                degree = int(float(pos)) if pos is not None else 0
+            except (ValueError, TypeError):
+                degree = 0
+            si_planets.append({
+                "planet": p.get('name'),
+                "sign_id": sign_id,
+                "degree": f"{degree:02d}"
+            })
+
+        # Add Ascendant to South Indian too
+        asc_info = vedic_data.get('ascendant') or {}
+        asc_long = asc_info.get('longitude')
+        try:
+            asc_deg = int(float(asc_long or 0) % 30)
+        except (ValueError, TypeError):
+            asc_deg = 0
+        si_planets.append({
+            "planet": "Asc",
+            "sign_id": sign_map.get(asc_info.get('sign'), 1),
+            "degree": f"{asc_deg:02d}"
+        })
+        return si_planets
+
+    @staticmethod
+    def _navamsa_south_indian_planets(vedic_data, sign_map):
+        """D9 placements (plus the Navamsa Asc) in the sign_id form of the South Indian chart."""
+        d9_data = (vedic_data.get('divisional_charts') or {}).get('D9') or []
+        si_planets_d9 = []
+        for p in d9_data:
+            si_planets_d9.append({
+                "planet": p.get('name'),
+                "sign_id": sign_map.get(p.get('sign'), 1),
+                "degree": "00" # D9 signs are enough
+            })
+
+        # Navamsa Ascendant for SI
+        asc_lon = (vedic_data.get('ascendant') or {}).get('longitude') or 0
+        try:
+            asc_lon = float(asc_lon)
+        except (ValueError, TypeError):
+            asc_lon = 0
+        asc_sign_idx = int(asc_lon // 30) % 12
+        pos_in_sign = asc_lon % 30
+        pada = int(pos_in_sign / (30/9)) + 1
+        element_group = (asc_sign_idx) % 4
+        start_offsets = [0, 9, 6, 3]
+        nav_asc_sign_idx = (start_offsets[element_group] + (pada - 1)) % 12
+
+        si_planets_d9.append({
+            "planet": "Asc",
+            "sign_id": nav_asc_sign_idx + 1,
+            "degree": "00"
+        })
+        return si_planets_d9
+
+    @staticmethod
+    def _submit_report_figures(report_data, sign_map):
+        """Queues every chart image of the report at once (see FigureBatch)."""
+        figures = FigureBatch()
+        vedic_data = report_data.get('vedic_astrology') or {}
+        if vedic_data.get('planets'):
+            try:
+                figures.submit("lagna_north", "lagna_north", vedic_data)
+                figures.submit("lagna_south", "south", PDFReportService._south_indian_planets(vedic_data, sign_map))
+                figures.submit("navamsa_north", "navamsa_north", vedic_data.get('divisional_charts') or {})
+                figures.submit("navamsa_south", "south", PDFReportService._navamsa_south_indian_planets(vedic_data, sign_map))
+            except Exception as e:
+                print(f"Chart PDF figure setup error: {e}")
+        acg_data = report_data.get('astrocartography', [])
+        if acg_data:
+            figures.submit("astro_map", "astro_map", acg_data)
+        return figures
+
+    @staticmethod
+    def _log_timings(timings):
+        figures = ", ".join(f"{name} {t['render']:.2f}s" for name, t in timings["figures"].items())
+        print(f"PDF report: {timings['total']:.2f}s total (story {timings['story']:.2f}s, "
+              f"layout {timings['layout']:.2f}s incl. {timings['figure_wait']:.2f}s waiting on figures; "
+              f"figures: {figures or 'none'})")
+
+    @staticmethod
+    def generate_pdf_report(report_data, lang="en", timings=None):
+        """
+        Consolidated report PDF. Charts are vector drawings (or PNGs rendered in
+        parallel with the layout, see FigureBatch). Pass a dict as `timings` to
+        get the per-section timing (seconds) back.
+        """
+        started = time.perf_counter()
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
         
@@ -127,6 +223,9 @@ class PDFReportService:
             "Leo": 5, "Virgo": 6, "Libra": 7, "Scorpio": 8, 
             "Sagittarius": 9, "Capricorn": 10, "Aquarius": 11, "Pisces": 12
         }
+
+        # Chart images render in the compute pool while the rest is put together
+        figures = PDFReportService._submit_report_figures(report_data, sign_map)
         
         # --- Title Page ---
         story.append(Spacer(1, 2*inch))
@@ -164,43 +263,10 @@ class PDFReportService:
             story.append(Paragraph("Birth Charts (Lagna / D1)", styles['SectionHeader']))
             
             try:
-                # 1. Generate North Indian (Diamond) Chart
-                # This uses house positions relative to Ascendant
-                chart_ni_buf = ChartGenerator.generate_lagna_chart_north_indian(vedic_data)
-                img_ni = Image(chart_ni_buf, width=3.0*inch, height=3.0*inch)
-                
-                # 2. Generate South Indian (Square) Chart
-                # Re-map signs for South Indian
-                si_planets = []
-                for p in raw_planets:
-                    sign_name = p.get('sign', 'Aries')
-                    sign_id = sign_map.get(sign_name, 1)
-                    try:
-                        pos = p.get('position')
-                        degree = int(float(pos)) if pos is not None else 0
-                    except (ValueError, TypeError):
-                        degree = 0
-                    si_planets.append({
-                        "planet": p.get('name'),
-                        "sign_id": sign_id,
-                        "degree": f"{degree:02d}"
-                    })
-                
-                # Add Ascendant to South Indian too
-                asc_info = vedic_data.get('ascendant') or {}
-                asc_long = asc_info.get('longitude')
-                try:
-                    asc_deg = int(float(asc_long or 0) % 30)
-                except (ValueError, TypeError):
-                    asc_deg = 0
-                si_planets.append({
-                    "planet": "Asc",
-                    "sign_id": sign_map.get(asc_info.get('sign'), 1),
-                    "degree": f"{asc_deg:02d}"
-                })
-                
-                chart_si_buf = ChartGenerator.generate_south_indian_chart_image(si_planets)
-                img_si = Image(chart_si_buf, width=3.0*inch, height=3.0*inch)
+                # 1. North Indian (Diamond) Chart - house positions relative to Ascendant
+                img_ni = figures.image("lagna_north", 3.0*inch, 3.0*inch)
+                # 2. South Indian (Square) Chart - signs re-mapped
+                img_si = figures.image("lagna_south", 3.0*inch, 3.0*inch)
                 
                 # Layout in a table
                 visual_table = Table([[img_ni, img_si]], colWidths=[3.1*inch, 3.1*inch])
@@ -224,41 +290,9 @@ class PDFReportService:
                 story.append(Paragraph("Divisional Chart (Navamsa / D9)", styles['SectionHeader']))
                 
                 # 1. North Indian Navamsa (Diamond)
-                nav_ni_buf = ChartGenerator.generate_navamsa_chart_north_indian(vedic_data.get('divisional_charts') or {})
-                img_nav_ni = Image(nav_ni_buf, width=3.0*inch, height=3.0*inch)
-                
+                img_nav_ni = figures.image("navamsa_north", 3.0*inch, 3.0*inch)
                 # 2. South Indian Navamsa (Square)
-                # Map D9 planets for SI
-                d9_data = (vedic_data.get('divisional_charts') or {}).get('D9') or []
-                si_planets_d9 = []
-                for p in d9_data:
-                    si_planets_d9.append({
-                        "planet": p.get('name'),
-                        "sign_id": sign_map.get(p.get('sign'), 1),
-                        "degree": "00" # D9 signs are enough
-                    })
-                
-                # Navamsa Ascendant for SI
-                asc_lon = (vedic_data.get('ascendant') or {}).get('longitude') or 0
-                try:
-                    asc_lon = float(asc_lon)
-                except (ValueError, TypeError):
-                    asc_lon = 0
-                asc_sign_idx = int(asc_lon // 30) % 12
-                pos_in_sign = asc_lon % 30
-                pada = int(pos_in_sign / (30/9)) + 1
-                element_group = (asc_sign_idx) % 4
-                start_offsets = [0, 9, 6, 3]
-                nav_asc_sign_idx = (start_offsets[element_group] + (pada - 1)) % 12
-                
-                si_planets_d9.append({
-                    "planet": "Asc",
-                    "sign_id": nav_asc_sign_idx + 1,
-                    "degree": "00"
-                })
-
-                nav_si_buf = ChartGenerator.generate_south_indian_chart_image(si_planets_d9)
-                img_nav_si = Image(nav_si_buf, width=3.0*inch, height=3.0*inch)
+                img_nav_si = figures.image("navamsa_south", 3.0*inch, 3.0*inch)
                 
                 # Layout
                 nav_table = Table([[img_nav_ni, img_nav_si]], colWidths=[3.1*inch, 3.1*inch])
@@ -555,8 +589,7 @@ class PDFReportService:
             story.append(Paragraph("Locational Astrology (Astrocartography)", styles['CenterTitle']))
             
             # Map Image
-            map_buf = ChartGenerator.generate_astro_map_image(acg_data)
-            map_img = Image(map_buf, width=6*inch, height=3*inch)
+            map_img = figures.image("astro_map", 6*inch, 3*inch)
             story.append(map_img)
             story.append(Paragraph("Power Zones World Map", styles['NormalText']))
             story.append(Spacer(1, 0.2*inch))
@@ -684,8 +717,24 @@ class PDFReportService:
             if best_p:
                 story.append(Paragraph(html.escape(str(best_p)), styles['NormalText']))
 
-        doc.build(story, onFirstPage=PDFReportService._add_standard_branding, onLaterPages=PDFReportService._add_standard_branding)
+        story_done = time.perf_counter()
+        try:
+            doc.build(story, onFirstPage=PDFReportService._add_standard_branding, onLaterPages=PDFReportService._add_standard_branding)
+        finally:
+            figures.cancel()
         buffer.seek(0)
+
+        finished = time.perf_counter()
+        report_timings = {
+            "story": round(story_done - started, 3),
+            "layout": round(finished - story_done, 3),
+            "figure_wait": round(sum(t["waited"] for t in figures.timings.values()), 3),
+            "figures": figures.timings,
+            "total": round(finished - started, 3),
+        }
+        PDFReportService._log_timings(report_timings)
+        if timings is not None:
+            timings.update(report_timings)
         return buffer
 
     @staticmethod
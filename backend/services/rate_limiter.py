@@ -0,0 +1,97 @@
+import heapq
+import asyncio
+import itertools
+import time
+
+
+class RateLimited(Exception):
+    """No request slot within the time the caller can wait."""
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket for one provider/model: per_minute requests on average, up to
+    burst at once. Callers that find the bucket empty queue by priority (lower
+    value first, FIFO within a priority) and are let through as tokens refill.
+    A caller whose estimated wait exceeds its timeout is rejected right away,
+    so an LLM chain can fail over instead of sitting in the queue.
+
+    Lives on the LLM event loop (see LLMClient); not thread-safe by itself.
+    """
+
+    def __init__(self, name, per_minute, burst=None):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or max(1, per_minute // 2))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._timer = None
+        self.stats = {"granted": 0, "queued": 0, "rejected": 0, "throttled_by_provider": 0}
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _queue_length(self):
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def estimated_wait(self):
+        """Seconds until a request queued now would be let through."""
+        self._refill()
+        missing = self._queue_length() + 1 - self.tokens
+        return max(0.0, missing / self.rate)
+
+    async def acquire(self, priority=1, timeout=None):
+        self._refill()
+        if not self._queue_length() and self.tokens >= 1:
+            self.tokens -= 1
+            self.stats["granted"] += 1
+            return
+
+        if timeout is not None and self.estimated_wait() > timeout:
+            self.stats["rejected"] += 1
+            raise RateLimited(f"{self.name}: rate limit, ~{self.estimated_wait():.1f}s queue")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.stats["queued"] += 1
+        self._schedule()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise RateLimited(f"{self.name}: no slot within {timeout:.1f}s")
+        self.stats["granted"] += 1
+
+    def _schedule(self):
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+
+    def _drain(self):
+        self._timer = None
+        self._refill()
+        while self._waiters and self.tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # timed out or cancelled while waiting
+                continue
+            self.tokens -= 1
+            future.set_result(True)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule()
+
+    def penalize(self):
+        """Provider answered 429: spend the bucket so queued calls back off."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+        self.stats["throttled_by_provider"] += 1
+
+    def snapshot(self):
+        tokens = min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate)
+        return dict(self.stats, tokens=round(tokens, 2), queued_now=self._queue_length(),
+                    per_minute=round(self.rate * 60, 1), burst=self.capacity)
@@ -0,0 +1,136 @@
+import io
+import os
+import time
+import threading
+
+from reportlab.platypus import Flowable
+from reportlab.lib.utils import ImageReader
+
+from services.compute_dispatcher import ComputeDispatcher
+
+
+def render_figure(kind, data):
+    # matplotlib is only imported when a PNG figure is actually needed
+    from services.chart_generator import render_figure as render_png
+    return render_png(kind, data)
+
+
+class FigureBatch:
+    """
+    The chart figures of one PDF report.
+
+    By default (PDF_CHART_FORMAT=vector) each figure is a ReportLab Drawing
+    from services/vector_charts.py, built when the story asks for it - vector
+    paths and text, no matplotlib, cheap enough to build inline. A figure the
+    vector renderer fails on falls back to its PNG.
+
+    With PDF_CHART_FORMAT=png the matplotlib PNGs are rendered concurrently.
+
+    All figures are submitted up front (submit) to the ComputeDispatcher
+    process pool - matplotlib is CPU-bound and holds the GIL, so threads would
+    not overlap - while the report keeps building its story. The story holds a
+    DeferredImage per figure, so doc.build lays out the pages before a chart
+    and only waits when it reaches one whose PNG is not ready yet.
+
+    With PDF_PARALLEL_FIGURES=false, COMPUTE_USE_PROCESSES=false (pyplot state
+    is not thread-safe) or inside a compute worker, figures are rendered inline
+    when they are drawn. A figure whose worker fails is rendered inline too; one
+    that cannot be rendered at all is drawn as a placeholder.
+
+    timings: per figure render time (in the worker) and the time the layout
+    waited for it, in seconds.
+    """
+    FORMAT = os.getenv("PDF_CHART_FORMAT", "vector").lower()
+    PARALLEL = os.getenv("PDF_PARALLEL_FIGURES", "true").lower() == "true"
+
+    def __init__(self):
+        self._jobs = {}
+        self._results = {}
+        self._lock = threading.Lock()
+        self.timings = {}
+
+    @classmethod
+    def parallel(cls):
+        from services.chart_worker import _IN_WORKER
+        return cls.PARALLEL and ComputeDispatcher.USE_PROCESSES and not _IN_WORKER
+
+    def submit(self, name, kind, data):
+        """Queues figure `name` (a FIGURE_RENDERERS kind with its input data)."""
+        future = None
+        if self.FORMAT != "vector" and self.parallel():
+            try:
+                future = ComputeDispatcher.submit_cpu(render_figure, kind, data)
+            except Exception as e:
+                print(f"PDF figure pool unavailable, rendering {name} inline: {e}")
+        self._jobs[name] = (kind, data, future)
+
+    def image(self, name, width, height):
+        """Flowable of the figure at the given size (a Drawing, or a DeferredImage for PNGs)."""
+        if name not in self._jobs:
+            raise KeyError(f"figure {name} was not submitted")
+        if self.FORMAT == "vector":
+            from services.vector_charts import VECTOR_RENDERERS
+            kind, data, _ = self._jobs[name]
+            started = time.perf_counter()
+            try:
+                drawing = VECTOR_RENDERERS[kind](data, width, height)
+                drawing.hAlign = 'CENTER'
+                with self._lock:
+                    self.timings[name] = {"render": round(time.perf_counter() - started, 3), "waited": 0.0}
+                return drawing
+            except Exception as e:
+                print(f"PDF figure {name}: vector chart failed, using the PNG: {e}")
+        return DeferredImage(self, name, width, height)
+
+    def result(self, name):
+        """PNG bytes of the figure (blocks until rendered), or None if it failed."""
+        with self._lock:
+            if name in self._results:
+                return self._results[name]
+        kind, data, future = self._jobs[name]
+        started = time.perf_counter()
+        png, seconds = None, 0.0
+        if future is not None:
+            try:
+                png, seconds = future.result()
+            except Exception as e:
+                print(f"PDF figure {name} failed in the compute pool, rendering inline: {e}")
+        if png is None:
+            try:
+                png, seconds = render_figure(kind, data)
+            except Exception as e:
+                print(f"PDF figure {name} could not be rendered: {e}")
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._results[name] = png
+            self.timings[name] = {"render": round(seconds, 3), "waited": round(waited, 3)}
+        return png
+
+    def cancel(self):
+        """Drops figures that were never drawn (report failed before layout)."""
+        for _, _, future in self._jobs.values():
+            if future is not None:
+                future.cancel()
+
+
+class DeferredImage(Flowable):
+    """Fixed-size image flowable whose PNG comes from a FigureBatch at draw time."""
+
+    def __init__(self, batch, name, width, height):
+        Flowable.__init__(self)
+        self.batch = batch
+        self.name = name
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        png = self.batch.result(self.name)
+        if png is None:
+            self.canv.setFont('Helvetica', 9)
+            self.canv.drawCentredString(self.drawWidth / 2, self.drawHeight / 2, "Chart unavailable")
+            return
+        self.canv.drawImage(ImageReader(io.BytesIO(png)), 0, 0, self.drawWidth, self.drawHeight, mask='auto')
@@ -1,9 +1,12 @@
 
 import os
 import math
+from functools import lru_cache
+import numpy as np
 from skyfield.api import load, Topos, Star
 from skyfield.api import load_file
 import datetime
+from services.birth_instant import BirthInstant
 
 class SkyfieldService:
     _ts = None
@@ -17,102 +20,100 @@ class SkyfieldService:
             # USE DE421 - balanced accuracy and size
             cls._planets = load('de421.bsp')
             
+    PLANETS_MAP = {
+        'Sun': 'sun',
+        'Moon': 'moon',
+        'Mercury': 'mercury',
+        'Venus': 'venus',
+        'Mars': 'mars',
+        'Jupiter': 'jupiter barycenter',
+        'Saturn': 'saturn barycenter',
+        'Uranus': 'uranus barycenter',
+        'Neptune': 'neptune barycenter',
+        'Pluto': 'pluto barycenter'
+    }
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _observer(cls, lat, lng):
+        """Topocentric observer, built once per location."""
+        cls._init_skyfield()
+        return cls._planets['earth'] + Topos(latitude_degrees=lat, longitude_degrees=lng)
+
+    @classmethod
+    def coverage_jd(cls):
+        """(start, end) Julian dates covered by every segment of the loaded ephemeris."""
+        cls._init_skyfield()
+        segments = cls._planets.spk.segments
+        return max(s.start_jd for s in segments), min(s.end_jd for s in segments)
+
+    @classmethod
+    def calculate_longitudes(cls, t, lat, lng, bodies=None):
+        """
+        Tropical apparent ecliptic longitudes (degrees) for many instants at once.
+        t may be a scalar or vector Skyfield Time (e.g. ts.utc(2024, 1, range(1, 366))).
+        Returns {planet_name: numpy array shaped like t}.
+        The observer position is computed once and shared by every body.
+        """
+        cls._init_skyfield()
+        observer = cls._observer(float(lat), float(lng)).at(t)
+        
+        names = bodies or cls.PLANETS_MAP.keys()
+        longitudes = {}
+        for name in names:
+            planet = cls._planets[cls.PLANETS_MAP[name]]
+            lon = observer.observe(planet).apparent().ecliptic_latlon()[1]
+            longitudes[name] = np.asarray(lon.degrees)
+        return longitudes
+
+    @classmethod
+    def calculate_equatorial(cls, t, bodies=None):
+        """
+        Geocentric apparent RA/Dec (degrees, equinox of date) for each body, plus
+        Greenwich apparent sidereal time in degrees. Location independent - this is
+        all the astrocartography line solver needs for every place on Earth.
+        Returns ({planet_name: (ra_deg, dec_deg)}, gast_deg).
+        """
+        cls._init_skyfield()
+        earth = cls._planets['earth'].at(t)
+
+        names = bodies or cls.PLANETS_MAP.keys()
+        coords = {}
+        for name in names:
+            planet = cls._planets[cls.PLANETS_MAP[name]]
+            ra, dec, _ = earth.observe(planet).apparent().radec(epoch='date')
+            coords[name] = (float(ra.hours) * 15.0, float(dec.degrees))
+        return coords, float(t.gast) * 15.0
+
     @classmethod
-    def calculate_positions(cls, year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+    def calculate_positions(cls, year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", instant=None):
         """
         Calculate planetary positions with IRONCLAD TIMEZONE SAFETY.
+        instant: an already resolved BirthInstant for these arguments (skips the zone work).
         """
         cls._init_skyfield()
         
-        # IRONCLAD OVERRIDE: Strict geographical enforcement for India
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        
-        # If timezone is UTC, we MUST respect it because it often comes from 
-        # internal engines that have already converted local time.
-        # We only override if it's None, empty, or a generic 'placeholder' UTC 
-        # that we suspect should be local.
-        is_generic_utc = str(timezone_str).upper() in ["NONE", ""]
-        
-        if is_generic_utc:
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
-        
-        # If timezone_str is 'UTC', we skip conversion logic
-        if str(timezone_str).upper() == "UTC":
-            u_year, u_month, u_day, u_hour, u_minute = year, month, day, hour, minute
-            is_converted = True
-        else:
-            is_converted = False
-        
-        if not is_converted:
-            import pytz
-            from datetime import datetime, timedelta
-            try:
-                local = datetime(year, month, day, hour, minute)
-                tz_name = str(timezone_str)
-                try:
-                    tz = pytz.timezone(tz_name)
-                except:
-                    # Fallback for Indian naming variants
-                    if "Kolkata" in tz_name or "Calcutta" in tz_name or is_india:
-                        tz = pytz.timezone("Asia/Kolkata")
-                    else:
-                        tz = pytz.UTC
-                        
-                local_dt = tz.localize(local)
-                utc_dt = local_dt.astimezone(pytz.UTC)
-                
-                # Use UTC components for Skyfield
-                u_year, u_month, u_day = utc_dt.year, utc_dt.month, utc_dt.day
-                u_hour, u_minute = utc_dt.hour, utc_dt.minute
-            except Exception as e:
-                # EMERGENCY MANUAL FALLBACK
-                if is_india:
-                    dt = datetime(year, month, day, hour, minute) - timedelta(hours=5, minutes=30)
-                    u_year, u_month, u_day, u_hour, u_minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
-                else:
-                    u_year, u_month, u_day, u_hour, u_minute = year, month, day, hour, minute
-                print(f"Skyfield timezone conversion emergency fallback for {timezone_str}")
+        # Local time -> UTC. A missing zone is resolved from the coordinates; an
+        # explicit UTC is respected (internal engines pass already converted times).
+        if instant is None:
+            instant = BirthInstant.resolve(year, month, day, hour, minute, lat, lng, timezone_str)
+        t = instant.time()
 
-        t = cls._ts.utc(u_year, u_month, u_day, u_hour, u_minute)
-        
-        earth = cls._planets['earth']
-        location = earth + Topos(latitude_degrees=lat, longitude_degrees=lng)
+        # Evaluate t and t+1h together: one vectorized pass gives positions,
+        # speed and retrograde for every body
+        t_pair = cls._ts.tt_jd([t.tt, t.tt + 1.0 / 24.0])
+        longitudes = cls.calculate_longitudes(t_pair, lat, lng)
         
         results = []
-        planets_map = {
-            'Sun': 'sun',
-            'Moon': 'moon',
-            'Mercury': 'mercury',
-            'Venus': 'venus',
-            'Mars': 'mars',
-            'Jupiter': 'jupiter barycenter',
-            'Saturn': 'saturn barycenter',
-            'Uranus': 'uranus barycenter',
-            'Neptune': 'neptune barycenter',
-            'Pluto': 'pluto barycenter'
-        }
-        
         signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
         
-        for name, key in planets_map.items():
-            planet = cls._planets[key]
-            astrometric = location.at(t).observe(planet)
-            
+        for name, lons in longitudes.items():
             # Ecliptic coordinates (Tropical)
-            from skyfield.constants import AU_KM
-            
-            lat_ecl, lon_ecl, dist = astrometric.apparent().ecliptic_latlon()
-            lon_deg = lon_ecl.degrees
+            lon_deg = float(lons[0])
             
             # 5. Check retrograde (Compare with position 1 hour later)
-            t2 = cls._ts.utc(u_year, u_month, u_day, u_hour + 1, u_minute)
-            pos2 = location.at(t2).observe(planet).apparent().ecliptic_latlon()[1].degrees
-            
             # Distance moved in 1 hour
-            diff = (pos2 - lon_deg + 180) % 360 - 180
+            diff = (float(lons[1]) - lon_deg + 180) % 360 - 180
             is_retrograde = diff < 0
             
             sign_idx = int(lon_deg // 30) % 12
@@ -163,61 +164,19 @@ class SkyfieldService:
         return results
 
     @classmethod
-    def calculate_angles(cls, year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+    def calculate_angles(cls, year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", instant=None):
         """
         Calculates Ascendant (AC), Midheaven (MC), Descendant (DC), and Imum Coeli (IC).
         Returns a dictionary of absolute degrees (0-360).
+        instant: an already resolved BirthInstant for these arguments (skips the zone work).
         """
         cls._init_skyfield()
         
-        # IRONCLAD OVERRIDE: Strict geographical enforcement for India
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        
-        # Smarter UTC detection
-        is_generic_utc = str(timezone_str).upper() in ["NONE", ""]
-        if is_generic_utc:
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
-        
-        # If timezone_str is 'UTC', skip conversion
-        if str(timezone_str).upper() == "UTC":
-            u_year, u_month, u_day, u_hour, u_minute = year, month, day, hour, minute
-            is_converted = True
-        else:
-            is_converted = False
-        
-        if not is_converted:
-            import pytz
-            from datetime import datetime, timedelta
-            try:
-                local = datetime(year, month, day, hour, minute)
-                tz_name = str(timezone_str)
-                try:
-                    tz = pytz.timezone(tz_name)
-                except:
-                    if "Kolkata" in tz_name or "Calcutta" in tz_name or is_india:
-                        tz = pytz.timezone("Asia/Kolkata")
-                    else:
-                        tz = pytz.UTC
-                        
-                local_dt = tz.localize(local)
-                utc_dt = local_dt.astimezone(pytz.UTC)
-                
-                # Use UTC components for Skyfield
-                u_year, u_month, u_day = utc_dt.year, utc_dt.month, utc_dt.day
-                u_hour, u_minute = utc_dt.hour, utc_dt.minute
-            except Exception as e:
-                # EMERGENCY MANUAL FALLBACK
-                if is_india:
-                    dt = datetime(year, month, day, hour, minute) - timedelta(hours=5, minutes=30)
-                    u_year, u_month, u_day, u_hour, u_minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
-                else:
-                    u_year, u_month, u_day, u_hour, u_minute = year, month, day, hour, minute
-                print(f"Skyfield angles timezone conversion emergency fallback for {timezone_str}")
-        
-        t = cls._ts.utc(u_year, u_month, u_day, u_hour, u_minute)
+        # Local time -> UTC. A missing zone is resolved from the coordinates; an
+        # explicit UTC is respected (internal engines pass already converted times).
+        if instant is None:
+            instant = BirthInstant.resolve(year, month, day, hour, minute, lat, lng, timezone_str)
+        t = instant.time()
         
         # 1. Calculate RAMC (Right Ascension of Midheaven)
         # RAMC = LST * 15 (sidereal time in degrees)
@@ -235,8 +194,6 @@ class SkyfieldService:
         # HIGH-PRECISION ASCENDANT CALCULATION
         # 1. Establish Frames and Times
         ts = cls._ts
-         # ensure t is a Time object
-        t = cls._ts.utc(u_year, u_month, u_day, u_hour, u_minute)
 
         # 2. define Earth and Topos
         earth = cls._planets['earth']
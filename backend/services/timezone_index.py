@@ -0,0 +1,138 @@
+import os
+import math
+import threading
+from functools import lru_cache
+import numpy as np
+
+
+class TimezoneIndex:
+    """
+    Offline coordinate -> IANA timezone lookup: timezone boundary polygons with
+    a lat/lng grid index and an even-odd point-in-polygon test.
+
+    Data: data/timezones.npz - the timezone-boundary-builder polygons
+    (OpenStreetMap contributors, ODbL), oceans included, simplified to ~1 km
+    (see build_timezone_data.py). Loaded lazily once per process. Each polygon
+    is registered in the CELL_DEG x CELL_DEG cells its bounding box overlaps,
+    so a lookup only tests the few polygons around the point.
+
+    A point in a sliver left between simplified borders takes the zone found
+    TOLERANCE away; the nautical zone (Etc/GMT+-N from the longitude) is the
+    last resort.
+    """
+    DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "timezones.npz")
+    CELL_DEG = 1.0
+
+    _loaded = False
+    _lock = threading.Lock()
+    zone_names = []
+    _poly_zone = None
+    _poly_bbox = None
+    _poly_rings = []
+    _cells = {}
+    tolerance = 0.01
+
+    @classmethod
+    def load(cls):
+        if cls._loaded:
+            return
+        with cls._lock:
+            if cls._loaded:
+                return
+            data = np.load(cls.DATA_PATH)
+            scale = float(data["scale"])
+            coords = data["coords"].astype(np.float64) / scale
+            offsets = data["ring_offsets"]
+            ring_counts = data["poly_rings"]
+
+            rings, bboxes = [], []
+            ring = 0
+            for count in ring_counts:
+                poly = [coords[offsets[r]:offsets[r + 1]] for r in range(ring, ring + count)]
+                ring += count
+                outer = poly[0]
+                bboxes.append((outer[:, 0].min(), outer[:, 0].max(), outer[:, 1].min(), outer[:, 1].max()))
+                # Ring as (x1, y1, x2, y2) edge columns for the vectorized crossing test
+                rings.append(np.concatenate([np.column_stack([r[:-1], r[1:]]) for r in poly]))
+
+            cls.zone_names = [str(z) for z in data["zone_names"]]
+            cls._poly_zone = data["poly_zone"]
+            cls._poly_bbox = np.array(bboxes)
+            cls._poly_rings = rings
+            cls.tolerance = float(data["tolerance"])
+
+            cells = {}
+            for i, (x0, x1, y0, y1) in enumerate(bboxes):
+                for a in range(cls._cell(y0, 90.0), cls._cell(y1, 90.0) + 1):
+                    for b in range(cls._cell(x0, 180.0), cls._cell(x1, 180.0) + 1):
+                        cells.setdefault((a, b), []).append(i)
+            # Smallest polygons first: an enclave is tested before the zone around it
+            area = (cls._poly_bbox[:, 1] - cls._poly_bbox[:, 0]) * (cls._poly_bbox[:, 3] - cls._poly_bbox[:, 2])
+            cls._cells = {key: sorted(idx, key=lambda i: area[i]) for key, idx in cells.items()}
+            cls._loaded = True
+            print(f"Timezone index loaded: {len(cls.zone_names)} zones, {len(rings)} polygons, {len(cls._cells)} cells")
+
+    @classmethod
+    def available(cls):
+        return os.path.exists(cls.DATA_PATH)
+
+    @classmethod
+    def _cell(cls, value, shift):
+        return int(math.floor((value + shift) / cls.CELL_DEG))
+
+    @classmethod
+    def _contains(cls, poly, lat, lng):
+        x0, x1, y0, y1 = cls._poly_bbox[poly]
+        if not (x0 <= lng <= x1 and y0 <= lat <= y1):
+            return False
+        edges = cls._poly_rings[poly]
+        ya, yb = edges[:, 1], edges[:, 3]
+        crosses = (ya > lat) != (yb > lat)
+        if not crosses.any():
+            return False
+        e = edges[crosses]
+        x_at = e[:, 0] + (lat - e[:, 1]) * (e[:, 2] - e[:, 0]) / (e[:, 3] - e[:, 1])
+        return bool(np.count_nonzero(x_at > lng) % 2)
+
+    @classmethod
+    def _lookup(cls, lat, lng):
+        cls.load()
+        for poly in cls._cells.get((cls._cell(lat, 90.0), cls._cell(lng, 180.0)), ()):
+            if cls._contains(poly, lat, lng):
+                return cls.zone_names[cls._poly_zone[poly]]
+        return None
+
+    @staticmethod
+    def nautical_zone(lng):
+        hours = int(round(lng / 15.0))
+        if hours == 0:
+            return "Etc/GMT"
+        # POSIX sign convention: Etc/GMT-5 is UTC+5
+        return f"Etc/GMT{'-' if hours > 0 else '+'}{abs(hours)}"
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _timezone_at(cls, lat, lng):
+        zone = cls._lookup(lat, lng)
+        if zone is None:
+            step = cls.tolerance * 1.5
+            for dlat, dlng in ((step, 0), (-step, 0), (0, step), (0, -step),
+                               (step, step), (step, -step), (-step, step), (-step, -step)):
+                zone = cls._lookup(min(90.0, max(-90.0, lat + dlat)), ((lng + dlng + 180.0) % 360.0) - 180.0)
+                if zone:
+                    break
+        return zone or cls.nautical_zone(lng)
+
+    @classmethod
+    def timezone_at(cls, lat, lng):
+        """IANA zone name at the coordinates (never None)."""
+        lat = min(90.0, max(-90.0, float(lat)))
+        lng = ((float(lng) + 180.0) % 360.0) - 180.0
+        # ~10 m resolution for the lookup cache
+        return cls._timezone_at(round(lat, 4), round(lng, 4))
+
+    @classmethod
+    def stats(cls):
+        info = cls._timezone_at.cache_info()
+        return {"loaded": cls._loaded, "zones": len(cls.zone_names), "polygons": len(cls._poly_rings),
+                "hits": info.hits, "misses": info.misses, "size": info.currsize}
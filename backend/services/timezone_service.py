@@ -1,114 +1,113 @@
-import requests
-from datetime import datetime
-import json
-import time
+from datetime import datetime, timedelta
+from services.timezone_index import TimezoneIndex
 
 class TimezoneService:
-    # Free API for MVP (Use Google in Production)
-    # Using open-meteo or similar usually require no key for low volume
-    
+    """
+    Timezone of a birth place and the UTC offset in force at the birth time.
+
+    The zone comes from the offline boundary index (services/timezone_index.py),
+    the offset from the tz database rules for that date, so historical DST and
+    zone changes are honoured. No network calls: safe to use from async routes
+    and from every chart engine, which all resolve zones through here.
+    """
+    INDIA_TZ = "Asia/Kolkata"
+
+    @staticmethod
+    def timezone_at(lat, lng):
+        """IANA zone at the coordinates ("UTC" if the boundary data is unavailable)."""
+        try:
+            return TimezoneIndex.timezone_at(lat, lng)
+        except Exception as e:
+            print(f"Timezone lookup failed: {e}")
+            return "UTC"
+
+    @staticmethod
+    def resolve_timezone(timezone_str, lat, lng, replace_utc=False):
+        """
+        Zone a chart should use: timezone_str as given, or the zone at lat/lng when
+        it is missing. With replace_utc an explicit UTC/GMT is also replaced inside
+        India, where older clients sent UTC for Indian birth times.
+        """
+        name = str(timezone_str or "").strip()
+        if name.upper() in ("", "NONE"):
+            return TimezoneService.timezone_at(lat, lng)
+        if replace_utc and name.upper() in ("UTC", "GMT"):
+            local = TimezoneService.timezone_at(lat, lng)
+            if local == TimezoneService.INDIA_TZ:
+                return local
+        return name
+
+    @staticmethod
+    def to_utc(year, month, day, hour, minute, lat, lng, timezone_str="UTC"):
+        """
+        Local time -> UTC components (year, month, day, hour, minute).
+        An unknown zone name falls back to the zone at lat/lng.
+        """
+        utc_dt = TimezoneService.to_utc_datetime(year, month, day, hour, minute, lat, lng, timezone_str)
+        return (utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute)
+
+    @staticmethod
+    def to_utc_datetime(year, month, day, hour, minute, lat, lng, timezone_str="UTC", second=0):
+        """
+        Local time -> naive UTC datetime, seconds included.
+        """
+        local = datetime(year, month, day, hour, minute, int(second))
+        if str(timezone_str).upper() == "UTC":
+            return local
+
+        import pytz
+        try:
+            try:
+                tz = pytz.timezone(str(timezone_str))
+            except Exception:
+                tz = pytz.timezone(TimezoneService.timezone_at(lat, lng))
+            return tz.localize(local).astimezone(pytz.UTC).replace(tzinfo=None)
+        except Exception as e:
+            # EMERGENCY FALLBACK: tz database offset of the zone at the coordinates
+            print(f"Timezone conversion emergency fallback for {timezone_str} at {lat},{lng}: {e}")
+            try:
+                offset = TimezoneService.calculate_historical_offset(
+                    TimezoneService.timezone_at(lat, lng), year, month, day, hour, minute
+                )
+                return local - timedelta(seconds=offset)
+            except Exception:
+                return local
+
     @staticmethod
     def get_timezone_data(lat, lng, date_str, time_str):
         """
-        Get timezone ID and logical offset for a specific historical timestamp.
+        Timezone ID and the UTC offset (seconds) in force at a birth timestamp.
         input date_str: "YYYY-MM-DD"
-        input time_str: "HH:MM:SS"
+        input time_str: "HH:MM" or "HH:MM:SS"
         """
+        tz_id = TimezoneService.timezone_at(lat, lng)
         try:
-            # Construct ISO timestamp for lookup
-            # Many APIs take a timestamp or date string
-            # Using Open-Meteo or similar logic, or a direct lookup
-            
-            # Using a simplified approach for this environment where external calls might be flaky
-            # We will use 'requests' to a public time API if possible.
-            # http://worldtimeapi.org/ is current time, not historical.
-            
-            # Use specific timezone API or fallback to coordinate approximation
-            # Since user environment has limits, we will try to use a very simple mapping
-            # or rely on the frontend to pass the timezone ID if possible?
-            # No, requirement is Backend Logic.
-            
-            # Let's try to find if we can use 'timezonefinder' again? No it failed.
-            
-            # Fallback Algorithm: 
-            # 1. Ask external API (e.g. timeapi.io)
-            # 2. Return UTC if fails
-            
-            dt_str = f"{date_str} {time_str}"
-            
-            # API: TimeAPI.io (Free, supports coord lookup)
-            # POST https://timeapi.io/api/TimeZone/coordinate
-            
-            url = "https://timeapi.io/api/TimeZone/coordinate"
-            payload = {
-                "latitude": lat,
-                "longitude": lng
-            }
-            
-            # Note: This gives CURRENT timezone rules usually, but mostly IDs don't change location.
-            # We get the ID, then we calculate offset?
-            # Actually proper astrology needs historical offset using 'pytz' or 'zoneinfo'
-            
-            # Since 'pytz' is missing, we must rely on the API returning the offset OR
-            # we accept we might be slightly off for historical DST if we can't pip install.
-            # REQUIRED: "The Solution: ... Use a library ... This is the #1 place where apps fail".
-            
-            # Decision: I will assume standard 'zoneinfo' is available in Python 3.9+ 
-            # If not, I will add a mock-implementation for the MVP that returns standard offsets.
-            
-            headers = {'Content-Type': 'application/json'}
-            response = requests.post(url, json=payload, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                tz_id = data.get("timeZone")
-                
-                # Now get historical offset?
-                # Without library, hard.
-                # We will return the ID and current offset as approximation for MVP
-                # UNLESS we can calculate it.
-                
-                current_offset = data.get("currentUtcOffset", {}).get("seconds", 0)
-                
-                return {
-                    "timezone_id": tz_id,
-                    "utc_offset": current_offset, # Warning: This is current offset, not historical
-                    "source": "TimeAPI"
-                }
-                
-        except Exception as e:
-            print(f"Timezone lookup failed: {e}")
-            
-        # Fallback Algorithm: If coordinates are roughly in India, use Asia/Kolkata
-        # India bounds approx: Lat 6 to 38, Lng 68 to 98
-        if 6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0:
-            return {
-                "timezone_id": "Asia/Kolkata",
-                "utc_offset": 19800,
-                "source": "Geo-Fallback (India)"
-            }
-            
-        # Fallback defaults
+            year, month, day = (int(v) for v in str(date_str).split("-")[:3])
+            hour, minute = (int(v) for v in str(time_str).split(":")[:2])
+            offset = TimezoneService.calculate_historical_offset(tz_id, year, month, day, hour, minute)
+        except ValueError as e:
+            print(f"Timezone offset: bad date/time {date_str} {time_str}: {e}")
+            offset = 0
         return {
-            "timezone_id": "UTC",
-            "utc_offset": 0,
-            "source": "Fallback"
+            "timezone_id": tz_id,
+            "utc_offset": offset,
+            "source": "Offline index"
         }
 
     @staticmethod
     def calculate_historical_offset(timezone_id, year, month, day, hour, minute):
-        # If 'zoneinfo' available (Python 3.9+)
+        """UTC offset (seconds) of the zone at that local time; zoneinfo, then pytz."""
         try:
             from zoneinfo import ZoneInfo
-            dt = datetime(year, month, day, hour, minute)
-            tz = ZoneInfo(timezone_id)
-            offset = tz.utcoffset(dt)
+            offset = ZoneInfo(timezone_id).utcoffset(datetime(year, month, day, hour, minute))
             return int(offset.total_seconds())
-        except ImportError:
-            # Fallback for systems without zoneinfo
-            if timezone_id == "Asia/Kolkata":
-                return 19800
-            return 0
+        except Exception:
+            pass
+        try:
+            # e.g. Windows without the tzdata package
+            import pytz
+            local = pytz.timezone(timezone_id).localize(datetime(year, month, day, hour, minute))
+            return int(local.utcoffset().total_seconds())
         except Exception:
             if timezone_id == "Asia/Kolkata":
                 return 19800
@@ -0,0 +1,134 @@
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from services.chart_context import ChartContext
+
+
+class TransitCache:
+    """
+    Shared cache for "now" transit charts.
+
+    Transits are the same for every user for minutes at a time, so instead of a
+    Skyfield pass per request, "now" is snapped to a time bucket (start of the
+    current TRANSIT_BUCKET_SECONDS window, UTC) and the location to a grid cell of
+    TRANSIT_LOCATION_GRID degrees. Each (bucket, cell) gets one non-persistent
+    ChartContext. A background thread computes the next bucket for recently used
+    cells shortly before it starts, so requests at a boundary don't pay for it.
+    """
+    BUCKET_SECONDS = int(os.getenv("TRANSIT_BUCKET_SECONDS", "300"))
+    LOCATION_GRID = float(os.getenv("TRANSIT_LOCATION_GRID", "1.0"))
+    PREFETCH_SECONDS = 15
+
+    _contexts = {}
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0, "prefetched": 0}
+    _refresher = None
+
+    @classmethod
+    def _bucket(cls, now=None):
+        ts = now or time.time()
+        return int(ts // cls.BUCKET_SECONDS) * cls.BUCKET_SECONDS
+
+    @classmethod
+    def _location_class(cls, lat, lng):
+        grid = cls.LOCATION_GRID
+        return round(round(float(lat) / grid) * grid, 4), round(round(float(lng) / grid) * grid, 4)
+
+    @classmethod
+    def _build_context(cls, bucket, lat, lng):
+        from services.vedic_astro_engine import VedicAstroEngine
+        t = datetime.fromtimestamp(bucket, tz=timezone.utc)
+        utc = (t.year, t.month, t.day, t.hour, t.minute)
+        ayanamsa = VedicAstroEngine.calculate_ayanamsa(t.year, t.month, t.day)
+        return ChartContext(utc, lat, lng, ayanamsa, persistent=False)
+
+    @classmethod
+    def get_context(cls, lat=51.5, lng=0.0, now=None):
+        """ChartContext for the current bucket and location cell of (lat, lng)."""
+        bucket = cls._bucket(now)
+        cell = cls._location_class(lat, lng)
+        key = (bucket,) + cell
+        with cls._lock:
+            ctx = cls._contexts.get(key)
+            if ctx is not None:
+                cls._stats["hits"] += 1
+                return ctx
+            cls._stats["misses"] += 1
+            ctx = cls._build_context(bucket, *cell)
+            cls._contexts[key] = ctx
+            # Only the current and the prefetched next bucket are worth keeping
+            for old in [k for k in cls._contexts if k[0] < bucket]:
+                del cls._contexts[old]
+            return ctx
+
+    @classmethod
+    def sidereal_planets(cls, lat=51.5, lng=0.0):
+        """Current sidereal planets, as in VedicAstroEngine.calculate_sidereal_planets(...)['planets']."""
+        from services.vedic_astro_engine import VedicAstroEngine
+        ctx = cls.get_context(lat, lng)
+        return VedicAstroEngine.calculate_sidereal_planets(
+            *ctx.utc, ctx.lat, ctx.lng, timezone_str='UTC', chart_context=ctx
+        )['planets']
+
+    @classmethod
+    def tropical_chart(cls, lat=51.5, lng=0.0, name="Transit"):
+        """Current tropical chart, as returned by KerykeionService.calculate_chart."""
+        from services.kerykeion_engine import KerykeionService
+        ctx = cls.get_context(lat, lng)
+        return KerykeionService.calculate_chart(
+            name, *ctx.utc, "Transit", ctx.lat, ctx.lng, timezone_str='UTC', chart_context=ctx
+        )
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            return dict(cls._stats, size=len(cls._contexts))
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._contexts.clear()
+            for name in cls._stats:
+                cls._stats[name] = 0
+
+    @classmethod
+    def prefetch_next_bucket(cls, now=None):
+        """Computes the next bucket for every location cell used in the current one."""
+        now = now or time.time()
+        current = cls._bucket(now)
+        upcoming = current + cls.BUCKET_SECONDS
+        with cls._lock:
+            cells = {k[1:] for k in cls._contexts if k[0] == current}
+            cells.add(cls._location_class(51.5, 0.0))  # Greenwich chart for cosmic alerts
+            todo = [c for c in cells if (upcoming,) + c not in cls._contexts]
+
+        for cell in todo:
+            ctx = cls._build_context(upcoming, *cell)
+            try:
+                ctx.tropical_positions()
+            except Exception as e:
+                print(f"Transit prefetch error {cell}: {e}")
+                continue
+            with cls._lock:
+                cls._contexts.setdefault((upcoming,) + cell, ctx)
+                cls._stats["prefetched"] += 1
+
+    @classmethod
+    def start_background_refresh(cls):
+        """Starts the daemon thread that warms each bucket before it begins (idempotent)."""
+        if cls._refresher is not None:
+            return
+
+        def loop():
+            while True:
+                next_start = cls._bucket() + cls.BUCKET_SECONDS
+                time.sleep(max(1, next_start - cls.PREFETCH_SECONDS - time.time()))
+                try:
+                    cls.prefetch_next_bucket()
+                except Exception as e:
+                    print(f"Transit refresh error: {e}")
+                time.sleep(cls.PREFETCH_SECONDS + 1)
+
+        cls._refresher = threading.Thread(target=loop, name="transit-refresh", daemon=True)
+        cls._refresher.start()
@@ -0,0 +1,187 @@
+from reportlab.graphics.shapes import Drawing, Group, Rect, Line, String, Circle
+from reportlab.lib import colors
+
+from services.chart_layout import lagna_north_placements, navamsa_north_placements
+
+
+SHORT_NAMES = {
+    'Jupiter': 'Ju', 'Saturn': 'Sa', 'Mars': 'Ma', 'Mercury': 'Me', 'Venus': 'Ve',
+    'Rahu': 'Ra', 'Ketu': 'Ke', 'Ascendant': 'Asc', 'Lagna': 'Asc',
+    'Uranus': 'Ur', 'Neptune': 'Ne', 'Pluto': 'Pl',
+}
+
+
+def _short_name(name):
+    name = str(name or '')
+    return SHORT_NAMES.get(name, name if len(name) <= 2 or name == 'Asc' else name[:2])
+
+
+def _text_block(drawing, x, y, lines, font_size, font='Helvetica', color=colors.black, anchor='middle', valign='center'):
+    """Multi-line label at (x, y), vertically centered (or hanging from y with valign='top')."""
+    lead = font_size * 1.2
+    if valign == 'top':
+        baseline = y - font_size * 0.75
+    else:
+        baseline = y + (len(lines) - 1) * lead / 2 - font_size * 0.35
+    for i, line in enumerate(lines):
+        drawing.add(String(x, baseline - i * lead, line, fontName=font, fontSize=font_size,
+                           fillColor=color, textAnchor=anchor))
+
+
+class VectorChartGenerator:
+    """
+    ReportLab-graphics versions of the ChartGenerator figures used in the PDF
+    report: North/South Indian D1/D9 charts and the astrocartography map.
+
+    They return Drawing flowables in the same layout as the matplotlib PNGs
+    (same grid coordinates, line weights and font sizes relative to the chart),
+    so the PDF embeds vector paths and text instead of 100-120 dpi bitmaps:
+    smaller files, sharp at any zoom, and no matplotlib on the PDF path.
+    """
+    # Approximate size (points) of the matplotlib charts before they are scaled
+    # into the PDF; line widths and fonts scale from these.
+    NORTH_NATIVE = 400.0
+    SOUTH_NATIVE = 345.0
+    MAP_NATIVE = 660.0
+
+    NORTH_HOUSES = {
+        1: (5, 8.5), 2: (2.5, 8.5), 3: (1.5, 7.5), 4: (1.5, 5),
+        5: (1.5, 2.5), 6: (2.5, 1.5), 7: (5, 1.5), 8: (7.5, 1.5),
+        9: (8.5, 2.5), 10: (8.5, 5), 11: (8.5, 7.5), 12: (7.5, 8.5),
+    }
+    SOUTH_SIGNS = {
+        1: (1.5, 3.5), 2: (2.5, 3.5), 3: (3.5, 3.5), 4: (3.5, 2.5),
+        5: (3.5, 1.5), 6: (3.5, 0.5), 7: (2.5, 0.5), 8: (1.5, 0.5),
+        9: (0.5, 0.5), 10: (0.5, 1.5), 11: (0.5, 2.5), 12: (0.5, 3.5),
+    }
+    SIGN_LABELS = {
+        1: "Ar", 2: "Ta", 3: "Ge", 4: "Cn", 5: "Le", 6: "Vi",
+        7: "Li", 8: "Sc", 9: "Sg", 10: "Cp", 11: "Aq", 12: "Pi"
+    }
+
+    @staticmethod
+    def north_indian_chart(planets, width, height=None):
+        """North Indian diamond chart; planets: [{'planet': 'Sun', 'house': 1, 'degree': '12'}, ...]"""
+        size = min(width, height or width)
+        k = size / VectorChartGenerator.NORTH_NATIVE
+        pad = 2 * k
+        unit = (size - 2 * pad) / 10.0
+
+        def pt(x, y):
+            return pad + x * unit, pad + y * unit
+
+        d = Drawing(size, size)
+        d.add(Rect(pad, pad, 10 * unit, 10 * unit, strokeColor=colors.black, strokeWidth=2 * k, fillColor=colors.white))
+        for (x1, y1), (x2, y2) in [((0, 0), (10, 10)), ((0, 10), (10, 0)),
+                                   ((5, 10), (0, 5)), ((0, 5), (5, 0)), ((5, 0), (10, 5)), ((10, 5), (5, 10))]:
+            d.add(Line(*pt(x1, y1), *pt(x2, y2), strokeColor=colors.black, strokeWidth=1.5 * k))
+
+        by_house = {i: [] for i in range(1, 13)}
+        for p in planets:
+            label = _short_name(p.get('planet', p.get('name', '')))
+            by_house.setdefault(p.get('house', 1), []).append(f"{label}{p.get('degree') or ''}")
+
+        for house, (x, y) in VectorChartGenerator.NORTH_HOUSES.items():
+            _text_block(d, *pt(x, y + 0.6), [str(house)], 7 * k, font='Helvetica-Oblique', color=colors.gray)
+            if by_house.get(house):
+                _text_block(d, *pt(x, y - 0.2), by_house[house], 8 * k, font='Helvetica-Bold', color=colors.darkblue)
+        return d
+
+    @staticmethod
+    def south_indian_chart(planets, width, height=None):
+        """South Indian square chart (fixed signs); planets: [{'planet': 'Sun', 'sign_id': 1, 'degree': '12'}, ...]"""
+        size = min(width, height or width)
+        k = size / VectorChartGenerator.SOUTH_NATIVE
+        pad = 2 * k
+        unit = (size - 2 * pad) / 4.0
+
+        def pt(x, y):
+            return pad + x * unit, pad + y * unit
+
+        d = Drawing(size, size)
+        # Outer frame and the 12 sign boxes around an empty center
+        d.add(Rect(pad, pad, 4 * unit, 4 * unit, strokeColor=colors.black, strokeWidth=2 * k, fillColor=None))
+        for (x1, y1), (x2, y2) in [((0, 1), (4, 1)), ((0, 3), (4, 3)), ((1, 0), (1, 4)), ((3, 0), (3, 4)),
+                                   ((0, 2), (1, 2)), ((3, 2), (4, 2)), ((2, 0), (2, 1)), ((2, 3), (2, 4))]:
+            d.add(Line(*pt(x1, y1), *pt(x2, y2), strokeColor=colors.black, strokeWidth=k))
+
+        by_sign = {i: [] for i in range(1, 13)}
+        for p in planets:
+            sign_id = p.get('sign_id')
+            if sign_id:
+                label = _short_name(p.get('planet') or p.get('name') or "Unknown")
+                by_sign[sign_id].append(f"{label}{p.get('degree') or ''}")
+
+        for sign_id, (x, y) in VectorChartGenerator.SOUTH_SIGNS.items():
+            _text_block(d, *pt(x - 0.4, y + 0.35), [VectorChartGenerator.SIGN_LABELS[sign_id]], 8 * k,
+                        color=colors.gray, anchor='start', valign='top')
+            if by_sign[sign_id]:
+                _text_block(d, *pt(x, y), by_sign[sign_id], 9 * k, font='Helvetica-Bold')
+        return d
+
+    @staticmethod
+    def lagna_chart_north_indian(vedic_data, width, height=None):
+        return VectorChartGenerator.north_indian_chart(lagna_north_placements(vedic_data), width, height)
+
+    @staticmethod
+    def navamsa_chart_north_indian(navamsa_data, width, height=None):
+        return VectorChartGenerator.north_indian_chart(navamsa_north_placements(navamsa_data), width, height)
+
+    @staticmethod
+    def astro_map(locations, width, height):
+        """World map scatter of the astrocartography power zones (equirectangular)."""
+        k = width / VectorChartGenerator.MAP_NATIVE
+        d = Drawing(width, height)
+
+        # Room for the title, the axis labels and the tick labels; the map keeps a 2:1 aspect
+        left, bottom, top = 40 * k, 34 * k, 24 * k
+        plot_h = min(height - bottom - top, (width - left - 8 * k) / 2.0)
+        plot_w = 2 * plot_h
+        x0 = left + (width - left - 8 * k - plot_w) / 2.0
+        y0 = bottom
+
+        def pt(lng, lat):
+            return x0 + (lng + 180) / 360.0 * plot_w, y0 + (lat + 90) / 180.0 * plot_h
+
+        d.add(Rect(x0, y0, plot_w, plot_h, fillColor=colors.HexColor('#e6f3ff'), strokeColor=colors.black, strokeWidth=0.8 * k))
+        tick_size = 10 * k
+        for lng in range(-150, 151, 50):
+            d.add(Line(*pt(lng, -90), *pt(lng, 90), strokeColor=colors.white, strokeOpacity=0.5,
+                       strokeWidth=0.8 * k, strokeDashArray=[3 * k, 1.5 * k]))
+            d.add(String(pt(lng, -90)[0], y0 - 4 * k - tick_size, str(lng), fontName='Helvetica',
+                         fontSize=tick_size, textAnchor='middle'))
+        for lat in range(-75, 76, 25):
+            d.add(Line(*pt(-180, lat), *pt(180, lat), strokeColor=colors.white, strokeOpacity=0.5,
+                       strokeWidth=0.8 * k, strokeDashArray=[3 * k, 1.5 * k]))
+            d.add(String(x0 - 4 * k, pt(-180, lat)[1] - tick_size * 0.35, str(lat), fontName='Helvetica',
+                         fontSize=tick_size, textAnchor='end'))
+        d.add(Line(*pt(-180, 0), *pt(180, 0), strokeColor=colors.gray, strokeOpacity=0.3, strokeWidth=1.5 * k))  # Equator
+        d.add(Line(*pt(0, -90), *pt(0, 90), strokeColor=colors.gray, strokeOpacity=0.3, strokeWidth=1.5 * k))  # Prime Meridian
+
+        for loc in locations:
+            lat = loc.get('lat', 0)
+            lng = loc.get('lng', 0)
+            x, y = pt(lng, lat)
+            d.add(Circle(x, y, 4 * k, fillColor=colors.red, strokeColor=colors.red, strokeWidth=0.5 * k))
+            lx, ly = pt(lng + 3, lat + 3)
+            label = [str(loc.get('city', 'Unknown')), f"({loc.get('planet', '')})"]
+            for i, line in enumerate(label):
+                d.add(String(lx, ly + (len(label) - 1 - i) * 9.6 * k, line, fontName='Helvetica-Bold',
+                             fontSize=8 * k, fillColor=colors.darkblue))
+
+        d.add(String(x0 + plot_w / 2, y0 + plot_h + 8 * k, "Astrocartography Power Zones",
+                     fontName='Helvetica', fontSize=12 * k, textAnchor='middle'))
+        d.add(String(x0 + plot_w / 2, 2 * k, "Longitude", fontName='Helvetica', fontSize=tick_size, textAnchor='middle'))
+        y_label = Group(String(0, 0, "Latitude", fontName='Helvetica', fontSize=tick_size, textAnchor='middle'))
+        y_label.translate(2 * k + tick_size * 0.8, y0 + plot_h / 2)
+        y_label.rotate(90)
+        d.add(y_label)
+        return d
+
+
+VECTOR_RENDERERS = {
+    "lagna_north": VectorChartGenerator.lagna_chart_north_indian,
+    "navamsa_north": VectorChartGenerator.navamsa_chart_north_indian,
+    "south": VectorChartGenerator.south_indian_chart,
+    "astro_map": VectorChartGenerator.astro_map,
+}
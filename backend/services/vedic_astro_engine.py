@@ -1,6 +1,9 @@
+import copy
 import math
-from datetime import datetime, timedelta
+from datetime import datetime
 from services.skyfield_engine import SkyfieldService
+from services.timezone_service import TimezoneService
+from services.birth_instant import BirthInstant
 
 class VedicAstroEngine:
     # Constants for Lahiri Ayanamsa
@@ -56,71 +59,55 @@ class VedicAstroEngine:
         return precession_deg
 
     @staticmethod
-    def calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+    def _resolve_utc(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
         """
-        Get Sidereal (Nirayana) planetary positions.
-        Converts local time to UTC before calculation if timezone provided.
+        Converts local birth time to UTC components (year, month, day, hour, minute, second).
+        A missing zone is the zone at the birth coordinates (see BirthInstant).
+        """
+        return BirthInstant.resolve(year, month, day, hour, minute, lat, lng, timezone_str).utc
+
+    @staticmethod
+    def get_chart_context(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+        """
+        Returns the shared ChartContext for this birth moment.
+        Pass it to calculate_sidereal_planets / calculate_panchang / calculate_vimshottari_dasha
+        (and KerykeionService.calculate_chart) so they all reuse one Skyfield pass.
         """
+        from services.chart_context import ChartContext
+
         # Ensure lat/lng are floats
-        try:
-            lat = float(lat)
-            lng = float(lng)
-        except:
-            pass
-
-        # SMART OVERRIDE & DEFAULT: 
-        # 1. If timezone is missing, empty, or None, default to Asia/Kolkata for Indian coords
-        # 2. If timezone is explicitly UTC but coords are in India, force Asia/Kolkata
-        # India bounds approx: Lat 6 to 38, Lng 68 to 98
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        
-        if not timezone_str or str(timezone_str).upper() == "NONE":
-            # Smart Default extraction
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
-
-        # Convert to UTC
-        import pytz
-        try:
-            local = datetime(year, month, day, hour, minute)
-            # Handle possible string/None in timezone_str
-            tz_name = str(timezone_str)
-            try:
-                tz = pytz.timezone(tz_name)
-            except:
-                # Fallback for common Indian naming variants
-                if "Kolkata" in tz_name or "Calcutta" in tz_name or is_india:
-                    tz = pytz.timezone("Asia/Kolkata")
-                else:
-                    tz = pytz.UTC
-                    
-            local_dt = tz.localize(local)
-            utc_dt = local_dt.astimezone(pytz.UTC)
-            
-            # Use UTC components
-            u_year, u_month, u_day = utc_dt.year, utc_dt.month, utc_dt.day
-            u_hour, u_minute = utc_dt.hour, utc_dt.minute
-        except Exception as e:
-            # Final fallback: If everything fails, and it's India, subtract 5.5 hours manually
-            if is_india:
-                dt = datetime(year, month, day, hour, minute) - timedelta(hours=5, minutes=30)
-                u_year, u_month, u_day, u_hour, u_minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
-            else:
-                u_year, u_month, u_day, u_hour, u_minute = year, month, day, hour, minute
-            print(f"Timezone conversion emergency fallback for {timezone_str} at {lat},{lng}")
+        lat = float(lat)
+        lng = float(lng)
 
+        utc = VedicAstroEngine._resolve_utc(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
         ayanamsa = VedicAstroEngine.calculate_ayanamsa(year, month, day)
+        return ChartContext.get(utc, lat, lng, ayanamsa)
+
+    @staticmethod
+    def calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", chart_context=None):
+        """
+        Get Sidereal (Nirayana) planetary positions.
+        Converts local time to UTC before calculation if timezone provided.
+        If chart_context is given, the memoized positions for that instant are reused.
+        """
+        if chart_context is None:
+            chart_context = VedicAstroEngine.get_chart_context(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
+
+        sidereal = chart_context.memoize("sidereal", lambda: VedicAstroEngine._build_sidereal(chart_context))
+        # Callers are free to mutate their copy
+        return copy.deepcopy(sidereal)
+
+    @staticmethod
+    def _build_sidereal(chart_context):
+        ayanamsa = chart_context.ayanamsa
         
         # Get Tropical positions from Skyfield using UTC time
-        # CRITICAL: We must explicitly pass timezone_str='UTC' because u_year, u_month, etc. are ALREADY in UTC
-        # If we don't specify, the default 'Asia/Kolkata' will cause double conversion!
-        tropical_data = SkyfieldService.calculate_positions(u_year, u_month, u_day, u_hour, u_minute, lat, lng, timezone_str='UTC')
+        # CRITICAL: The context holds UTC components and always calls Skyfield with timezone_str='UTC'
+        # to prevent double conversion.
+        tropical_data = chart_context.tropical_positions()
         
         # Get Tropical Ascendant using UTC time
-        # CRITICAL: Same as above - already UTC, must specify to prevent double conversion
-        angles = SkyfieldService.calculate_angles(u_year, u_month, u_day, u_hour, u_minute, lat, lng, timezone_str='UTC')
+        angles = chart_context.angles()
         tropical_asc = angles['Ascendant']
         sidereal_asc = (tropical_asc - ayanamsa) % 360
         asc_sign_index = int(sidereal_asc // 30) % 12
@@ -146,6 +133,7 @@ class VedicAstroEngine:
                 "tropical_longitude": p['longitude'],
                 "sidereal_longitude": round(sid_lon, 4),
                 "sign": signs[sign_index],
+                "sign_id": sign_index + 1,
                 "position": round(pos_in_sign, 2),
                 "house": house_num, 
                 "nakshatra": VedicAstroEngine._calculate_nakshatra(sid_lon),
@@ -164,6 +152,89 @@ class VedicAstroEngine:
             "planets": sidereal_data
         }
 
+    @staticmethod
+    def calculate_sidereal_series(times, lat, lng, bodies=None):
+        """
+        Sidereal positions for many instants in one vectorized Skyfield pass.
+        times: UTC datetimes (naive values are treated as UTC) or a Skyfield Time vector.
+        Returns columnar numpy arrays per body: longitude, sign_id (1-12), retrograde,
+        plus a `valid` mask for instants the ephemeris covers.
+        Skips Ascendant, nakshatra and dignity work - use calculate_sidereal_planets for a full chart.
+        """
+        import numpy as np
+        import pytz
+
+        SkyfieldService._init_skyfield()
+        ts = SkyfieldService._ts
+
+        if hasattr(times, 'tt'):
+            t = times
+            dates = list(np.atleast_1d(t.utc_datetime()))
+        else:
+            dates = []
+            for d in times:
+                if d.tzinfo is not None:
+                    d = d.astimezone(pytz.UTC).replace(tzinfo=None)
+                dates.append(d)
+            t = ts.utc(
+                [d.year for d in dates], [d.month for d in dates], [d.day for d in dates],
+                [d.hour for d in dates], [d.minute for d in dates], [d.second for d in dates]
+            )
+
+        tt = np.atleast_1d(t.tt)
+        n = len(tt)
+
+        # Instants outside the ephemeris are reported as invalid (NaN longitude, sign_id 0)
+        start_jd, end_jd = SkyfieldService.coverage_jd()
+        valid = (tt >= start_jd) & (tt + 1.0 / 24.0 <= end_jd)
+        tt_valid = tt[valid]
+        m = len(tt_valid)
+
+        ayanamsa = np.array([VedicAstroEngine.calculate_ayanamsa(d.year, d.month, d.day) for d in dates])
+
+        def columns(tropical, retrograde):
+            sid_lon = (tropical - ayanamsa) % 360
+            sign_id = np.zeros(n, dtype=int)
+            sign_id[valid] = (sid_lon[valid] // 30).astype(int) % 12 + 1
+            return {
+                "longitude": sid_lon,
+                "sign_id": sign_id,
+                "retrograde": retrograde
+            }
+
+        series = {}
+        planet_bodies = [b for b in (bodies or SkyfieldService.PLANETS_MAP.keys()) if b in SkyfieldService.PLANETS_MAP]
+        if m:
+            # Every instant and instant+1h together, so retrograde comes from the same pass
+            t_pair = ts.tt_jd(np.concatenate([tt_valid, tt_valid + 1.0 / 24.0]))
+            longitudes = SkyfieldService.calculate_longitudes(t_pair, lat, lng, bodies=planet_bodies)
+        else:
+            longitudes = {name: np.empty(0) for name in planet_bodies}
+
+        for name, lons in longitudes.items():
+            tropical = np.full(n, np.nan)
+            tropical[valid] = lons[:m]
+            retrograde = np.zeros(n, dtype=bool)
+            retrograde[valid] = ((lons[m:] - lons[:m] + 180) % 360 - 180) < 0
+            series[name] = columns(tropical, retrograde)
+
+        # Mean lunar nodes (same formula as SkyfieldService.calculate_positions)
+        if bodies is None or 'Rahu' in bodies or 'Ketu' in bodies:
+            T = (tt - 2451545.0) / 36525.0
+            omega_deg = (125.04452 - 1934.136261 * T) % 360
+            always_retro = np.ones(n, dtype=bool)
+            if bodies is None or 'Rahu' in bodies:
+                series['Rahu'] = columns(omega_deg, always_retro)
+            if bodies is None or 'Ketu' in bodies:
+                series['Ketu'] = columns((omega_deg + 180) % 360, always_retro)
+
+        return {
+            "times": dates,
+            "ayanamsa": ayanamsa,
+            "valid": valid,
+            "planets": series
+        }
+
     @staticmethod
     def _calculate_nakshatra(longitude):
         # 360 degrees / 27 nakshatras = 13.3333... degrees per nakshatra
@@ -231,20 +302,16 @@ class VedicAstroEngine:
         return {"status": "Neutral", "sanskrit": "Sama"}
 
     @staticmethod
-    def calculate_panchang(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+    def calculate_panchang(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", chart_context=None):
         """
         Calculates Panchang elements: Tithi, Nakshatra, Yoga.
-        IRONCLAD TIMEZONE SAFETY: Enforces Asia/Kolkata for Indian coordinates.
+        IRONCLAD TIMEZONE SAFETY: Resolves the zone from the birth coordinates.
+        If chart_context is given, its memoized positions are reused.
         """
-        # IRONCLAD OVERRIDE: Strict geographical enforcement for India
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        if not timezone_str or str(timezone_str).upper() in ["UTC", "GMT", "NONE"]:
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
+        # IRONCLAD OVERRIDE: a missing zone (or UTC/GMT sent for an Indian birth place) becomes the local zone
+        timezone_str = TimezoneService.resolve_timezone(timezone_str, lat, lng, replace_utc=True)
         
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
+        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str, chart_context=chart_context)
         planets = sidereal_data['planets']
         
         sun_lon = next(p for p in planets if p['name'] == 'Sun')['sidereal_longitude']
@@ -387,118 +454,67 @@ class VedicAstroEngine:
         }
 
     @staticmethod
-    def calculate_vimshottari_dasha(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata"):
+    def get_dasha_tree(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", chart_context=None):
+        """
+        Vimshottari DashaTree (maha / antar / pratyantar) for a birth moment.
+        IRONCLAD TIMEZONE SAFETY: Resolves the zone from the birth coordinates.
+        Memoized on the chart context - the tree is read-only, callers share it.
+        """
+        from services.dasha_tree import DashaTree
+
+        # IRONCLAD OVERRIDE: a missing zone (or UTC/GMT sent for an Indian birth place) becomes the local zone
+        timezone_str = TimezoneService.resolve_timezone(timezone_str, lat, lng, replace_utc=True)
+
+        if chart_context is None:
+            chart_context = VedicAstroEngine.get_chart_context(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
+
+        def build():
+            sidereal_data = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str, chart_context=chart_context)
+            moon = next(p for p in sidereal_data['planets'] if p['name'] == 'Moon')
+            return DashaTree.from_moon(moon['sidereal_longitude'], datetime(year, month, day, hour, minute))
+
+        # Dasha dates are in local birth time, so the local moment is part of the key
+        return chart_context.memoize(f"dasha_tree:{year}-{month}-{day}-{hour}-{minute}", build)
+
+    @staticmethod
+    def calculate_vimshottari_dasha(year, month, day, hour, minute, lat, lng, timezone_str="Asia/Kolkata", chart_context=None):
         """
         Calculates Vimshottari Dasha details based on Moon's Nakshatra.
         Includes Mahadasha and Antardasha (Bhukti).
-        IRONCLAD TIMEZONE SAFETY: Enforces Asia/Kolkata for Indian coordinates.
+        IRONCLAD TIMEZONE SAFETY: Resolves the zone from the birth coordinates.
+        If chart_context is given, its memoized positions are reused.
         """
-        # IRONCLAD OVERRIDE: Strict geographical enforcement for India
-        is_india = (6.0 <= lat <= 38.0 and 68.0 <= lng <= 98.0)
-        if not timezone_str or str(timezone_str).upper() in ["UTC", "GMT", "NONE"]:
-            if is_india:
-                timezone_str = "Asia/Kolkata"
-            else:
-                timezone_str = "UTC"
-        
-        sidereal_data = VedicAstroEngine.calculate_sidereal_planets(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str)
-        moon = next(p for p in sidereal_data['planets'] if p['name'] == 'Moon')
-        
-        nak_info = moon['nakshatra']
-        nak_index = nak_info['index'] - 1 # 0-indexed
-        
-        # Ruler Index in sequence
-        ruler_index = nak_index % 9
-        
-        # Calculate balance of Dasha
-        # 360 degrees / 27 nakshatras = 13.3333... deg per nakshatra
-        nak_span = 360 / 27
-        current_nak_start = nak_index * nak_span
-        traversed = moon['sidereal_longitude'] - current_nak_start
-        
-        # Current Dasha at birth
-        current_dasha_lord, total_years = VedicAstroEngine.DASHA_PLANETS[ruler_index]
-        balance_years = ((nak_span - traversed) / nak_span) * total_years
-        
-        birth_date = datetime(year, month, day, hour, minute)
-        timeline = []
-        
-        # 1. First Dasha (Balance)
-        d_start = birth_date
-        d_end = d_start + timedelta(days=balance_years * 365.2425)
-        
-        # Calculate Antardashas for this first dasha
-        # Since it's a balance dasha, we need to find where in the Antardasha sequence the birth occurs
-        traversed_years = total_years - balance_years
-        
-        # All Mahadashas (Full Cycle)
-        current_time = birth_date - timedelta(days=traversed_years * 365.2425)
-        
-        all_dashas = []
-        for i in range(15): # Calculate enough for a lifetime
-            idx = (ruler_index + i) % 9
-            m_lord, m_years = VedicAstroEngine.DASHA_PLANETS[idx]
-            m_end = current_time + timedelta(days=m_years * 365.2425)
-            
-            # Sub-periods (Antardashas)
-            sub_periods = []
-            s_time = current_time
-            for j in range(9):
-                s_idx = (idx + j) % 9
-                s_lord, s_years = VedicAstroEngine.DASHA_PLANETS[s_idx]
-                # Antardasha = (M_Years * S_Years) / 120
-                ant_years = (m_years * s_years) / 120.0
-                s_end = s_time + timedelta(days=ant_years * 365.2425)
-                
-                sub_periods.append({
-                    "planet": s_lord,
-                    "start": s_time,
-                    "end": s_end
-                })
-                s_time = s_end
-            
-            all_dashas.append({
-                "planet": m_lord,
-                "start": current_time,
-                "end": m_end,
-                "antardashas": sub_periods
-            })
-            current_time = m_end
-            
+        tree = VedicAstroEngine.get_dasha_tree(year, month, day, hour, minute, lat, lng, timezone_str=timezone_str, chart_context=chart_context)
+
         # Filter for relevant periods (current and future)
         now = datetime.now()
-        active_m = None
-        active_a = None
-        active_ant = None
-        
+        active_m_index = tree.active_index(now, "maha")
+        active_ant = tree.active(now, "antar")
+        active_a = active_ant['planet'] if active_ant else None
+
         results = []
-        for m in all_dashas:
+        for i in range(len(tree)):
+            m = tree.period("maha", i)
             # We want current phase and future ones for the UI
             if m['end'] > now:
-                # If this is the active Mahadasha, find the active Antardasha
-                if m['start'] <= now:
-                    active_m = m['planet']
-                    for a in m['antardashas']:
-                        if a['start'] <= now < a['end']:
-                            active_a = a['planet']
-                            active_ant = a
-                            break
-                            
                 results.append({
                     "planet": m['planet'],
                     "start": m['start'].strftime("%Y-%m-%d"),
                     "end": m['end'].strftime("%Y-%m-%d"),
-                    "is_active": (m['start'] <= now < m['end']),
-                    "active_antardasha": active_a if (m['start'] <= now < m['end']) else None
+                    "is_active": i == active_m_index,
+                    "active_antardasha": active_a if i == active_m_index else None
                 })
-                
+                if len(results) >= 10: # Return next few periods
+                    break
+
         return {
-            "active_mahadasha": active_m,
+            "active_mahadasha": tree.period("maha", active_m_index)['planet'] if active_m_index is not None else None,
             "active_antardasha": active_a,
             "active_antardasha_start": active_ant['start'].strftime("%b %Y") if active_ant else None,
             "active_antardasha_end": active_ant['end'].strftime("%b %Y") if active_ant else None,
-            "timeline": results[:10] # Return next few periods
+            "timeline": results
         }
+
     @staticmethod
     def calculate_remedies(sidereal_data, lang="en"):
         """
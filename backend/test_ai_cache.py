@@ -0,0 +1,103 @@
+"""
+Checks the AI response cache: fingerprinting, TTLs, the SQLite tier and the generator wiring.
+"""
+import sys
+sys.path.append('.')
+
+import os
+import json
+import time
+import tempfile
+
+from services.ai_cache import AIResponseCache
+from services.llm_provider import LLMClient, StubProvider
+from services import ai_service
+
+
+def test_fingerprint_normalizes_prompt():
+    a = AIResponseCache.fingerprint("vedic_summary", "m", "Sun in Leo\n    Moon in Aries ", "en")
+    b = AIResponseCache.fingerprint("vedic_summary", "m", "Sun in Leo Moon in Aries", "en")
+    assert a == b
+    assert a != AIResponseCache.fingerprint("vedic_summary", "m", "Sun in Leo Moon in Aries", "hi")
+    assert a != AIResponseCache.fingerprint("vedic_summary", "other", "Sun in Leo Moon in Aries", "en")
+    assert a != AIResponseCache.fingerprint("daily_guidance", "m", "Sun in Leo Moon in Aries", "en")
+
+
+def test_hits_ttl_and_failures():
+    AIResponseCache.clear()
+    calls = {"n": 0}
+
+    def compute():
+        calls["n"] += 1
+        time.sleep(0.01)
+        return {"text": "answer"}
+
+    first = AIResponseCache.cached("executive_summary", "m", "prompt", compute)
+    first["text"] = "mutated by caller"
+    second = AIResponseCache.cached("executive_summary", "m", "prompt", compute)
+    assert calls["n"] == 1 and second == {"text": "answer"}
+
+    # Failed LLM calls are not cached
+    assert AIResponseCache.cached("executive_summary", "m", "other", lambda: None) is None
+    assert AIResponseCache.cached("executive_summary", "m", "other", lambda: "ok") == "ok"
+
+    stats = AIResponseCache.stats()
+    print(f"AI cache stats: {stats}")
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["saved_seconds"] > 0
+    assert stats["generators"]["executive_summary"]["hits"] == 1
+
+    # Expired entries are recomputed
+    original = dict(AIResponseCache.TTLS)
+    AIResponseCache.TTLS["executive_summary"] = -1
+    try:
+        AIResponseCache.cached("executive_summary", "m", "short", compute)
+        AIResponseCache.cached("executive_summary", "m", "short", compute)
+    finally:
+        AIResponseCache.TTLS.update(original)
+    assert calls["n"] == 3
+    AIResponseCache.clear()
+
+
+def test_disk_tier_survives_memory_loss():
+    path = os.path.join(tempfile.mkdtemp(), "ai.db")
+    original_path = AIResponseCache.DB_PATH
+    AIResponseCache.DB_PATH = path
+    AIResponseCache._db_initialized = False
+    try:
+        AIResponseCache.clear()
+        AIResponseCache.cached("numerology_insights", "m", "numbers", lambda: "insight")
+        AIResponseCache._memory.clear()  # e.g. another worker or a restart
+
+        assert AIResponseCache.cached("numerology_insights", "m", "numbers", lambda: None) == "insight"
+        assert AIResponseCache.stats()["disk_hits"] == 1
+    finally:
+        AIResponseCache.clear()
+        AIResponseCache.DB_PATH = original_path
+        AIResponseCache._db_initialized = False
+
+
+def test_generators_skip_repeat_llm_calls():
+    AIResponseCache.clear()
+    stub = StubProvider(reply=json.dumps({"ideal_partner": "x", "marriage_outlook": "y"}), delay=0.01)
+    LLMClient.set_provider_override(stub)
+    try:
+        planets = [{"name": "Venus", "sign": "Libra", "house": 7}]
+        panchang = {"nakshatra": {"name": "Rohini"}, "ascendant": {"name": "Leo"}}
+        a = ai_service.generate_relationship_analysis("Test", planets, panchang)
+        b = ai_service.generate_relationship_analysis("Test", planets, panchang)
+        c = ai_service.generate_relationship_analysis("Test", planets, panchang, lang="hi")
+    finally:
+        LLMClient.set_provider_override(None)
+        AIResponseCache.clear()
+
+    assert a == b == c == {"ideal_partner": "x", "marriage_outlook": "y"}
+    assert stub.calls == 2  # one per language
+
+
+if __name__ == "__main__":
+    test_fingerprint_normalizes_prompt()
+    test_hits_ttl_and_failures()
+    test_disk_tier_survives_memory_loss()
+    test_generators_skip_repeat_llm_calls()
+    print("AI cache checks passed.")
@@ -0,0 +1,87 @@
+"""
+Checks the analytic astrocartography lines against topocentric Skyfield positions.
+"""
+import sys
+sys.path.append('.')
+
+from skyfield.api import wgs84
+
+from services.astrocartography_engine import AstrocartographyEngine
+from services.city_index import CityIndex
+from services.skyfield_engine import SkyfieldService
+
+# 12 Nov 1976, 12:50 UTC
+BIRTH_UTC = (1976, 11, 12, 12, 50)
+
+
+def _observe(name, lat, lng):
+    SkyfieldService._init_skyfield()
+    t = SkyfieldService._ts.utc(*BIRTH_UTC)
+    observer = SkyfieldService._planets['earth'] + wgs84.latlon(lat, lng)
+    return observer.at(t).observe(SkyfieldService._planets[SkyfieldService.PLANETS_MAP[name]]).apparent()
+
+
+def test_lines_match_horizon_and_meridian():
+    lines = AstrocartographyEngine.calculate_lines(*BIRTH_UTC)
+
+    for name in ["Sun", "Venus", "Saturn"]:
+        # On the AC/DC lines the planet sits on the horizon (rising in the east, setting in the west)
+        for angle, east in [("Ascendant", True), ("Descendant", False)]:
+            lat, lng = lines[name][angle][len(lines[name][angle]) // 2]
+            alt, az, _ = _observe(name, lat, lng).altaz()
+            assert abs(alt.degrees) < 0.05, (name, angle, alt.degrees)
+            assert (az.degrees < 180) == east
+
+        # On the MC line it culminates (hour angle 0)
+        hour_angle, _, _ = _observe(name, 30.0, lines[name]["Midheaven"]).hadec()
+        assert abs(hour_angle.hours * 15) < 0.05, name
+
+
+def test_power_zones_use_real_angle_distance():
+    lines = AstrocartographyEngine.calculate_lines(*BIRTH_UTC)
+    mc_lng = lines["Jupiter"]["Midheaven"]
+    cities = [
+        {"name": "On Jupiter MC", "lat": 10.0, "lng": mc_lng},
+        {"name": "Far Away", "lat": 10.0, "lng": mc_lng + 45.0}  # between the MC and the AC/DC curves
+    ]
+
+    zones = AstrocartographyEngine.calculate_power_zones("Test", *BIRTH_UTC, cities=cities, limit=50)
+    hits = {(z["city"], z["planet"], z["angle"]) for z in zones}
+    print(f"Power zones: {sorted(hits)}")
+    assert ("On Jupiter MC", "Jupiter", "Midheaven") in hits
+    assert not any(city == "Far Away" and planet == "Jupiter" for city, planet, _ in hits)
+
+    default = AstrocartographyEngine.calculate_power_zones("Test", *BIRTH_UTC)
+    assert len(default) <= 5
+    assert all(z["angle"] in AstrocartographyEngine.ANGLE_MEANINGS for z in default)
+
+
+def test_gazetteer_index_matches_full_scan():
+    names, ra, dec, gast = AstrocartographyEngine._equatorial_state(*BIRTH_UTC)
+    CityIndex.load()
+    every_city = [CityIndex.city(i) for i in range(len(CityIndex.names))]
+
+    full_scan = {(p, a, c["name"]) for p, a, c, _ in AstrocartographyEngine._line_hits(names, ra, dec, gast, every_city, 1.5)}
+    indexed = {(p, a, c["name"]) for p, a, c, _ in AstrocartographyEngine._gazetteer_hits(names, ra, dec, gast, 1.5)}
+    print(f"Cities on lines: {len(indexed)} of {len(every_city)}")
+    assert full_scan == indexed
+
+
+def test_line_city_search_filters():
+    lines = AstrocartographyEngine.find_line_cities(*BIRTH_UTC, orb=2.0, per_line=3, min_population=500000, countries=["in", "US"])
+    assert lines
+    for cities in lines.values():
+        assert len(cities) <= 3
+        assert [c["distance"] for c in cities] == sorted(c["distance"] for c in cities)
+        assert all(c["population"] >= 500000 and c["country_code"] in ("IN", "US") for c in cities)
+
+    zones = AstrocartographyEngine.calculate_power_zones("Test", *BIRTH_UTC)
+    assert len({z["line_title"] for z in zones}) == len(zones)
+
+
+if __name__ == "__main__":
+    test_lines_match_horizon_and_meridian()
+    test_power_zones_use_real_angle_distance()
+    test_gazetteer_index_matches_full_scan()
+    test_line_city_search_filters()
+    print("Astrocartography checks passed.")
@@ -0,0 +1,68 @@
+"""
+Checks BirthInstant: one shared, cached UTC normalization per birth moment, to the second,
+and that the engines give the same chart whether they resolve it themselves or get it passed in.
+"""
+import sys
+sys.path.append('.')
+
+from services.birth_instant import BirthInstant
+from services.skyfield_engine import SkyfieldService
+
+# Rahul Kumar - 12 Nov 1976, 18:20, Bokaro
+BIRTH = (1976, 11, 12, 18, 20, 23.67, 86.15)
+
+
+def test_resolves_once():
+    BirthInstant.clear()
+    first = BirthInstant.resolve(*BIRTH, "Asia/Kolkata")
+    again = BirthInstant.resolve(*BIRTH, "Asia/Kolkata")
+    assert first is again
+    assert first.utc == (1976, 11, 12, 12, 50, 0)
+    assert first.time() is again.time()
+    stats = BirthInstant.stats()
+    print(f"BirthInstant stats: {stats}")
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_missing_zone_and_utc():
+    assert BirthInstant.resolve(*BIRTH, None).utc == (1976, 11, 12, 12, 50, 0)
+    # Engines pass already converted times as UTC
+    assert BirthInstant.resolve(*BIRTH, "UTC").utc == (1976, 11, 12, 18, 20, 0)
+    assert BirthInstant.from_utc((1976, 11, 12, 12, 50), 23.67, 86.15).utc == (1976, 11, 12, 12, 50, 0)
+
+
+def test_seconds_are_kept():
+    whole = BirthInstant.resolve(*BIRTH, "Asia/Kolkata")
+    later = BirthInstant.resolve(*BIRTH, "Asia/Kolkata", second=45)
+    assert later.utc == (1976, 11, 12, 12, 50, 45)
+    assert abs((later.jd - whole.jd) * 86400.0 - 45.0) < 1e-3
+
+
+def test_instant_matches_direct_calculation():
+    instant = BirthInstant.resolve(*BIRTH, "Asia/Kolkata")
+    assert SkyfieldService.calculate_positions(*BIRTH, "Asia/Kolkata", instant=instant) == \
+        SkyfieldService.calculate_positions(*BIRTH, "Asia/Kolkata")
+    assert SkyfieldService.calculate_angles(*BIRTH, "Asia/Kolkata", instant=instant) == \
+        SkyfieldService.calculate_angles(*BIRTH, "Asia/Kolkata")
+
+
+def test_bounded():
+    saved = BirthInstant.MAX_INSTANTS
+    BirthInstant.MAX_INSTANTS = 5
+    try:
+        BirthInstant.clear()
+        for minute in range(10):
+            BirthInstant.resolve(2000, 1, 1, 12, minute, 28.61, 77.21, "Asia/Kolkata")
+        assert BirthInstant.stats()["size"] == 5
+        assert BirthInstant.stats()["evictions"] == 5
+    finally:
+        BirthInstant.MAX_INSTANTS = saved
+
+
+if __name__ == "__main__":
+    test_resolves_once()
+    test_missing_zone_and_utc()
+    test_seconds_are_kept()
+    test_instant_matches_direct_calculation()
+    test_bounded()
+    print("BirthInstant OK")
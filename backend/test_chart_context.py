@@ -0,0 +1,120 @@
+"""
+Checks that one ChartContext serves every engine method with a single Skyfield pass.
+"""
+import sys
+sys.path.append('.')
+
+import os
+import tempfile
+from services.chart_context import ChartContext
+from services.chart_store import ChartDiskStore
+from services.skyfield_engine import SkyfieldService
+from services.vedic_astro_engine import VedicAstroEngine
+from services.kerykeion_engine import KerykeionService
+
+# Rahul Kumar - 12 Nov 1976, 18:20, Bokaro
+BIRTH = (1976, 11, 12, 18, 20, 23.67, 86.15)
+
+
+def test_context_matches_direct_calculation():
+    ChartContext.clear()
+    ctx = VedicAstroEngine.get_chart_context(*BIRTH, timezone_str="Asia/Kolkata")
+
+    assert ctx.utc == (1976, 11, 12, 12, 50, 0)
+
+    with_ctx = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata", chart_context=ctx)
+    ChartContext.clear()
+    without_ctx = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata")
+
+    assert with_ctx == without_ctx
+
+
+def test_single_skyfield_pass_per_report():
+    ChartContext.clear()
+    calls = {"positions": 0, "angles": 0}
+    original_positions = SkyfieldService.calculate_positions
+    original_angles = SkyfieldService.calculate_angles
+
+    def counting_positions(*args, **kwargs):
+        calls["positions"] += 1
+        return original_positions(*args, **kwargs)
+
+    def counting_angles(*args, **kwargs):
+        calls["angles"] += 1
+        return original_angles(*args, **kwargs)
+
+    SkyfieldService.calculate_positions = counting_positions
+    SkyfieldService.calculate_angles = counting_angles
+    try:
+        ctx = VedicAstroEngine.get_chart_context(*BIRTH, timezone_str="Asia/Kolkata")
+        sidereal = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata", chart_context=ctx)
+        panchang = VedicAstroEngine.calculate_panchang(*BIRTH, timezone_str="Asia/Kolkata", chart_context=ctx)
+        dasha = VedicAstroEngine.calculate_vimshottari_dasha(*BIRTH, timezone_str="Asia/Kolkata", chart_context=ctx)
+        chart = KerykeionService.calculate_chart("Rahul", *BIRTH[:5], "Bokaro", *BIRTH[5:], timezone_str="Asia/Kolkata", chart_context=ctx)
+    finally:
+        SkyfieldService.calculate_positions = original_positions
+        SkyfieldService.calculate_angles = original_angles
+
+    print(f"Skyfield calls: {calls}")
+    assert calls == {"positions": 1, "angles": 1}
+    assert panchang['moon_sign'] == next(p['sign'] for p in sidereal['planets'] if p['name'] == 'Moon')
+    assert dasha['timeline']
+    assert chart['angles']['Ascendant'] == ctx.angles()['Ascendant']
+
+
+def test_returned_data_is_not_shared():
+    ChartContext.clear()
+    ctx = VedicAstroEngine.get_chart_context(*BIRTH, timezone_str="Asia/Kolkata")
+    first = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, chart_context=ctx)
+    first['planets'][0]['sign'] = "Mutated"
+    second = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, chart_context=ctx)
+    assert second['planets'][0]['sign'] != "Mutated"
+
+
+def test_lru_counters_and_eviction():
+    ChartContext.clear()
+    original_max = ChartContext.MAX_CONTEXTS
+    ChartContext.MAX_CONTEXTS = 2
+    try:
+        for hour in (1, 2, 1, 3):
+            ChartContext.get((2000, 1, 1, hour, 0), 28.61, 77.21, 23.85)
+        stats = ChartContext.stats()
+    finally:
+        ChartContext.MAX_CONTEXTS = original_max
+        ChartContext.clear()
+    print(f"Chart cache stats: {stats}")
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 3, 1, 2)
+
+
+def test_disk_tier_shared_across_processes():
+    ChartContext.clear()
+    original_path = ChartDiskStore.PATH
+    ChartDiskStore.PATH = os.path.join(tempfile.mkdtemp(), "charts.db")
+    ChartDiskStore._initialized = False
+    try:
+        first = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata")
+        # Simulates another worker: empty memory tier, same SQLite file
+        ChartContext.clear()
+        original_positions = SkyfieldService.calculate_positions
+        SkyfieldService.calculate_positions = None  # must not be called on a disk hit
+        try:
+            second = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata")
+        finally:
+            SkyfieldService.calculate_positions = original_positions
+        stats = ChartContext.stats()
+    finally:
+        ChartDiskStore.PATH = original_path
+        ChartDiskStore._initialized = False
+        ChartContext.clear()
+
+    assert stats["disk_hits"] == 1
+    assert first == second
+
+
+if __name__ == "__main__":
+    test_context_matches_direct_calculation()
+    test_single_skyfield_pass_per_report()
+    test_returned_data_is_not_shared()
+    test_lru_counters_and_eviction()
+    test_disk_tier_shared_across_processes()
+    print("ChartContext checks passed.")
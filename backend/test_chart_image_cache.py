@@ -0,0 +1,61 @@
+"""
+Checks the chart image cache of the /api/chart/{lagna,navamsa}/{north,south} endpoints:
+placement fingerprints, shared renders and ETag / If-None-Match revalidation.
+"""
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+import main
+from services.chart_image_cache import ChartImageCache
+
+BIRTH = {"name": "Test", "year": 1990, "month": 5, "day": 15, "hour": 10, "minute": 30,
+         "city": "Delhi", "lat": 28.61, "lng": 77.21, "timezone": "Asia/Kolkata"}
+
+
+def test_same_placements_share_one_render():
+    a = [{"planet": "Sun", "house": 1, "degree": "12"}, {"planet": "Asc", "house": 1, "degree": "03"}]
+    b = [dict(p) for p in a]
+    assert ChartImageCache.fingerprint("north", a) == ChartImageCache.fingerprint("north", b)
+    assert ChartImageCache.fingerprint("north", a) != ChartImageCache.fingerprint("south", a)
+    moved = [dict(a[0], house=2), a[1]]
+    assert ChartImageCache.fingerprint("north", a) != ChartImageCache.fingerprint("north", moved)
+
+    ChartImageCache.clear()
+    first = ChartImageCache.get_image("north", a)
+    second = ChartImageCache.get_image("north", b)
+    stats = ChartImageCache.stats()
+    print(f"Chart image cache: {stats}")
+    assert first == second and first.startswith("data:image/png;base64,")
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+
+def test_endpoints_revalidate_with_etag():
+    ChartImageCache.clear()
+    client = TestClient(main.app)
+    for division in ("lagna", "navamsa"):
+        for style in ("north", "south"):
+            url = f"/api/chart/{division}/{style}"
+            first = client.post(url, json=BIRTH)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert first.json()["image"].startswith("data:image/png;base64,")
+
+            # Another user with the same placements is served the same image
+            repeat = client.post(url, json=dict(BIRTH, name="Someone Else", city="New Delhi"))
+            assert repeat.status_code == 200 and repeat.headers["etag"] == etag
+
+            cached = client.post(url, json=BIRTH, headers={"If-None-Match": etag})
+            assert cached.status_code == 304 and not cached.content
+            assert cached.headers["etag"] == etag
+
+    stats = ChartImageCache.stats()
+    print(f"Chart image cache after the endpoints: {stats}")
+    assert stats["misses"] == 4 and stats["hits"] == 4 and stats["not_modified"] == 4
+
+
+if __name__ == "__main__":
+    test_same_placements_share_one_render()
+    test_endpoints_revalidate_with_etag()
+    print("Chart image cache OK")
@@ -0,0 +1,122 @@
+"""
+Checks the per-profile chart snapshots: computed once and stored, recomputed when the birth
+fields change, deleted with the profile, and matching from snapshots equals matching from birth data.
+"""
+import sys
+sys.path.append('.')
+
+import asyncio
+from datetime import date, time
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.future import select
+
+from database import Base
+from models import User, Profile, ChartSnapshot
+from services.chart_snapshot import ChartSnapshotService
+from services.compute_dispatcher import ComputeDispatcher
+from services.matching_service import MatchingService
+from services.llm_provider import LLMClient, StubProvider
+
+
+def _profile(owner, name, birth_date, birth_time, lat, lng, tz="Asia/Kolkata"):
+    return Profile(owner_id=owner.id, name=name, gender="female", birth_date=birth_date, birth_time=birth_time,
+                   latitude=lat, longitude=lng, location_name="Test", timezone_id=tz, utc_offset=19800)
+
+
+async def _session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)()
+
+
+def _counting_run_cpu():
+    calls = []
+    original = ComputeDispatcher.run_cpu
+
+    async def run_cpu(fn, *args, **kwargs):
+        calls.append(fn.__name__)
+        return await original(fn, *args, **kwargs)
+    return calls, original, run_cpu
+
+
+def test_snapshot_lifecycle():
+    async def scenario():
+        db = await _session()
+        user = User(full_name="Owner")
+        db.add(user)
+        await db.commit()
+        profile = _profile(user, "Bride", date(1990, 5, 17), time(8, 45), 28.61, 77.21)
+        db.add(profile)
+        await db.commit()
+
+        calls, original, counting = _counting_run_cpu()
+        ComputeDispatcher.run_cpu = counting
+        try:
+            first = await ChartSnapshotService.get(db, profile)
+            again = await ChartSnapshotService.get(db, profile)
+            assert calls == ["compute_snapshot"]
+            assert first == again
+            assert first["moon"]["nakshatra"]["name"]
+            assert ChartSnapshotService.dasha_tree(first).period("maha", 0)["planet"]
+
+            # Birth time changed: the stored chart is stale and recomputed
+            profile.birth_time = time(20, 45)
+            await db.commit()
+            moved = await ChartSnapshotService.get(db, profile)
+            assert calls == ["compute_snapshot", "compute_snapshot"]
+            assert moved["sidereal"]["ascendant"] != first["sidereal"]["ascendant"]
+        finally:
+            ComputeDispatcher.run_cpu = original
+
+        rows = (await db.execute(select(ChartSnapshot))).scalars().all()
+        assert len(rows) == 1 and rows[0].engine_version == ChartSnapshotService.ENGINE_VERSION
+
+        await db.delete(profile)
+        await db.commit()
+        assert (await db.execute(select(ChartSnapshot))).scalars().all() == []
+        await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_match_from_snapshots_equals_birth_data():
+    async def scenario():
+        db = await _session()
+        user = User(full_name="Owner")
+        db.add(user)
+        await db.commit()
+        bride = _profile(user, "Bride", date(1992, 3, 4), time(6, 30), 19.07, 72.88)
+        groom = _profile(user, "Groom", date(1989, 11, 21), time(14, 10), 28.61, 77.21)
+        db.add_all([bride, groom])
+        await db.commit()
+        details = await ChartSnapshotService.details_with_snapshots(db, bride, groom)
+        await db.close()
+        return details
+
+    bride_details, groom_details = asyncio.run(scenario())
+    assert "snapshot" in bride_details and "snapshot" in groom_details
+
+    LLMClient.set_provider_override(StubProvider(reply="Stub analysis"))
+    try:
+        stored = MatchingService.calculate_ashta_koota(bride_details, groom_details)
+        plain = MatchingService.calculate_ashta_koota(
+            {k: v for k, v in bride_details.items() if k != "snapshot"},
+            {k: v for k, v in groom_details.items() if k != "snapshot"}
+        )
+    finally:
+        LLMClient.set_provider_override(None)
+
+    print(f"Score from snapshots {stored['total_score']}, from birth data {plain['total_score']}")
+    for key in ("total_score", "koota_details", "bride", "groom", "dasha_synchronization",
+                "navamsa_compatibility", "marriage_windows"):
+        assert stored[key] == plain[key], key
+
+
+if __name__ == "__main__":
+    test_snapshot_lifecycle()
+    test_match_from_snapshots_equals_birth_data()
+    ComputeDispatcher.shutdown()
+    print("Chart snapshots OK")
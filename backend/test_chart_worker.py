@@ -0,0 +1,64 @@
+"""
+Checks the worker-pool chart engine mode (CHART_ENGINE_MODE=process).
+"""
+import sys
+sys.path.append('.')
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services import chart_worker
+from services.chart_context import ChartContext
+from services.chart_worker import ChartWorkerPool
+from services.compute_dispatcher import ComputeDispatcher
+from services.skyfield_engine import SkyfieldService
+from services.vedic_astro_engine import VedicAstroEngine
+
+BIRTH = (1976, 11, 12, 18, 20, 23.67, 86.15)
+
+
+def worker_state():
+    return os.getpid(), chart_worker._IN_WORKER, SkyfieldService._planets is not None
+
+
+def test_workers_start_with_ephemeris_loaded():
+    try:
+        ComputeDispatcher.warm_up()
+        pid, in_worker, loaded = ComputeDispatcher.run_cpu_sync(worker_state)
+    finally:
+        ComputeDispatcher.shutdown()
+    assert pid != os.getpid()
+    assert in_worker and loaded
+
+
+def test_process_mode_matches_inline():
+    ChartContext.clear()
+    inline = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata")
+
+    ChartContext.clear()
+    ChartWorkerPool.MODE = "process"
+    try:
+        pooled = VedicAstroEngine.calculate_sidereal_planets(*BIRTH, timezone_str="Asia/Kolkata")
+
+        # Several reports' Skyfield passes at once, each in a worker process
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            charts = list(executor.map(
+                lambda year: VedicAstroEngine.calculate_sidereal_planets(year, 1, 1, 12, 0, 28.61, 77.21, timezone_str="UTC"),
+                range(2000, 2008)
+            ))
+        print(f"8 charts via worker pool: {time.time() - start:.2f}s")
+    finally:
+        ChartWorkerPool.MODE = "inline"
+        ComputeDispatcher.shutdown()
+        ChartContext.clear()
+
+    assert pooled == inline
+    assert len(charts) == 8 and all(c['planets'] for c in charts)
+
+
+if __name__ == "__main__":
+    test_workers_start_with_ephemeris_loaded()
+    test_process_mode_matches_inline()
+    print("Chart worker pool checks passed.")
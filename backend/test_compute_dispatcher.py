@@ -0,0 +1,60 @@
+"""
+Checks that ComputeDispatcher runs blocking work off the event loop.
+"""
+import sys
+sys.path.append('.')
+
+import os
+import time
+import asyncio
+import threading
+
+from services.compute_dispatcher import ComputeDispatcher
+from services.vedic_astro_engine import VedicAstroEngine
+
+
+def slow_call(seconds):
+    time.sleep(seconds)
+    return threading.current_thread().name
+
+
+def test_io_work_does_not_block_event_loop():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        name, _ = await asyncio.gather(ComputeDispatcher.run_io(slow_call, 0.2), ticker())
+        return name, ticks
+
+    name, ticks = asyncio.run(main())
+    print(f"I/O thread: {name}, loop ticks while waiting: {ticks}")
+    assert name.startswith("compute-io")
+    assert ticks == 5
+
+
+def test_cpu_work_runs_in_worker_process():
+    async def main():
+        pid = await ComputeDispatcher.run_cpu(os.getpid)
+        chart = await ComputeDispatcher.run_cpu(
+            VedicAstroEngine.calculate_sidereal_planets, 1976, 11, 12, 18, 20, 23.67, 86.15, timezone_str="Asia/Kolkata"
+        )
+        return pid, chart
+
+    try:
+        pid, chart = asyncio.run(main())
+    finally:
+        ComputeDispatcher.shutdown()
+
+    assert pid != os.getpid()
+    assert chart == VedicAstroEngine.calculate_sidereal_planets(1976, 11, 12, 18, 20, 23.67, 86.15, timezone_str="Asia/Kolkata")
+
+
+if __name__ == "__main__":
+    test_io_work_does_not_block_event_loop()
+    test_cpu_work_runs_in_worker_process()
+    print("ComputeDispatcher checks passed.")
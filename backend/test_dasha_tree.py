@@ -0,0 +1,78 @@
+"""
+Checks the array-backed Vimshottari DashaTree against a plain linear scan.
+"""
+import sys
+sys.path.append('.')
+
+import random
+from datetime import datetime, timedelta
+
+from services.dasha_tree import DashaTree
+from services.vedic_astro_engine import VedicAstroEngine
+from services.matching_service import MatchingService
+
+BIRTH = (1990, 5, 15, 10, 30, 28.61, 77.21, "Asia/Kolkata")
+
+
+def _linear_active(tree, when, level):
+    for i in range(len(tree.starts[level])):
+        period = tree.period(level, i)
+        if period['start'] <= when < period['end']:
+            return period
+    return None
+
+
+def test_bisect_matches_linear_scan():
+    tree = DashaTree.from_moon(123.456, datetime(1990, 5, 15, 10, 30))
+    random.seed(7)
+    for _ in range(200):
+        when = datetime(1990, 5, 15) + timedelta(days=random.uniform(-2000, 120 * 365))
+        for level in DashaTree.LEVELS:
+            assert tree.active(when, level) == _linear_active(tree, when, level), (when, level)
+
+    # Outside the tree there is no active period
+    assert tree.active(tree.cycle_start - timedelta(days=1)) is None
+
+
+def test_levels_nest_and_overlap():
+    tree = DashaTree.from_moon(300.0, datetime(1985, 1, 1))
+
+    # Nine children exactly fill each parent period
+    for upper, lower in zip(DashaTree.LEVELS, DashaTree.LEVELS[1:]):
+        for i in range(len(tree.starts[upper])):
+            assert abs(tree.starts[lower][9 * i] - tree.starts[upper][i]) < 1e-6
+            assert abs(tree.ends[lower][9 * i + 8] - tree.ends[upper][i]) < 1e-6
+
+    chain = tree.active_chain(datetime(2020, 6, 1))
+    antar = chain["antar"]
+    assert tree.parent_index(antar["index"]) == chain["maha"]["index"]
+
+    start, end = datetime(2020, 1, 1), datetime(2030, 1, 1)
+    expected = [tree.period("antar", i) for i in range(len(tree.starts["antar"]))
+                if tree.period("antar", i)['end'] > start and tree.period("antar", i)['start'] < end]
+    assert tree.overlapping(start, end, "antar") == expected
+
+
+def test_callers_share_one_tree():
+    tree = VedicAstroEngine.get_dasha_tree(*BIRTH)
+    assert VedicAstroEngine.get_dasha_tree(*BIRTH) is tree
+
+    dasha = VedicAstroEngine.calculate_vimshottari_dasha(*BIRTH)
+    current = tree.active(datetime.now(), "maha")
+    assert dasha['active_mahadasha'] == current['planet']
+    assert dasha['timeline'][0]['planet'] == current['planet'] and dasha['timeline'][0]['is_active']
+
+    year, month, day, hour, minute, lat, lng, tz = BIRTH
+    details = {"name": "Test", "year": year, "month": month, "day": day, "hour": hour, "minute": minute,
+               "lat": lat, "lng": lng, "timezone": tz}
+    assert MatchingService._dasha_tree(details) is tree
+    sync = MatchingService._analyze_dasha_synchronization(None, None, details, details)
+    print(f"Dasha sync: {sync}")
+    assert sync["bride_current_dasha"] == current['planet']
+
+
+if __name__ == "__main__":
+    test_bisect_matches_linear_scan()
+    test_levels_nest_and_overlap()
+    test_callers_share_one_tree()
+    print("Dasha tree checks passed.")
@@ -0,0 +1,136 @@
+"""
+Checks the precomputed daily horoscopes: batch generation, serving from the store and the per-profile layer.
+"""
+import sys
+sys.path.append('.')
+
+import os
+import json
+import datetime
+import tempfile
+
+from services.ai_cache import AIResponseCache
+from services.astrology_aggregator import AstrologyAggregator
+from services.horoscope_store import DailyHoroscopeStore
+from services.llm_provider import LLMClient, StubProvider
+
+GUIDANCE = {"prediction": "A calm, constructive day.", "lucky_number": 4, "lucky_color": "Blue", "mood": "Steady",
+            "energy_level": 4, "categories": {"love": {"title": "Love", "summary": "Warm", "details": ["a"], "status": "Good"}}}
+PROFILE = {"name": "Asha", "birth_date": "1990-05-15", "birth_time": "10:30", "latitude": 28.61, "longitude": 77.21}
+
+
+def _run(stub, fn):
+    AIResponseCache.clear()
+    LLMClient.set_provider_override(stub)
+    try:
+        return fn()
+    finally:
+        LLMClient.set_provider_override(None)
+        AIResponseCache.clear()
+
+
+def test_batch_covers_every_sign_and_language():
+    DailyHoroscopeStore.clear()
+    stub = StubProvider(reply=json.dumps(GUIDANCE))
+    summary = _run(stub, DailyHoroscopeStore.generate_day)
+    print(f"Batch: {summary}")
+
+    expected = 12 * len(DailyHoroscopeStore.LANGS)
+    assert summary["generated"] == summary["ai"] == expected
+    assert stub.calls == expected
+    assert DailyHoroscopeStore.pending() == []
+    assert DailyHoroscopeStore.transit_snapshot()["planets"]
+
+    # Nothing left to do: a second run is skipped
+    assert _run(stub, DailyHoroscopeStore.generate_day)["skipped"] is True
+
+    # Requests are served from the store: no LLM call, per-profile metrics layered on top
+    calls = stub.calls
+    generic = _run(stub, lambda: AstrologyAggregator.get_dynamic_horoscope("leo", lang="fr"))
+    personal = _run(stub, lambda: AstrologyAggregator.get_dynamic_horoscope("Leo", lang="fr", profile_data=PROFILE))
+    assert stub.calls == calls
+    assert generic["prediction"] == personal["prediction"] == GUIDANCE["prediction"]
+    for payload in (generic, personal):
+        assert payload["lucky_time"] and payload["lucky_direction"] and payload["gemstone_caution"]["risk_score"] > 0
+    assert generic["date"] == datetime.date.today().isoformat()
+    DailyHoroscopeStore.clear()
+
+
+def test_template_entries_are_retried():
+    DailyHoroscopeStore.clear()
+    summary = _run(StubProvider(fail=True), lambda: DailyHoroscopeStore.generate_day())
+    assert summary["template"] == summary["generated"] and summary["ai"] == 0
+    assert len(DailyHoroscopeStore.pending()) == 12 * len(DailyHoroscopeStore.LANGS)
+    fallback = DailyHoroscopeStore.get("Aries", "en")
+    assert fallback["source"] == AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE and fallback["categories"]
+
+    snapshot = DailyHoroscopeStore.transit_snapshot()
+    retry = _run(StubProvider(reply=json.dumps(GUIDANCE)), DailyHoroscopeStore.generate_day)
+    assert retry["ai"] == retry["generated"] and DailyHoroscopeStore.pending() == []
+    # The retry reuses the day's transit snapshot
+    assert DailyHoroscopeStore.transit_snapshot() is snapshot
+    DailyHoroscopeStore.clear()
+
+
+def test_personal_context_bypasses_the_store():
+    DailyHoroscopeStore.clear()
+    stub = StubProvider(reply=json.dumps(GUIDANCE))
+    _run(stub, DailyHoroscopeStore.generate_day)
+    calls = stub.calls
+    _run(stub, lambda: AstrologyAggregator.get_dynamic_horoscope("Leo", context={"profession": "Teacher"}))
+    assert stub.calls == calls + 1
+    DailyHoroscopeStore.clear()
+
+
+def test_sqlite_tier_is_shared_and_claimed_once():
+    path = os.path.join(tempfile.mkdtemp(), "horoscopes.db")
+    original = DailyHoroscopeStore.DB_PATH
+    DailyHoroscopeStore.DB_PATH = path
+    DailyHoroscopeStore._db_initialized = False
+    try:
+        DailyHoroscopeStore.clear()
+        _run(StubProvider(reply=json.dumps(GUIDANCE)), DailyHoroscopeStore.generate_day)
+        DailyHoroscopeStore._memory.clear()  # another worker
+        assert DailyHoroscopeStore.get("Virgo", "hi")["prediction"] == GUIDANCE["prediction"]
+        assert DailyHoroscopeStore._claim("2030-01-01") is True
+        assert DailyHoroscopeStore._claim("2030-01-01") is False
+    finally:
+        DailyHoroscopeStore.clear()
+        DailyHoroscopeStore.DB_PATH = original
+        DailyHoroscopeStore._db_initialized = False
+
+
+def test_retry_reaches_the_other_worker():
+    path = os.path.join(tempfile.mkdtemp(), "horoscopes.db")
+    original, retry_seconds = DailyHoroscopeStore.DB_PATH, DailyHoroscopeStore.RETRY_SECONDS
+    DailyHoroscopeStore.DB_PATH = path
+    DailyHoroscopeStore._db_initialized = False
+    try:
+        DailyHoroscopeStore.clear()
+        # Worker A owns the run and falls back to the template
+        _run(StubProvider(fail=True), DailyHoroscopeStore.generate_day)
+        # Worker B serves the template from SQLite
+        DailyHoroscopeStore._memory.clear()
+        assert DailyHoroscopeStore.get("Leo", "en")["source"] == AstrologyAggregator.HOROSCOPE_TEMPLATE_SOURCE
+        worker_b = dict(DailyHoroscopeStore._memory)
+
+        # Worker A retries; worker B's memory tier is unaware of it
+        DailyHoroscopeStore.RETRY_SECONDS = 0
+        retry = _run(StubProvider(reply=json.dumps(GUIDANCE)), DailyHoroscopeStore.generate_day)
+        assert retry["ai"] == retry["generated"]
+        DailyHoroscopeStore._memory.clear()
+        DailyHoroscopeStore._memory.update(worker_b)
+        assert DailyHoroscopeStore.get("Leo", "en")["prediction"] == GUIDANCE["prediction"]
+    finally:
+        DailyHoroscopeStore.clear()
+        DailyHoroscopeStore.DB_PATH, DailyHoroscopeStore.RETRY_SECONDS = original, retry_seconds
+        DailyHoroscopeStore._db_initialized = False
+
+
+if __name__ == "__main__":
+    test_batch_covers_every_sign_and_language()
+    test_template_entries_are_retried()
+    test_personal_context_bypasses_the_store()
+    test_sqlite_tier_is_shared_and_claimed_once()
+    test_retry_reaches_the_other_worker()
+    print("Daily horoscope store checks passed.")
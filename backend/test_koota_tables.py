@@ -0,0 +1,81 @@
+"""
+Regression test for the precomputed Ashta-Koota tables: every cell matches the per-pair
+MatchingService._calc_* rules, the combined quarter table matches the per-koota tables,
+and the table totals are pinned so a rule change cannot slip through unnoticed.
+"""
+import sys
+import time
+sys.path.append('.')
+
+import numpy as np
+
+from services.koota_tables import KootaTables
+from services.matching_service import MatchingService
+
+RULES = {
+    "Varna": MatchingService._calc_varna, "Vashya": MatchingService._calc_vashya,
+    "Tara": MatchingService._calc_tara, "Yoni": MatchingService._calc_yoni,
+    "Graha Maitri": MatchingService._calc_maitri, "Gana": MatchingService._calc_gana,
+    "Bhakoot": MatchingService._calc_bhakoot, "Nadi": MatchingService._calc_nadi
+}
+
+# Sum of every table (and of TOTAL in half points) when the tables were introduced
+PINNED_SUMS = {"Varna": 90.0, "Vashya": 160.0, "Tara": 1215.0, "Yoni": 1468.0, "Graha Maitri": 406.0,
+               "Gana": 2678.0, "Bhakoot": 504.0, "Nadi": 3888.0}
+PINNED_TOTAL_HALF_POINTS = 483888
+
+
+def _label(name, kind, idx):
+    return KootaTables.attributes(idx if kind == "nakshatra" else 0, idx if kind == "rashi" else 0)[name]
+
+
+def test_tables_match_rules():
+    for name, kind, max_points in KootaTables.KOOTAS:
+        size = 12 if kind == "rashi" else 27
+        table = KootaTables.POINTS[name]
+        assert table.shape == (size, size)
+        for b in range(size):
+            for g in range(size):
+                result = RULES[name](b, g)
+                expected = result[0] if isinstance(result, tuple) else result
+                assert table[b, g] == expected, f"{name}[{b}, {g}]: {table[b, g]} != {expected}"
+                if isinstance(result, tuple):
+                    # Labels: bride's attribute second, groom's third
+                    assert result[1:] == (_label(name, kind, b), _label(name, kind, g))
+        assert table.max() <= max_points
+
+
+def test_pinned_totals():
+    assert {name: float(t.sum()) for name, t in KootaTables.POINTS.items()} == PINNED_SUMS
+    assert int(KootaTables.TOTAL.sum(dtype=np.int64)) == PINNED_TOTAL_HALF_POINTS
+    assert KootaTables.TOTAL.shape == (108, 108) and KootaTables.TOTAL.dtype == np.uint8
+
+
+def test_score_is_sum_of_kootas():
+    for bq in range(0, 108, 5):
+        for gq in range(108):
+            b_nak, b_pada, g_nak, g_pada = bq // 4, bq % 4 + 1, gq // 4, gq % 4 + 1
+            points = KootaTables.koota_points(b_nak, bq // 9, g_nak, gq // 9)
+            assert KootaTables.score(b_nak, g_nak, b_pada, g_pada) == sum(float(p) for p in points.values())
+    assert KootaTables.score(0, 0) == 28.0
+
+
+def test_vectorized_score():
+    rng = np.random.default_rng(7)
+    b_nak, g_nak = rng.integers(0, 27, 10000), rng.integers(0, 27, 10000)
+    b_pada, g_pada = rng.integers(1, 5, 10000), rng.integers(1, 5, 10000)
+    started = time.perf_counter()
+    scores = KootaTables.score(b_nak, g_nak, b_pada, g_pada)
+    elapsed = time.perf_counter() - started
+    print(f"10000 pairs scored in {elapsed * 1000:.2f} ms")
+    assert scores.shape == (10000,)
+    assert scores[42] == KootaTables.score(int(b_nak[42]), int(g_nak[42]), int(b_pada[42]), int(g_pada[42]))
+    assert scores.min() >= 0 and scores.max() <= 36
+
+
+if __name__ == "__main__":
+    test_tables_match_rules()
+    test_pinned_totals()
+    test_score_is_sum_of_kootas()
+    test_vectorized_score()
+    print("Koota tables OK")
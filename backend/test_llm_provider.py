@@ -0,0 +1,123 @@
+"""
+Checks the LLM chain: failover, hedging, deadlines and JSON handling, using offline stub providers.
+"""
+import sys
+sys.path.append('.')
+
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from services.llm_provider import LLMClient, LLMError, StubProvider, parse_json_text
+
+PRIMARY, FAST, GEMINI = "llama-3.3-70b-versatile", "llama-3.1-8b-instant", "gemini-1.5-flash"
+
+
+def _with_stubs(stubs, fn):
+    LLMClient.set_provider_override(stubs)
+    try:
+        return fn()
+    finally:
+        LLMClient.set_provider_override(None)
+
+
+def test_failover_moves_on_immediately():
+    stubs = {PRIMARY: StubProvider(PRIMARY, fail=True), FAST: StubProvider(FAST, reply="fast answer"),
+             GEMINI: StubProvider(GEMINI, reply="gemini answer")}
+    started = time.perf_counter()
+    answer = _with_stubs(stubs, lambda: LLMClient.complete("hi", chain="quality", hedge_ms=0))
+    assert answer == "fast answer"
+    assert stubs[GEMINI].calls == 0
+    assert time.perf_counter() - started < 1.0
+
+
+def test_hedge_fires_fast_model_for_slow_primary():
+    stubs = {PRIMARY: StubProvider(PRIMARY, reply="slow answer", delay=2.0), FAST: StubProvider(FAST, reply="fast answer", delay=0.05),
+             GEMINI: StubProvider(GEMINI, fail=True)}
+    before = LLMClient.stats()["hedged"]
+    started = time.perf_counter()
+    answer = _with_stubs(stubs, lambda: LLMClient.complete("hi", chain="quality", hedge_ms=100))
+    elapsed = time.perf_counter() - started
+    print(f"Hedged answer in {elapsed:.2f}s: {LLMClient.stats()}")
+    assert answer == "fast answer"
+    assert elapsed < 1.0
+    assert LLMClient.stats()["hedged"] >= before + 1
+
+    # Without hedging the chain waits for the primary
+    stubs[PRIMARY].delay = 0.3
+    assert _with_stubs(stubs, lambda: LLMClient.complete("hi", chain="quality", hedge_ms=0)) == "slow answer"
+
+
+def test_deadline_bounds_the_whole_chain():
+    stubs = {PRIMARY: StubProvider(PRIMARY, delay=5.0), FAST: StubProvider(FAST, delay=5.0), GEMINI: StubProvider(GEMINI, delay=5.0)}
+    started = time.perf_counter()
+    try:
+        _with_stubs(stubs, lambda: LLMClient.complete("hi", chain="quality", deadline=0.3, hedge_ms=0))
+        assert False, "expected LLMError"
+    except LLMError as e:
+        print(f"Deadline error: {e}")
+    assert time.perf_counter() - started < 1.5
+
+
+def test_json_mode_skips_malformed_answers():
+    stubs = {FAST: StubProvider(FAST, reply="not json at all"), PRIMARY: StubProvider(PRIMARY, reply='Sure! ```json\n{"ok": 1}\n```')}
+    assert _with_stubs(stubs, lambda: LLMClient.complete("hi", chain="fast", json_mode=True)) == {"ok": 1}
+    assert parse_json_text('prefix {"a": [1, 2]} suffix') == {"a": [1, 2]}
+
+
+def test_async_entry_point():
+    stub = StubProvider(reply="async answer")
+
+    async def ask():
+        return await asyncio.gather(*[LLMClient.complete_async(f"hi {i}", chain="chat") for i in range(5)])
+
+    answers = _with_stubs(stub, lambda: asyncio.run(ask()))
+    assert answers == ["async answer"] * 5 and stub.calls == 5
+
+
+def _complete_in_child():
+    return LLMClient.complete("hi", chain="chat", deadline=2)
+
+
+def test_forked_child_gets_its_own_loop():
+    # The parent's loop thread does not survive a fork; the child must not wait on it
+    stub = StubProvider(reply="ok")
+
+    def run():
+        assert LLMClient.complete("hi", chain="chat") == "ok"
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as pool:
+            return pool.submit(_complete_in_child).result(timeout=10)
+
+    assert _with_stubs(stub, run) == "ok"
+
+
+def test_lost_loop_raises_instead_of_hanging():
+    stub = StubProvider(reply="never")
+    grace = LLMClient.WAIT_GRACE_SECONDS
+    with LLMClient._loop_lock:
+        live, LLMClient._loop = LLMClient._loop, asyncio.new_event_loop()  # nobody runs this one
+    LLMClient.WAIT_GRACE_SECONDS = 0.1
+    started = time.perf_counter()
+    try:
+        _with_stubs(stub, lambda: LLMClient.complete("hi", chain="chat", deadline=0.2))
+        assert False, "expected LLMError"
+    except LLMError as e:
+        print(f"Lost loop error: {e}")
+    finally:
+        LLMClient.WAIT_GRACE_SECONDS = grace
+        with LLMClient._loop_lock:
+            LLMClient._loop.close()
+            LLMClient._loop = live
+    assert time.perf_counter() - started < 1.5
+
+
+if __name__ == "__main__":
+    test_failover_moves_on_immediately()
+    test_hedge_fires_fast_model_for_slow_primary()
+    test_deadline_bounds_the_whole_chain()
+    test_json_mode_skips_malformed_answers()
+    test_async_entry_point()
+    test_forked_child_gets_its_own_loop()
+    test_lost_loop_raises_instead_of_hanging()
+    print("LLM provider checks passed.")
@@ -0,0 +1,170 @@
+"""
+Checks batch Kundali matching: table-based ranking agrees with the full pair matcher in both
+roles, results are ordered, and /api/kundali-match/batch ranks the current user's saved profiles
+(the match routes never read or write charts of other users' profiles).
+"""
+import sys
+sys.path.append('.')
+
+from datetime import date, time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, get_db
+from sqlalchemy.future import select
+from models import User, Profile, ChartSnapshot
+from routers import vedastro_router
+from routers.auth_router import get_current_user
+from services.compute_dispatcher import ComputeDispatcher
+from services.matching_service import MatchingService
+from services.llm_provider import LLMClient, StubProvider
+
+BASE = {"name": "Asha", "year": 1992, "month": 3, "day": 4, "hour": 6, "minute": 30,
+        "lat": 19.07, "lng": 72.88, "timezone": "Asia/Kolkata"}
+CANDIDATES = [
+    {"profile_id": f"c{i}", "name": f"Candidate {i}", "year": 1985 + i, "month": 1 + i, "day": 3 + 2 * i,
+     "hour": (5 + 3 * i) % 24, "minute": 10, "lat": 28.61, "lng": 77.21, "timezone": "Asia/Kolkata"}
+    for i in range(8)
+]
+
+
+def test_ranking_matches_pair_matcher():
+    LLMClient.set_provider_override(StubProvider(reply="Stub analysis"))
+    try:
+        for role in ("bride", "groom"):
+            ranked = MatchingService.rank_candidates(BASE, CANDIDATES, base_role=role)
+            assert len(ranked) == len(CANDIDATES)
+            totals = [r["total_score"] for r in ranked]
+            print(f"{role}: {[(r['profile_id'], r['total_score']) for r in ranked]}")
+            assert totals == sorted(totals, reverse=True)
+
+            by_id = {c["profile_id"]: c for c in CANDIDATES}
+            for entry in ranked:
+                other = by_id[entry["profile_id"]]
+                pair = (BASE, other) if role == "bride" else (other, BASE)
+                full = MatchingService.calculate_ashta_koota(*pair)
+                assert entry["total_score"] == full["total_score"]
+                assert [k["points"] for k in entry["koota_details"]] == [k["points"] for k in full["koota_details"]]
+    finally:
+        LLMClient.set_provider_override(None)
+
+
+def test_limit():
+    assert len(MatchingService.rank_candidates(BASE, CANDIDATES, limit=3)) == 3
+    assert MatchingService.rank_candidates(BASE, []) == []
+
+
+def test_dhanishta_moon_is_scored_as_dhanishta():
+    # Moon in Dhanishta (Aquarius); the name lookup this replaced scored it as Ashwini
+    bride = dict(BASE, day=3)
+    match_result, _ = MatchingService.calculate_match_data(bride, CANDIDATES[0])
+    assert match_result["bride"]["nakshatra"] == "Dhanishta"
+    kootas = {k["name"]: k for k in match_result["koota_details"]}
+    assert (kootas["Yoni"]["bride_val"], kootas["Gana"]["bride_val"], kootas["Nadi"]["bride_val"]) == ("Lion", "Rakshasa", "Madhya")
+
+    ranked = MatchingService.rank_candidates(bride, [CANDIDATES[0]])
+    assert ranked[0]["total_score"] == match_result["total_score"]
+    assert [k["points"] for k in ranked[0]["koota_details"]] == [k["points"] for k in match_result["koota_details"]]
+
+
+def test_match_data_leaves_ai_to_caller():
+    # Routes compute the match on the compute pool and the AI analysis on the I/O pool
+    import asyncio
+    LLMClient.set_provider_override(StubProvider(reply="Stub analysis"))
+    try:
+        match_result, ai_inputs = MatchingService.calculate_match_data(BASE, CANDIDATES[0])
+        assert match_result["ai_analysis"] is None
+        full = MatchingService.calculate_ashta_koota(BASE, CANDIDATES[0])
+        assert full == dict(match_result, ai_analysis="Stub analysis")
+        assert MatchingService.generate_ai_analysis(**ai_inputs) == "Stub analysis"
+
+        routed = asyncio.run(vedastro_router._calculate_match(BASE, CANDIDATES[0], "en"))
+        assert routed == full
+    finally:
+        LLMClient.set_provider_override(None)
+
+
+def test_batch_endpoint():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_db():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(vedastro_router.router)
+    app.dependency_overrides[get_db] = override_db
+    users = {}
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            user, other = User(full_name="Owner"), User(full_name="Someone else")
+            db.add_all([user, other])
+            await db.commit()
+            users.update(owner=user, other=other)
+            rows = [Profile(id="base", owner_id=user.id, name="Asha", gender="female", birth_date=date(1992, 3, 4),
+                            birth_time=time(6, 30), latitude=19.07, longitude=72.88, timezone_id="Asia/Kolkata")]
+            for c in CANDIDATES[:4]:
+                rows.append(Profile(id=c["profile_id"], owner_id=user.id, name=c["name"], gender="male",
+                                    birth_date=date(c["year"], c["month"], c["day"]), birth_time=time(c["hour"], c["minute"]),
+                                    latitude=c["lat"], longitude=c["lng"], timezone_id=c["timezone"]))
+            c = CANDIDATES[4]
+            rows.append(Profile(id="foreign", owner_id=other.id, name=c["name"], gender="male",
+                                birth_date=date(c["year"], c["month"], c["day"]), birth_time=time(c["hour"], c["minute"]),
+                                latitude=c["lat"], longitude=c["lng"], timezone_id=c["timezone"]))
+            db.add_all(rows)
+            await db.commit()
+
+    client = TestClient(app)
+    import asyncio
+    asyncio.run(seed())
+    app.dependency_overrides[get_current_user] = lambda: users["owner"]
+
+    body = client.post("/api/kundali-match/batch", json={
+        "profile_id": "base", "candidate_ids": ["c0", "c1", "c2", "c3", "nope", "foreign", "base"]
+    }).json()
+    print(f"Batch: {[(r['profile_id'], r['total_score']) for r in body['results']]}")
+    assert body["role"] == "bride"
+    # Another user's profile is neither scored nor revealed
+    assert body["missing_ids"] == ["nope", "foreign"]
+    assert [r["profile_id"] for r in body["results"]] == \
+        [r["profile_id"] for r in MatchingService.rank_candidates(BASE, CANDIDATES[:4])]
+    assert body["results"][0]["match_request"] == {"bride_id": "base", "groom_id": body["results"][0]["profile_id"]}
+
+    assert client.post("/api/kundali-match/batch", json={"profile_id": "base", "candidate_ids": []}).status_code == 400
+
+    # Someone else's base profile is not found, and no snapshot gets written for it
+    app.dependency_overrides[get_current_user] = lambda: users["other"]
+    assert client.post("/api/kundali-match/batch", json={"profile_id": "base", "candidate_ids": ["foreign"]}).status_code == 404
+    del app.dependency_overrides[get_current_user]
+    assert client.post("/api/kundali-match/batch", json={"profile_id": "base", "candidate_ids": ["c0"]}).status_code == 401
+
+    # The pair routes are scoped the same way
+    pair = {"bride_id": "base", "groom_id": "foreign"}
+    for path in ("/api/kundali-match", "/api/kundali-match/pdf"):
+        assert client.post(path, json=pair).status_code == 401
+        app.dependency_overrides[get_current_user] = lambda: users["owner"]
+        assert client.post(path, json=pair).status_code == 404
+        del app.dependency_overrides[get_current_user]
+
+    async def snapshot_ids():
+        async with session_factory() as db:
+            result = await db.execute(select(ChartSnapshot.profile_id))
+            return set(result.scalars().all())
+    assert "foreign" not in asyncio.run(snapshot_ids())
+
+
+if __name__ == "__main__":
+    test_ranking_matches_pair_matcher()
+    test_limit()
+    test_dhanishta_moon_is_scored_as_dhanishta()
+    test_match_data_leaves_ai_to_caller()
+    test_batch_endpoint()
+    ComputeDispatcher.shutdown()
+    print("Batch matching OK")
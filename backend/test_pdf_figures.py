@@ -0,0 +1,104 @@
+"""
+Checks the chart figures of the consolidated PDF: vector charts by default, the parallel PNG pipeline
+(compute pool, inline fallback, placeholders for failed figures) and the per-section timings.
+"""
+import sys
+sys.path.append('.')
+
+from services.compute_dispatcher import ComputeDispatcher
+from services.pdf_service import PDFReportService
+from services.report_figures import FigureBatch
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+
+def _report():
+    planets = [{"name": p, "sign": SIGNS[i], "position": 12.5, "house": i + 1} for i, p in enumerate(PLANETS)]
+    d9 = [{"name": p, "sign": SIGNS[(i * 5) % 12], "house": (i * 5) % 12 + 1} for i, p in enumerate(PLANETS)]
+    return {
+        "profile": {"name": "Test", "dob": "2000-01-01", "tob": "12:00", "place": "Delhi",
+                    "coordinates": {"lat": 28.61, "lng": 77.21}},
+        "vedic_astrology": {
+            "planets": planets,
+            "ascendant": {"sign": "Leo", "longitude": 131.2},
+            "divisional_charts": {"D9": d9},
+        },
+        "astrocartography": [{"city": "Paris", "lat": 48.85, "lng": 2.35, "planet": "Venus", "effect": "Harmony"}],
+    }
+
+
+FIGURES = {"lagna_north", "lagna_south", "navamsa_north", "navamsa_south", "astro_map"}
+
+
+def _build(parallel=True, chart_format="png"):
+    saved = FigureBatch.PARALLEL, FigureBatch.FORMAT
+    FigureBatch.PARALLEL, FigureBatch.FORMAT = parallel, chart_format
+    try:
+        timings = {}
+        pdf = PDFReportService.generate_pdf_report(_report(), timings=timings).getvalue()
+        return pdf, timings
+    finally:
+        FigureBatch.PARALLEL, FigureBatch.FORMAT = saved
+
+
+def test_vector_charts_embed_no_images():
+    vector_pdf, timings = _build(chart_format="vector")
+    png_pdf, _ = _build(parallel=False)
+    print(f"Vector PDF {len(vector_pdf)} bytes, PNG PDF {len(png_pdf)} bytes; timings {timings}")
+
+    assert vector_pdf.startswith(b"%PDF")
+    assert set(timings["figures"]) == FIGURES
+    assert b"/Subtype /Image" not in vector_pdf
+    assert b"/Subtype /Image" in png_pdf
+    assert len(vector_pdf) < len(png_pdf)
+
+
+def test_parallel_figures_match_inline():
+    parallel_pdf, timings = _build(parallel=True)
+    inline_pdf, inline_timings = _build(parallel=False)
+    print(f"Parallel: {timings}")
+    print(f"Inline: {inline_timings}")
+
+    assert parallel_pdf.startswith(b"%PDF")
+    assert set(timings["figures"]) == FIGURES
+    assert all(t["render"] > 0 for t in timings["figures"].values())
+    for section in ("story", "layout", "figure_wait", "total"):
+        assert timings[section] >= 0
+    assert timings["total"] >= timings["story"]
+    # Same figures, drawn the same way: the documents only differ in their timestamps/ids
+    assert abs(len(parallel_pdf) - len(inline_pdf)) < 200
+
+
+def test_broken_pool_falls_back_inline():
+    batch = FigureBatch()
+    batch.FORMAT = "png"
+    batch.submit("south", "south", [{"planet": "Sun", "sign_id": 1, "degree": "10"}])
+    kind, data, future = batch._jobs["south"]
+    if future is not None:
+        future.cancel()
+        future.result = lambda: (_ for _ in ()).throw(RuntimeError("worker died"))
+    png = batch.result("south")
+    assert png.startswith(b"\x89PNG")
+    assert batch.timings["south"]["render"] > 0
+
+
+def test_failed_figure_is_a_placeholder():
+    batch = FigureBatch()
+    batch._jobs["broken"] = ("no_such_kind", {}, None)
+    assert batch.result("broken") is None
+    try:
+        batch.image("missing", 10, 10)
+        assert False, "unknown figures must raise"
+    except KeyError:
+        pass
+
+
+if __name__ == "__main__":
+    test_vector_charts_embed_no_images()
+    test_parallel_figures_match_inline()
+    test_broken_pool_falls_back_inline()
+    test_failed_figure_is_a_placeholder()
+    ComputeDispatcher.shutdown()
+    print("PDF figure pipeline OK")
@@ -0,0 +1,97 @@
+"""
+Checks provider rate limiting, priority queueing and single-flight coalescing of LLM calls.
+"""
+import sys
+sys.path.append('.')
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from services.rate_limiter import TokenBucketLimiter, RateLimited
+from services.llm_provider import LLMClient, StubProvider
+
+PRIMARY, FAST = "llama-3.3-70b-versatile", "llama-3.1-8b-instant"
+
+
+def test_bucket_grants_burst_then_refills_in_priority_order():
+    async def run():
+        limiter = TokenBucketLimiter("test", per_minute=600, burst=2)  # one token per 0.1 s
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(priority, timeout=2)
+            order.append(name)
+
+        started = time.monotonic()
+        await asyncio.gather(call("burst-1", 1), call("burst-2", 1))
+        assert time.monotonic() - started < 0.05
+
+        # Queued in the order free, free, paid - the paid call is let through first
+        await asyncio.gather(call("free-1", 1), call("free-2", 1), call("paid", 0))
+        return order, time.monotonic() - started, limiter
+
+    order, elapsed, limiter = asyncio.run(run())
+    print(f"Grant order: {order} in {elapsed:.2f}s, {limiter.snapshot()}")
+    assert order == ["burst-1", "burst-2", "paid", "free-1", "free-2"]
+    assert 0.25 < elapsed < 0.6
+
+
+def test_long_queue_is_rejected_up_front():
+    async def run():
+        limiter = TokenBucketLimiter("test", per_minute=60, burst=1)
+        await limiter.acquire(timeout=1)
+        started = time.monotonic()
+        try:
+            await limiter.acquire(timeout=0.2)
+            assert False, "expected RateLimited"
+        except RateLimited:
+            pass
+        return time.monotonic() - started, limiter
+
+    waited, limiter = asyncio.run(run())
+    assert waited < 0.05 and limiter.stats["rejected"] == 1
+
+
+def test_identical_concurrent_requests_share_one_call():
+    stub = StubProvider(reply='{"prediction": "calm day"}', delay=0.2)
+    LLMClient.set_provider_override(stub)
+    before = LLMClient.stats()["coalesced"]
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            answers = list(pool.map(lambda _: LLMClient.complete("Leo daily", chain="groq", json_mode=True), range(8)))
+    finally:
+        LLMClient.set_provider_override(None)
+
+    assert stub.calls == 1
+    assert all(a == {"prediction": "calm day"} for a in answers)
+    answers[0]["prediction"] = "mutated"
+    assert answers[1]["prediction"] == "calm day"  # every caller gets its own copy
+    assert LLMClient.stats()["coalesced"] == before + 7
+
+
+def test_throttled_primary_fails_over_instead_of_waiting():
+    stubs = {PRIMARY: StubProvider(PRIMARY, reply="primary"), FAST: StubProvider(FAST, reply="fast")}
+    LLMClient.RATE_LIMITS["stub:" + PRIMARY] = 1  # one request per minute
+    LLMClient.set_provider_override(stubs)
+    try:
+        first = LLMClient.complete("question 1", chain="chat", hedge_ms=0, deadline=2)
+        started = time.perf_counter()
+        second = LLMClient.complete("question 2", chain="chat", hedge_ms=0, deadline=2)
+        elapsed = time.perf_counter() - started
+    finally:
+        LLMClient.set_provider_override(None)
+        del LLMClient.RATE_LIMITS["stub:" + PRIMARY]
+        LLMClient._limiters.pop("stub:" + PRIMARY, None)
+
+    assert (first, second) == ("primary", "fast")
+    assert elapsed < 0.5
+    assert LLMClient.priority_for("Premium") < LLMClient.priority_for("free") == LLMClient.priority_for(None)
+
+
+if __name__ == "__main__":
+    test_bucket_grants_burst_then_refills_in_priority_order()
+    test_long_queue_is_rejected_up_front()
+    test_identical_concurrent_requests_share_one_call()
+    test_throttled_primary_fails_over_instead_of_waiting()
+    print("Rate limiter checks passed.")
@@ -0,0 +1,105 @@
+"""
+Checks the bundled AI synthesis of the consolidated report (one LLM request, per-section fallback).
+"""
+import sys
+sys.path.append('.')
+
+import json
+
+from services.ai_cache import AIResponseCache
+from services.llm_provider import LLMClient, StubProvider
+from services.ai_service import validate_bundle_section
+from generate_report import ReportGenerator
+
+BIRTH = ("Test User", 1990, 5, 15, 10, 30, "New Delhi", 28.61, 77.21, "Asia/Kolkata")
+LONG_TEXT = "A steady, thoughtful paragraph that is long enough to count as a real answer."
+
+VEDIC_SUMMARY = {k: {"title": k, "content": LONG_TEXT} for k in
+                 ["personality_analysis", "emotional_core", "career_path", "relationships", "life_phase", "dosha_check", "remedies"]}
+PERSONALITY = {"overall_personality": [LONG_TEXT], "manglik_status": "None", "pitru_dosha_status": "None",
+               "emotional_nature": LONG_TEXT, "strengths": ["Focus"], "challenges": ["Rest"], "life_theme": LONG_TEXT}
+RELATIONSHIP = {"ideal_partner": "Kind", "marriage_outlook": "Warm", "compatibility_style": "Open",
+                "challenges": ["Patience"], "relationship_tip": "Listen"}
+
+
+def _stub(bundle):
+    prompts = []
+
+    def reply(prompt, json_mode):
+        prompts.append(prompt)
+        if "exactly these top-level keys" in prompt:
+            return json.dumps(bundle)
+        if json_mode:
+            return json.dumps(dict(PERSONALITY, **RELATIONSHIP, fallback=True))
+        return "Standalone " + LONG_TEXT
+
+    return StubProvider(reply=reply), prompts
+
+
+def _report(stub, mode):
+    AIResponseCache.clear()
+    LLMClient.set_provider_override(stub)
+    original_mode = ReportGenerator.AI_MODE
+    ReportGenerator.AI_MODE = mode
+    try:
+        return ReportGenerator.generate_consolidated_report(*BIRTH)
+    finally:
+        ReportGenerator.AI_MODE = original_mode
+        LLMClient.set_provider_override(None)
+        AIResponseCache.clear()
+
+
+def test_full_bundle_is_one_request():
+    stub, prompts = _stub({
+        "vedic_summary": VEDIC_SUMMARY, "personality": PERSONALITY, "relationship": RELATIONSHIP,
+        "executive_summary": "Executive " + LONG_TEXT, "numerology_insights": "Numbers " + LONG_TEXT
+    })
+    report = _report(stub, "bundle")
+
+    print(f"Bundle mode LLM requests: {stub.calls}")
+    assert stub.calls == 1
+    vedic = report["vedic_astrology"]
+    assert vedic["ai_summary"] == VEDIC_SUMMARY
+    assert vedic["vedic_personality_analysis"] == PERSONALITY
+    assert vedic["relationship_analysis"] == RELATIONSHIP
+    assert report["predictions_summary"]["best_prediction"] == "Executive " + LONG_TEXT
+    assert report["numerology"]["ai_insights"] == "Numbers " + LONG_TEXT
+
+
+def test_missing_sections_fall_back_individually():
+    broken_personality = dict(PERSONALITY, overall_personality=None)
+    stub, prompts = _stub({
+        "vedic_summary": VEDIC_SUMMARY, "personality": broken_personality,
+        "executive_summary": "Executive " + LONG_TEXT, "numerology_insights": "Numbers " + LONG_TEXT
+    })
+    report = _report(stub, "bundle")
+
+    # The bundle plus the personality and relationship generators
+    assert stub.calls == 3
+    vedic = report["vedic_astrology"]
+    assert vedic["ai_summary"] == VEDIC_SUMMARY
+    assert vedic["vedic_personality_analysis"]["fallback"] is True
+    assert vedic["relationship_analysis"]["fallback"] is True
+
+
+def test_separate_mode_sends_one_request_per_generator():
+    stub, _ = _stub({})
+    _report(stub, "separate")
+    print(f"Separate mode LLM requests: {stub.calls}")
+    assert stub.calls >= 4
+
+
+def test_section_validation():
+    assert validate_bundle_section("vedic_summary", VEDIC_SUMMARY)
+    assert not validate_bundle_section("vedic_summary", dict(VEDIC_SUMMARY, remedies={"title": "x"}))
+    assert not validate_bundle_section("relationship", {"ideal_partner": "Kind"})
+    assert not validate_bundle_section("executive_summary", "")
+    assert not validate_bundle_section("executive_summary", {"text": LONG_TEXT})
+
+
+if __name__ == "__main__":
+    test_full_bundle_is_one_request()
+    test_missing_sections_fall_back_individually()
+    test_separate_mode_sends_one_request_per_generator()
+    test_section_validation()
+    print("Report bundle checks passed.")
@@ -0,0 +1,79 @@
+"""
+Checks the offline timezone resolver: boundary lookups for known places, the nautical fallback,
+historical UTC offsets (DST, pre-1945 zones) and the zone defaults the chart engines rely on.
+"""
+import sys
+import time
+sys.path.append('.')
+
+from services.timezone_index import TimezoneIndex
+from services.timezone_service import TimezoneService
+
+PLACES = [
+    ("Delhi", 28.61, 77.21, "Asia/Kolkata"),
+    ("Kathmandu", 27.72, 85.32, "Asia/Kathmandu"),
+    ("Dhaka", 23.81, 90.41, "Asia/Dhaka"),
+    ("London", 51.51, -0.13, "Europe/London"),
+    ("New York", 40.71, -74.01, "America/New_York"),
+    ("Phoenix", 33.45, -112.07, "America/Phoenix"),
+    ("Sydney", -33.87, 151.21, "Australia/Sydney"),
+    ("Sao Paulo", -23.55, -46.63, "America/Sao_Paulo"),
+]
+
+
+def test_known_places():
+    for name, lat, lng, expected in PLACES:
+        zone = TimezoneIndex.timezone_at(lat, lng)
+        print(f"{name}: {zone}")
+        assert zone == expected, f"{name}: {zone} != {expected}"
+
+
+def test_open_ocean_is_nautical():
+    zone = TimezoneIndex.timezone_at(0.0, -150.0)
+    assert zone.startswith("Etc/GMT"), zone
+    assert TimezoneIndex.nautical_zone(82.5) == "Etc/GMT-6"
+    assert TimezoneIndex.nautical_zone(-75.0) == "Etc/GMT+5"
+    assert TimezoneIndex.nautical_zone(3.0) == "Etc/GMT"
+
+
+def test_lookup_is_fast():
+    TimezoneIndex.timezone_at(28.61, 77.21)  # load
+    started = time.perf_counter()
+    for i in range(500):
+        TimezoneIndex.timezone_at(10.0 + i * 0.05, 70.0 + i * 0.03)
+    per_lookup = (time.perf_counter() - started) / 500
+    print(f"Uncached lookup: {per_lookup * 1e6:.0f} us")
+    assert per_lookup < 0.005
+
+
+def test_historical_offsets():
+    summer = TimezoneService.get_timezone_data(40.71, -74.01, "2000-07-01", "12:00")
+    winter = TimezoneService.get_timezone_data(40.71, -74.01, "2000-01-01", "12:00")
+    assert summer["timezone_id"] == "America/New_York"
+    assert summer["utc_offset"] == -4 * 3600
+    assert winter["utc_offset"] == -5 * 3600
+    # War time in India (UTC+6:30, 1942-1945)
+    assert TimezoneService.calculate_historical_offset("Asia/Kolkata", 1943, 6, 1, 12, 0) == 23400
+    assert TimezoneService.calculate_historical_offset("Asia/Kolkata", 1990, 1, 1, 12, 0) == 19800
+
+
+def test_resolve_timezone_defaults():
+    assert TimezoneService.resolve_timezone(None, 28.61, 77.21) == "Asia/Kolkata"
+    assert TimezoneService.resolve_timezone("None", 51.51, -0.13) == "Europe/London"
+    # Explicit UTC is kept, except for Indian birth places where callers ask for the legacy override
+    assert TimezoneService.resolve_timezone("UTC", 28.61, 77.21) == "UTC"
+    assert TimezoneService.resolve_timezone("UTC", 28.61, 77.21, replace_utc=True) == "Asia/Kolkata"
+    assert TimezoneService.resolve_timezone("UTC", 51.51, -0.13, replace_utc=True) == "UTC"
+    assert TimezoneService.to_utc(2000, 1, 1, 5, 30, 28.61, 77.21, "Asia/Kolkata") == (2000, 1, 1, 0, 0)
+    # Unknown zone names fall back to the zone at the coordinates
+    assert TimezoneService.to_utc(2000, 1, 1, 5, 30, 28.61, 77.21, "Not/AZone") == (2000, 1, 1, 0, 0)
+
+
+if __name__ == "__main__":
+    test_known_places()
+    test_open_ocean_is_nautical()
+    test_lookup_is_fast()
+    test_historical_offsets()
+    test_resolve_timezone_defaults()
+    print(TimezoneIndex.stats())
+    print("Timezone resolver OK")
@@ -0,0 +1,66 @@
+"""
+Checks the time-bucketed "now" transit cache.
+"""
+import sys
+sys.path.append('.')
+
+import time
+
+from services.transit_cache import TransitCache
+from services.skyfield_engine import SkyfieldService
+from services.vedic_astro_engine import VedicAstroEngine
+from services.astrology_aggregator import AstrologyAggregator
+
+
+def test_one_skyfield_pass_per_bucket_and_cell():
+    TransitCache.clear()
+    calls = {"positions": 0}
+    original_positions = SkyfieldService.calculate_positions
+
+    def counting_positions(*args, **kwargs):
+        calls["positions"] += 1
+        return original_positions(*args, **kwargs)
+
+    SkyfieldService.calculate_positions = counting_positions
+    try:
+        # Three users in the same 1-degree cell, plus the report/insight helpers
+        a = TransitCache.sidereal_planets(28.61, 77.21)
+        b = TransitCache.sidereal_planets(28.70, 77.10)
+        c = AstrologyAggregator.get_current_transits(28.65, 77.25)
+        chart = TransitCache.tropical_chart(28.61, 77.21)
+    finally:
+        SkyfieldService.calculate_positions = original_positions
+
+    stats = TransitCache.stats()
+    print(f"Transit cache stats: {stats}, Skyfield calls: {calls}")
+    assert calls["positions"] == 1
+    assert a == b == c
+    assert stats["hits"] == 3 and stats["misses"] == 1
+    assert chart['planets']
+
+
+def test_bucket_matches_direct_calculation():
+    TransitCache.clear()
+    ctx = TransitCache.get_context(0, 0)
+    direct = VedicAstroEngine.calculate_sidereal_planets(*ctx.utc, 0, 0, timezone_str="UTC")
+    assert TransitCache.sidereal_planets(0, 0) == direct['planets']
+
+
+def test_prefetch_warms_next_bucket():
+    TransitCache.clear()
+    now = time.time()
+    TransitCache.get_context(28.61, 77.21, now=now)
+    TransitCache.prefetch_next_bucket(now=now)
+
+    upcoming = now + TransitCache.BUCKET_SECONDS
+    before = TransitCache.stats()["hits"]
+    TransitCache.get_context(28.61, 77.21, now=upcoming)
+    assert TransitCache.stats()["hits"] == before + 1
+    TransitCache.clear()
+
+
+if __name__ == "__main__":
+    test_one_skyfield_pass_per_bucket_and_cell()
+    test_bucket_matches_direct_calculation()
+    test_prefetch_warms_next_bucket()
+    print("Transit cache checks passed.")
@@ -28,6 +28,8 @@ const ChatWidget = ({ reportData }) => {
         return savedCount ? parseInt(savedCount, 10) : 0;
     });
     const messagesEndRef = useRef(null);
+    // Server-side chat session: the profile context is sent once, follow-ups send only the message
+    const sessionIdRef = useRef(null);
 
     const CHAT_LIMIT = 10;
     const isLimitReached = messageCount >= CHAT_LIMIT;
@@ -107,24 +109,61 @@ const ChatWidget = ({ reportData }) => {
                 }
             };
 
-            const response = await fetch(`${API_BASE_URL}/api/chat/`, {
+            const openStream = (withContext) => fetch(`${API_BASE_URL}/api/chat/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     message: userMessage.text,
-                    context: context,
-                    history: messages.slice(-5)
+                    session_id: sessionIdRef.current,
+                    ...(withContext ? { context: context, history: messages.slice(-5) } : {})
                 })
             });
 
-            if (!response.ok) throw new Error("Failed to get response");
-            const data = await response.json();
+            let response = await openStream(!sessionIdRef.current);
+            if (response.status === 404) {
+                // Session expired on the server - start over with the full context
+                response = await openStream(true);
+            }
+            if (!response.ok || !response.body) throw new Error("Failed to get response");
 
-            setMessages(prev => [...prev, {
-                id: Date.now() + 1,
-                role: 'assistant',
-                text: data.response
-            }]);
+            // Server-Sent Events: render tokens as they arrive
+            const replyId = Date.now() + 1;
+            let started = false;
+            const showText = (text) => {
+                if (!started) {
+                    started = true;
+                    setIsLoading(false);
+                    setMessages(prev => [...prev, { id: replyId, role: 'assistant', text }]);
+                } else {
+                    setMessages(prev => prev.map(m => m.id === replyId ? { ...m, text } : m));
+                }
+            };
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let answer = '';
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const block of events) {
+                    let eventName = 'message';
+                    let data = null;
+                    block.split('\n').forEach(line => {
+                        if (line.startsWith('event: ')) eventName = line.slice(7);
+                        else if (line.startsWith('data: ')) data = JSON.parse(line.slice(6));
+                    });
+                    if (!data) continue;
+                    if (eventName === 'session') sessionIdRef.current = data.session_id;
+                    else if (eventName === 'message') { answer += data.token; showText(answer); }
+                    else if (eventName === 'done') showText(data.response);
+                    else if (eventName === 'error') throw new Error(data.detail);
+                }
+            }
+            if (!started) throw new Error("Empty response");
 
         } catch (error) {
             console.error("Chat Error:", error);
@@ -156,6 +156,27 @@ const LoshuGridDisplay = ({ loshuData, showAnalysis = false }) => {
     );
 };
 
+// Chart images by request, revalidated with the server's ETag (304 = reuse the cached image).
+// Plain object: `Map` is the lucide icon in this file.
+const chartImageCache = {};
+
+const fetchChartImage = async (url, payload) => {
+    const body = JSON.stringify(payload);
+    const key = `${url}|${body}`;
+    const cached = chartImageCache[key];
+    const headers = { 'Content-Type': 'application/json' };
+    if (cached) headers['If-None-Match'] = cached.etag;
+
+    const res = await fetch(url, { method: 'POST', headers, body });
+    if (res.status === 304 && cached) return cached.image;
+    if (!res.ok) return null;
+
+    const data = await res.json();
+    const etag = res.headers.get('ETag');
+    if (etag) chartImageCache[key] = { etag, image: data.image };
+    return data.image;
+};
+
 // Vedic Charts Display Component
 const VedicChartsDisplay = ({ userData }) => {
     const [chartStyle, setChartStyle] = useState('north'); // 'north' or 'south'
@@ -194,27 +215,17 @@ const VedicChartsDisplay = ({ userData }) => {
                 const style = chartStyle;
 
                 // Fetch both charts in parallel
-                const [lagnaRes, navamsaRes] = await Promise.all([
-                    fetch(`${API_BASE_URL}/api/chart/lagna/${style}`, {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(payload)
-                    }),
-                    fetch(`${API_BASE_URL}/api/chart/navamsa/${style}`, {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(payload)
-                    })
+                const [lagnaImage, navamsaImage] = await Promise.all([
+                    fetchChartImage(`${API_BASE_URL}/api/chart/lagna/${style}`, payload),
+                    fetchChartImage(`${API_BASE_URL}/api/chart/navamsa/${style}`, payload)
                 ]);
 
-                if (lagnaRes.ok) {
-                    const data = await lagnaRes.json();
-                    setLagnaChart(data.image);
+                if (lagnaImage) {
+                    setLagnaChart(lagnaImage);
                 }
 
-                if (navamsaRes.ok) {
-                    const data = await navamsaRes.json();
-                    setNavamsaChart(data.image);
+                if (navamsaImage) {
+                    setNavamsaChart(navamsaImage);
                 }
             } catch (err) {
                 console.error('Chart fetch error:', err);